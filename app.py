@@ -1,6 +1,7 @@
 import io
 import os
 import re
+import threading
 import time
 import zipfile
 from typing import Any
@@ -70,20 +71,40 @@ if (
     )
     ANTHROPIC_API_KEY = "sk-ant-REDACTED"
 
-from anthropic import Anthropic
-
 from services.prompt_loader import get_prompt_loader
 
-client: Anthropic | None = None
-try:
-    client = Anthropic(api_key=ANTHROPIC_API_KEY)
-    if "invalid" in ANTHROPIC_API_KEY.lower():
-        print("⚠️  Using placeholder API key - Stage 1 & Stage 2 will fail!")
-    else:
-        print("✅ Anthropic API client initialized")
-except Exception as e:
-    print(f"❌ Failed to initialize Anthropic client: {e}")
-    # client remains None to prevent crashes
+if "invalid" in ANTHROPIC_API_KEY.lower():
+    print("⚠️  Using placeholder API key - Stage 1 & Stage 2 will fail!")
+
+
+class _LazyAnthropicClient:
+    """Module-level `client` that builds the Anthropic SDK client on first use.
+
+    Importing the SDK accounts for roughly a quarter of worker boot time and
+    most workers never call it, so the import is deferred to the first
+    attribute access (e.g. ``client.messages.create``).
+    """
+
+    def __init__(self, api_key: str):
+        self._api_key = api_key
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from anthropic import Anthropic
+
+                    self._client = Anthropic(api_key=self._api_key)
+                    app_logger.info("Anthropic API client initialized")
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get(), name)
+
+
+client = _LazyAnthropicClient(ANTHROPIC_API_KEY)
 import json
 import os
 import secrets
@@ -216,7 +237,6 @@ from services.document_generators import (
     generate_client_email_html,
     generate_client_report_html,
     generate_internal_analysis_html,
-    html_to_pdf,
 )
 from services.encryption import (
     decrypt_value,
@@ -230,16 +250,12 @@ from services.franchise_service import (
     get_org_filter,
 )
 from services.jwt_utils import create_token, require_jwt
+from services.log_partition_service import get_log_partition_service
 from services.litigation_tools import (
     assess_willfulness,
     calculate_case_score,
     calculate_damages,
 )
-from services.pdf_generator import (
-    CreditAnalysisPDFGenerator,
-    LetterPDFGenerator,
-    SectionPDFGenerator,
-)
 from services.performance_service import (
     PerformanceService,
     app_cache,
@@ -248,6 +264,7 @@ from services.performance_service import (
     invalidate_cache,
     request_timing_middleware,
 )
+from services.pdf_render_service import RenderJob, get_pdf_render_service, render_pdfs
 from services.predictive_analytics_service import predictive_analytics_service
 from services.scheduler_service import (
     COMMON_CRON_EXPRESSIONS,
@@ -255,6 +272,7 @@ from services.scheduler_service import (
     SchedulerService,
 )
 from services.task_queue_service import TaskQueueService
+from services.tenant_resolver import get_tenant_resolver
 from services.white_label_service import WhiteLabelService, get_white_label_service
 from services.whitelabel_service import (
     WhiteLabelConfigService,
@@ -266,87 +284,7 @@ from services.workflow_triggers_service import (
     WorkflowTriggersService,
 )
 
-app = Flask(__name__)
-
-# Initialize Sentry error tracking (with user context and Slack alerts)
-from services.sentry_service import init_sentry
-
-if init_sentry(app):
-    app_logger.info("Sentry error tracking initialized with user context")
-else:
-    app_logger.info("Sentry not configured (set SENTRY_DSN to enable)")
-
-# Initialize request/response logging
-init_request_logging(app)
-app_logger.info("Flask app initialized")
-
-# Initialize rate limiting
-limiter = init_rate_limiter(app)
-app_logger.info("Rate limiting initialized")
-
-# Initialize security headers and HTTPS enforcement
-from services.security_headers import init_security_headers
-
-init_security_headers(app)
-app_logger.info("Security headers initialized")
-
-# Initialize graceful shutdown handling
-from services.graceful_shutdown_service import init_graceful_shutdown
-
-shutdown_manager = init_graceful_shutdown(app)
-app_logger.info("Graceful shutdown handling initialized")
-
-# Initialize database pool monitoring
-try:
-    from database import engine
-    from services.database_pool_service import init_pool_monitoring
-
-    pool_monitor = init_pool_monitoring(engine, start_background=True)
-    app_logger.info("Database pool monitoring initialized")
-except Exception as e:
-    app_logger.warning(f"Could not initialize pool monitoring: {e}")
-
-# Initialize rate limit monitoring
-from services.rate_limit_monitor_service import init_rate_limit_monitoring
-
-try:
-    rate_limit_monitor = init_rate_limit_monitoring()
-    app_logger.info("Rate limit monitoring initialized")
-except Exception as e:
-    app_logger.warning(f"Could not initialize rate limit monitoring: {e}")
-
-# Initialize request ID tracking
-from services.request_id_service import (
-    configure_logging_with_request_id,
-    init_request_id_middleware,
-)
-
-init_request_id_middleware(app)
-configure_logging_with_request_id()
-app_logger.info("Request ID tracking initialized")
-
-# Initialize memory cleanup service (prevents memory leaks)
-from services.memory_cleanup_service import register_cleanup_hook
-
-# Secret key for session management (using centralized config)
-app.secret_key = config.SECRET_KEY
-
-from routes.affiliate_portal import affiliate_portal
-from routes.partner import partner_bp
-
-# Register blueprints
-from routes.portal import portal
-
-app.register_blueprint(portal)
-print("✅ Portal blueprint registered")
-
-app.register_blueprint(affiliate_portal)
-print("✅ Affiliate portal blueprint registered")
-
-app.register_blueprint(partner_bp)
-print("✅ Partner portal blueprint registered")
-
-# Initialize Swagger/OpenAPI documentation
+# Swagger/OpenAPI documentation settings
 from flasgger import Swagger
 
 swagger_config = {
@@ -375,8 +313,128 @@ swagger_template = {
     "servers": [{"url": "/", "description": "Current server"}],
 }
 
-swagger = Swagger(app, config=swagger_config, template=swagger_template)
-app_logger.info("Swagger API documentation initialized at /api/docs/")
+
+def init_observability(app):
+    """Error tracking and request logging; runs before the rate limiter so
+    rate-limited requests are still logged"""
+    # Initialize Sentry error tracking (with user context and Slack alerts)
+    from services.sentry_service import init_sentry
+
+    if init_sentry(app):
+        app_logger.info("Sentry error tracking initialized with user context")
+    else:
+        app_logger.info("Sentry not configured (set SENTRY_DSN to enable)")
+
+    # Initialize request/response logging
+    init_request_logging(app)
+    app_logger.info("Flask app initialized")
+
+
+def init_app_services(app):
+    """Boot-time integrations that routes do not depend on: security headers,
+    graceful shutdown, pool and rate limit monitoring, request IDs and the
+    OpenAPI docs"""
+    # Initialize security headers and HTTPS enforcement
+    from services.security_headers import init_security_headers
+
+    init_security_headers(app)
+    app_logger.info("Security headers initialized")
+
+    # Initialize graceful shutdown handling
+    from services.graceful_shutdown_service import init_graceful_shutdown
+
+    init_graceful_shutdown(app)
+    app_logger.info("Graceful shutdown handling initialized")
+
+    # Initialize database pool monitoring
+    try:
+        from database import engine
+        from services.database_pool_service import init_pool_monitoring
+
+        init_pool_monitoring(engine, start_background=True)
+        app_logger.info("Database pool monitoring initialized")
+    except Exception as e:
+        app_logger.warning(f"Could not initialize pool monitoring: {e}")
+
+    # Initialize rate limit monitoring
+    from services.rate_limit_monitor_service import init_rate_limit_monitoring
+
+    try:
+        init_rate_limit_monitoring()
+        app_logger.info("Rate limit monitoring initialized")
+    except Exception as e:
+        app_logger.warning(f"Could not initialize rate limit monitoring: {e}")
+
+    # Initialize request ID tracking
+    from services.request_id_service import (
+        configure_logging_with_request_id,
+        init_request_id_middleware,
+    )
+
+    init_request_id_middleware(app)
+    configure_logging_with_request_id()
+    app_logger.info("Request ID tracking initialized")
+
+    # Initialize Swagger/OpenAPI documentation
+    Swagger(app, config=swagger_config, template=swagger_template)
+    app_logger.info("Swagger API documentation initialized at /api/docs/")
+
+
+def create_app(init_services=True):
+    """Application factory.
+
+    Builds the Flask app with its secret key, rate limiter (kept in
+    app.extensions["rate_limiter"]) and the portal, affiliate and partner
+    blueprints. With init_services=False the boot-time integrations
+    (init_observability, init_app_services) are skipped so they can be
+    initialized later or not at all; DEFER_APP_SERVICES=true does this for
+    the module-level app.
+    """
+    app = Flask(__name__)
+
+    # Secret key for session management (using centralized config)
+    app.secret_key = config.SECRET_KEY
+
+    if init_services:
+        init_observability(app)
+
+    # Initialize rate limiting
+    app.extensions["rate_limiter"] = init_rate_limiter(app)
+    app_logger.info("Rate limiting initialized")
+
+    if init_services:
+        init_app_services(app)
+
+    # Register blueprints
+    from routes.affiliate_portal import affiliate_portal
+    from routes.partner import partner_bp
+    from routes.portal import portal
+
+    app.register_blueprint(portal)
+    print("✅ Portal blueprint registered")
+
+    app.register_blueprint(affiliate_portal)
+    print("✅ Affiliate portal blueprint registered")
+
+    app.register_blueprint(partner_bp)
+    print("✅ Partner portal blueprint registered")
+
+    return app
+
+
+app = create_app(init_services=os.environ.get("DEFER_APP_SERVICES") != "true")
+limiter = app.extensions["rate_limiter"]
+
+# Initialize memory cleanup service (prevents memory leaks)
+from services.memory_cleanup_service import register_cleanup_hook
+
+# Services that register background task handlers or event hooks on import
+import services.portal_summary_service  # noqa: E402,F401  (portal summary invalidation and task handler)
+import services.client_success_service  # noqa: E402,F401  (snapshot task handler)
+import services.key_rotation_service  # noqa: E402,F401  (key rotation task handler)
+import services.ai_dispute_writer_service  # noqa: E402,F401  (bulk letter generation task handler)
+import services.timeline_service  # noqa: E402,F401  (timeline backfill task handler)
+import services.deadline_service  # noqa: E402,F401  (deadline reminder send task handler)
 
 # CI/CD Authentication Bypass (ONLY activates with CI=true AND not in production)
 if config.IS_CI and not config.IS_PRODUCTION:
@@ -481,10 +539,6 @@ delivered_cases = set()
 register_cleanup_hook(app, login_attempts, credit_reports, delivered_cases)
 app_logger.info("Memory cleanup hook registered")
 
-# Initialize PDF generators
-pdf_gen = LetterPDFGenerator()
-section_pdf_gen = SectionPDFGenerator()
-
 # Create required directories
 os.makedirs("static/section_pdfs", exist_ok=True)
 os.makedirs("static/generated_letters", exist_ok=True)
@@ -755,17 +809,12 @@ def require_api_key(scopes=None):
     return decorator
 
 
-_whitelabel_config_cache: dict[str, Any] = {}
-_whitelabel_cache_timestamps: dict[str, datetime] = {}
-_WHITELABEL_CACHE_TTL = 300
-
-
 def with_branding(f):
     """
     Decorator that injects white-label branding into template context.
     Detects subdomain/domain from request and loads appropriate config.
     Falls back to default Brightpath Ascend branding if no config found.
-    Caches config lookups for performance.
+    Lookups go through the shared per-host tenant resolver.
     """
 
     @wraps(f)
@@ -774,40 +823,14 @@ def with_branding(f):
         config = None
 
         try:
-            host = request.host
-            if host:
-                host = host.lower().split(":")[0]
-
-                cache_key = f"wl_host:{host}"
-                cached_config = _get_whitelabel_cache(cache_key)
-
-                if cached_config is not None:
-                    if cached_config == "default":
-                        branding = _get_default_whitelabel_branding()
-                    else:
-                        branding = (
-                            cached_config.get_branding_dict()
-                            if hasattr(cached_config, "get_branding_dict")
-                            else cached_config
-                        )
-                        config = cached_config
-                else:
-                    db = get_db()
-                    try:
-                        service = get_whitelabel_config_service(db)
-                        config = service.detect_config_from_host(host)
-
-                        if config and config.is_active:
-                            branding = config.get_branding_dict()
-                            _set_whitelabel_cache(cache_key, config)
-                        else:
-                            branding = _get_default_whitelabel_branding()
-                            _set_whitelabel_cache(cache_key, "default")
-                    finally:
-                        db.close()
+            resolved = getattr(g, "resolved_host", None)
+            if resolved is None:
+                resolved = get_tenant_resolver().resolve(request.host)
+            config = resolved.whitelabel_config
+            branding = resolved.whitelabel_branding
         except Exception as e:
             print(f"Branding lookup error: {e}")
-            branding = _get_default_whitelabel_branding()
+            config = None
 
         if branding is None:
             branding = _get_default_whitelabel_branding()
@@ -820,29 +843,6 @@ def with_branding(f):
     return decorated_function
 
 
-def _get_whitelabel_cache(key):
-    """Get value from white-label cache if not expired"""
-    if key not in _whitelabel_config_cache:
-        return None
-
-    timestamp = _whitelabel_cache_timestamps.get(key)
-    if (
-        timestamp
-        and (datetime.utcnow() - timestamp).total_seconds() > _WHITELABEL_CACHE_TTL
-    ):
-        del _whitelabel_config_cache[key]
-        del _whitelabel_cache_timestamps[key]
-        return None
-
-    return _whitelabel_config_cache.get(key)
-
-
-def _set_whitelabel_cache(key, value):
-    """Set value in white-label cache"""
-    _whitelabel_config_cache[key] = value
-    _whitelabel_cache_timestamps[key] = datetime.utcnow()
-
-
 def _get_default_whitelabel_branding():
     """Return default Brightpath Ascend Group branding"""
     return {
@@ -882,49 +882,32 @@ def inject_whitelabel_branding():
     }
 
 
+_STATIC_URL_PREFIX = (app.static_url_path or "/static").rstrip("/") + "/"
+
+
 @app.before_request
 def detect_tenant():
     """Middleware to detect tenant from subdomain or custom domain"""
     g.tenant = None
     g.tenant_branding = None
 
+    if request.path.startswith(_STATIC_URL_PREFIX):
+        return
+
     try:
         host = request.host
         if not host:
             return
 
-        db = get_db()
-        try:
-            service = get_white_label_service(db)
-            tenant = service.detect_tenant_from_host(host)
-
-            if tenant and tenant.is_active:
-                g.tenant = tenant
-                g.tenant_branding = tenant.get_branding_config()
-            else:
-                g.tenant_branding = service.get_default_branding()
-        except Exception as e:
-            print(f"Tenant detection error: {e}")
-            g.tenant_branding = {
-                "primary_color": "#319795",
-                "secondary_color": "#1a1a2e",
-                "accent_color": "#84cc16",
-                "logo_url": "/static/images/logo.png",
-                "favicon_url": None,
-                "company_name": "Brightpath Ascend Group",
-                "company_address": None,
-                "company_phone": None,
-                "company_email": None,
-                "support_email": None,
-                "terms_url": None,
-                "privacy_url": None,
-                "custom_css": None,
-                "custom_js": None,
-            }
-        finally:
-            db.close()
+        resolved = get_tenant_resolver().resolve(host)
+        g.resolved_host = resolved
+        g.tenant = resolved.tenant
+        g.tenant_branding = resolved.tenant_branding
     except Exception as e:
-        pass
+        print(f"Tenant detection error: {e}")
+
+    if g.tenant_branding is None:
+        g.tenant_branding = WhiteLabelService.get_default_branding()
 
 
 @app.context_processor
@@ -5599,7 +5582,9 @@ def analyze_and_generate_letters():
             output_path = os.path.join("static", "generated_letters", filename)
 
             try:
-                pdf_gen.generate_dispute_letter_pdf(
+                from services.pdf_generator import LetterPDFGenerator
+
+                LetterPDFGenerator().generate_dispute_letter_pdf(
                     letter_content=combined_content,
                     client_name=client_name,
                     bureau=bureau,
@@ -5952,25 +5937,22 @@ def download_full_report(analysis_id):
             "static", "generated_letters", client_filename
         )
         os.makedirs(os.path.dirname(client_output_path), exist_ok=True)
-        client_html = generate_client_report_html(
-            analysis, violations, standing, damages, case_score
-        )
-        html_to_pdf(client_html, client_output_path)
 
         # Generate Apple-style Internal Analysis PDF
         legal_filename = f"{client_name_safe}_Legal_Analysis_{timestamp}.pdf"
         legal_output_path = os.path.join("static", "generated_letters", legal_filename)
-        legal_html = generate_internal_analysis_html(
-            analysis, violations, standing, damages, case_score
-        )
-        html_to_pdf(legal_html, legal_output_path)
 
         # Return the requested PDF type (default to client)
         pdf_type = request.args.get("type", "client")
         # Check if request wants inline viewing (from iframe) or download
         inline = request.args.get("inline", "true").lower() == "true"
 
+        # Only the document being returned is rendered
         if pdf_type == "legal":
+            legal_html = generate_internal_analysis_html(
+                analysis, violations, standing, damages, case_score
+            )
+            get_pdf_render_service().render(legal_html, legal_output_path)
             return send_file(
                 legal_output_path,
                 as_attachment=not inline,  # False = inline, True = download
@@ -5978,6 +5960,10 @@ def download_full_report(analysis_id):
                 mimetype="application/pdf",
             )
         else:
+            client_html = generate_client_report_html(
+                analysis, violations, standing, damages, case_score
+            )
+            get_pdf_render_service().render(client_html, client_output_path)
             return send_file(
                 client_output_path,
                 as_attachment=not inline,  # False = inline, True = download
@@ -6186,7 +6172,52 @@ def approve_analysis_stage_1(analysis_id):
                 case_score=case_score,
                 credit_scores=credit_scores,
             )
-            html_to_pdf(internal_html, internal_path)
+
+            # 2. CLIENT REPORT (7-page Apple-style report)
+            print(f"  📄 Generating 7-Page Client Report...")
+            client_report_filename = (
+                f"{client_filename_safe}_Client_Report_{timestamp}.pdf"
+            )
+            client_report_path = os.path.join(
+                "static", "generated_letters", client_report_filename
+            )
+
+            client_report_html = generate_client_report_html(
+                analysis=analysis,
+                violations=violations,
+                standing=standing,
+                damages=damages,
+                case_score=case_score,
+                credit_scores=credit_scores,
+            )
+
+            # 3. CLIENT EMAIL (email-optimized, 2-3 pages)
+            print(f"  📧 Generating Client Email...")
+            client_email_filename = (
+                f"{client_filename_safe}_Client_Email_{timestamp}.pdf"
+            )
+            client_email_path = os.path.join(
+                "static", "generated_letters", client_email_filename
+            )
+
+            client_email_html = generate_client_email_html(
+                analysis=analysis,
+                violations=violations,
+                standing=standing,
+                damages=damages,
+                case_score=case_score,
+            )
+
+            # Render all three concurrently in the bounded PDF worker pool, so
+            # WeasyPrint never runs in this web worker; the records below are
+            # only written once the files exist
+            render_pdfs(
+                [
+                    RenderJob(internal_html, internal_path),
+                    RenderJob(client_report_html, client_report_path),
+                    RenderJob(client_email_html, client_email_path),
+                ]
+            )
 
             internal_record = DisputeLetter(
                 analysis_id=analysis_id,
@@ -6210,25 +6241,6 @@ def approve_analysis_stage_1(analysis_id):
             )
             print(f"  ✅ Internal Analysis saved: {internal_path}")
 
-            # 2. CLIENT REPORT (7-page Apple-style report)
-            print(f"  📄 Generating 7-Page Client Report...")
-            client_report_filename = (
-                f"{client_filename_safe}_Client_Report_{timestamp}.pdf"
-            )
-            client_report_path = os.path.join(
-                "static", "generated_letters", client_report_filename
-            )
-
-            client_report_html = generate_client_report_html(
-                analysis=analysis,
-                violations=violations,
-                standing=standing,
-                damages=damages,
-                case_score=case_score,
-                credit_scores=credit_scores,
-            )
-            html_to_pdf(client_report_html, client_report_path)
-
             client_report_record = DisputeLetter(
                 analysis_id=analysis_id,
                 client_id=analysis.client_id,
@@ -6251,24 +6263,6 @@ def approve_analysis_stage_1(analysis_id):
             )
             print(f"  ✅ Client Report saved: {client_report_path}")
 
-            # 3. CLIENT EMAIL (email-optimized, 2-3 pages)
-            print(f"  📧 Generating Client Email...")
-            client_email_filename = (
-                f"{client_filename_safe}_Client_Email_{timestamp}.pdf"
-            )
-            client_email_path = os.path.join(
-                "static", "generated_letters", client_email_filename
-            )
-
-            client_email_html = generate_client_email_html(
-                analysis=analysis,
-                violations=violations,
-                standing=standing,
-                damages=damages,
-                case_score=case_score,
-            )
-            html_to_pdf(client_email_html, client_email_path)
-
             client_email_record = DisputeLetter(
                 analysis_id=analysis_id,
                 client_id=analysis.client_id,
@@ -12869,6 +12863,8 @@ def api_generate_credit_analysis(client_id):
         safe_name = client.name.replace(" ", "_").lower()
         output_path = f"generated_pdfs/credit_analysis_{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
 
+        from services.pdf_generator import CreditAnalysisPDFGenerator
+
         generator = CreditAnalysisPDFGenerator()
         pdf_path = generator.generate_credit_analysis_pdf(
             client_name=client.name,
@@ -14088,8 +14084,8 @@ def api_send_analysis_email(analysis_id):
                     credit_scores=None,
                 )
 
-                # Convert HTML to PDF using WeasyPrint
-                html_to_pdf(report_html, tmp_path)
+                # Convert HTML to PDF in the WeasyPrint worker pool
+                get_pdf_render_service().render(report_html, tmp_path)
 
                 # Read and encode PDF to base64
                 with open(tmp_path, "rb") as f:
@@ -19415,6 +19411,22 @@ def api_get_client_settlements(client_id):
 # ==============================================================================
 
 
+@app.route("/api/timeline/backfill-all", methods=["POST"])
+@require_staff(roles=["admin"])
+def api_timeline_backfill_all():
+    """Queue a bulk timeline backfill; poll /api/batch/jobs/<batch_job_id>/progress"""
+    from services.timeline_service import start_timeline_backfill
+
+    data = request.get_json() or {}
+    try:
+        result = start_timeline_backfill(
+            staff_id=session.get("staff_id"), client_ids=data.get("client_ids")
+        )
+        return jsonify({"success": True, **result}), 202
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route("/api/client/<int:client_id>/timeline", methods=["GET"])
 def api_client_timeline(client_id):
     """Get complete dispute timeline for a client - merges data from multiple sources"""
@@ -20584,9 +20596,24 @@ def api_batch_process_ocr():
         if not upload_ids:
             return jsonify({"success": False, "error": "upload_ids required"}), 400
 
-        from services.ocr_service import batch_process_uploads
+        from services.ocr_service import OCR_MAX_BATCH_CONCURRENCY, batch_process_uploads
 
-        result = batch_process_uploads(upload_ids, category)
+        max_concurrency = data.get("max_concurrency")
+        if max_concurrency is not None:
+            try:
+                max_concurrency = int(max_concurrency)
+            except (TypeError, ValueError):
+                return (
+                    jsonify({"success": False, "error": "max_concurrency must be an integer"}),
+                    400,
+                )
+            max_concurrency = max(1, min(max_concurrency, OCR_MAX_BATCH_CONCURRENCY))
+
+        result = batch_process_uploads(
+            upload_ids,
+            category,
+            max_concurrency=max_concurrency,
+        )
 
         return jsonify(
             {
@@ -29857,9 +29884,6 @@ If you cannot identify clear violations, return violation_count: 0 with empty vi
 CREDIT REPORT TO ANALYZE:
 """
 
-        if client is None:
-            return jsonify({"success": False, "error": "AI service unavailable"}), 503
-
         response = client.messages.create(
             model="claude-sonnet-4-20250514",
             max_tokens=2000,
@@ -30088,18 +30112,6 @@ Format the letter professionally with proper headers, spacing, and signature blo
 Use assertive but professional language befitting FCRA consumer protection litigation.
 """
 
-        if client is None:
-            print("[Demand Generator] AI client is None - service unavailable")
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "AI service unavailable. Please check API key configuration.",
-                    }
-                ),
-                503,
-            )
-
         print(
             f"[Demand Generator] Calling AI with {len(violation_summary)} violations, demand amount: ${demand_amount}"
         )
@@ -35807,6 +35819,93 @@ def api_audit_cleanup():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route("/api/audit/partitions", methods=["GET"])
+@require_staff(roles=["admin"])
+def api_log_partitions_status():
+    """Partition layout and retention policy for the high-volume log tables"""
+    try:
+        status = get_log_partition_service().get_status()
+        return jsonify({"success": True, "tables": status})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route("/api/audit/partitions/maintenance", methods=["POST"])
+@require_staff(roles=["admin"])
+def api_log_partitions_maintenance():
+    """Create upcoming monthly partitions; purge only the tables given retention"""
+    data = request.get_json() or {}
+    service = get_log_partition_service()
+
+    months_ahead = data.get("months_ahead", 2)
+    try:
+        retention_days = service.validate_retention(data.get("retention_days"))
+        if (
+            isinstance(months_ahead, bool)
+            or not isinstance(months_ahead, int)
+            or not 0 <= months_ahead <= 24
+        ):
+            raise ValueError("months_ahead must be an integer between 0 and 24")
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    try:
+        result = service.run_maintenance(
+            retention_days=retention_days,
+            months_ahead=months_ahead,
+        )
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route("/api/audit/partitions/convert", methods=["POST"])
+@require_staff(roles=["admin"])
+def api_log_partitions_convert():
+    """Queue the rebuild of a log table as a monthly partitioned table"""
+    from services.log_partition_service import PARTITIONED_LOG_TABLES
+
+    data = request.get_json() or {}
+    table = data.get("table")
+    if table not in PARTITIONED_LOG_TABLES:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "error": f"table must be one of: {', '.join(PARTITIONED_LOG_TABLES)}",
+                }
+            ),
+            400,
+        )
+
+    try:
+        # Copies every row, so it runs in the background worker
+        task = TaskQueueService.enqueue_task(
+            "log_partition_convert",
+            {"table": table, "months_ahead": 2},
+            staff_id=session.get("staff_id"),
+        )
+        return jsonify({"success": True, "task_id": task.id}), 202
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route("/api/admin/encryption/rotate", methods=["POST"])
+@require_staff(roles=["admin"])
+def api_encryption_rotate():
+    """Queue re-encryption of stored secrets under the current encryption key"""
+    data = request.get_json() or {}
+    try:
+        task = TaskQueueService.enqueue_task(
+            "rotate_encryption_keys",
+            {"chunk_size": data.get("chunk_size", 500)},
+            staff_id=session.get("staff_id"),
+        )
+        return jsonify({"success": True, "task_id": task.id}), 202
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 # ============================================================
 # ACTIVITY LOGS ROUTES (Paul's Logging System)
 # ============================================================
@@ -36070,7 +36169,12 @@ def api_performance_metrics():
         try:
             perf_service = get_performance_service(db)
 
-            if endpoint and method:
+            # Merged across workers by default; all_workers=false for this worker only
+            if request.args.get("all_workers", "true").lower() != "false":
+                metrics = perf_service.get_merged_metrics(
+                    period_minutes=period, endpoint=endpoint, method=method
+                )
+            elif endpoint and method:
                 metrics = perf_service.get_endpoint_metrics(endpoint, method)
             else:
                 metrics = perf_service.get_endpoint_metrics()
@@ -42666,7 +42770,6 @@ def dashboard_staff_performance():
 # CLIENT SUCCESS METRICS API ENDPOINTS
 # =====================================================================
 
-
 @app.route("/api/client-success/dashboard", methods=["GET"])
 @require_staff()
 def api_client_success_dashboard():
@@ -43192,6 +43295,36 @@ def api_ai_dispute_writer_generate():
         db.close()
 
 
+@app.route("/api/ai-dispute-writer/generate-bulk", methods=["POST"])
+@require_staff()
+def api_ai_dispute_writer_generate_bulk():
+    """Queue round-based letter generation for many clients"""
+    data = request.get_json() or {}
+
+    client_ids = data.get("client_ids") or []
+    if not client_ids:
+        return jsonify({"success": False, "error": "client_ids required"}), 400
+
+    try:
+        task = TaskQueueService.enqueue_task(
+            "generate_letters_bulk",
+            {
+                "client_ids": client_ids,
+                "round_number": data.get("round", 1),
+                "bureaus": data.get("bureaus"),
+                "custom_instructions": data.get("custom_instructions"),
+                "tone": data.get("tone", "professional"),
+            },
+            staff_id=session.get("staff_id"),
+        )
+        return (
+            jsonify({"success": True, "task_id": task.id, "clients": len(client_ids)}),
+            202,
+        )
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route("/api/ai-dispute-writer/generate-quick", methods=["POST"])
 @require_staff()
 def api_ai_dispute_writer_generate_quick():
@@ -2170,6 +2170,41 @@ class CreditScoreSnapshot(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class ClientPortalSummary(Base):
+    """Per-client portal dashboard totals, maintained by portal_summary_service"""
+    __tablename__ = 'client_portal_summaries'
+
+    client_id = Column(Integer, ForeignKey('clients.id'), primary_key=True)
+
+    violation_count = Column(Integer, default=0)
+    total_violations = Column(Float, default=0)  # Statutory damages, else damages exposure
+    disputed_accounts = Column(Integer, default=0)
+    bureau_counts = Column(JSON)  # {"Equifax": 4, "Experian": 2, ...}
+
+    current_round = Column(Integer, default=1)
+    starting_score = Column(Integer)
+    current_score = Column(Integer)
+
+    # Set (and version bumped) in the same transaction as any write to the
+    # inputs above; the next read rebuilds the row
+    stale = Column(Boolean, default=False, nullable=False)
+    version = Column(Integer, default=0, nullable=False)
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'client_id': self.client_id,
+            'violation_count': self.violation_count or 0,
+            'total_violations': self.total_violations or 0,
+            'disputed_accounts': self.disputed_accounts or 0,
+            'bureau_counts': self.bureau_counts or {},
+            'current_round': self.current_round or 1,
+            'starting_score': self.starting_score,
+            'current_score': self.current_score,
+            'refreshed_at': self.refreshed_at.isoformat() if self.refreshed_at else None,
+        }
+
+
 class CreditScoreProjection(Base):
     """Store projected score improvements based on negative removal"""
     __tablename__ = 'credit_score_projections'
@@ -2756,6 +2791,7 @@ class BackgroundTask(Base):
     max_retries = Column(Integer, default=3)
     client_id = Column(Integer, ForeignKey('clients.id'), nullable=True)
     created_by_staff_id = Column(Integer, ForeignKey('staff.id'), nullable=True)
+    idempotency_key = Column(String(200), unique=True, nullable=True)  # Enqueue at most once per key
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -2776,6 +2812,7 @@ class BackgroundTask(Base):
             'max_retries': self.max_retries,
             'client_id': self.client_id,
             'created_by_staff_id': self.created_by_staff_id,
+            'idempotency_key': self.idempotency_key,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -3933,6 +3970,9 @@ class PerformanceMetric(Base):
     period_start = Column(DateTime, nullable=False, index=True)
     period_end = Column(DateTime, nullable=False)
 
+    # Serialized LatencyHistogram for the window, merged across workers at query time
+    histogram = Column(JSON)
+
     created_at = Column(DateTime, default=datetime.utcnow)
 
     def to_dict(self):
@@ -8091,6 +8131,7 @@ def init_db():
         ("background_tasks", "max_retries", "INTEGER DEFAULT 3"),
         ("background_tasks", "client_id", "INTEGER REFERENCES clients(id)"),
         ("background_tasks", "created_by_staff_id", "INTEGER REFERENCES staff(id)"),
+        ("background_tasks", "idempotency_key", "VARCHAR(200) UNIQUE"),
         ("background_tasks", "created_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
         ("background_tasks", "updated_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
         ("scheduled_jobs", "id", "SERIAL PRIMARY KEY"),
@@ -8392,6 +8433,7 @@ def init_db():
         ("performance_metrics", "cache_hit_rate", "FLOAT DEFAULT 0"),
         ("performance_metrics", "period_start", "TIMESTAMP NOT NULL"),
         ("performance_metrics", "period_end", "TIMESTAMP NOT NULL"),
+        ("performance_metrics", "histogram", "JSON"),
         ("performance_metrics", "created_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
         ("cache_entries", "id", "SERIAL PRIMARY KEY"),
         ("cache_entries", "cache_key", "VARCHAR(255) UNIQUE NOT NULL"),
@@ -9629,6 +9671,7 @@ def create_performance_indices():
         ("idx_performance_metrics_period", "performance_metrics", "period_start"),
         ("idx_cache_entries_key", "cache_entries", "cache_key"),
         ("idx_cache_entries_expires", "cache_entries", "expires_at"),
+        ("idx_case_deadlines_status_date", "case_deadlines", "status, deadline_date"),
     ]
 
     conn = engine.connect()
@@ -0,0 +1,557 @@
+"""
+Data-Volume Profiles for Load Testing.
+
+Seeds the database with a synthetic book of business at a fixed scale so the
+locust scenarios measure endpoints against realistic table sizes, then turns
+the locust stats CSV into a p95-per-endpoint report for that scale.
+
+Profiles (10k, 100k, 1m clients) keep the child tables proportional to the
+client count: dispute items, portal messages, email/SMS logs, audit logs and
+case outcomes. Generation is deterministic for a given seed, and rows are
+bulk loaded in chunks - COPY on PostgreSQL, executemany everywhere else.
+
+Run with:
+    python -m load_tests.data_volume seed --profile 100k
+    ./load_tests/run_load_test.sh profile 100k
+    python -m load_tests.data_volume report --profile 100k \
+        --stats load_tests/results_100k_stats.csv --output load_tests/p95.json
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import func, select, text
+from werkzeug.security import generate_password_hash
+
+# Clients generated (and loaded, with their child rows) per round trip
+CHUNK_SIZE = 5000
+
+# Credentials the locust users log in with
+STAFF_LOGIN = ("test@example.com", "testpass123")
+PORTAL_LOGIN = ("testclient@example.com", "test123")
+
+
+@dataclass(frozen=True)
+class Profile:
+    """Table sizes for one scale; child tables are mean rows per client"""
+
+    name: str
+    clients: int
+    staff: int
+    dispute_items: float = 12
+    messages: float = 6
+    emails: float = 8
+    sms: float = 3
+    audit_logs: float = 25
+    outcome_rate: float = 0.15  # share of clients with a closed case
+    history_days: int = 3 * 365
+
+
+PROFILES = {
+    "10k": Profile("10k", clients=10_000, staff=25),
+    "100k": Profile("100k", clients=100_000, staff=100),
+    "1m": Profile("1m", clients=1_000_000, staff=400),
+}
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael",
+    "Linda", "David", "Elizabeth", "William", "Barbara", "Carlos", "Maria",
+    "Wei", "Aisha", "Daniel", "Susan", "Jamal", "Priya",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller",
+    "Davis", "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson",
+    "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Nguyen", "Patel",
+]
+CREDITORS = [
+    "CAPITAL ONE", "SYNCHRONY BANK", "MIDLAND CREDIT MGMT", "PORTFOLIO RECOVERY",
+    "LVNV FUNDING", "DISCOVER BANK", "NAVIENT", "CREDIT ONE BANK",
+    "JEFFERSON CAPITAL", "CHASE CARD",
+]
+BUREAUS = ["Equifax", "Experian", "TransUnion"]
+ITEM_TYPES = ["collection", "late_payment", "charge_off", "inquiry", "public_record"]
+ITEM_STATUSES = ["to_do", "sent", "in_progress", "deleted", "updated", "no_change"]
+CLIENT_STATUSES = ["signup", "active", "active", "active", "paused", "complete", "cancelled"]
+CLIENT_STAGES = ["lead", "onboarding", "pending_payment", "active", "active", "active"]
+PAYMENT_STATUSES = ["paid", "paid", "pending", "failed"]
+OUTCOMES = ["settled", "settled", "won", "lost", "dismissed"]
+EMAIL_TEMPLATES = ["welcome", "dispute_sent", "round_update", "payment_reminder"]
+EMAIL_STATUSES = ["sent", "sent", "delivered", "opened", "failed"]
+AUDIT_EVENTS = [
+    ("login", "staff", "staff", "Staff login"),
+    ("data_access", "client", "staff", "Viewed client profile"),
+    ("data_modify", "dispute_item", "staff", "Updated dispute item status"),
+    ("document_access", "document", "client", "Downloaded document"),
+    ("data_access", "credit_report", "staff", "Viewed credit report"),
+]
+MESSAGES = [
+    "Any update on my disputes?",
+    "I uploaded my new credit report.",
+    "Thanks, I received the letters.",
+    "Your round 2 letters were mailed today.",
+    "We received a response from Experian.",
+]
+
+
+# =============================================================================
+# Bulk Loading
+# =============================================================================
+
+
+def _copy_value(value: Any) -> Any:
+    """CSV cell for COPY; None becomes an empty (NULL) field"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+class BulkLoader:
+    """
+    Inserts row dicts into a table in one round trip per batch.
+
+    PostgreSQL gets COPY FROM STDIN; other dialects fall back to an
+    executemany insert. Ids are assigned by the generator, so sequences are
+    moved past them in finish().
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.use_copy = engine.dialect.name == "postgresql"
+        self.counts: Dict[str, int] = {}
+        self._tables = set()
+
+    def next_id(self, table) -> int:
+        with self.engine.connect() as conn:
+            return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+    def exists(self, column, value) -> bool:
+        with self.engine.connect() as conn:
+            return conn.execute(select(column).where(column == value).limit(1)).first() is not None
+
+    def defaults(self, table) -> Dict[str, Any]:
+        """Python-side column defaults, which COPY would otherwise skip"""
+        values = {}
+        for column in table.columns:
+            default = column.default
+            if default is None or column.primary_key:
+                continue
+            if default.is_scalar:
+                values[column.name] = default.arg
+            elif default.is_callable:
+                values[column.name] = default.arg(None)
+        return values
+
+    def load(self, table, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        if self.use_copy:
+            self._copy(table, rows)
+        else:
+            with self.engine.begin() as conn:
+                conn.execute(table.insert(), rows)
+        self._tables.add(table)
+        self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+
+    def _copy(self, table, rows: List[Dict[str, Any]]):
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_copy_value(row[c]) for c in columns])
+        buffer.seek(0)
+
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+            raw.commit()
+        finally:
+            raw.close()
+
+    def finish(self):
+        """Move id sequences past the explicitly assigned ids"""
+        if not self.use_copy:
+            return
+        with self.engine.begin() as conn:
+            for table in self._tables:
+                conn.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                        f"(SELECT MAX(id) FROM {table.name}))"
+                    )
+                )
+
+
+# =============================================================================
+# Row Generation
+# =============================================================================
+
+
+class VolumeGenerator:
+    """Deterministic synthetic rows for a profile, one client chunk at a time"""
+
+    def __init__(self, profile: Profile, loader: BulkLoader, seed: int = 42):
+        from database import (
+            AuditLog,
+            CaseOutcome,
+            Client,
+            ClientMessage,
+            DisputeItem,
+            EmailLog,
+            SMSLog,
+            Staff,
+        )
+
+        self.profile = profile
+        self.loader = loader
+        self.rng = random.Random(seed)
+        self.now = datetime.utcnow().replace(microsecond=0)
+        self.tables = {
+            model.__tablename__: model.__table__
+            for model in (
+                Staff, Client, DisputeItem, ClientMessage, EmailLog, SMSLog,
+                AuditLog, CaseOutcome,
+            )
+        }
+        self.ids = {name: loader.next_id(table) for name, table in self.tables.items()}
+        self.base_rows = {
+            name: loader.defaults(table) for name, table in self.tables.items()
+        }
+        self.staff_ids: List[int] = []
+
+    def _row(self, table: str, **values) -> Dict[str, Any]:
+        row = dict(self.base_rows[table])
+        row.update(values)
+        row["id"] = self.ids[table]
+        self.ids[table] += 1
+        return row
+
+    def _count(self, mean: float) -> int:
+        """Rows for one client: uniform around the profile mean"""
+        return self.rng.randint(0, round(2 * mean))
+
+    def _since(self, start: datetime) -> datetime:
+        seconds = int((self.now - start).total_seconds())
+        return start + timedelta(seconds=self.rng.randint(0, max(seconds, 0)))
+
+    def staff(self) -> List[Dict[str, Any]]:
+        password_hash = generate_password_hash("loadtest")
+        rows = []
+        for _ in range(self.profile.staff):
+            row = self._row(
+                "staff",
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                role=self.rng.choice(["paralegal", "paralegal", "attorney", "viewer"]),
+                password_hash=password_hash,
+            )
+            row["email"] = f"loadtest.staff{row['id']}@example.com"
+            rows.append(row)
+        if not self.loader.exists(self.tables["staff"].c.email, STAFF_LOGIN[0]):
+            rows[0].update(
+                email=STAFF_LOGIN[0],
+                password_hash=generate_password_hash(STAFF_LOGIN[1]),
+                role="admin",
+            )
+        self.staff_ids = [row["id"] for row in rows]
+        return rows
+
+    def client_chunk(self, size: int, portal_login: bool = False) -> Dict[str, List[Dict]]:
+        """Clients plus their proportional child rows, keyed by table"""
+        p, rng = self.profile, self.rng
+        rows = {name: [] for name in self.tables if name != "staff"}
+        start = self.now - timedelta(days=p.history_days)
+
+        for _ in range(size):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            created = self._since(start)
+            status = rng.choice(CLIENT_STATUSES)
+            payment_status = rng.choice(PAYMENT_STATUSES)
+            paid = payment_status == "paid"
+            client = self._row(
+                "clients",
+                name=f"{first} {last}",
+                first_name=first,
+                last_name=last,
+                phone=f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+                status=status,
+                dispute_status="active" if status == "active" else "new",
+                client_stage=rng.choice(CLIENT_STAGES),
+                current_dispute_round=rng.randint(0, 4),
+                assigned_to=rng.choice(self.staff_ids),
+                payment_status=payment_status,
+                total_paid=rng.choice([19900, 29900, 49700]) if paid else 0,
+                payment_received_at=self._since(created) if paid else None,
+                portal_password_hash=None,
+                created_at=created,
+                updated_at=self._since(created),
+            )
+            client_id = client["id"]
+            client["email"] = f"loadtest.client{client_id}@example.com"
+            client["referral_code"] = f"LT{client_id:010d}"
+            rows["clients"].append(client)
+
+            for _ in range(self._count(p.dispute_items)):
+                rows["dispute_items"].append(self._row(
+                    "dispute_items",
+                    client_id=client_id,
+                    bureau=rng.choice(BUREAUS),
+                    dispute_round=rng.randint(1, 4),
+                    item_type=rng.choice(ITEM_TYPES),
+                    creditor_name=rng.choice(CREDITORS),
+                    account_id=f"XXXX{rng.randint(1000, 9999)}",
+                    balance=Decimal(rng.randint(0, 1_500_000)) / 100,
+                    status=rng.choice(ITEM_STATUSES),
+                    created_at=self._since(created),
+                    updated_at=self._since(created),
+                ))
+
+            for _ in range(self._count(p.messages)):
+                from_client = rng.random() < 0.5
+                rows["client_messages"].append(self._row(
+                    "client_messages",
+                    client_id=client_id,
+                    staff_id=None if from_client else client["assigned_to"],
+                    message=rng.choice(MESSAGES),
+                    sender_type="client" if from_client else "staff",
+                    is_read=rng.random() < 0.8,
+                    created_at=self._since(created),
+                ))
+
+            for _ in range(self._count(p.emails)):
+                sent = self._since(created)
+                rows["email_logs"].append(self._row(
+                    "email_logs",
+                    client_id=client_id,
+                    email_address=client["email"],
+                    subject="Your credit restoration update",
+                    template_type=rng.choice(EMAIL_TEMPLATES),
+                    status=rng.choice(EMAIL_STATUSES),
+                    sent_at=sent,
+                    created_at=sent,
+                ))
+
+            for _ in range(self._count(p.sms)):
+                sent = self._since(created)
+                rows["sms_logs"].append(self._row(
+                    "sms_logs",
+                    client_id=client_id,
+                    phone_number=client["phone"],
+                    message="Your dispute letters were sent.",
+                    template_type="status_update",
+                    status="delivered",
+                    sent_at=sent,
+                    created_at=sent,
+                ))
+
+            for _ in range(self._count(p.audit_logs)):
+                event_type, resource_type, user_type, action = rng.choice(AUDIT_EVENTS)
+                at = self._since(created)
+                rows["audit_logs"].append(self._row(
+                    "audit_logs",
+                    timestamp=at,
+                    event_type=event_type,
+                    resource_type=resource_type,
+                    resource_id=str(client_id),
+                    user_id=client_id if user_type == "client" else client["assigned_to"],
+                    user_type=user_type,
+                    action=action,
+                    user_ip=f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                    created_at=at,
+                ))
+
+            if rng.random() < p.outcome_rate:
+                outcome = rng.choice(OUTCOMES)
+                rows["case_outcomes"].append(self._row(
+                    "case_outcomes",
+                    client_id=client_id,
+                    case_type="fcra_dispute",
+                    final_outcome=outcome,
+                    settlement_amount=rng.randint(1000, 25000) if outcome == "settled" else 0,
+                    time_to_resolution_days=rng.randint(30, 540),
+                    attorney_id=rng.choice(self.staff_ids),
+                    dispute_rounds_completed=rng.randint(1, 4),
+                    violation_count=rng.randint(1, 12),
+                    created_at=self._since(created),
+                ))
+
+        if portal_login:
+            self._add_portal_login(rows["clients"][0])
+        return rows
+
+    def _add_portal_login(self, client: Dict[str, Any]):
+        """Give the first generated client the portal test login, if unused"""
+        if not self.loader.exists(self.tables["clients"].c.email, PORTAL_LOGIN[0]):
+            client.update(
+                email=PORTAL_LOGIN[0],
+                portal_password_hash=generate_password_hash(PORTAL_LOGIN[1]),
+                status="active",
+            )
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, List[Dict]]]:
+        remaining = self.profile.clients
+        first = True
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            yield self.client_chunk(size, portal_login=first)
+            remaining -= size
+            first = False
+
+
+def seed_profile(
+    profile: Profile,
+    engine=None,
+    seed: int = 42,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, int]:
+    """
+    Bulk load a profile's rows on top of whatever the database holds.
+
+    Args:
+        profile: Scale to generate
+        engine: SQLAlchemy engine (defaults to database.engine)
+        seed: Random seed; the same seed reproduces the same rows
+        chunk_size: Clients generated and loaded per batch
+        progress: Called with (clients loaded, total clients) after each chunk
+
+    Returns:
+        Dictionary mapping table name to rows inserted
+    """
+    if engine is None:
+        from database import engine
+
+    loader = BulkLoader(engine)
+    generator = VolumeGenerator(profile, loader, seed=seed)
+    loader.load(generator.tables["staff"], generator.staff())
+
+    loaded = 0
+    for chunk in generator.chunks(chunk_size):
+        # Parents first so foreign keys hold on every dialect
+        for name, rows in chunk.items():
+            loader.load(generator.tables[name], rows)
+        loaded += len(chunk["clients"])
+        if progress:
+            progress(loaded, profile.clients)
+
+    loader.finish()
+    return loader.counts
+
+
+# =============================================================================
+# p95 Report
+# =============================================================================
+
+
+def _stat(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None  # locust writes "N/A" for endpoints without requests
+
+
+def read_locust_stats(path: str) -> Dict[str, Dict[str, Any]]:
+    """Per-endpoint latency percentiles from a locust *_stats.csv"""
+    endpoints = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            name = row["Name"] if row["Name"] == "Aggregated" else (
+                f"{row['Type']} {row['Name']}"
+            )
+            endpoints[name] = {
+                "requests": int(row["Request Count"]),
+                "failures": int(row["Failure Count"]),
+                "p50_ms": _stat(row.get("50%")),
+                "p95_ms": _stat(row.get("95%")),
+                "p99_ms": _stat(row.get("99%")),
+            }
+    return endpoints
+
+
+def record_scale(report: Dict[str, Any], profile: Profile, stats_path: str) -> Dict[str, Any]:
+    """Add one scale's locust results to a multi-scale report"""
+    report.setdefault("scales", {})[profile.name] = {
+        "clients": profile.clients,
+        "recorded_at": datetime.utcnow().isoformat(),
+        "endpoints": read_locust_stats(stats_path),
+    }
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Endpoint x scale table of p95 latencies"""
+    scales = sorted(report.get("scales", {}), key=lambda s: report["scales"][s]["clients"])
+    endpoints = sorted(
+        {e for s in scales for e in report["scales"][s]["endpoints"]},
+        key=lambda e: (e == "Aggregated", e),
+    )
+    width = max([len(e) for e in endpoints] + [8])
+    lines = [f"{'p95 (ms)':<{width}}" + "".join(f"{s:>10}" for s in scales)]
+    for endpoint in endpoints:
+        cells = []
+        for scale in scales:
+            p95 = report["scales"][scale]["endpoints"].get(endpoint, {}).get("p95_ms")
+            cells.append(f"{p95:>10.0f}" if p95 is not None else f"{'-':>10}")
+        lines.append(f"{endpoint:<{width}}" + "".join(cells))
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_cmd = commands.add_parser("seed", help="Bulk load a data-volume profile")
+    seed_cmd.add_argument("--profile", choices=PROFILES, required=True)
+    seed_cmd.add_argument("--seed", type=int, default=42)
+    seed_cmd.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    report_cmd = commands.add_parser("report", help="Record p95 by endpoint for a profile")
+    report_cmd.add_argument("--profile", choices=PROFILES, required=True)
+    report_cmd.add_argument("--stats", required=True, help="locust *_stats.csv")
+    report_cmd.add_argument("--output", default="load_tests/p95_by_scale.json")
+
+    args = parser.parse_args(argv)
+    profile = PROFILES[args.profile]
+
+    if args.command == "seed":
+        started = time.monotonic()
+
+        def progress(done, total):
+            print(f"  {done:,}/{total:,} clients", file=sys.stderr)
+
+        counts = seed_profile(
+            profile, seed=args.seed, chunk_size=args.chunk_size, progress=progress
+        )
+        for table, count in counts.items():
+            print(f"{table:<16}{count:>12,}")
+        print(f"Seeded profile {profile.name} in {time.monotonic() - started:.1f}s")
+        return 0
+
+    report = {}
+    if os.path.exists(args.output):
+        with open(args.output) as f:
+            report = json.load(f)
+    record_scale(report, profile, args.stats)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
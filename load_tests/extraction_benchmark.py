@@ -0,0 +1,74 @@
+"""
+Negative Item Extraction Benchmark.
+
+Times per-report extract_negative_items_from_report against
+extract_negative_items_batch on the same parsed reports, and checks that
+both produce identical items.
+
+Run with:
+    python -m load_tests.extraction_benchmark uploads/credit_reports/*.json --copies 50
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from services.negative_item_extractor import (
+    extract_negative_items_batch,
+    extract_negative_items_from_report,
+)
+
+
+def benchmark(parsed_reports: List[Dict], runs: int = 3) -> Dict[str, Any]:
+    """Median ms for per-report vs batch extraction of the same reports"""
+    per_report_ms, batch_ms = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        single = [extract_negative_items_from_report(r) for r in parsed_reports]
+        per_report_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        batch = extract_negative_items_batch(parsed_reports)
+        batch_ms.append((time.perf_counter() - started) * 1000)
+
+    per_report = statistics.median(per_report_ms)
+    batched = statistics.median(batch_ms)
+    return {
+        "reports": len(parsed_reports),
+        "accounts": sum(len(r.get("accounts", [])) for r in parsed_reports),
+        "items": sum(len(items) for items in batch),
+        "runs": runs,
+        "median_per_report_ms": round(per_report, 1),
+        "median_batch_ms": round(batched, 1),
+        "speedup": round(per_report / batched, 2) if batched else None,
+        "identical": single == batch,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark batch negative item extraction"
+    )
+    parser.add_argument("reports", nargs="+", help="credit report JSON files")
+    parser.add_argument(
+        "--copies", type=int, default=1, help="repeat the corpus to simulate a book"
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    corpus = []
+    for path in args.reports:
+        with open(path, "r") as f:
+            corpus.append(json.load(f))
+
+    logging.getLogger("services.negative_item_extractor").setLevel(logging.WARNING)
+    report = benchmark(corpus * args.copies, args.runs)
+    print(json.dumps(report, indent=2))
+    return 0 if report["identical"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -14,8 +14,12 @@ Run with:
 Or headless:
     locust -f load_tests/locustfile.py --host http://localhost:5001 \
         --headless -u 50 -r 5 --run-time 5m
+
+Data-volume runs (seeded 10k/100k/1m client profiles, see data_volume.py):
+    ./load_tests/run_load_test.sh profile 100k
 """
 
+import os
 import random
 import string
 
@@ -115,6 +119,83 @@ class StaffUser(HttpUser):
     weight = 3  # Most common user type
 
 
+# =============================================================================
+# Data-Volume Staff User (seeded profiles)
+# =============================================================================
+
+
+class DataVolumeBehavior(TaskSet):
+    """Staff pages whose cost grows with client, message and audit volume."""
+
+    def on_start(self):
+        self.client.post(
+            "/api/staff/login",
+            json={"email": "test@example.com", "password": "testpass123"},
+            name="/api/staff/login",
+        )
+
+    @tag("data-volume")
+    @task(10)
+    def view_dashboard(self):
+        self.client.get("/dashboard", name="/dashboard")
+
+    @tag("data-volume")
+    @task(6)
+    def view_clients(self):
+        self.client.get("/dashboard/clients", name="/dashboard/clients")
+
+    @tag("data-volume")
+    @task(6)
+    def search_clients(self):
+        term = random.choice(["smith", "garcia", "nguyen"])
+        self.client.get(
+            f"/api/clients?search={term}&page=1&per_page=20",
+            name="/api/clients?search",
+        )
+
+    @tag("data-volume")
+    @task(5)
+    def view_inbox(self):
+        self.client.get("/api/inbox", name="/api/inbox")
+
+    @tag("data-volume")
+    @task(3)
+    def view_unified_inbox(self):
+        self.client.get("/dashboard/unified-inbox", name="/dashboard/unified-inbox")
+
+    @tag("data-volume")
+    @task(3)
+    def view_analytics(self):
+        self.client.get("/dashboard/analytics", name="/dashboard/analytics")
+
+    @tag("data-volume")
+    @task(2)
+    def view_revenue(self):
+        self.client.get("/dashboard/revenue", name="/dashboard/revenue")
+
+    @tag("data-volume")
+    @task(2)
+    def view_audit_logs(self):
+        self.client.get("/api/audit/logs?page=1&per_page=50", name="/api/audit/logs")
+
+    @tag("data-volume")
+    @task(2)
+    def view_success_rates(self):
+        self.client.get("/api/ml/success-rates", name="/api/ml/success-rates")
+
+    @tag("data-volume")
+    @task(1)
+    def check_messages(self):
+        self.client.get("/api/messages/unread-total", name="/api/messages/unread-total")
+
+
+class DataVolumeUser(HttpUser):
+    """Staff user for seeded data-volume runs; only active when LOAD_TEST_PROFILE is set."""
+    abstract = not os.environ.get("LOAD_TEST_PROFILE")
+    tasks = [DataVolumeBehavior]
+    wait_time = between(1, 3)
+
+
 # =============================================================================
 # Client Portal User
 # =============================================================================
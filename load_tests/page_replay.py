@@ -0,0 +1,246 @@
+"""
+Replay Harness for Credit Import Automation
+
+Serves a recorded monitoring-site session (login page, report page, XHR
+payloads) from a local HTTP server and routes the import browser to it, so
+CreditImportAutomation step latency can be benchmarked offline and
+repeatably instead of against the live sites.
+
+A recording is a directory with a manifest.json:
+
+    {
+      "service": "MyScoreIQ.com",
+      "entries": [
+        {"url": "https://member.myscoreiq.com/", "file": "login.html"},
+        {"url": "https://member.myscoreiq.com/", "method": "POST", "status": 302,
+         "headers": {"Location": "https://member.myscoreiq.com/dashboard"}},
+        {"url": "https://member.myscoreiq.com/api/report", "file": "report.json",
+         "content_type": "application/json", "delay_ms": 400}
+      ]
+    }
+
+`delay_ms` reproduces the recorded server latency. Requests that are not in
+the recording get a 404 and never reach the network.
+
+Usage:
+    python -m load_tests.page_replay serve recordings/myscoreiq
+    python -m load_tests.page_replay benchmark recordings/myscoreiq --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import mimetypes
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _entry_key(method: str, host: str, path: str) -> Tuple[str, str, str]:
+    return (method.upper(), host.lower(), path or "/")
+
+
+class ReplayServer:
+    """Local HTTP server for one recording (runs on a background thread)"""
+
+    def __init__(self, recording_dir: str, host: str = "127.0.0.1", port: int = 0):
+        self.recording_dir = recording_dir
+        with open(os.path.join(recording_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.service = self.manifest.get("service")
+        self.entries: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        for entry in self.manifest.get("entries", []):
+            parts = urlsplit(entry["url"])
+            path = parts.path + (f"?{parts.query}" if parts.query else "")
+            self.entries[_entry_key(entry.get("method", "GET"), parts.netloc, path)] = entry
+        self.hits: List[str] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def local_url(self, url: str) -> str:
+        """Replay-server URL for a recorded site URL"""
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.base_url}/{parts.netloc}{parts.path or '/'}{query}"
+
+    def find(self, method: str, host: str, path: str) -> Optional[Dict[str, Any]]:
+        """Recorded entry for a request; falls back to ignoring the query string"""
+        entry = self.entries.get(_entry_key(method, host, path))
+        if entry is None and "?" in path:
+            entry = self.entries.get(_entry_key(method, host, path.split("?", 1)[0]))
+        return entry
+
+    def has(self, url: str, method: str = "GET") -> bool:
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        return self.find(method, parts.netloc, path) is not None
+
+    def _handler_class(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                # /<host>/<path>: the original host is the first path segment
+                host, _, rest = self.path.lstrip("/").partition("/")
+                path = "/" + rest
+                entry = replay.find(self.command, host, path)
+                with replay._lock:
+                    replay.hits.append(f"{self.command} {host}{path}")
+
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+
+                if entry is None:
+                    self.send_error(404, "Not in recording")
+                    return
+
+                if entry.get("delay_ms"):
+                    time.sleep(entry["delay_ms"] / 1000)
+
+                body = b""
+                if entry.get("file"):
+                    with open(os.path.join(replay.recording_dir, entry["file"]), "rb") as f:
+                        body = f.read()
+                content_type = entry.get("content_type") or (
+                    mimetypes.guess_type(entry.get("file") or "")[0] or "text/html"
+                )
+
+                self.send_response(entry.get("status", 200))
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (entry.get("headers") or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _respond
+            do_POST = _respond
+
+            def log_message(self, format, *args):
+                logger.debug("replay: " + format % args)
+
+        return Handler
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="page-replay", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def route_setup(self):
+        """Async callable(context) for CreditImportAutomation(route_setup=...)"""
+
+        async def install(context):
+            async def handle(route):
+                request = route.request
+                if not self.has(request.url, request.method):
+                    await route.abort()
+                    return
+                # Redirects go back to the browser so their targets are replayed too
+                response = await route.fetch(
+                    url=self.local_url(request.url), max_redirects=0
+                )
+                await route.fulfill(response=response)
+
+            await context.route("**/*", handle)
+
+        return install
+
+
+def median_timings(runs: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Median duration per step across import results' "timings" """
+    samples: Dict[str, List[int]] = {}
+    for timings in runs:
+        for step, ms in (timings or {}).get("steps", {}).items():
+            samples.setdefault(step, []).append(ms)
+    return {step: int(statistics.median(values)) for step, values in samples.items()}
+
+
+async def benchmark(recording_dir: str, runs: int = 3) -> Dict[str, Any]:
+    """Run the import against a recording `runs` times; median per-step ms"""
+    from services.credit_import_automation import CreditImportAutomation
+
+    results = []
+    with ReplayServer(recording_dir) as server:
+        for run in range(runs):
+            automation = CreditImportAutomation(route_setup=server.route_setup())
+            started = time.monotonic()
+            result = await automation.import_report(
+                service_name=server.service,
+                username="replay@example.com",
+                password="replay",
+                ssn_last4="0000",
+                client_id=0,
+                client_name=f"replay_{run}",
+            )
+            result["total_ms"] = int((time.monotonic() - started) * 1000)
+            results.append(result)
+
+    totals = [r["total_ms"] for r in results]
+    return {
+        "service": server.service,
+        "runs": runs,
+        "succeeded": sum(1 for r in results if r.get("success")),
+        "median_total_ms": int(statistics.median(totals)) if totals else 0,
+        "median_steps_ms": median_timings([r.get("timings") for r in results]),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded monitoring-site pages")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="serve a recording until interrupted")
+    serve.add_argument("recording")
+    serve.add_argument("--port", type=int, default=8765)
+    bench = sub.add_parser("benchmark", help="median import step timings")
+    bench.add_argument("recording")
+    bench.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        server = ReplayServer(args.recording, port=args.port).start()
+        print(f"Replaying {args.recording} at {server.base_url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.stop()
+        return 0
+
+    report = asyncio.run(benchmark(args.recording, args.runs))
+    print(json.dumps(report, indent=2))
+    return 0 if report["succeeded"] == report["runs"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
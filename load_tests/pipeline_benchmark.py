@@ -0,0 +1,445 @@
+"""
+Offline Benchmark for the Credit Report Pipeline
+
+Replays a corpus of saved (anonymized) credit reports through the backend
+stages that run after an import, without a browser, database or AI calls:
+
+    load     read the saved report from disk
+    parse    CreditReportParser.parse (HTML reports only)
+    extract  NegativeItemExtractor
+    metro2   run_full_metro2_validation and detect_metro2_violations per tradeline
+    letters  render one dispute letter per bureau through the template engine
+    pdf      LetterPDFGenerator for each rendered letter
+
+Each stage reports its median wall time over the timed runs and its peak
+traced allocations (tracemalloc, measured in a separate pass so tracing does
+not skew the timings). The results also carry the process peak RSS.
+
+Usage:
+    python -m load_tests.pipeline_benchmark                             # default corpus
+    python -m load_tests.pipeline_benchmark --corpus reports/ --runs 5
+    python -m load_tests.pipeline_benchmark --output results.json
+    python -m load_tests.pipeline_benchmark --baseline base.json       # exit 1 on regression
+
+Results are JSON (see run_benchmark). With --baseline, a stage regresses when
+its median time grows by more than --threshold (and by at least
+MIN_REGRESSION_MS) and its fastest run is slower than the baseline's slowest,
+or its peak allocation grows by more than --alloc-threshold. Peak RSS is
+reported but not gated: it moves with the allocator and the runner. CI
+benchmarks the pull request's base commit and the head on the same runner
+and fails the build on any regression.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_CORPUS = (
+    PROJECT_ROOT / "tests" / "fixtures" / "identityiq_njames_sample.html",
+    PROJECT_ROOT / "tests" / "test_samples" / "sample_credit_report.html",
+)
+
+STAGES = ("load", "parse", "extract", "metro2", "letters", "pdf")
+
+RESULTS_VERSION = 1
+
+# Regression gates (fractions of the baseline)
+TIME_THRESHOLD = float(os.environ.get("PIPELINE_BENCH_THRESHOLD", "0.25"))
+ALLOC_THRESHOLD = float(os.environ.get("PIPELINE_BENCH_ALLOC_THRESHOLD", "0.10"))
+# Stages this fast are dominated by noise; smaller slowdowns are ignored
+MIN_REGRESSION_MS = 5.0
+
+BUREAUS = ("Equifax", "Experian", "TransUnion")
+
+# Parsed payment_history values -> Metro 2 payment rating characters
+METRO2_HISTORY_CODES = {
+    "OK": "0",
+    "30": "1",
+    "60": "2",
+    "90": "3",
+    "120": "4",
+    "150": "5",
+    "180": "6",
+    "CO": "L",
+    "FC": "8",
+    "RP": "8",
+}
+
+LETTER_TEMPLATE = """{bureau_name}
+
+Re: Dispute of Inaccurate Information - FCRA Section 611
+
+I am writing to dispute inaccurate information in my credit file.
+
+Name: {client_name}
+
+I am disputing the following items:
+
+{dispute_items}
+
+These items are inaccurate because:
+{violation_summary}
+
+Please investigate and delete or correct these items within 30 days."""
+
+
+@dataclass
+class CorpusReport:
+    """One saved report in the corpus"""
+
+    path: Path
+    service: str = "benchmark"
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def is_html(self) -> bool:
+        return self.path.suffix.lower() in (".html", ".htm")
+
+
+def load_corpus(paths) -> List[CorpusReport]:
+    """Reports from files and directories (*.html, *.htm, *.json), sorted by name"""
+    reports = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files = sorted(
+                p
+                for p in path.iterdir()
+                if p.suffix.lower() in (".html", ".htm", ".json")
+            )
+        else:
+            files = [path]
+        reports.extend(CorpusReport(f) for f in files if f.exists())
+    return reports
+
+
+def tradeline_from_account(account: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a parsed account to the tradeline fields the Metro 2 validators read"""
+    # One character per month, from the first bureau reporting that month
+    history = "".join(
+        METRO2_HISTORY_CODES.get(
+            str(
+                entry.get("transunion")
+                or entry.get("experian")
+                or entry.get("equifax")
+                or ""
+            )
+            .strip()
+            .upper(),
+            "-",
+        )
+        for entry in account.get("payment_history") or []
+    )
+    return {
+        "creditor_name": account.get("creditor") or "Unknown Creditor",
+        "account_number": account.get("account_number") or "",
+        "date_opened": account.get("date_opened"),
+        "date_reported": account.get("date_reported"),
+        "current_balance": account.get("balance"),
+        "high_credit": account.get("high_balance") or account.get("high_credit"),
+        "credit_limit": account.get("credit_limit"),
+        "payment_status": account.get("payment_status") or "",
+        "payment_history": history,
+        "original_creditor": account.get("original_creditor"),
+        "account_type": account.get("account_type") or "",
+        "account_status": account.get("status") or "",
+    }
+
+
+def letter_variables(report: Dict, items: List[Dict], metro2: Dict, bureau: str) -> Dict:
+    """Template variables for one bureau's dispute letter"""
+    personal = report.get("personal_info") or {}
+    names = personal.get("names") or [report.get("client_name") or "Consumer"]
+    bureau_items = [i for i in items if bureau in (i.get("bureaus") or [])]
+    return {
+        "bureau_name": bureau,
+        "client_name": names[0] if isinstance(names, list) else names,
+        "dispute_items": "\n\n".join(
+            f"- {i['creditor_name']} ({i['account_id']}): {i['item_type']}"
+            for i in bureau_items
+        ),
+        "violation_summary": "\n\n".join(
+            f"- {v.get('issue') or v.get('description') or v}"
+            for v in (metro2.get("metro2_violations") or [])[:20]
+        ),
+    }
+
+
+class StageRecorder:
+    """Accumulates per-stage wall time and traced allocation peaks"""
+
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self.ms: Dict[str, float] = {}
+        self.alloc_peak: Dict[str, int] = {}
+
+    def run(self, stage: str, fn: Callable[[], Any]) -> Any:
+        if self.trace:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        result = fn()
+        self.ms[stage] = self.ms.get(stage, 0.0) + (time.perf_counter() - started) * 1000
+        if self.trace:
+            _, peak = tracemalloc.get_traced_memory()
+            self.alloc_peak[stage] = max(self.alloc_peak.get(stage, 0), peak - before)
+        return result
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_pipeline(corpus_report: CorpusReport, recorder: StageRecorder, workdir: str) -> Dict:
+    """Run one report through every stage; returns counts for the results"""
+    from services.credit_report_parser import CreditReportParser
+    from services.metro2_service import detect_metro2_violations
+    from services.metro2_validator import run_full_metro2_validation
+    from services.negative_item_extractor import extract_negative_items_from_report
+    from services.pdf_generator import LetterPDFGenerator
+    from services.template_engine import blank_if_falsy, render_fields
+
+    def load():
+        with open(corpus_report.path, "r", encoding="utf-8") as f:
+            return f.read() if corpus_report.is_html else json.load(f)
+
+    content = recorder.run("load", load)
+    if corpus_report.is_html:
+        report = recorder.run(
+            "parse", lambda: CreditReportParser(content, corpus_report.service).parse()
+        )
+    else:
+        report = content
+    accounts = report.get("accounts") or []
+
+    items = recorder.run("extract", lambda: extract_negative_items_from_report(report))
+
+    def metro2():
+        tradelines = [tradeline_from_account(a) for a in accounts]
+        results = run_full_metro2_validation(tradelines)
+        tradeline_violations = sum(
+            len(detect_metro2_violations(t)) for t in tradelines
+        )
+        return results, tradeline_violations
+
+    metro2_results, tradeline_violations = recorder.run("metro2", metro2)
+
+    def letters():
+        return {
+            bureau: render_fields(
+                "benchmark",
+                "dispute",
+                RESULTS_VERSION,
+                {"content": LETTER_TEMPLATE},
+                letter_variables(report, items, metro2_results, bureau),
+                formatter=blank_if_falsy,
+            )[0]["content"]
+            for bureau in BUREAUS
+        }
+
+    rendered = recorder.run("letters", letters)
+
+    def pdfs():
+        generator = LetterPDFGenerator()
+        stem = Path(corpus_report.name).stem
+        for bureau, content in rendered.items():
+            generator.generate_dispute_letter_pdf(
+                content,
+                "Benchmark Client",
+                bureau,
+                1,
+                os.path.join(workdir, f"{stem}_{bureau}.pdf"),
+            )
+
+    recorder.run("pdf", pdfs)
+
+    return {
+        "name": corpus_report.name,
+        "accounts": len(accounts),
+        "items": len(items),
+        "metro2_violations": len(metro2_results.get("metro2_violations") or []),
+        "tradeline_violations": tradeline_violations,
+    }
+
+
+def run_benchmark(corpus: List[CorpusReport], runs: int = 3, warmup: int = 1) -> Dict:
+    """
+    Replay the corpus `warmup + runs` times, plus one traced pass.
+
+    Returns:
+        {"version", "created_at", "python", "platform", "runs", "corpus": [...],
+         "stages": {stage: {"median_ms", "min_ms", "max_ms", "alloc_peak_kb"}},
+         "total_median_ms", "peak_rss_mb"}
+    """
+    if not corpus:
+        raise ValueError("Benchmark corpus is empty")
+
+    # Per-report info logging would dominate the smaller stages
+    previous_disable = logging.root.manager.disable
+    logging.disable(logging.INFO)
+    try:
+        with tempfile.TemporaryDirectory(prefix="pipeline_bench_") as workdir:
+            timings: List[StageRecorder] = []
+            summary: List[Dict] = []
+            for run in range(warmup + runs):
+                recorder = StageRecorder()
+                summary = [run_pipeline(r, recorder, workdir) for r in corpus]
+                if run >= warmup:
+                    timings.append(recorder)
+
+            traced = StageRecorder(trace=True)
+            tracemalloc.start()
+            try:
+                for r in corpus:
+                    run_pipeline(r, traced, workdir)
+            finally:
+                tracemalloc.stop()
+    finally:
+        logging.disable(previous_disable)
+
+    stages = {}
+    for stage in STAGES:
+        samples = [t.ms[stage] for t in timings if stage in t.ms]
+        if not samples:
+            continue
+        stages[stage] = {
+            "median_ms": round(statistics.median(samples), 2),
+            "min_ms": round(min(samples), 2),
+            "max_ms": round(max(samples), 2),
+            "alloc_peak_kb": round(traced.alloc_peak.get(stage, 0) / 1024, 1),
+        }
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "corpus": summary,
+        "stages": stages,
+        "total_median_ms": round(sum(s["median_ms"] for s in stages.values()), 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def compare_results(
+    current: Dict,
+    baseline: Dict,
+    threshold: float = TIME_THRESHOLD,
+    alloc_threshold: float = ALLOC_THRESHOLD,
+    min_regression_ms: float = MIN_REGRESSION_MS,
+) -> List[str]:
+    """Regressions of `current` against `baseline`, one message per stage metric"""
+    regressions = []
+    for stage, now in current.get("stages", {}).items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before:
+            continue
+
+        base_ms, cur_ms = before["median_ms"], now["median_ms"]
+        # the run ranges must not overlap, so one noisy sample cannot fail the gate
+        slower = now.get("min_ms", cur_ms) > before.get("max_ms", base_ms)
+        if (slower and cur_ms > base_ms * (1 + threshold)
+                and cur_ms - base_ms >= min_regression_ms):
+            regressions.append(
+                f"{stage}: median {cur_ms:.1f}ms vs {base_ms:.1f}ms "
+                f"(+{(cur_ms / base_ms - 1) * 100 if base_ms else 100:.0f}%)"
+            )
+
+        base_kb, cur_kb = before.get("alloc_peak_kb", 0), now.get("alloc_peak_kb", 0)
+        if base_kb and cur_kb > base_kb * (1 + alloc_threshold):
+            regressions.append(
+                f"{stage}: peak allocations {cur_kb:.0f}KB vs {base_kb:.0f}KB "
+                f"(+{(cur_kb / base_kb - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def format_report(results: Dict) -> str:
+    """Human-readable stage table"""
+    accounts = sum(r["accounts"] for r in results["corpus"])
+    lines = [
+        f"{len(results['corpus'])} reports, {accounts} accounts, "
+        f"{results['runs']} runs (python {results['python']})",
+        "",
+        f"{'stage':<10}{'median':>12}{'min':>12}{'max':>12}{'alloc peak':>14}",
+    ]
+    for stage, s in results["stages"].items():
+        lines.append(
+            f"{stage:<10}{s['median_ms']:>10.1f}ms{s['min_ms']:>10.1f}ms"
+            f"{s['max_ms']:>10.1f}ms{s['alloc_peak_kb']:>12.0f}KB"
+        )
+    lines.append(f"{'total':<10}{results['total_median_ms']:>10.1f}ms")
+    lines.append(f"peak RSS  {results['peak_rss_mb']:>10.1f}MB")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the credit report pipeline on saved reports"
+    )
+    parser.add_argument(
+        "--corpus", nargs="+", default=None, help="report files or directories"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="timed runs")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs first")
+    parser.add_argument("--output", help="write JSON results to this path")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=TIME_THRESHOLD)
+    parser.add_argument("--alloc-threshold", type=float, default=ALLOC_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus or DEFAULT_CORPUS)
+    if not corpus:
+        print("No reports found in the corpus", file=sys.stderr)
+        return 2
+
+    results = run_benchmark(corpus, runs=args.runs, warmup=args.warmup)
+    print(format_report(results))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare_results(
+            results, baseline, args.threshold, args.alloc_threshold
+        )
+        if regressions:
+            print("\nRegressions against baseline:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,12 @@
 #   ./load_tests/run_load_test.sh                    # Interactive UI at http://localhost:8089
 #   ./load_tests/run_load_test.sh headless            # Headless: 50 users, 5/sec ramp, 5 min
 #   ./load_tests/run_load_test.sh headless 100 10 10m # Custom: 100 users, 10/sec, 10 min
+#   ./load_tests/run_load_test.sh profile 100k        # Seed 100k clients, data-volume run, p95 report
+#   ./load_tests/run_load_test.sh profile 1m 50 5 10m # Profile (10k/100k/1m) with custom load
+#
+# Profile runs load the seeded rows on top of the database the app uses
+# (DATABASE_URL), so point both at a disposable database. Set SKIP_SEED=1 to
+# rerun against an already seeded profile.
 #
 # Prerequisites:
 #   pip install locust
@@ -24,7 +30,42 @@ if ! command -v locust &> /dev/null; then
     pip install locust
 fi
 
-if [ "$1" = "headless" ]; then
+if [ "$1" = "profile" ]; then
+    PROFILE="${2:-10k}"
+    USERS="${3:-50}"
+    SPAWN_RATE="${4:-5}"
+    RUN_TIME="${5:-5m}"
+    RESULTS="load_tests/results_${PROFILE}"
+
+    echo "=== FCRA Data-Volume Load Test (profile $PROFILE) ==="
+    echo "Host: $HOST"
+    echo "Users: $USERS, Spawn rate: $SPAWN_RATE/s, Duration: $RUN_TIME"
+    echo ""
+
+    if [ "${SKIP_SEED:-0}" != "1" ]; then
+        python -m load_tests.data_volume seed --profile "$PROFILE"
+        echo ""
+    fi
+
+    LOAD_TEST_PROFILE="$PROFILE" locust -f "$LOCUSTFILE" DataVolumeUser \
+        --host "$HOST" \
+        --headless \
+        -u "$USERS" \
+        -r "$SPAWN_RATE" \
+        --run-time "$RUN_TIME" \
+        --csv="$RESULTS" \
+        --html="${RESULTS}.html"
+
+    echo ""
+    python -m load_tests.data_volume report --profile "$PROFILE" \
+        --stats "${RESULTS}_stats.csv" --output load_tests/p95_by_scale.json
+
+    echo ""
+    echo "Results saved to:"
+    echo "  ${RESULTS}_stats.csv"
+    echo "  ${RESULTS}.html"
+    echo "  load_tests/p95_by_scale.json"
+elif [ "$1" = "headless" ]; then
     USERS="${2:-50}"
     SPAWN_RATE="${3:-5}"
     RUN_TIME="${4:-5m}"
@@ -239,7 +239,8 @@ def offline():
 @require_full_access
 def dashboard():
     """Main dashboard/case overview page - requires ACTIVE stage"""
-    from database import get_db, Client, DisputeItem, Violation, SecondaryBureauFreeze, Analysis, Damages
+    from database import get_db, Client
+    from services.portal_summary_service import TOTAL_ROUNDS, get_portal_summary_service
 
     current_user = get_current_user()
     if not current_user:
@@ -254,55 +255,23 @@ def dashboard():
             flash('Client not found. Please log in again.', 'error')
             return redirect(url_for('portal_login'))
 
-        # Get dispute items/accounts
-        accounts = []
-        try:
-            accounts = db.query(DisputeItem).filter_by(client_id=client.id).all()
-        except:
-            pass
-
-        # Calculate total violations value - query through Analysis for more reliable data
-        total_violations = 0
-        violation_count = 0
+        # Violation totals, bureau counts, round and scores come from the
+        # maintained per-client summary (one primary-key read)
+        summary = {}
         try:
-            # First try direct client_id query
-            violations = db.query(Violation).filter_by(client_id=client.id).all()
-
-            # If no results, try through Analysis
-            if not violations:
-                analyses = db.query(Analysis).filter_by(client_id=client.id).all()
-                analysis_ids = [a.id for a in analyses]
-                if analysis_ids:
-                    violations = db.query(Violation).filter(Violation.analysis_id.in_(analysis_ids)).all()
-
-            violation_count = len(violations)
-
-            # Calculate total from statutory damages
-            for v in violations:
-                # Use max statutory damages if available
-                if v.statutory_damages_max:
-                    total_violations += v.statutory_damages_max
-                elif v.statutory_damages_min:
-                    total_violations += v.statutory_damages_min
-
-            # If no statutory damages, check Damages table
-            if total_violations == 0:
-                analyses = db.query(Analysis).filter_by(client_id=client.id).all()
-                for analysis in analyses:
-                    damages = db.query(Damages).filter_by(analysis_id=analysis.id).first()
-                    if damages and damages.total_estimated:
-                        total_violations += damages.total_estimated
+            summary = get_portal_summary_service(db).get_summary(client.id)
         except Exception as e:
-            print(f"Error fetching violations: {e}")
-            pass
+            db.rollback()
+            print(f"Error loading portal summary: {e}")
 
-        disputed_accounts = len(accounts)
-        bureau_count = len(set(getattr(a, 'bureau', '') for a in accounts if getattr(a, 'bureau', '')))
+        total_violations = summary.get('total_violations', 0)
+        disputed_accounts = summary.get('disputed_accounts', 0)
+        bureau_count = len(summary.get('bureau_counts') or {})
         if bureau_count == 0:
             bureau_count = 3  # Default to 3 bureaus
 
-        current_round = getattr(client, 'current_round', 1) or 1
-        progress_percent = int((current_round / 4) * 100)
+        current_round = summary.get('current_round') or 1
+        progress_percent = int((current_round / TOTAL_ROUNDS) * 100)
 
         # Days until response
         days_until_response = 0
@@ -311,13 +280,12 @@ def dashboard():
             days_until_response = max(0, (response_due - datetime.now()).days)
 
         # Scores
-        starting_score = getattr(client, 'starting_score', None)
-        current_score = getattr(client, 'current_score', None)
+        starting_score = summary.get('starting_score')
+        current_score = summary.get('current_score')
 
         return render_template('portal/dashboard.html',
             current_user=current_user,
             client=client,
-            accounts=accounts,
             total_violations=total_violations,
             disputed_accounts=disputed_accounts,
             bureau_count=bureau_count,
@@ -1447,6 +1415,23 @@ def api_get_timeline_progress():
         db.close()
 
 
+@portal.route('/api/portal/summary', methods=['GET'])
+@portal_login_required
+@require_full_access
+def api_get_portal_summary():
+    """Get violation totals, bureau counts, round and scores - requires ACTIVE stage"""
+    from flask import jsonify
+    from database import get_db
+    from services.portal_summary_service import get_portal_summary_service
+
+    db = get_db()
+    try:
+        summary = get_portal_summary_service(db).get_summary(get_client_id())
+        return jsonify({'success': True, 'summary': summary})
+    finally:
+        db.close()
+
+
 @portal.route('/api/timeline/backfill', methods=['POST'])
 @portal_login_required
 @require_full_access
@@ -27,6 +27,7 @@ from database import (
 )
 from services.activity_logger import log_activity, log_dispute_generated
 from services.ai_usage_service import log_ai_usage
+from services.packet_pipeline import map_in_packet_pool, merge_pdfs, use_packet_pool
 from services.prompt_loader import PromptLoader
 
 
@@ -537,6 +538,198 @@ Phone: {client.phone or 'N/A'}
             status="info",
         )
 
+        prepared = self._prepare_generation(
+            client_id,
+            round_number,
+            selected_item_ids=selected_item_ids,
+            bureaus=bureaus,
+            custom_instructions=custom_instructions,
+            tone=tone,
+        )
+        if "error" in prepared:
+            return prepared
+
+        client = prepared["client"]
+        violations = prepared["violations"]
+        dispute_items = prepared["dispute_items"]
+        round_info = prepared["round_info"]
+        target_bureaus = prepared["target_bureaus"]
+        prompt = prepared["prompt"]
+
+        # Call AI to generate letters
+        log_activity(
+            "Call Claude AI",
+            f"Sending to AI ({len(prompt)} chars)...",
+            client_id=client_id,
+            status="info",
+        )
+        try:
+            letters = self._call_ai_generate(
+                prompt, round_info["prompt_key"], client=client, round_number=round_number
+            )
+            duration_ms = (time.time() - start_time) * 1000
+            log_activity(
+                "AI Response Received",
+                f"Generated {len(letters)} letters in {duration_ms:.0f}ms",
+                client_id=client_id,
+                status="success",
+            )
+        except Exception as e:
+            log_activity(
+                "AI Generation Failed",
+                str(e),
+                client_id=client_id,
+                status="error",
+                error=str(e),
+            )
+            return {"error": f"AI generation failed: {str(e)}"}
+
+        # Log the successful completion
+        log_dispute_generated(client_id, round_number, len(letters))
+
+        return {
+            "success": True,
+            "client_id": client_id,
+            "client_name": client.name,
+            "round": round_number,
+            "round_name": round_info["name"],
+            "bureaus": target_bureaus,
+            "letters": letters,
+            "generated_at": datetime.utcnow().isoformat(),
+            "items_disputed": len(dispute_items),
+            "violations_cited": len(violations),
+        }
+
+    def generate_letters_bulk(
+        self,
+        client_ids: List[int],
+        round_number: int = 1,
+        bureaus: Optional[List[str]] = None,
+        custom_instructions: Optional[str] = None,
+        tone: str = "professional",
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate dispute letters for many clients with concurrent AI calls.
+
+        Prompts are built one client at a time (database work), then all AI
+        requests run through AIGenerationService. Every client shares the
+        round's system prompt, so after the first call the rest read it from
+        the provider's prompt cache.
+
+        Args:
+            client_ids: Clients to generate for
+            round_number: Dispute round (1-4)
+            bureaus: Specific bureaus to generate for (None = all with items)
+            custom_instructions: Additional instructions for the AI
+            tone: Letter tone (professional, aggressive, formal)
+            max_concurrency: AI requests in flight (default AI_MAX_CONCURRENCY)
+
+        Returns:
+            Dict with per-client results keyed by client ID
+        """
+        import time
+
+        from services.ai_generation_service import (
+            AI_MAX_CONCURRENCY,
+            AIGenerationService,
+            GenerationRequest,
+        )
+
+        if round_number not in self.ROUND_STRATEGIES:
+            return {"error": f"Invalid round number: {round_number}. Must be 1-4."}
+
+        start_time = time.time()
+        round_info = self.ROUND_STRATEGIES[round_number]
+        system_prompt = self._load_system_prompt(round_info["prompt_key"])
+
+        results: Dict[int, Dict[str, Any]] = {}
+        prepared_by_client = {}
+        for client_id in client_ids:
+            prepared = self._prepare_generation(
+                client_id,
+                round_number,
+                bureaus=bureaus,
+                custom_instructions=custom_instructions,
+                tone=tone,
+            )
+            if "error" in prepared:
+                results[client_id] = {"success": False, "error": prepared["error"]}
+            else:
+                prepared_by_client[client_id] = prepared
+
+        generated = AIGenerationService(
+            max_concurrency=max_concurrency or AI_MAX_CONCURRENCY
+        ).generate_many(
+            [
+                GenerationRequest(
+                    key=client_id,
+                    system=system_prompt,
+                    prompt=prepared["prompt"],
+                    temperature=0.3,
+                )
+                for client_id, prepared in prepared_by_client.items()
+            ]
+        )
+
+        for result in generated:
+            client_id = result.key
+            prepared = prepared_by_client[client_id]
+            log_ai_usage(
+                service="dispute_writer",
+                operation="generate_letters_bulk",
+                model=result.model or "unknown",
+                input_tokens=result.input_tokens,
+                output_tokens=result.output_tokens,
+                duration_ms=result.duration_ms,
+                client_id=client_id,
+                dispute_round=round_number,
+                success=result.success,
+                error_message=result.error,
+            )
+            if not result.success:
+                results[client_id] = {
+                    "success": False,
+                    "error": f"AI generation failed: {result.error}",
+                }
+                continue
+
+            letters = self._parse_letters(result.text)
+            log_dispute_generated(client_id, round_number, len(letters))
+            results[client_id] = {
+                "success": True,
+                "client_id": client_id,
+                "client_name": prepared["client"].name,
+                "round": round_number,
+                "round_name": round_info["name"],
+                "bureaus": prepared["target_bureaus"],
+                "letters": letters,
+                "generated_at": datetime.utcnow().isoformat(),
+                "items_disputed": len(prepared["dispute_items"]),
+                "violations_cited": len(prepared["violations"]),
+                "cache_read_tokens": result.cache_read_tokens,
+            }
+
+        succeeded = sum(1 for r in results.values() if r.get("success"))
+        return {
+            "success": succeeded > 0,
+            "round": round_number,
+            "results": results,
+            "generated": succeeded,
+            "failed": len(results) - succeeded,
+            "duration_ms": int((time.time() - start_time) * 1000),
+        }
+
+    def _prepare_generation(
+        self,
+        client_id: int,
+        round_number: int,
+        selected_item_ids: Optional[List[int]] = None,
+        bureaus: Optional[List[str]] = None,
+        custom_instructions: Optional[str] = None,
+        tone: str = "professional",
+    ) -> Dict[str, Any]:
+        """Load a client's context and build the letter prompt (no AI call)"""
         # Gather context
         log_activity(
             "Load Client Data",
@@ -625,46 +818,13 @@ Phone: {client.phone or 'N/A'}
             tone=tone,
         )
 
-        # Call AI to generate letters
-        log_activity(
-            "Call Claude AI",
-            f"Sending to AI ({len(prompt)} chars)...",
-            client_id=client_id,
-            status="info",
-        )
-        try:
-            letters = self._call_ai_generate(prompt, round_info["prompt_key"])
-            duration_ms = (time.time() - start_time) * 1000
-            log_activity(
-                "AI Response Received",
-                f"Generated {len(letters)} letters in {duration_ms:.0f}ms",
-                client_id=client_id,
-                status="success",
-            )
-        except Exception as e:
-            log_activity(
-                "AI Generation Failed",
-                str(e),
-                client_id=client_id,
-                status="error",
-                error=str(e),
-            )
-            return {"error": f"AI generation failed: {str(e)}"}
-
-        # Log the successful completion
-        log_dispute_generated(client_id, round_number, len(letters))
-
         return {
-            "success": True,
-            "client_id": client_id,
-            "client_name": client.name,
-            "round": round_number,
-            "round_name": round_info["name"],
-            "bureaus": target_bureaus,
-            "letters": letters,
-            "generated_at": datetime.utcnow().isoformat(),
-            "items_disputed": len(dispute_items),
-            "violations_cited": len(violations),
+            "client": client,
+            "violations": violations,
+            "dispute_items": dispute_items,
+            "round_info": round_info,
+            "target_bureaus": target_bureaus,
+            "prompt": prompt,
         }
 
     def _build_generation_prompt(
@@ -743,31 +903,35 @@ Generate all letters now:
 
         return prompt
 
-    def _call_ai_generate(self, prompt: str, round_key: str) -> Dict[str, str]:
-        """Call Claude to generate the letters"""
-
-        # Load the round-specific prompt from knowledge base
+    def _load_system_prompt(self, round_key: str) -> str:
+        """Round-specific system prompt from the knowledge base"""
         try:
-            system_prompt = self.prompt_loader.get_round_prompt(
-                int(round_key.replace("r", ""))
-            )
+            return self.prompt_loader.get_round_prompt(int(round_key.replace("r", "")))
         except Exception:
             # Fallback to quick prompt
-            system_prompt = self.prompt_loader.load_prompt("quick")
+            return self.prompt_loader.load_prompt("quick")
+
+    def _call_ai_generate(
+        self,
+        prompt: str,
+        round_key: str,
+        client: Optional[Client] = None,
+        round_number: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """Call Claude to generate the letters"""
+        from services.ai_generation_service import DEFAULT_MODEL, system_blocks
 
-        # Truncate system prompt if too long (keep first 50k chars)
-        if len(system_prompt) > 50000:
-            system_prompt = system_prompt[:50000] + "\n\n[Truncated for length]"
+        system_prompt = self._load_system_prompt(round_key)
 
-        # Call Claude
+        # Call Claude (system prompt sent as a cacheable block)
         import time
 
         start_time = time.time()
         response = self.anthropic_client.messages.create(
-            model="claude-sonnet-4-20250514",
+            model=DEFAULT_MODEL,
             max_tokens=8000,
             temperature=0.3,
-            system=system_prompt,
+            system=system_blocks(system_prompt),
             messages=[{"role": "user", "content": prompt}],
         )
         duration_ms = int((time.time() - start_time) * 1000)
@@ -1876,18 +2040,14 @@ Include placeholders for police report number and FTC complaint reference.
         Returns:
             Dict with packets per bureau, ready for SendCertifiedMail
         """
-        from io import BytesIO
-
-        from pypdf import PdfReader, PdfWriter
-
         from services.pdf_service import FCRAPDFGenerator
 
         client = self.db.query(Client).filter(Client.id == client_id).first()
         if not client:
             return {"error": "Client not found"}
 
-        pdf_gen = FCRAPDFGenerator()
         packets = {}
+        plans = []
 
         # Build client address string
         client_address = self._format_client_address(client)
@@ -1939,16 +2099,33 @@ Include placeholders for police report number and FTC complaint reference.
                 ]
             )
 
-            # Generate cover sheet
-            cover_sheet_pdf = pdf_gen.generate_envelope_cover_sheet(
-                bureau=bureau,
-                bureau_address=bureau_address,
-                client_name=client.name,
-                client_address=client_address,
-                documents=packet_docs,
-                police_case_number=police_case_number,
-                ftc_reference_number=ftc_reference_number,
-            )
+            plans.append((bureau, bureau_address, bureau_letter_key, packet_docs))
+
+        cover_sheet_jobs = [
+            {
+                "bureau": bureau,
+                "bureau_address": bureau_address,
+                "client_name": client.name,
+                "client_address": client_address,
+                "documents": packet_docs,
+                "police_case_number": police_case_number,
+                "ftc_reference_number": ftc_reference_number,
+            }
+            for bureau, bureau_address, _, packet_docs in plans
+        ]
+
+        # Cover sheets for all bureaus are rendered in parallel in the packet
+        # worker pool
+        if use_packet_pool(len(cover_sheet_jobs)):
+            cover_sheets = map_in_packet_pool(_render_cover_sheet, cover_sheet_jobs)
+        else:
+            pdf_gen = FCRAPDFGenerator()
+            cover_sheets = [
+                pdf_gen.generate_envelope_cover_sheet(**job) for job in cover_sheet_jobs
+            ]
+
+        for plan, cover_sheet_pdf in zip(plans, cover_sheets):
+            bureau, bureau_address, bureau_letter_key, packet_docs = plan
 
             # Create packet info
             packets[bureau] = {
@@ -2041,29 +2218,7 @@ Include placeholders for police report number and FTC complaint reference.
                 )
 
                 # Combine cover sheet + letter into single PDF
-                from io import BytesIO
-
-                from pypdf import PdfReader, PdfWriter
-
-                writer = PdfWriter()
-
-                # Add cover sheet first
-                cover_sheet_stream = BytesIO(packet["cover_sheet_pdf"])
-                cover_reader = PdfReader(cover_sheet_stream)
-                for page in cover_reader.pages:
-                    writer.add_page(page)
-
-                # Add letter
-                letter_stream = BytesIO(letter_pdf)
-                letter_reader = PdfReader(letter_stream)
-                for page in letter_reader.pages:
-                    writer.add_page(page)
-
-                # Get combined PDF bytes
-                combined_pdf = BytesIO()
-                writer.write(combined_pdf)
-                combined_pdf.seek(0)
-                document_bytes = combined_pdf.read()
+                document_bytes, _ = merge_pdfs([packet["cover_sheet_pdf"], letter_pdf])
 
                 # Queue to SendCertified
                 result = sendcertified.create_mailing(
@@ -2152,3 +2307,39 @@ Include placeholders for police report number and FTC complaint reference.
         pdf_buffer = BytesIO()
         HTML(string=html_content).write_pdf(pdf_buffer)
         return pdf_buffer.getvalue()
+
+
+_cover_sheet_generator = None
+
+
+def _render_cover_sheet(job: Dict[str, Any]) -> bytes:
+    """Render one 5-Day Knock-Out cover sheet; runs in a packet pool worker"""
+    global _cover_sheet_generator
+    from services.pdf_service import FCRAPDFGenerator
+
+    if _cover_sheet_generator is None:
+        _cover_sheet_generator = FCRAPDFGenerator()
+    return _cover_sheet_generator.generate_envelope_cover_sheet(**job)
+
+
+# Register the task handler for the scheduler
+from services.task_queue_service import register_task_handler  # noqa: E402
+
+
+@register_task_handler("generate_letters_bulk")
+def handle_generate_letters_bulk(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Task handler: generate a round of letters for many clients"""
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return AIDisputeWriterService(db).generate_letters_bulk(
+            client_ids=payload["client_ids"],
+            round_number=payload.get("round_number", 1),
+            bureaus=payload.get("bureaus"),
+            custom_instructions=payload.get("custom_instructions"),
+            tone=payload.get("tone", "professional"),
+            max_concurrency=payload.get("max_concurrency"),
+        )
+    finally:
+        db.close()
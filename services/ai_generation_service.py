@@ -0,0 +1,243 @@
+"""
+AI Generation Service
+
+Runs many Claude message requests at once (letters for a round of clients,
+several bureaus) with bounded concurrency, instead of one blocking call per
+client inside a request handler.
+
+- Concurrency: at most AI_MAX_CONCURRENCY requests are in flight.
+- Token budget: with AI_INPUT_TOKENS_PER_MINUTE set, requests wait until
+  their estimated input tokens fit in the last minute's budget, so a large
+  batch is paced under the account's rate limit instead of failing on 429s.
+- Prompt caching: the (large, shared) system prompt is sent as a cached
+  block. Requests are grouped by system prompt and the first request of each
+  group runs on its own, so the rest of the group reads the cached prefix
+  instead of every concurrent request writing it. Cache hits are counted at
+  the user-prompt size against the token budget.
+
+The client honours ANTHROPIC_BASE_URL, which is how tests point it at a local
+stub server.
+
+Usage:
+    service = AIGenerationService(max_concurrency=4)
+    results = service.generate_many([
+        GenerationRequest(key=client_id, system=system_prompt, prompt=prompt),
+        ...
+    ])
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "claude-sonnet-4-20250514"
+AI_MAX_CONCURRENCY = int(os.environ.get("AI_MAX_CONCURRENCY", "4"))
+# 0 disables budget pacing
+AI_INPUT_TOKENS_PER_MINUTE = int(os.environ.get("AI_INPUT_TOKENS_PER_MINUTE", "0"))
+# System prompts longer than this are cut (keeps request size predictable)
+MAX_SYSTEM_PROMPT_CHARS = 50000
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough input token count (about 4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+def system_blocks(system_prompt: str) -> List[Dict[str, Any]]:
+    """System prompt as a single cacheable block"""
+    text = system_prompt.strip()
+    if len(text) > MAX_SYSTEM_PROMPT_CHARS:
+        text = text[:MAX_SYSTEM_PROMPT_CHARS] + "\n\n[Truncated for length]"
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+@dataclass
+class GenerationRequest:
+    """One message request; `key` identifies it in the results"""
+
+    key: Hashable
+    system: str
+    prompt: str
+    max_tokens: int = 8000
+    temperature: Optional[float] = None  # None = API default
+    model: str = DEFAULT_MODEL
+
+
+@dataclass
+class GenerationResult:
+    key: Hashable
+    success: bool
+    text: str = ""
+    error: Optional[str] = None
+    model: Optional[str] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_tokens: int = 0
+    cache_read_tokens: int = 0
+    duration_ms: int = 0
+
+
+class TokenBudget:
+    """Sliding one-minute window of estimated input tokens"""
+
+    def __init__(self, tokens_per_minute: int, window: float = 60.0):
+        self.tokens_per_minute = tokens_per_minute
+        self.window = window
+        self._spent: deque = deque()  # (monotonic time, tokens)
+        self._lock = asyncio.Lock()
+
+    def _expire(self, now: float) -> int:
+        while self._spent and now - self._spent[0][0] >= self.window:
+            self._spent.popleft()
+        return sum(tokens for _, tokens in self._spent)
+
+    async def acquire(self, tokens: int) -> None:
+        if self.tokens_per_minute <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                used = self._expire(now)
+                # A request bigger than the whole budget still runs, alone
+                if not self._spent or used + tokens <= self.tokens_per_minute:
+                    self._spent.append((now, tokens))
+                    return
+                await asyncio.sleep(self.window - (now - self._spent[0][0]))
+
+
+class AIGenerationService:
+    """Bounded-concurrency Claude requests with prompt-cache-aware ordering"""
+
+    def __init__(
+        self,
+        max_concurrency: int = AI_MAX_CONCURRENCY,
+        tokens_per_minute: int = AI_INPUT_TOKENS_PER_MINUTE,
+        client_factory: Optional[Callable[[], Any]] = None,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.tokens_per_minute = tokens_per_minute
+        self.client_factory = client_factory or self._default_client
+
+    @staticmethod
+    def _default_client():
+        from anthropic import AsyncAnthropic
+
+        return AsyncAnthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+
+    async def _call(
+        self,
+        client,
+        semaphore: asyncio.Semaphore,
+        budget: TokenBudget,
+        request: GenerationRequest,
+        prefix_cached: bool,
+    ) -> GenerationResult:
+        estimate = estimate_tokens(request.prompt)
+        if not prefix_cached:
+            estimate += estimate_tokens(request.system)
+
+        async with semaphore:
+            await budget.acquire(estimate)
+            started = time.monotonic()
+            params = {
+                "model": request.model,
+                "max_tokens": request.max_tokens,
+                "system": system_blocks(request.system),
+                "messages": [{"role": "user", "content": request.prompt}],
+            }
+            if request.temperature is not None:
+                params["temperature"] = request.temperature
+            try:
+                response = await client.messages.create(**params)
+            except Exception as e:
+                logger.warning(f"AI request {request.key!r} failed: {e}")
+                return GenerationResult(
+                    key=request.key,
+                    success=False,
+                    error=str(e),
+                    duration_ms=int((time.monotonic() - started) * 1000),
+                )
+
+        usage = getattr(response, "usage", None)
+        return GenerationResult(
+            key=request.key,
+            success=True,
+            text="".join(
+                getattr(block, "text", "") for block in (response.content or [])
+            ),
+            model=getattr(response, "model", request.model),
+            input_tokens=getattr(usage, "input_tokens", 0) or 0,
+            output_tokens=getattr(usage, "output_tokens", 0) or 0,
+            cache_creation_tokens=getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            cache_read_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+            duration_ms=int((time.monotonic() - started) * 1000),
+        )
+
+    async def agenerate_many(
+        self, requests: List[GenerationRequest]
+    ) -> List[GenerationResult]:
+        """Run all requests; results are in request order and never raise"""
+        if not requests:
+            return []
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        budget = TokenBudget(self.tokens_per_minute)
+        client = self.client_factory()
+
+        groups: "OrderedDict[str, List[int]]" = OrderedDict()
+        for index, request in enumerate(requests):
+            groups.setdefault(request.system, []).append(index)
+
+        results: List[Optional[GenerationResult]] = [None] * len(requests)
+
+        async def run_group(indexes: List[int]) -> None:
+            # The first request writes the cached prefix; the rest read it
+            first = indexes[0]
+            results[first] = await self._call(
+                client, semaphore, budget, requests[first], prefix_cached=False
+            )
+            cached = results[first].success
+            rest = await asyncio.gather(
+                *(
+                    self._call(client, semaphore, budget, requests[i], cached)
+                    for i in indexes[1:]
+                )
+            )
+            for i, result in zip(indexes[1:], rest):
+                results[i] = result
+
+        try:
+            await asyncio.gather(*(run_group(indexes) for indexes in groups.values()))
+        finally:
+            close = getattr(client, "close", None)
+            if close is not None:
+                try:
+                    await close()
+                except Exception:
+                    pass
+        return results
+
+    def generate_many(self, requests: List[GenerationRequest]) -> List[GenerationResult]:
+        """Synchronous entry point for request handlers and task workers"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.agenerate_many(requests))
+
+        # Called from inside an event loop: run on a separate thread's loop
+        box: Dict[str, Any] = {}
+
+        def runner():
+            box["results"] = asyncio.run(self.agenerate_many(requests))
+
+        thread = threading.Thread(target=runner, name="ai-generation")
+        thread.start()
+        thread.join()
+        return box["results"]
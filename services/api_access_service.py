@@ -6,14 +6,19 @@ Manages API keys, rate limiting, request logging, and webhooks for third-party i
 import hashlib
 import hmac
 import json
+import logging
 import os
 import secrets
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from typing import Any, Dict, List, Optional, Tuple
 
 import requests  # type: ignore[import-untyped]
+from sqlalchemy import bindparam, func
+from sqlalchemy import inspect as sa_inspect
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from database import (
@@ -25,12 +30,32 @@ from database import (
     Staff,
     get_db,
 )
+from services.shared_state import (
+    SharedGeneration,
+    SharedStateBackend,
+    get_shared_state,
+)
+
+logger = logging.getLogger(__name__)
+
+# Verified keys are trusted for this long before the row is re-read;
+# revocation and rotation invalidate immediately (other workers within ~1s)
+API_KEY_CACHE_TTL = int(os.environ.get("API_KEY_CACHE_TTL_SECONDS", "30"))
+API_KEY_CACHE_MAX_KEYS = 10000
+API_USAGE_FLUSH_INTERVAL = int(os.environ.get("API_USAGE_FLUSH_INTERVAL_SECONDS", "5"))
+API_REQUEST_LOG_MAX_PENDING = 10000
 
 
 class RateLimiter:
-    """In-memory rate limiter for API requests"""
+    """Fixed-window rate limiter for API requests.
 
-    def __init__(self):
+    With a shared state backend the counters live in that backend, so every
+    gunicorn worker enforces the same limit. Without one (the default for
+    direct construction) counts are kept in this process only.
+    """
+
+    def __init__(self, backend: Optional[SharedStateBackend] = None):
+        self.backend = backend
         self._minute_counts = defaultdict(lambda: {"count": 0, "reset_at": None})
         self._day_counts = defaultdict(lambda: {"count": 0, "reset_at": None})
 
@@ -41,6 +66,9 @@ class RateLimiter:
         Check if request is within rate limits and increment counters
         Returns (is_allowed, rate_limit_info)
         """
+        if self.backend is not None:
+            return self._check_and_increment_shared(key_id, per_minute, per_day)
+
         now = datetime.utcnow()
 
         minute_key = f"minute:{key_id}"
@@ -78,8 +106,52 @@ class RateLimiter:
 
         return True, rate_info
 
+    def _check_and_increment_shared(
+        self, key_id: int, per_minute: int, per_day: int
+    ) -> Tuple[bool, dict]:
+        """Increment-then-check against the shared backend.
+
+        Increments are atomic, so two workers can never both take the last
+        slot; a rejected request gives its increment back.
+        """
+        backend = self.backend
+        minute_key = f"ratelimit:minute:{key_id}"
+        day_key = f"ratelimit:day:{key_id}"
+        now = datetime.utcnow()
+
+        minute_count = backend.incr(minute_key, 1, ttl=60)
+        day_count = backend.incr(day_key, 1, ttl=86400)
+
+        minute_reset = now + timedelta(seconds=backend.get_ttl(minute_key) or 60)
+        day_reset = now + timedelta(seconds=backend.get_ttl(day_key) or 86400)
+        rate_info = {
+            "minute_remaining": max(0, per_minute - minute_count),
+            "minute_limit": per_minute,
+            "minute_reset": minute_reset.isoformat(),
+            "day_remaining": max(0, per_day - day_count),
+            "day_limit": per_day,
+            "day_reset": day_reset.isoformat(),
+        }
+
+        if minute_count > per_minute or day_count > per_day:
+            backend.incr(minute_key, -1)
+            backend.incr(day_key, -1)
+            error = (
+                "Rate limit exceeded (per minute)"
+                if minute_count > per_minute
+                else "Rate limit exceeded (per day)"
+            )
+            return False, {**rate_info, "error": error}
+
+        return True, rate_info
+
     def get_usage(self, key_id: int) -> dict:
         """Get current usage stats for a key"""
+        if self.backend is not None:
+            return {
+                "minute_count": int(self.backend.get(f"ratelimit:minute:{key_id}", 0) or 0),
+                "day_count": int(self.backend.get(f"ratelimit:day:{key_id}", 0) or 0),
+            }
         minute_data = self._minute_counts.get(f"minute:{key_id}", {"count": 0})
         day_data = self._day_counts.get(f"day:{key_id}", {"count": 0})
         return {
@@ -88,7 +160,277 @@ class RateLimiter:
         }
 
 
-rate_limiter = RateLimiter()
+rate_limiter = RateLimiter(backend=get_shared_state())
+
+
+def hash_api_key(raw_key: str) -> Tuple[str, str]:
+    """Return (key_hash, key_prefix) as stored on APIKey"""
+    key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
+    return key_hash, raw_key[:8] if len(raw_key) >= 8 else ""
+
+
+class VerifiedAPIKey(SimpleNamespace):
+    """Detached copy of an APIKey row, safe to share between requests"""
+
+    @classmethod
+    def from_row(cls, api_key: APIKey) -> "VerifiedAPIKey":
+        return cls(
+            **{
+                attr.key: getattr(api_key, attr.key)
+                for attr in sa_inspect(APIKey).column_attrs
+            }
+        )
+
+    def has_scope(self, scope: str) -> bool:
+        return APIKey.has_scope(self, scope)  # type: ignore[arg-type]
+
+    def has_any_scope(self, scopes: List[str]) -> bool:
+        return APIKey.has_any_scope(self, scopes)  # type: ignore[arg-type]
+
+
+class APIKeyCache:
+    """Short-TTL cache of verified API keys, keyed by key hash.
+
+    Only keys that exist are cached; unknown keys always go to the database
+    so a flood of bad keys cannot fill the cache. is_active and expires_at
+    are cached with the key, so callers still check them on every request.
+    """
+
+    def __init__(
+        self,
+        ttl: float = API_KEY_CACHE_TTL,
+        max_keys: int = API_KEY_CACHE_MAX_KEYS,
+        backend: Optional[SharedStateBackend] = None,
+    ):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[str, Tuple[float, VerifiedAPIKey]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._generation = SharedGeneration("api_keys", backend)
+
+    def lookup(self, raw_key: str, db: Any = None) -> Optional[VerifiedAPIKey]:
+        """Find the key for a raw API key, from cache or the database"""
+        key_hash, key_prefix = hash_api_key(raw_key)
+
+        if self._generation.changed():
+            self._clear()
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key_hash)
+                return entry[1]
+            epoch = self._epoch
+
+        should_close = db is None
+        db = db or get_db()
+        try:
+            row = (
+                db.query(APIKey)
+                .filter(APIKey.key_hash == key_hash, APIKey.key_prefix == key_prefix)
+                .first()
+            )
+            verified = VerifiedAPIKey.from_row(row) if row else None
+        finally:
+            if should_close:
+                db.close()
+
+        if verified is None:
+            return None
+
+        with self._lock:
+            if epoch == self._epoch:
+                self._entries[key_hash] = (time.monotonic() + self.ttl, verified)
+                self._entries.move_to_end(key_hash)
+                while len(self._entries) > self.max_keys:
+                    self._entries.popitem(last=False)
+        return verified
+
+    def invalidate(self, key_id: Optional[int] = None) -> None:
+        """Forget one key (or all keys) here and in other workers"""
+        if key_id is None:
+            self._clear()
+        else:
+            with self._lock:
+                self._epoch += 1
+                for key_hash, (_, verified) in list(self._entries.items()):
+                    if verified.id == key_id:
+                        del self._entries[key_hash]
+        self._generation.bump()
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+
+class APIUsageRecorder:
+    """Buffers API key usage counters and APIRequest rows for bulk writes.
+
+    The request path only appends to memory; a background thread (or an
+    explicit flush()) writes everything in one transaction: one executemany
+    UPDATE for api_keys usage and one bulk INSERT for api_requests.
+    """
+
+    def __init__(
+        self,
+        flush_interval: int = API_USAGE_FLUSH_INTERVAL,
+        max_pending: int = API_REQUEST_LOG_MAX_PENDING,
+    ):
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+        self._usage: Dict[int, Dict[str, Any]] = {}
+        self._requests: List[Dict[str, Any]] = []
+        self._flush_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.dropped_requests = 0
+
+    def record_use(
+        self, key_id: int, request_ip: Optional[str] = None, uses: int = 1
+    ) -> None:
+        """Count authenticated calls for a key (uses=0 only records the IP)"""
+        with self._lock:
+            usage = self._usage.setdefault(
+                key_id, {"count": 0, "last_used_at": None, "last_used_ip": None}
+            )
+            usage["count"] += uses
+            usage["last_used_at"] = datetime.utcnow()
+            if request_ip:
+                usage["last_used_ip"] = request_ip
+        self._ensure_flush_thread()
+
+    def record_request(self, **fields: Any) -> None:
+        """Queue one APIRequest row (column name -> value)"""
+        fields.setdefault("created_at", datetime.utcnow())
+        with self._lock:
+            if len(self._requests) >= self._max_pending:
+                self.dropped_requests += 1
+                return
+            self._requests.append(fields)
+        self._ensure_flush_thread()
+
+    def pending(self) -> Dict[str, int]:
+        with self._lock:
+            return {"keys": len(self._usage), "requests": len(self._requests)}
+
+    def flush(self) -> Dict[str, int]:
+        """Write buffered usage and request rows; returns what was written"""
+        with self._lock:
+            usage, self._usage = self._usage, {}
+            rows, self._requests = self._requests, []
+        if not usage and not rows:
+            return {"keys": 0, "requests": 0}
+
+        db = get_db()
+        try:
+            # Rows for keys that no longer exist (or the 0 used for unknown
+            # keys) would fail the foreign key and abort the whole batch
+            key_ids = set(usage) | {r.get("api_key_id") for r in rows}
+            key_ids.discard(None)
+            existing = {
+                key_id
+                for (key_id,) in db.query(APIKey.id).filter(APIKey.id.in_(key_ids))
+            }
+            rows = [r for r in rows if r.get("api_key_id") in existing]
+            updates = [
+                {
+                    "key_id": key_id,
+                    "uses": u["count"],
+                    "used_at": u["last_used_at"],
+                    "used_ip": u["last_used_ip"],
+                }
+                for key_id, u in usage.items()
+                if key_id in existing
+            ]
+
+            if rows:
+                db.bulk_insert_mappings(APIRequest, rows)
+            if updates:
+                table = APIKey.__table__
+                db.execute(
+                    table.update()
+                    .where(table.c.id == bindparam("key_id"))
+                    .values(
+                        usage_count=func.coalesce(table.c.usage_count, 0)
+                        + bindparam("uses"),
+                        last_used_at=bindparam("used_at"),
+                        last_used_ip=func.coalesce(
+                            bindparam("used_ip"), table.c.last_used_ip
+                        ),
+                    ),
+                    updates,
+                )
+            db.commit()
+            return {"keys": len(updates), "requests": len(rows)}
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"API usage flush failed, will retry: {e}")
+            self._requeue(usage, rows)
+            return {"keys": 0, "requests": 0}
+        finally:
+            db.close()
+
+    def _requeue(self, usage: Dict[int, Dict[str, Any]], rows: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            for key_id, u in usage.items():
+                current = self._usage.get(key_id)
+                if current is None:
+                    self._usage[key_id] = u
+                else:
+                    current["count"] += u["count"]
+                    current["last_used_ip"] = current["last_used_ip"] or u["last_used_ip"]
+            room = max(0, self._max_pending - len(self._requests))
+            self.dropped_requests += max(0, len(rows) - room)
+            self._requests[:0] = rows[:room]
+
+    def _ensure_flush_thread(self) -> None:
+        if os.environ.get("TESTING", "").lower() == "true":
+            return
+        self.start_flush_thread()
+
+    def start_flush_thread(self) -> None:
+        """Flush buffered usage in the background (one thread per process)"""
+        if self._flush_thread and self._flush_thread.is_alive():
+            return
+        with self._lock:
+            if self._flush_thread and self._flush_thread.is_alive():
+                return
+
+            def flush_loop():
+                while not self._stop.wait(self._flush_interval):
+                    try:
+                        self.flush()
+                    except Exception as e:
+                        logger.error(f"API usage flush failed: {e}")
+
+            self._stop.clear()
+            self._flush_thread = threading.Thread(
+                target=flush_loop, name="api-usage-flush", daemon=True
+            )
+            self._flush_thread.start()
+
+    def shutdown(self) -> None:
+        """Stop the flush thread and write whatever is still buffered"""
+        self._stop.set()
+        if self._flush_thread and self._flush_thread.is_alive():
+            self._flush_thread.join(timeout=2)
+        self.flush()
+
+    def _reset_after_fork(self) -> None:
+        # The parent flushes what it buffered; a forked worker starts empty
+        self._lock = threading.Lock()
+        self._usage = {}
+        self._requests = []
+        self._flush_thread = None
+        self._stop = threading.Event()
+
+
+api_key_cache = APIKeyCache(backend=get_shared_state())
+api_usage_recorder = APIUsageRecorder()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=api_usage_recorder._reset_after_fork)
 
 
 class APIAccessService:
@@ -120,8 +462,7 @@ class APIAccessService:
         db, should_close = self._get_db()
         try:
             raw_key = f"ba_{secrets.token_urlsafe(32)}"
-            key_prefix = raw_key[:8]
-            key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
+            key_hash, key_prefix = hash_api_key(raw_key)
 
             expires_at = None
             if expires_in_days:
@@ -167,6 +508,11 @@ class APIAccessService:
         """
         Validate an API key and return the key object if valid
         Returns (api_key, error_message)
+
+        Without a session (the request hot path) the key comes from
+        api_key_cache as a VerifiedAPIKey and usage is counted in
+        api_usage_recorder, so no write happens before the route runs.
+        With a caller-supplied session the row is updated in that session.
         """
         if not raw_key:
             return None, "API key is required"
@@ -178,8 +524,10 @@ class APIAccessService:
         if len(raw_key) < 8:
             return None, "Invalid API key format"
 
-        key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
-        key_prefix = raw_key[:8]
+        if self.db is None:
+            return self._validate_cached(raw_key)
+
+        key_hash, key_prefix = hash_api_key(raw_key)
 
         db, should_close = self._get_db()
         try:
@@ -209,6 +557,22 @@ class APIAccessService:
             if should_close:
                 db.close()
 
+    def _validate_cached(self, raw_key: str) -> Tuple[Optional[Any], Optional[str]]:
+        try:
+            api_key = api_key_cache.lookup(raw_key)
+        except Exception as e:
+            return None, f"Validation error: {str(e)}"
+
+        if not api_key:
+            return None, "Invalid API key"
+        if not api_key.is_active:
+            return None, "API key has been revoked"
+        if api_key.expires_at and api_key.expires_at < datetime.utcnow():
+            return None, "API key has expired"
+
+        api_usage_recorder.record_use(api_key.id)
+        return api_key, None
+
     def revoke_api_key(
         self, key_id: int, staff_id: Optional[int] = None
     ) -> Dict[str, Any]:
@@ -228,6 +592,7 @@ class APIAccessService:
             api_key.is_active = False
             api_key.updated_at = datetime.utcnow()
             db.commit()
+            api_key_cache.invalidate(key_id)
 
             return {
                 "success": True,
@@ -265,14 +630,14 @@ class APIAccessService:
                     return {"success": False, "error": "Permission denied"}
 
             raw_key = f"ba_{secrets.token_urlsafe(32)}"
-            key_prefix = raw_key[:8]
-            key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
+            key_hash, key_prefix = hash_api_key(raw_key)
 
             old_key.key_hash = key_hash
             old_key.key_prefix = key_prefix
             old_key.updated_at = datetime.utcnow()
 
             db.commit()
+            api_key_cache.invalidate(key_id)
 
             return {
                 "success": True,
@@ -310,37 +675,46 @@ class APIAccessService:
         request_body: Optional[dict] = None,
         error_message: Optional[str] = None,
     ) -> bool:
-        """Log an API request for analytics"""
-        db, should_close = self._get_db()
-        try:
-            safe_headers = {}
-            if request_headers:
-                for k, v in request_headers.items():
-                    if k.lower() not in ["authorization", "cookie", "x-api-key"]:
-                        safe_headers[k] = v
-
-            safe_body = None
-            if request_body:
-                safe_body = {
-                    k: v
-                    for k, v in request_body.items()
-                    if k.lower()
-                    not in ["password", "secret", "token", "key", "ssn", "credit_card"]
-                }
+        """Log an API request for analytics
 
-            log = APIRequest(
-                api_key_id=key_id,
-                endpoint=endpoint,
-                method=method,
-                request_ip=request_ip,
-                request_headers=safe_headers,
-                request_body=safe_body,
-                response_status=response_status,
-                response_time_ms=response_time_ms,
-                error_message=error_message,
-            )
+        Without a session the row is queued on api_usage_recorder and
+        written by its next bulk flush.
+        """
+        safe_headers = {}
+        if request_headers:
+            for k, v in request_headers.items():
+                if k.lower() not in ["authorization", "cookie", "x-api-key"]:
+                    safe_headers[k] = v
+
+        safe_body = None
+        if request_body:
+            safe_body = {
+                k: v
+                for k, v in request_body.items()
+                if k.lower()
+                not in ["password", "secret", "token", "key", "ssn", "credit_card"]
+            }
+
+        fields = {
+            "api_key_id": key_id,
+            "endpoint": endpoint,
+            "method": method,
+            "request_ip": request_ip,
+            "request_headers": safe_headers,
+            "request_body": safe_body,
+            "response_status": response_status,
+            "response_time_ms": response_time_ms,
+            "error_message": error_message,
+        }
+
+        if self.db is None:
+            api_usage_recorder.record_request(**fields)
+            api_usage_recorder.record_use(key_id, request_ip, uses=0)
+            return True
 
-            db.add(log)
+        db = self.db
+        try:
+            db.add(APIRequest(**fields))
 
             api_key = db.query(APIKey).filter(APIKey.id == key_id).first()
             if api_key:
@@ -351,9 +725,6 @@ class APIAccessService:
         except Exception as e:
             print(f"Failed to log API request: {e}")
             return False
-        finally:
-            if should_close:
-                db.close()
 
     def get_key_usage_stats(self, key_id: int, days: int = 30) -> Dict[str, Any]:
         """Get usage statistics for an API key"""
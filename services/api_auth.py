@@ -8,6 +8,10 @@ Provides:
 - Rate limit headers on API responses
 - Request logging for authenticated API calls
 
+Verified keys come from api_key_cache, and usage counters and request logs
+are buffered in api_usage_recorder and written in bulk, so an API call does
+no database write before (or after) its route runs.
+
 Usage:
     from services.api_auth import require_api_key, require_auth
 
@@ -24,7 +28,6 @@ Usage:
         return jsonify(result)
 """
 
-import hashlib
 import time
 from datetime import datetime, timedelta
 from functools import wraps
@@ -33,8 +36,11 @@ from typing import List, Optional
 import jwt
 from flask import g, jsonify, make_response, request, session
 
-from database import API_SCOPES, APIKey, APIRequest, get_db
-from services.api_access_service import APIAccessService, rate_limiter
+from services.api_access_service import (
+    api_key_cache,
+    api_usage_recorder,
+    rate_limiter,
+)
 from services.config import config
 
 # Use config secret or fallback for JWT
@@ -133,30 +139,27 @@ def add_rate_limit_headers(response, rate_info: dict):
     return response
 
 
+def _request_ip() -> Optional[str]:
+    return request.headers.get("X-Forwarded-For", request.remote_addr)
+
+
 def log_api_request(
     api_key_id: int,
     response_status: int,
     start_time: float,
     error: Optional[str] = None,
 ) -> None:
-    """Log an API request for analytics."""
+    """Queue an API request log row for the next bulk flush."""
     try:
-        duration_ms = int((time.time() - start_time) * 1000)
-        db = get_db()
-        try:
-            api_request = APIRequest(
-                api_key_id=api_key_id,
-                endpoint=request.path,
-                method=request.method,
-                request_ip=request.headers.get("X-Forwarded-For", request.remote_addr),
-                response_status=response_status,
-                response_time_ms=duration_ms,
-                error_message=error,
-            )
-            db.add(api_request)
-            db.commit()
-        finally:
-            db.close()
+        api_usage_recorder.record_request(
+            api_key_id=api_key_id,
+            endpoint=request.path,
+            method=request.method,
+            request_ip=_request_ip(),
+            response_status=response_status,
+            response_time_ms=int((time.time() - start_time) * 1000),
+            error_message=error,
+        )
     except Exception as e:
         # Don't fail the request if logging fails
         print(f"API request logging failed: {e}")
@@ -199,115 +202,92 @@ def require_api_key(scopes: Optional[List[str]] = None):
                 )
 
             # Validate API key
-            db = get_db()
-            try:
-                key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
-                key_prefix = raw_key[:8] if len(raw_key) >= 8 else ""
-
-                api_key = (
-                    db.query(APIKey)
-                    .filter(
-                        APIKey.key_hash == key_hash, APIKey.key_prefix == key_prefix
-                    )
-                    .first()
-                )
-
-                if not api_key:
-                    log_api_request(0, 401, start_time, "Invalid API key")
-                    return jsonify({"success": False, "error": "Invalid API key"}), 401
+            api_key = api_key_cache.lookup(raw_key)
+            if not api_key:
+                log_api_request(0, 401, start_time, "Invalid API key")
+                return jsonify({"success": False, "error": "Invalid API key"}), 401
 
-                if not api_key.is_active:
-                    log_api_request(api_key.id, 401, start_time, "API key revoked")
-                    return (
-                        jsonify(
-                            {"success": False, "error": "API key has been revoked"}
-                        ),
-                        401,
-                    )
-
-                if api_key.expires_at and api_key.expires_at < datetime.utcnow():
-                    log_api_request(api_key.id, 401, start_time, "API key expired")
-                    return (
-                        jsonify({"success": False, "error": "API key has expired"}),
-                        401,
-                    )
+            if not api_key.is_active:
+                log_api_request(api_key.id, 401, start_time, "API key revoked")
+                return (
+                    jsonify(
+                        {"success": False, "error": "API key has been revoked"}
+                    ),
+                    401,
+                )
 
-                # Check scopes
-                key_scopes = api_key.scopes or []
-                missing_scopes = [s for s in scopes if s not in key_scopes]
-                if missing_scopes:
-                    log_api_request(
-                        api_key.id, 403, start_time, f"Missing scopes: {missing_scopes}"
-                    )
-                    return (
-                        jsonify(
-                            {
-                                "success": False,
-                                "error": "Insufficient permissions",
-                                "required_scopes": scopes,
-                                "missing_scopes": missing_scopes,
-                            }
-                        ),
-                        403,
-                    )
+            if api_key.expires_at and api_key.expires_at < datetime.utcnow():
+                log_api_request(api_key.id, 401, start_time, "API key expired")
+                return (
+                    jsonify({"success": False, "error": "API key has expired"}),
+                    401,
+                )
 
-                # Check rate limits
-                allowed, rate_info = rate_limiter.check_and_increment(
-                    api_key.id,
-                    api_key.rate_limit_per_minute or 60,
-                    api_key.rate_limit_per_day or 10000,
+            # Check scopes
+            key_scopes = api_key.scopes or []
+            missing_scopes = [s for s in scopes if s not in key_scopes]
+            if missing_scopes:
+                log_api_request(
+                    api_key.id, 403, start_time, f"Missing scopes: {missing_scopes}"
+                )
+                return (
+                    jsonify(
+                        {
+                            "success": False,
+                            "error": "Insufficient permissions",
+                            "required_scopes": scopes,
+                            "missing_scopes": missing_scopes,
+                        }
+                    ),
+                    403,
                 )
 
-                if not allowed:
-                    log_api_request(api_key.id, 429, start_time, "Rate limit exceeded")
-                    response = make_response(
-                        jsonify(
-                            {
-                                "success": False,
-                                "error": "Rate limit exceeded",
-                                "rate_limits": rate_info,
-                            }
-                        ),
-                        429,
-                    )
-                    return add_rate_limit_headers(response, rate_info)
+            # Check rate limits
+            allowed, rate_info = rate_limiter.check_and_increment(
+                api_key.id,
+                api_key.rate_limit_per_minute or 60,
+                api_key.rate_limit_per_day or 10000,
+            )
 
-                # Update last used
-                api_key.last_used_at = datetime.utcnow()
-                api_key.last_used_ip = request.headers.get(
-                    "X-Forwarded-For", request.remote_addr
+            if not allowed:
+                log_api_request(api_key.id, 429, start_time, "Rate limit exceeded")
+                response = make_response(
+                    jsonify(
+                        {
+                            "success": False,
+                            "error": "Rate limit exceeded",
+                            "rate_limits": rate_info,
+                        }
+                    ),
+                    429,
                 )
-                api_key.usage_count = (api_key.usage_count or 0) + 1
-                db.commit()
+                return add_rate_limit_headers(response, rate_info)
 
-                # Store API key in g for access in the route
-                g.api_key = api_key
-                g.auth_type = "api_key"
-                g.rate_info = rate_info
+            # Count usage; written by the next bulk flush
+            api_usage_recorder.record_use(api_key.id, _request_ip())
 
-                # Execute the route
-                result = f(*args, **kwargs)
+            # Store API key in g for access in the route
+            g.api_key = api_key
+            g.auth_type = "api_key"
+            g.rate_info = rate_info
 
-                # Add rate limit headers to response
-                if isinstance(result, tuple):
-                    response = make_response(
-                        result[0], result[1] if len(result) > 1 else 200
-                    )
-                else:
-                    response = make_response(result)
+            # Execute the route
+            result = f(*args, **kwargs)
 
-                response = add_rate_limit_headers(response, rate_info)
+            # Add rate limit headers to response
+            if isinstance(result, tuple):
+                response = make_response(
+                    result[0], result[1] if len(result) > 1 else 200
+                )
+            else:
+                response = make_response(result)
 
-                # Log successful request
-                log_api_request(api_key.id, response.status_code, start_time)
+            response = add_rate_limit_headers(response, rate_info)
 
-                return response
+            # Log successful request
+            log_api_request(api_key.id, response.status_code, start_time)
 
-            except Exception as e:
-                db.rollback()
-                raise
-            finally:
-                db.close()
+            return response
 
         return decorated_function
 
@@ -348,92 +328,74 @@ def require_auth(
                 raw_key = get_api_key_from_request()
                 if raw_key:
                     # Use the require_api_key logic
-                    db = get_db()
-                    try:
-                        key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
-                        key_prefix = raw_key[:8] if len(raw_key) >= 8 else ""
-
-                        api_key = (
-                            db.query(APIKey)
-                            .filter(
-                                APIKey.key_hash == key_hash,
-                                APIKey.key_prefix == key_prefix,
+                    api_key = api_key_cache.lookup(raw_key)
+
+                    if api_key and api_key.is_active:
+                        # Check expiration
+                        if (
+                            api_key.expires_at
+                            and api_key.expires_at < datetime.utcnow()
+                        ):
+                            return (
+                                jsonify(
+                                    {
+                                        "success": False,
+                                        "error": "API key has expired",
+                                    }
+                                ),
+                                401,
                             )
-                            .first()
-                        )
 
-                        if api_key and api_key.is_active:
-                            # Check expiration
-                            if (
-                                api_key.expires_at
-                                and api_key.expires_at < datetime.utcnow()
-                            ):
-                                return (
-                                    jsonify(
-                                        {
-                                            "success": False,
-                                            "error": "API key has expired",
-                                        }
-                                    ),
-                                    401,
-                                )
-
-                            # Check scopes
-                            key_scopes = api_key.scopes or []
-                            missing_scopes = [s for s in scopes if s not in key_scopes]
-                            if missing_scopes:
-                                return (
-                                    jsonify(
-                                        {
-                                            "success": False,
-                                            "error": "Insufficient permissions",
-                                            "missing_scopes": missing_scopes,
-                                        }
-                                    ),
-                                    403,
-                                )
-
-                            # Check rate limits
-                            allowed, rate_info = rate_limiter.check_and_increment(
-                                api_key.id,
-                                api_key.rate_limit_per_minute or 60,
-                                api_key.rate_limit_per_day or 10000,
+                        # Check scopes
+                        key_scopes = api_key.scopes or []
+                        missing_scopes = [s for s in scopes if s not in key_scopes]
+                        if missing_scopes:
+                            return (
+                                jsonify(
+                                    {
+                                        "success": False,
+                                        "error": "Insufficient permissions",
+                                        "missing_scopes": missing_scopes,
+                                    }
+                                ),
+                                403,
                             )
 
-                            if not allowed:
-                                response = make_response(
-                                    jsonify(
-                                        {
-                                            "success": False,
-                                            "error": "Rate limit exceeded",
-                                        }
-                                    ),
-                                    429,
-                                )
-                                return add_rate_limit_headers(response, rate_info)
-
-                            # Update usage
-                            api_key.last_used_at = datetime.utcnow()
-                            api_key.usage_count = (api_key.usage_count or 0) + 1
-                            db.commit()
-
-                            g.api_key = api_key
-                            g.auth_type = "api_key"
-                            g.rate_info = rate_info
-
-                            result = f(*args, **kwargs)
-
-                            if isinstance(result, tuple):
-                                response = make_response(
-                                    result[0], result[1] if len(result) > 1 else 200
-                                )
-                            else:
-                                response = make_response(result)
+                        # Check rate limits
+                        allowed, rate_info = rate_limiter.check_and_increment(
+                            api_key.id,
+                            api_key.rate_limit_per_minute or 60,
+                            api_key.rate_limit_per_day or 10000,
+                        )
 
+                        if not allowed:
+                            response = make_response(
+                                jsonify(
+                                    {
+                                        "success": False,
+                                        "error": "Rate limit exceeded",
+                                    }
+                                ),
+                                429,
+                            )
                             return add_rate_limit_headers(response, rate_info)
 
-                    finally:
-                        db.close()
+                        api_usage_recorder.record_use(api_key.id, _request_ip())
+
+                        g.api_key = api_key
+                        g.auth_type = "api_key"
+                        g.rate_info = rate_info
+
+                        result = f(*args, **kwargs)
+
+                        if isinstance(result, tuple):
+                            response = make_response(
+                                result[0], result[1] if len(result) > 1 else 200
+                            )
+                        else:
+                            response = make_response(result)
+
+                        return add_rate_limit_headers(response, rate_info)
 
             # No valid auth found
             return (
@@ -23,6 +23,7 @@ from database import (
     AuditLog,
     get_db,
 )
+from services.log_partition_service import get_log_partition_service
 
 PHI_FIELDS = [
     "ssn",
@@ -1022,14 +1023,12 @@ class AuditService:
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
 
-            count = db.query(AuditLog).filter(AuditLog.timestamp < cutoff_date).count()
+            # Drops whole monthly partitions on Postgres, batched deletes otherwise
+            count = get_log_partition_service().purge_before(
+                "audit_logs", cutoff_date, db=db
+            )
 
             if count > 0:
-                db.query(AuditLog).filter(AuditLog.timestamp < cutoff_date).delete(
-                    synchronize_session=False
-                )
-                db.commit()
-
                 self.log_event(
                     event_type="delete",
                     resource_type="audit_logs",
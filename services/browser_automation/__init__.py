@@ -15,6 +15,7 @@ from .cfpb_automation import CFPBAutomation
 from .fko_orchestrator import FiveKnockoutOrchestrator
 from .ftc_automation import FTCAutomation
 from .inquiry_orchestrator import InquiryDisputeOrchestrator
+from .orchestration import AutomationPool, PortalThrottle, StepCheckpoint, run_steps
 
 __all__ = [
     "BaseAutomation",
@@ -28,4 +29,8 @@ __all__ = [
     "ExperianAutomation",
     "FiveKnockoutOrchestrator",
     "InquiryDisputeOrchestrator",
+    "AutomationPool",
+    "PortalThrottle",
+    "StepCheckpoint",
+    "run_steps",
 ]
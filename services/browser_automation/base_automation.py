@@ -313,7 +313,7 @@ class BaseAutomation:
                 automation_type=automation_type,
                 portal=portal,
                 status="pending",
-                staff_id=self.staff_id,
+                initiated_by_staff_id=self.staff_id,
             )
             db.add(run)
             db.commit()
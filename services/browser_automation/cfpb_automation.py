@@ -7,12 +7,12 @@ for 5-Day Knockout and Inquiry Disputes.
 Files ONE complaint per bureau (TransUnion, Equifax, Experian).
 """
 
-import asyncio
 import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from .base_automation import AutomationError, AutomationResult, BaseAutomation
+from .orchestration import AutomationStep, run_steps
 
 logger = logging.getLogger(__name__)
 
@@ -328,12 +328,17 @@ I have filed an FTC Identity Theft Report and a police report. I am requesting i
         """
         File CFPB complaints for all bureaus reporting an account.
 
+        Each complaint runs concurrently in its own CFPBAutomation (this
+        instance only supplies the settings), paced by the shared "cfpb"
+        portal throttle.
+
         Args:
             account: Account details
             bureaus: List of bureaus to file against (default: all 3)
             is_inquiry: True for inquiry dispute
             ftc_report_number: FTC report number
-            delay_seconds: Delay between submissions
+            delay_seconds: Deprecated; spacing comes from
+                orchestration.PORTAL_LIMITS["cfpb"]
 
         Returns:
             Dictionary mapping bureau name to AutomationResult
@@ -341,34 +346,33 @@ I have filed an FTC Identity Theft Report and a police report. I am requesting i
         if bureaus is None:
             bureaus = account.get("bureaus", ["transunion", "equifax", "experian"])
 
-        results = {}
-
-        for i, bureau in enumerate(bureaus):
-            bureau_lower = bureau.lower()
-            logger.info(f"Filing CFPB complaint {i+1}/{len(bureaus)} against {bureau}")
-
-            try:
-                result = await self.file_cfpb_complaint(
+        logger.info(f"Filing {len(bureaus)} CFPB complaints concurrently")
+        steps = [
+            AutomationStep(
+                key=bureau.lower(),
+                portal="cfpb",
+                factory=self._spawn,
+                action=lambda cfpb, bureau=bureau: cfpb.file_cfpb_complaint(
                     bureau=bureau,
                     account=account,
                     is_inquiry=is_inquiry,
                     ftc_report_number=ftc_report_number,
-                )
-                results[bureau_lower] = result
-            except Exception as e:
-                logger.error(f"Failed to file CFPB complaint against {bureau}: {e}")
-                results[bureau_lower] = AutomationResult(
-                    success=False,
-                    message=str(e),
-                    error_code="CFPB_FILING_FAILED",
-                )
-
-            # Delay between submissions
-            if i < len(bureaus) - 1:
-                logger.info(f"Waiting {delay_seconds}s before next bureau...")
-                await asyncio.sleep(delay_seconds)
-
-        return results
+                ),
+                error_code="CFPB_FILING_FAILED",
+            )
+            for bureau in bureaus
+        ]
+        return await run_steps(steps)
+
+    def _spawn(self) -> "CFPBAutomation":
+        """A new automation with this one's settings, for a separate browser"""
+        return CFPBAutomation(
+            client_id=self.client_id,
+            staff_id=self.staff_id,
+            headless=self.headless,
+            timeout=self.timeout,
+            anthropic_api_key=self.anthropic_api_key,
+        )
 
 
 async def run_cfpb_automation(
@@ -6,8 +6,10 @@ Coordinates the full 5-Day Knockout (5KO) browser automation flow:
 2. CFPB Complaints (one per bureau)
 3. Bureau Portal Disputes (Equifax, TransUnion, Experian)
 
-Files ONE item per submission across all portals.
-Updates client timeline fields in chronological order.
+Files ONE item per submission across all portals. Once the FTC report is
+filed, the CFPB complaints and bureau disputes run concurrently (see
+orchestration.py), and progress is checkpointed so a run can be resumed.
+Updates client timeline fields as each stage lands.
 """
 
 import asyncio
@@ -16,7 +18,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from .base_automation import AutomationError, AutomationResult
+from .base_automation import AutomationResult
 from .bureau_automation import (
     EquifaxAutomation,
     ExperianAutomation,
@@ -25,10 +27,22 @@ from .bureau_automation import (
 )
 from .cfpb_automation import CFPBAutomation
 from .ftc_automation import FTCAutomation
+from .orchestration import (
+    AutomationPool,
+    AutomationStep,
+    StepCheckpoint,
+    get_automation_pool,
+    run_steps,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _filed_now(results: Dict[str, AutomationResult]) -> bool:
+    """True if any result succeeded in this run (not restored from a checkpoint)"""
+    return any(r.success and not r.data.get("resumed") for r in results.values())
+
+
 @dataclass
 class FiveKnockoutStatus:
     """Status of a 5-Day Knockout run"""
@@ -51,6 +65,7 @@ class FiveKnockoutStatus:
     # Status
     current_step: str = "pending"
     error: str = None
+    run_id: int = None  # checkpoint AutomationRun, for resume
 
     @property
     def is_complete(self) -> bool:
@@ -91,6 +106,7 @@ class FiveKnockoutStatus:
             "cfpb_confirmations": self.cfpb_confirmations,
             "bureau_confirmations": self.bureau_confirmations,
             "error": self.error,
+            "run_id": self.run_id,
             "ftc": self.ftc_result.to_dict() if self.ftc_result else None,
             "cfpb": {k: v.to_dict() for k, v in self.cfpb_results.items()},
             "bureaus": {k: v.to_dict() for k, v in self.bureau_results.items()},
@@ -103,9 +119,9 @@ class FiveKnockoutOrchestrator:
 
     Flow:
     1. File FTC Identity Theft Report → Get report number
-    2. File CFPB Complaint for each bureau reporting the account
-    3. Submit disputes to bureau portals (respecting limits)
-    4. Update client timeline fields throughout
+    2. Concurrently: file a CFPB Complaint for each bureau reporting the
+       account and submit disputes to the bureau portals (respecting limits)
+    3. Update client timeline fields throughout
 
     Timeline Fields Updated:
     - fko_started_at: When process begins
@@ -120,6 +136,7 @@ class FiveKnockoutOrchestrator:
         staff_id: int = None,
         headless: bool = False,
         delay_between_steps: int = 30,
+        pool: AutomationPool = None,
     ):
         """
         Initialize the orchestrator.
@@ -128,12 +145,15 @@ class FiveKnockoutOrchestrator:
             client_id: The client ID
             staff_id: Staff member who initiated
             headless: Run browsers in headless mode (default False for oversight)
-            delay_between_steps: Seconds to wait between major steps
+            delay_between_steps: Deprecated; submissions are paced by the
+                per-portal throttles in orchestration.PORTAL_LIMITS
+            pool: Browser pool to run in (default: shared pool for the loop)
         """
         self.client_id = client_id
         self.staff_id = staff_id
         self.headless = headless
         self.delay_between_steps = delay_between_steps
+        self.pool = pool
         self.status = None
 
     async def run_full_knockout(
@@ -143,10 +163,14 @@ class FiveKnockoutOrchestrator:
         skip_cfpb: bool = False,
         skip_bureaus: bool = False,
         bureaus_to_file: List[str] = None,
+        resume_run_id: int = None,
     ) -> FiveKnockoutStatus:
         """
         Run the complete 5-Day Knockout process for a single account.
 
+        The FTC report is filed first; the CFPB complaints and bureau portal
+        disputes then run concurrently, paced by the shared portal throttles.
+
         Args:
             account: Account details dictionary with:
                 - creditor_name: Name of creditor
@@ -159,6 +183,8 @@ class FiveKnockoutOrchestrator:
             skip_cfpb: Skip CFPB filing
             skip_bureaus: Skip bureau portal disputes
             bureaus_to_file: Specific bureaus to file with (default: all in account['bureaus'])
+            resume_run_id: Checkpoint AutomationRun of an interrupted knockout;
+                steps it recorded as completed are not filed again
 
         Returns:
             FiveKnockoutStatus with results of all steps
@@ -170,7 +196,8 @@ class FiveKnockoutOrchestrator:
         )
 
         # Update client timeline - process started
-        self._update_client_field("fko_started_at", datetime.utcnow())
+        if not resume_run_id:
+            self._update_client_field("fko_started_at", datetime.utcnow())
         self._update_client_field("fko_status", "in_progress")
 
         bureaus = bureaus_to_file or account.get(
@@ -178,29 +205,32 @@ class FiveKnockoutOrchestrator:
         )
 
         try:
-            # Step 1: FTC Identity Theft Report
-            if not skip_ftc:
-                self.status.current_step = "ftc"
-                logger.info(f"Step 1/3: Filing FTC report for client {self.client_id}")
-                await self._run_ftc_step(account)
-                await asyncio.sleep(self.delay_between_steps)
-
-            # Step 2: CFPB Complaints
-            if not skip_cfpb:
-                self.status.current_step = "cfpb"
-                logger.info(
-                    f"Step 2/3: Filing CFPB complaints for client {self.client_id}"
-                )
-                await self._run_cfpb_step(account, bureaus)
-                await asyncio.sleep(self.delay_between_steps)
+            steps = self._build_steps(
+                account, bureaus, skip_ftc, skip_cfpb, skip_bureaus
+            )
+            checkpoint = StepCheckpoint(
+                client_id=self.client_id,
+                automation_type="5ko",
+                staff_id=self.staff_id,
+                run_id=resume_run_id,
+            )
+            self.status.current_step = "ftc" if not skip_ftc else "portals"
+            logger.info(
+                f"Running {len(steps)} 5KO steps for client {self.client_id}"
+            )
+            await run_steps(
+                steps,
+                pool=self.pool,
+                checkpoint=checkpoint,
+                on_result=self._record_result,
+            )
+            self.status.run_id = checkpoint.run_id
 
-            # Step 3: Bureau Portal Disputes
-            if not skip_bureaus:
-                self.status.current_step = "bureaus"
-                logger.info(
-                    f"Step 3/3: Filing bureau disputes for client {self.client_id}"
-                )
-                await self._run_bureau_step(account, bureaus)
+            # Timeline fields for groups that filed something new this run
+            if _filed_now(self.status.cfpb_results):
+                self._update_client_field("fko_cfpb_filed_at", datetime.utcnow())
+            if _filed_now(self.status.bureau_results):
+                self._update_client_field("fko_letters_sent_at", datetime.utcnow())
 
             # Mark complete
             self.status.current_step = "complete"
@@ -227,123 +257,103 @@ class FiveKnockoutOrchestrator:
             logger.error(f"5KO failed for client {self.client_id}: {e}")
             raise
 
-    async def _run_ftc_step(self, account: Dict[str, Any]):
-        """Run the FTC filing step"""
-        try:
-            async with FTCAutomation(
-                client_id=self.client_id,
-                staff_id=self.staff_id,
-                headless=self.headless,
-            ) as ftc:
-                result = await ftc.file_identity_theft_report(account, is_inquiry=False)
-                self.status.ftc_result = result
-
-                if result.success and result.confirmation_number:
-                    self.status.ftc_report_number = result.confirmation_number
-                    self._update_client_field("fko_ftc_filed_at", datetime.utcnow())
-                    logger.info(f"FTC report filed: {result.confirmation_number}")
-
-        except Exception as e:
-            logger.error(f"FTC step failed: {e}")
-            self.status.ftc_result = AutomationResult(
-                success=False,
-                message=str(e),
-                error_code="FTC_FAILED",
-            )
-
-    async def _run_cfpb_step(self, account: Dict[str, Any], bureaus: List[str]):
-        """Run the CFPB filing step for all bureaus"""
-        try:
-            async with CFPBAutomation(
-                client_id=self.client_id,
-                staff_id=self.staff_id,
-                headless=self.headless,
-            ) as cfpb:
-                results = await cfpb.file_complaints_all_bureaus(
-                    account=account,
-                    bureaus=bureaus,
-                    is_inquiry=False,
-                    ftc_report_number=self.status.ftc_report_number,
-                    delay_seconds=60,
-                )
-                self.status.cfpb_results = results
-
-                # Collect confirmations
-                for bureau, result in results.items():
-                    if result.success and result.confirmation_number:
-                        self.status.cfpb_confirmations[bureau] = (
-                            result.confirmation_number
-                        )
-
-                # Update timeline if any CFPB was successful
-                if any(r.success for r in results.values()):
-                    self._update_client_field("fko_cfpb_filed_at", datetime.utcnow())
-
-                logger.info(
-                    f"CFPB complaints filed: {sum(1 for r in results.values() if r.success)}/{len(bureaus)} successful"
-                )
-
-        except Exception as e:
-            logger.error(f"CFPB step failed: {e}")
-            for bureau in bureaus:
-                self.status.cfpb_results[bureau] = AutomationResult(
-                    success=False,
-                    message=str(e),
-                    error_code="CFPB_FAILED",
+    def _build_steps(
+        self,
+        account: Dict[str, Any],
+        bureaus: List[str],
+        skip_ftc: bool = False,
+        skip_cfpb: bool = False,
+        skip_bureaus: bool = False,
+    ) -> List[AutomationStep]:
+        """FTC first; every CFPB complaint and bureau dispute after it"""
+        steps = []
+        after = ()
+
+        if not skip_ftc:
+            steps.append(
+                AutomationStep(
+                    key="ftc",
+                    portal="ftc",
+                    factory=self._automation_factory(FTCAutomation),
+                    action=lambda ftc: ftc.file_identity_theft_report(
+                        account, is_inquiry=False
+                    ),
+                    error_code="FTC_FAILED",
                 )
+            )
+            after = ("ftc",)
 
-    async def _run_bureau_step(self, account: Dict[str, Any], bureaus: List[str]):
-        """Run the bureau portal dispute step"""
         for bureau in bureaus:
-            try:
-                automation = get_bureau_automation(
-                    bureau=bureau,
-                    client_id=self.client_id,
-                    staff_id=self.staff_id,
-                    headless=self.headless,
+            bureau = bureau.lower()
+            if not skip_cfpb:
+                steps.append(
+                    AutomationStep(
+                        key=f"cfpb:{bureau}",
+                        portal="cfpb",
+                        factory=self._automation_factory(CFPBAutomation),
+                        action=lambda cfpb, bureau=bureau: cfpb.file_cfpb_complaint(
+                            bureau=bureau,
+                            account=account,
+                            is_inquiry=False,
+                            ftc_report_number=self.status.ftc_report_number,
+                        ),
+                        after=after,
+                        error_code="CFPB_FILING_FAILED",
+                    )
                 )
-
-                async with automation:
-                    result = await automation.submit_dispute(
-                        account=account,
-                        ftc_report_number=self.status.ftc_report_number,
+            if not skip_bureaus:
+                steps.append(
+                    AutomationStep(
+                        key=f"bureau:{bureau}",
+                        portal=bureau,
+                        factory=lambda bureau=bureau: get_bureau_automation(
+                            bureau=bureau,
+                            client_id=self.client_id,
+                            staff_id=self.staff_id,
+                            headless=self.headless,
+                        ),
+                        action=lambda automation: automation.submit_dispute(
+                            account=account,
+                            ftc_report_number=self.status.ftc_report_number,
+                        ),
+                        after=after,
+                        error_code="BUREAU_FAILED",
                     )
-                    self.status.bureau_results[bureau] = result
-
-                    if result.success and result.confirmation_number:
-                        self.status.bureau_confirmations[bureau] = (
-                            result.confirmation_number
-                        )
-
-                logger.info(
-                    f"Bureau {bureau} dispute: {'Success' if result.success else 'Failed'}"
                 )
 
-                # Delay between bureaus
-                await asyncio.sleep(30)
+        return steps
 
-            except AutomationError as e:
-                if e.error_code == "DISPUTE_LIMIT_REACHED":
-                    logger.warning(f"Bureau {bureau}: {e.message}")
-                else:
-                    logger.error(f"Bureau {bureau} failed: {e}")
-
-                self.status.bureau_results[bureau] = AutomationResult(
-                    success=False,
-                    message=e.message,
-                    error_code=e.error_code,
-                )
-            except Exception as e:
-                logger.error(f"Bureau {bureau} failed unexpectedly: {e}")
-                self.status.bureau_results[bureau] = AutomationResult(
-                    success=False,
-                    message=str(e),
-                    error_code="BUREAU_FAILED",
-                )
+    def _automation_factory(self, automation_class):
+        return lambda: automation_class(
+            client_id=self.client_id,
+            staff_id=self.staff_id,
+            headless=self.headless,
+        )
 
-        # Update timeline if any bureau was successful
-        if any(r.success for r in self.status.bureau_results.values()):
-            self._update_client_field("fko_letters_sent_at", datetime.utcnow())
+    def _record_result(self, step: AutomationStep, result: AutomationResult):
+        """Fold a finished step into the status as soon as it completes"""
+        group, _, bureau = step.key.partition(":")
+        resumed = result.data.get("resumed", False)
+
+        if group == "ftc":
+            self.status.ftc_result = result
+            self.status.current_step = "portals"
+            if result.success and result.confirmation_number:
+                self.status.ftc_report_number = result.confirmation_number
+                if not resumed:
+                    self._update_client_field("fko_ftc_filed_at", datetime.utcnow())
+                logger.info(f"FTC report filed: {result.confirmation_number}")
+        elif group == "cfpb":
+            self.status.cfpb_results[bureau] = result
+            if result.success and result.confirmation_number:
+                self.status.cfpb_confirmations[bureau] = result.confirmation_number
+        elif group == "bureau":
+            self.status.bureau_results[bureau] = result
+            if result.success and result.confirmation_number:
+                self.status.bureau_confirmations[bureau] = result.confirmation_number
+            logger.info(
+                f"Bureau {bureau} dispute: {'Success' if result.success else 'Failed'}"
+            )
 
     def _update_client_field(self, field: str, value: Any):
         """Update a field on the client record"""
@@ -433,3 +443,43 @@ async def run_5ko_for_client(
         headless=headless,
     )
     return await orchestrator.run_full_knockout(account)
+
+
+async def run_5ko_batch(
+    jobs: List[Dict[str, Any]],
+    staff_id: int = None,
+    headless: bool = False,
+) -> List[FiveKnockoutStatus]:
+    """
+    Run 5KOs for many clients concurrently on one shared browser pool.
+
+    Args:
+        jobs: List of {"client_id": ..., "account": {...}} dictionaries
+        staff_id: Staff member who initiated
+        headless: Run in headless mode
+
+    Returns:
+        List of FiveKnockoutStatus in the order of `jobs`
+    """
+    pool = get_automation_pool()
+
+    async def run_job(job):
+        orchestrator = FiveKnockoutOrchestrator(
+            client_id=job["client_id"],
+            staff_id=staff_id,
+            headless=headless,
+            pool=pool,
+        )
+        try:
+            return await orchestrator.run_full_knockout(job["account"])
+        except Exception as e:
+            logger.error(f"5KO for client {job['client_id']} failed: {e}")
+            return FiveKnockoutStatus(
+                client_id=job["client_id"],
+                account=job["account"],
+                started_at=datetime.utcnow(),
+                current_step="failed",
+                error=str(e),
+            )
+
+    return list(await asyncio.gather(*(run_job(job) for job in jobs)))
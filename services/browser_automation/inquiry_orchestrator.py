@@ -5,7 +5,8 @@ Coordinates the browser automation flow for disputing unauthorized hard inquirie
 1. FTC Identity Theft Report (one per inquiry)
 2. CFPB Complaint (one per bureau reporting the inquiry)
 
-Simpler than 5KO - no bureau portal submissions needed.
+Simpler than 5KO - no bureau portal submissions needed. The CFPB complaints
+run concurrently once the FTC report is filed (see orchestration.py).
 Inquiries are typically removed faster since they're easier to prove unauthorized.
 """
 
@@ -15,9 +16,16 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from .base_automation import AutomationError, AutomationResult
+from .base_automation import AutomationResult
 from .cfpb_automation import CFPBAutomation
 from .ftc_automation import FTCAutomation
+from .orchestration import (
+    AutomationPool,
+    AutomationStep,
+    StepCheckpoint,
+    get_automation_pool,
+    run_steps,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +50,7 @@ class InquiryDisputeStatus:
     # Status
     current_step: str = "pending"
     error: str = None
+    run_id: int = None  # checkpoint AutomationRun, for resume
 
     @property
     def is_complete(self) -> bool:
@@ -77,6 +86,7 @@ class InquiryDisputeStatus:
             "ftc_report_number": self.ftc_report_number,
             "cfpb_confirmations": self.cfpb_confirmations,
             "error": self.error,
+            "run_id": self.run_id,
             "ftc": self.ftc_result.to_dict() if self.ftc_result else None,
             "cfpb": {k: v.to_dict() for k, v in self.cfpb_results.items()},
         }
@@ -106,6 +116,7 @@ class InquiryDisputeOrchestrator:
         staff_id: int = None,
         headless: bool = False,
         delay_between_steps: int = 30,
+        pool: AutomationPool = None,
     ):
         """
         Initialize the orchestrator.
@@ -114,12 +125,15 @@ class InquiryDisputeOrchestrator:
             client_id: The client ID
             staff_id: Staff member who initiated
             headless: Run browsers in headless mode (default False for oversight)
-            delay_between_steps: Seconds to wait between major steps
+            delay_between_steps: Deprecated; submissions are paced by the
+                per-portal throttles in orchestration.PORTAL_LIMITS
+            pool: Browser pool to run in (default: shared pool for the loop)
         """
         self.client_id = client_id
         self.staff_id = staff_id
         self.headless = headless
         self.delay_between_steps = delay_between_steps
+        self.pool = pool
         self.status = None
 
     async def run_inquiry_dispute(
@@ -128,6 +142,7 @@ class InquiryDisputeOrchestrator:
         skip_ftc: bool = False,
         skip_cfpb: bool = False,
         bureaus_to_file: List[str] = None,
+        resume_run_id: int = None,
     ) -> InquiryDisputeStatus:
         """
         Run the complete inquiry dispute process for a single unauthorized inquiry.
@@ -140,6 +155,8 @@ class InquiryDisputeOrchestrator:
             skip_ftc: Skip FTC filing (if already done)
             skip_cfpb: Skip CFPB filing
             bureaus_to_file: Specific bureaus to file against (default: all in inquiry['bureaus'])
+            resume_run_id: Checkpoint AutomationRun of an interrupted dispute;
+                steps it recorded as completed are not filed again
 
         Returns:
             InquiryDisputeStatus with results of all steps
@@ -151,7 +168,8 @@ class InquiryDisputeOrchestrator:
         )
 
         # Update client timeline - process started
-        self._update_client_field("inquiry_dispute_started_at", datetime.utcnow())
+        if not resume_run_id:
+            self._update_client_field("inquiry_dispute_started_at", datetime.utcnow())
         self._update_client_field("inquiry_dispute_status", "in_progress")
 
         bureaus = bureaus_to_file or inquiry.get(
@@ -159,22 +177,31 @@ class InquiryDisputeOrchestrator:
         )
 
         try:
-            # Step 1: FTC Identity Theft Report
-            if not skip_ftc:
-                self.status.current_step = "ftc"
-                logger.info(
-                    f"Step 1/2: Filing FTC inquiry report for client {self.client_id}"
-                )
-                await self._run_ftc_step(inquiry)
-                await asyncio.sleep(self.delay_between_steps)
+            steps = self._build_steps(inquiry, bureaus, skip_ftc, skip_cfpb)
+            checkpoint = StepCheckpoint(
+                client_id=self.client_id,
+                automation_type="inquiry",
+                staff_id=self.staff_id,
+                run_id=resume_run_id,
+            )
+            self.status.current_step = "ftc" if not skip_ftc else "cfpb"
+            logger.info(
+                f"Running {len(steps)} inquiry dispute steps for client {self.client_id}"
+            )
+            await run_steps(
+                steps,
+                pool=self.pool,
+                checkpoint=checkpoint,
+                on_result=self._record_result,
+            )
+            self.status.run_id = checkpoint.run_id
 
-            # Step 2: CFPB Complaints
-            if not skip_cfpb:
-                self.status.current_step = "cfpb"
-                logger.info(
-                    f"Step 2/2: Filing CFPB inquiry complaints for client {self.client_id}"
-                )
-                await self._run_cfpb_step(inquiry, bureaus)
+            # Update timeline if any CFPB complaint was filed in this run
+            if any(
+                r.success and not r.data.get("resumed")
+                for r in self.status.cfpb_results.values()
+            ):
+                self._update_client_field("inquiry_cfpb_filed_at", datetime.utcnow())
 
             # Mark complete
             self.status.current_step = "complete"
@@ -203,77 +230,79 @@ class InquiryDisputeOrchestrator:
             logger.error(f"Inquiry dispute failed for client {self.client_id}: {e}")
             raise
 
-    async def _run_ftc_step(self, inquiry: Dict[str, Any]):
-        """Run the FTC filing step for an inquiry"""
-        try:
-            async with FTCAutomation(
-                client_id=self.client_id,
-                staff_id=self.staff_id,
-                headless=self.headless,
-            ) as ftc:
-                result = await ftc.file_identity_theft_report(inquiry, is_inquiry=True)
-                self.status.ftc_result = result
+    def _build_steps(
+        self,
+        inquiry: Dict[str, Any],
+        bureaus: List[str],
+        skip_ftc: bool = False,
+        skip_cfpb: bool = False,
+    ) -> List[AutomationStep]:
+        """FTC first; the CFPB complaints for every bureau after it"""
+        steps = []
+        after = ()
+
+        if not skip_ftc:
+            steps.append(
+                AutomationStep(
+                    key="ftc",
+                    portal="ftc",
+                    factory=self._automation_factory(FTCAutomation),
+                    action=lambda ftc: ftc.file_identity_theft_report(
+                        inquiry, is_inquiry=True
+                    ),
+                    error_code="FTC_FAILED",
+                )
+            )
+            after = ("ftc",)
 
-                if result.success and result.confirmation_number:
-                    self.status.ftc_report_number = result.confirmation_number
-                    self._update_client_field("inquiry_ftc_filed_at", datetime.utcnow())
-                    self._update_client_field(
-                        "inquiry_ftc_report_number", result.confirmation_number
-                    )
-                    logger.info(
-                        f"FTC inquiry report filed: {result.confirmation_number}"
+        if not skip_cfpb:
+            for bureau in bureaus:
+                steps.append(
+                    AutomationStep(
+                        key=f"cfpb:{bureau.lower()}",
+                        portal="cfpb",
+                        factory=self._automation_factory(CFPBAutomation),
+                        action=lambda cfpb, bureau=bureau: cfpb.file_cfpb_complaint(
+                            bureau=bureau,
+                            account=inquiry,
+                            is_inquiry=True,
+                            ftc_report_number=self.status.ftc_report_number,
+                        ),
+                        after=after,
+                        error_code="CFPB_FILING_FAILED",
                     )
+                )
 
-        except Exception as e:
-            logger.error(f"FTC step failed: {e}")
-            self.status.ftc_result = AutomationResult(
-                success=False,
-                message=str(e),
-                error_code="FTC_FAILED",
-            )
+        return steps
 
-    async def _run_cfpb_step(self, inquiry: Dict[str, Any], bureaus: List[str]):
-        """Run the CFPB filing step for all bureaus"""
-        try:
-            async with CFPBAutomation(
-                client_id=self.client_id,
-                staff_id=self.staff_id,
-                headless=self.headless,
-            ) as cfpb:
-                results = await cfpb.file_complaints_all_bureaus(
-                    account=inquiry,
-                    bureaus=bureaus,
-                    is_inquiry=True,
-                    ftc_report_number=self.status.ftc_report_number,
-                    delay_seconds=60,
-                )
-                self.status.cfpb_results = results
+    def _automation_factory(self, automation_class):
+        return lambda: automation_class(
+            client_id=self.client_id,
+            staff_id=self.staff_id,
+            headless=self.headless,
+        )
 
-                # Collect confirmations
-                for bureau, result in results.items():
-                    if result.success and result.confirmation_number:
-                        self.status.cfpb_confirmations[bureau] = (
-                            result.confirmation_number
-                        )
+    def _record_result(self, step: AutomationStep, result: AutomationResult):
+        """Fold a finished step into the status as soon as it completes"""
+        group, _, bureau = step.key.partition(":")
 
-                # Update timeline if any CFPB was successful
-                if any(r.success for r in results.values()):
+        if group == "ftc":
+            self.status.ftc_result = result
+            self.status.current_step = "cfpb"
+            if result.success and result.confirmation_number:
+                self.status.ftc_report_number = result.confirmation_number
+                if not result.data.get("resumed"):
+                    self._update_client_field("inquiry_ftc_filed_at", datetime.utcnow())
                     self._update_client_field(
-                        "inquiry_cfpb_filed_at", datetime.utcnow()
+                        "inquiry_ftc_report_number", result.confirmation_number
                     )
-
                 logger.info(
-                    f"CFPB inquiry complaints filed: {sum(1 for r in results.values() if r.success)}/{len(bureaus)} successful"
-                )
-
-        except Exception as e:
-            logger.error(f"CFPB step failed: {e}")
-            for bureau in bureaus:
-                self.status.cfpb_results[bureau] = AutomationResult(
-                    success=False,
-                    message=str(e),
-                    error_code="CFPB_FAILED",
+                    f"FTC inquiry report filed: {result.confirmation_number}"
                 )
+        else:
+            self.status.cfpb_results[bureau] = result
+            if result.success and result.confirmation_number:
+                self.status.cfpb_confirmations[bureau] = result.confirmation_number
 
     def _update_client_field(self, field: str, value: Any):
         """Update a field on the client record"""
@@ -353,48 +382,45 @@ async def run_batch_inquiry_disputes(
     delay_between_inquiries: int = 120,
 ) -> List[InquiryDisputeStatus]:
     """
-    Run inquiry disputes for multiple inquiries.
+    Run inquiry disputes for multiple inquiries concurrently.
+
+    All inquiries share one browser pool, so filings to the same portal are
+    paced by its throttle rather than by a delay between inquiries.
 
     Args:
         client_id: The client ID
         inquiries: List of inquiry details
         staff_id: Staff member who initiated
         headless: Run in headless mode
-        delay_between_inquiries: Delay in seconds between inquiries
+        delay_between_inquiries: Deprecated; see orchestration.PORTAL_LIMITS
 
     Returns:
-        List of InquiryDisputeStatus objects
+        List of InquiryDisputeStatus objects in the order of `inquiries`
     """
-    results = []
+    pool = get_automation_pool()
 
-    for i, inquiry in enumerate(inquiries):
+    async def run_one(i, inquiry):
         logger.info(
             f"Processing inquiry {i+1}/{len(inquiries)}: {inquiry.get('creditor_name', 'Unknown')}"
         )
-
+        orchestrator = InquiryDisputeOrchestrator(
+            client_id=client_id,
+            staff_id=staff_id,
+            headless=headless,
+            pool=pool,
+        )
         try:
-            result = await run_inquiry_dispute_for_client(
-                client_id=client_id,
-                inquiry=inquiry,
-                staff_id=staff_id,
-                headless=headless,
-            )
-            results.append(result)
+            return await orchestrator.run_inquiry_dispute(inquiry)
         except Exception as e:
             logger.error(f"Inquiry dispute {i+1} failed: {e}")
-            results.append(
-                InquiryDisputeStatus(
-                    client_id=client_id,
-                    inquiry=inquiry,
-                    started_at=datetime.utcnow(),
-                    current_step="failed",
-                    error=str(e),
-                )
+            return InquiryDisputeStatus(
+                client_id=client_id,
+                inquiry=inquiry,
+                started_at=datetime.utcnow(),
+                current_step="failed",
+                error=str(e),
             )
 
-        # Delay between inquiries
-        if i < len(inquiries) - 1:
-            logger.info(f"Waiting {delay_between_inquiries}s before next inquiry...")
-            await asyncio.sleep(delay_between_inquiries)
-
-    return results
+    return list(
+        await asyncio.gather(*(run_one(i, q) for i, q in enumerate(inquiries)))
+    )
@@ -0,0 +1,322 @@
+"""
+Concurrent Step Orchestration for Browser Automation
+
+Runs independent portal submissions (FTC, CFPB, Equifax, TransUnion, Experian)
+concurrently instead of one after another with fixed sleeps in between:
+
+- Every step gets its own automation instance (and therefore its own browser
+  session), opened from a shared pool that caps how many browsers run at once.
+- Pacing is per portal: each portal has a PortalThrottle limiting concurrent
+  sessions and the minimum gap between submission starts, so CFPB complaints
+  are spaced out while the bureau portals proceed in parallel.
+- Step outcomes are checkpointed to an AutomationRun row, so an interrupted
+  knockout can be resumed without re-filing the steps that already succeeded.
+
+One pool is shared per event loop, so orchestrators running for many clients
+on the same loop share the browser cap and the portal throttles.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from .base_automation import AutomationError, AutomationResult
+
+logger = logging.getLogger(__name__)
+
+
+# Maximum browsers open at once across all orchestrators on a loop
+DEFAULT_MAX_BROWSERS = int(os.environ.get("AUTOMATION_MAX_BROWSERS", "6"))
+
+# portal -> (max concurrent sessions, minimum seconds between submission starts)
+PORTAL_LIMITS = {
+    "ftc": (2, 20),
+    "cfpb": (2, 60),
+    "equifax": (2, 30),
+    "transunion": (2, 30),
+    "experian": (2, 30),
+}
+DEFAULT_PORTAL_LIMIT = (1, 30)
+
+# Short bureau codes used in account dicts
+PORTAL_ALIASES = {"eq": "equifax", "tu": "transunion", "exp": "experian"}
+
+
+def portal_name(name: str) -> str:
+    """Canonical portal key for a bureau or portal name"""
+    name = (name or "").lower()
+    return PORTAL_ALIASES.get(name, name)
+
+
+class PortalThrottle:
+    """Limits concurrent sessions and spaces submission starts for one portal"""
+
+    def __init__(
+        self,
+        max_concurrent: int = 1,
+        min_interval: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._lock = asyncio.Lock()
+        self._last_start = None
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a session slot; returns once the portal's interval has passed"""
+        async with self._slots:
+            async with self._lock:
+                if self._last_start is not None:
+                    wait = self._last_start + self.min_interval - self._clock()
+                    if wait > 0:
+                        await self._sleep(wait)
+                self._last_start = self._clock()
+            yield
+
+
+class AutomationPool:
+    """Shared browser slots plus one PortalThrottle per portal"""
+
+    def __init__(
+        self,
+        max_browsers: int = None,
+        limits: Dict[str, Tuple[int, float]] = None,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.max_browsers = max_browsers or DEFAULT_MAX_BROWSERS
+        self.limits = dict(PORTAL_LIMITS if limits is None else limits)
+        self._sleep = sleep
+        self._browsers = asyncio.Semaphore(self.max_browsers)
+        self._throttles: Dict[str, PortalThrottle] = {}
+
+    def throttle(self, portal: str) -> PortalThrottle:
+        portal = portal_name(portal)
+        if portal not in self._throttles:
+            max_concurrent, min_interval = self.limits.get(
+                portal, DEFAULT_PORTAL_LIMIT
+            )
+            self._throttles[portal] = PortalThrottle(
+                max_concurrent, min_interval, sleep=self._sleep
+            )
+        return self._throttles[portal]
+
+    @asynccontextmanager
+    async def session(self, portal: str, factory: Callable[[], Any]):
+        """
+        Open a fresh automation for `portal` once the portal throttle and a
+        browser slot allow it; torn down on exit.
+        """
+        # Wait on the portal first so a queued step does not hold a browser slot
+        async with self.throttle(portal).slot():
+            async with self._browsers:
+                async with factory() as automation:
+                    yield automation
+
+
+_pools: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_automation_pool() -> AutomationPool:
+    """The pool shared by everything running on the current event loop"""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = AutomationPool()
+    return pool
+
+
+@dataclass
+class AutomationStep:
+    """One portal submission in an orchestrated run"""
+
+    key: str  # unique within the run, e.g. "cfpb:equifax"
+    portal: str
+    factory: Callable[[], Any]  # builds the automation (an async context manager)
+    action: Callable[[Any], Awaitable[AutomationResult]]
+    after: Tuple[str, ...] = ()  # keys that must finish first
+    error_code: str = "STEP_FAILED"
+
+
+class StepCheckpoint:
+    """
+    Persists step outcomes in AutomationRun.result_data["steps"] so a run can
+    be resumed. Failures never interrupt the automation itself.
+    """
+
+    PORTAL = "orchestrator"
+
+    def __init__(
+        self,
+        client_id: int,
+        automation_type: str,
+        staff_id: int = None,
+        run_id: int = None,
+    ):
+        self.client_id = client_id
+        self.automation_type = automation_type
+        self.staff_id = staff_id
+        self.run_id = run_id
+
+    def _update(self, apply: Callable[[Any], None]):
+        from database import AutomationRun, get_db
+
+        db = get_db()
+        try:
+            run = None
+            if self.run_id:
+                run = (
+                    db.query(AutomationRun)
+                    .filter(AutomationRun.id == self.run_id)
+                    .first()
+                )
+            if run is None:
+                run = AutomationRun(
+                    client_id=self.client_id,
+                    automation_type=self.automation_type,
+                    portal=self.PORTAL,
+                    status="pending",
+                    initiated_by_staff_id=self.staff_id,
+                    result_data={"steps": {}},
+                )
+                db.add(run)
+            apply(run)
+            db.commit()
+            self.run_id = run.id
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to checkpoint {self.automation_type} run: {e}")
+        finally:
+            db.close()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Checkpointed steps by key (empty for a new run)"""
+        steps = {}
+
+        def apply(run):
+            steps.update((run.result_data or {}).get("steps", {}))
+            if run.status != "running":
+                run.mark_started()
+
+        self._update(apply)
+        return steps
+
+    def save(self, key: str, result: AutomationResult):
+        def apply(run):
+            data = dict(run.result_data or {})
+            steps = dict(data.get("steps", {}))
+            steps[key] = {
+                "status": "completed" if result.success else "failed",
+                "confirmation_number": result.confirmation_number,
+                "message": result.message,
+                "error_code": result.error_code,
+                "finished_at": datetime.utcnow().isoformat(),
+            }
+            data["steps"] = steps
+            # Reassign so the JSON column is flagged dirty
+            run.result_data = data
+            run.items_processed = len(steps)
+            run.items_succeeded = sum(
+                1 for s in steps.values() if s["status"] == "completed"
+            )
+            run.items_failed = run.items_processed - run.items_succeeded
+
+        self._update(apply)
+
+    def finish(self, results: Dict[str, AutomationResult]):
+        failed = [key for key, result in results.items() if not result.success]
+
+        def apply(run):
+            run.items_total = len(results)
+            if failed:
+                run.mark_failed(
+                    f"Steps failed: {', '.join(failed)}", error_code="STEPS_FAILED"
+                )
+            else:
+                run.mark_completed()
+
+        self._update(apply)
+
+
+def restore_result(entry: Dict[str, Any]) -> AutomationResult:
+    """AutomationResult for a step completed in an earlier attempt"""
+    return AutomationResult(
+        success=True,
+        message=entry.get("message") or "Completed in a previous run",
+        confirmation_number=entry.get("confirmation_number"),
+        data={"resumed": True},
+    )
+
+
+async def run_steps(
+    steps: List[AutomationStep],
+    pool: AutomationPool = None,
+    checkpoint: StepCheckpoint = None,
+    on_result: Callable[[AutomationStep, AutomationResult], None] = None,
+) -> Dict[str, AutomationResult]:
+    """
+    Run steps concurrently, each waiting only for the steps in its `after`.
+
+    Steps already completed in the checkpoint are skipped. `on_result` is
+    called as each step finishes (before its dependents start), including
+    for restored steps.
+
+    Returns:
+        Dictionary mapping step key to AutomationResult
+    """
+    pool = pool or get_automation_pool()
+    done = checkpoint.load() if checkpoint else {}
+    results: Dict[str, AutomationResult] = {}
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run_one(step: AutomationStep):
+        if step.after:
+            await asyncio.gather(*(tasks[key] for key in step.after))
+
+        if done.get(step.key, {}).get("status") == "completed":
+            logger.info(f"Step {step.key} already completed, skipping")
+            result = restore_result(done[step.key])
+        else:
+            try:
+                async with pool.session(step.portal, step.factory) as automation:
+                    result = await step.action(automation)
+            except AutomationError as e:
+                if e.error_code == "DISPUTE_LIMIT_REACHED":
+                    logger.warning(f"Step {step.key}: {e.message}")
+                else:
+                    logger.error(f"Step {step.key} failed: {e}")
+                result = AutomationResult(
+                    success=False,
+                    message=e.message,
+                    error_code=e.error_code,
+                    screenshot_path=e.screenshot_path,
+                )
+            except Exception as e:
+                logger.error(f"Step {step.key} failed unexpectedly: {e}")
+                result = AutomationResult(
+                    success=False, message=str(e), error_code=step.error_code
+                )
+            if checkpoint:
+                checkpoint.save(step.key, result)
+
+        results[step.key] = result
+        if on_result:
+            on_result(step, result)
+
+    for step in steps:
+        tasks[step.key] = asyncio.create_task(run_one(step))
+    await asyncio.gather(*tasks.values())
+
+    if checkpoint:
+        checkpoint.finish(results)
+    return results
@@ -25,6 +25,7 @@ from database import (
 )
 from services.email_service import send_email
 from services.sms_service import send_sms
+from services.template_engine import DOUBLE_BRACE, blank_if_falsy, compile_template
 
 
 def create_campaign(
@@ -344,8 +345,33 @@ def send_campaign(campaign_id: int) -> Dict[str, Any]:
         .all()
     )
 
+    # Compile each template once for the whole campaign
+    email_subject = compile_template(
+        campaign.email_subject
+        or (email_template.subject if email_template else "Message from Brightpath Ascend"),
+        DOUBLE_BRACE,
+    )
+    email_content = compile_template(
+        campaign.email_content
+        or (email_template.html_content if email_template else None)
+        or "",
+        DOUBLE_BRACE,
+    )
+    sms_content = compile_template(
+        campaign.sms_content or (sms_template.message if sms_template else None) or "",
+        DOUBLE_BRACE,
+    )
+
+    # Load all recipient clients in one query
+    client_ids = {r.client_id for r in recipients}
+    clients = (
+        {c.id: c for c in db.query(Client).filter(Client.id.in_(client_ids)).all()}
+        if client_ids
+        else {}
+    )
+
     for recipient in recipients:
-        client = db.query(Client).filter(Client.id == recipient.client_id).first()
+        client = clients.get(recipient.client_id)
         if not client:
             continue
 
@@ -360,19 +386,8 @@ def send_campaign(campaign_id: int) -> Dict[str, Any]:
         # Send email
         if campaign.channel in ["email", "both"] and client.email:
             try:
-                subject = campaign.email_subject or (
-                    email_template.subject
-                    if email_template
-                    else "Message from Brightpath Ascend"
-                )
-                content = campaign.email_content or (
-                    email_template.html_content if email_template else ""
-                )
-
-                # Replace variables
-                for key, value in variables.items():
-                    subject = subject.replace(f"{{{{{key}}}}}", str(value or ""))
-                    content = content.replace(f"{{{{{key}}}}}", str(value or ""))
+                subject = email_subject.render(variables, blank_if_falsy)
+                content = email_content.render(variables, blank_if_falsy)
 
                 send_email(to_email=client.email, subject=subject, html_content=content)
                 recipient.email_status = "sent"
@@ -386,13 +401,7 @@ def send_campaign(campaign_id: int) -> Dict[str, Any]:
         # Send SMS
         if campaign.channel in ["sms", "both"] and client.phone and client.sms_opt_in:
             try:
-                content = campaign.sms_content or (
-                    sms_template.message if sms_template else ""
-                )
-
-                # Replace variables
-                for key, value in variables.items():
-                    content = content.replace(f"{{{{{key}}}}}", str(value or ""))
+                content = sms_content.render(variables, blank_if_falsy)
 
                 send_sms(to_phone=client.phone, message=content)
                 recipient.sms_status = "sent"
@@ -8,11 +8,14 @@ Tracks and calculates client success metrics including:
 - Aggregate reports for dashboard
 """
 
+import logging
+import math
+from collections import defaultdict
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy import and_, asc, desc, func, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 
 from database import (
     Analysis,
@@ -25,6 +28,20 @@ from database import (
     Violation,
 )
 
+logger = logging.getLogger(__name__)
+
+# Clients processed per round of grouped queries in update_all_clients
+SNAPSHOT_CHUNK_SIZE = 500
+
+# Snapshot columns that do not indicate a change on the client's file.
+# days_in_program moves every day on its own.
+_UNCHANGED_IGNORED_FIELDS = {
+    "client_id",
+    "snapshot_date",
+    "snapshot_type",
+    "days_in_program",
+}
+
 
 class ClientSuccessService:
     """Service for tracking and calculating client success metrics"""
@@ -54,6 +71,22 @@ class ClientSuccessService:
         # Calculate item metrics
         item_metrics = self._calculate_item_metrics(client_id)
 
+        # Get estimated value from violations
+        estimated_value = self._calculate_estimated_value(client_id)
+
+        return self._build_metrics(
+            client, initial_data, current_data, item_metrics, estimated_value
+        )
+
+    def _build_metrics(
+        self,
+        client: Client,
+        initial_data: Dict[str, Any],
+        current_data: Dict[str, Any],
+        item_metrics: Dict[str, int],
+        estimated_value: float,
+    ) -> Dict[str, Any]:
+        """Combine per-source figures into the metrics dictionary"""
         # Calculate score changes
         score_changes = self._calculate_score_changes(initial_data, current_data)
 
@@ -69,11 +102,8 @@ class ClientSuccessService:
         if client.created_at:
             days_in_program = (datetime.utcnow() - client.created_at).days
 
-        # Get estimated value from violations
-        estimated_value = self._calculate_estimated_value(client_id)
-
         return {
-            "client_id": client_id,
+            "client_id": client.id,
             "client_name": client.name,
             # Initial state
             "initial_negative_items": initial_data.get("total_negatives", 0),
@@ -123,29 +153,7 @@ class ClientSuccessService:
         )
 
         if first_snapshot:
-            avg_score = None
-            scores = [
-                s
-                for s in [
-                    first_snapshot.equifax_score,
-                    first_snapshot.experian_score,
-                    first_snapshot.transunion_score,
-                ]
-                if s
-            ]
-            if scores:
-                avg_score = sum(scores) // len(scores)
-
-            return {
-                "equifax_score": first_snapshot.equifax_score,
-                "experian_score": first_snapshot.experian_score,
-                "transunion_score": first_snapshot.transunion_score,
-                "avg_score": first_snapshot.average_score or avg_score,
-                "total_negatives": first_snapshot.total_negatives or 0,
-                "equifax_negatives": first_snapshot.equifax_negatives or 0,
-                "experian_negatives": first_snapshot.experian_negatives or 0,
-                "transunion_negatives": first_snapshot.transunion_negatives or 0,
-            }
+            return self._snapshot_data(first_snapshot, include_bureau_negatives=True)
 
         # Fallback: count initial dispute items
         initial_items = (
@@ -154,13 +162,7 @@ class ClientSuccessService:
             .count()
         )
 
-        return {
-            "equifax_score": None,
-            "experian_score": None,
-            "transunion_score": None,
-            "avg_score": None,
-            "total_negatives": initial_items,
-        }
+        return self._no_snapshot_data(initial_items)
 
     def _get_current_data(self, client_id: int) -> Dict[str, Any]:
         """Get current credit data from latest snapshot"""
@@ -173,26 +175,7 @@ class ClientSuccessService:
         )
 
         if latest_snapshot:
-            avg_score = None
-            scores = [
-                s
-                for s in [
-                    latest_snapshot.equifax_score,
-                    latest_snapshot.experian_score,
-                    latest_snapshot.transunion_score,
-                ]
-                if s
-            ]
-            if scores:
-                avg_score = sum(scores) // len(scores)
-
-            return {
-                "equifax_score": latest_snapshot.equifax_score,
-                "experian_score": latest_snapshot.experian_score,
-                "transunion_score": latest_snapshot.transunion_score,
-                "avg_score": latest_snapshot.average_score or avg_score,
-                "total_negatives": latest_snapshot.total_negatives or 0,
-            }
+            return self._snapshot_data(latest_snapshot)
 
         # Fallback: count remaining negative items
         remaining_items = (
@@ -204,13 +187,38 @@ class ClientSuccessService:
             .count()
         )
 
-        return {
-            "equifax_score": None,
-            "experian_score": None,
-            "transunion_score": None,
-            "avg_score": None,
-            "total_negatives": remaining_items,
+        return self._no_snapshot_data(remaining_items)
+
+    @staticmethod
+    def _snapshot_data(
+        snapshot: CreditScoreSnapshot, include_bureau_negatives: bool = False
+    ) -> Dict[str, Any]:
+        """Scores and negative counts from a credit score snapshot"""
+        avg_score = None
+        scores = [
+            s
+            for s in [
+                snapshot.equifax_score,
+                snapshot.experian_score,
+                snapshot.transunion_score,
+            ]
+            if s
+        ]
+        if scores:
+            avg_score = sum(scores) // len(scores)
+
+        data = {
+            "equifax_score": snapshot.equifax_score,
+            "experian_score": snapshot.experian_score,
+            "transunion_score": snapshot.transunion_score,
+            "avg_score": snapshot.average_score or avg_score,
+            "total_negatives": snapshot.total_negatives or 0,
         }
+        if include_bureau_negatives:
+            data["equifax_negatives"] = snapshot.equifax_negatives or 0
+            data["experian_negatives"] = snapshot.experian_negatives or 0
+            data["transunion_negatives"] = snapshot.transunion_negatives or 0
+        return data
 
     def _calculate_item_metrics(self, client_id: int) -> Dict[str, int]:
         """Calculate item deletion/verification metrics from DisputeItems and CRAResponses"""
@@ -219,29 +227,9 @@ class ClientSuccessService:
             self.db.query(DisputeItem).filter(DisputeItem.client_id == client_id).all()
         )
 
-        total_deleted = 0
-        total_verified = 0
-        total_updated = 0
-        total_in_progress = 0
-        equifax_deleted = 0
-        experian_deleted = 0
-        transunion_deleted = 0
-
+        metrics = self._empty_item_metrics()
         for item in dispute_items:
-            if item.status == "deleted":
-                total_deleted += 1
-                if item.bureau and "equifax" in item.bureau.lower():
-                    equifax_deleted += 1
-                elif item.bureau and "experian" in item.bureau.lower():
-                    experian_deleted += 1
-                elif item.bureau and "transunion" in item.bureau.lower():
-                    transunion_deleted += 1
-            elif item.status == "verified" or item.status == "no_change":
-                total_verified += 1
-            elif item.status == "updated":
-                total_updated += 1
-            elif item.status in ["sent", "in_progress", "to_do"]:
-                total_in_progress += 1
+            self._tally_item(metrics, item.status, item.bureau)
 
         # Also count from CRAResponses
         cra_responses = (
@@ -250,22 +238,49 @@ class ClientSuccessService:
 
         for response in cra_responses:
             if response.items_deleted:
-                total_deleted += response.items_deleted
+                metrics["total_deleted"] += response.items_deleted
             if response.items_verified:
-                total_verified += response.items_verified
+                metrics["total_verified"] += response.items_verified
             if response.items_updated:
-                total_updated += response.items_updated
+                metrics["total_updated"] += response.items_updated
+
+        return metrics
 
+    @staticmethod
+    def _empty_item_metrics() -> Dict[str, int]:
         return {
-            "total_deleted": total_deleted,
-            "total_verified": total_verified,
-            "total_updated": total_updated,
-            "total_in_progress": total_in_progress,
-            "equifax_deleted": equifax_deleted,
-            "experian_deleted": experian_deleted,
-            "transunion_deleted": transunion_deleted,
+            "total_deleted": 0,
+            "total_verified": 0,
+            "total_updated": 0,
+            "total_in_progress": 0,
+            "equifax_deleted": 0,
+            "experian_deleted": 0,
+            "transunion_deleted": 0,
         }
 
+    @staticmethod
+    def _tally_item(
+        metrics: Dict[str, int],
+        status: Optional[str],
+        bureau: Optional[str],
+        count: int = 1,
+    ) -> None:
+        """Add count dispute items with the given status/bureau to metrics"""
+        if status == "deleted":
+            metrics["total_deleted"] += count
+            if bureau and "equifax" in bureau.lower():
+                metrics["equifax_deleted"] += count
+            elif bureau and "experian" in bureau.lower():
+                metrics["experian_deleted"] += count
+            elif bureau and "transunion" in bureau.lower():
+                metrics["transunion_deleted"] += count
+        elif status == "verified" or status == "no_change":
+            metrics["total_verified"] += count
+        elif status == "updated":
+            metrics["total_updated"] += count
+        elif status in ["sent", "in_progress", "to_do"]:
+            metrics["total_in_progress"] += count
+
     def _calculate_score_changes(self, initial: Dict, current: Dict) -> Dict[str, int]:
         """Calculate score changes between initial and current state"""
         changes = {
@@ -316,38 +331,7 @@ class ClientSuccessService:
         if "error" in metrics:
             return None
 
-        snapshot = ClientSuccessMetric(
-            client_id=client_id,
-            snapshot_date=date.today(),
-            snapshot_type=snapshot_type,
-            initial_negative_items=metrics["initial_negative_items"],
-            initial_equifax_score=metrics["initial_equifax_score"],
-            initial_experian_score=metrics["initial_experian_score"],
-            initial_transunion_score=metrics["initial_transunion_score"],
-            initial_avg_score=metrics["initial_avg_score"],
-            current_negative_items=metrics["current_negative_items"],
-            current_equifax_score=metrics["current_equifax_score"],
-            current_experian_score=metrics["current_experian_score"],
-            current_transunion_score=metrics["current_transunion_score"],
-            current_avg_score=metrics["current_avg_score"],
-            items_deleted=metrics["items_deleted"],
-            items_verified=metrics["items_verified"],
-            items_updated=metrics["items_updated"],
-            items_in_progress=metrics["items_in_progress"],
-            equifax_items_deleted=metrics["equifax_items_deleted"],
-            experian_items_deleted=metrics["experian_items_deleted"],
-            transunion_items_deleted=metrics["transunion_items_deleted"],
-            equifax_score_change=metrics["equifax_score_change"],
-            experian_score_change=metrics["experian_score_change"],
-            transunion_score_change=metrics["transunion_score_change"],
-            avg_score_change=metrics["avg_score_change"],
-            deletion_rate=metrics["deletion_rate"] / 100,  # Store as decimal
-            dispute_rounds_completed=metrics["dispute_rounds_completed"],
-            days_in_program=metrics["days_in_program"],
-            estimated_value_recovered=metrics["estimated_value_recovered"],
-            is_active=metrics["is_active"],
-            case_complete=metrics["case_complete"],
-        )
+        snapshot = ClientSuccessMetric(**self._snapshot_values(metrics, snapshot_type))
 
         self.db.add(snapshot)
         self.db.commit()
@@ -355,6 +339,44 @@ class ClientSuccessService:
 
         return snapshot
 
+    @staticmethod
+    def _snapshot_values(
+        metrics: Dict[str, Any], snapshot_type: str
+    ) -> Dict[str, Any]:
+        """Column values for a ClientSuccessMetric row"""
+        return {
+            "client_id": metrics["client_id"],
+            "snapshot_date": date.today(),
+            "snapshot_type": snapshot_type,
+            "initial_negative_items": metrics["initial_negative_items"],
+            "initial_equifax_score": metrics["initial_equifax_score"],
+            "initial_experian_score": metrics["initial_experian_score"],
+            "initial_transunion_score": metrics["initial_transunion_score"],
+            "initial_avg_score": metrics["initial_avg_score"],
+            "current_negative_items": metrics["current_negative_items"],
+            "current_equifax_score": metrics["current_equifax_score"],
+            "current_experian_score": metrics["current_experian_score"],
+            "current_transunion_score": metrics["current_transunion_score"],
+            "current_avg_score": metrics["current_avg_score"],
+            "items_deleted": metrics["items_deleted"],
+            "items_verified": metrics["items_verified"],
+            "items_updated": metrics["items_updated"],
+            "items_in_progress": metrics["items_in_progress"],
+            "equifax_items_deleted": metrics["equifax_items_deleted"],
+            "experian_items_deleted": metrics["experian_items_deleted"],
+            "transunion_items_deleted": metrics["transunion_items_deleted"],
+            "equifax_score_change": metrics["equifax_score_change"],
+            "experian_score_change": metrics["experian_score_change"],
+            "transunion_score_change": metrics["transunion_score_change"],
+            "avg_score_change": metrics["avg_score_change"],
+            "deletion_rate": metrics["deletion_rate"] / 100,  # Store as decimal
+            "dispute_rounds_completed": metrics["dispute_rounds_completed"],
+            "days_in_program": metrics["days_in_program"],
+            "estimated_value_recovered": metrics["estimated_value_recovered"],
+            "is_active": metrics["is_active"],
+            "case_complete": metrics["case_complete"],
+        }
+
     def get_latest_snapshot(self, client_id: int) -> Optional[ClientSuccessMetric]:
         """Get the most recent snapshot for a client"""
         return (
@@ -376,33 +398,242 @@ class ClientSuccessService:
             .all()
         )
 
-    def update_all_clients(self, snapshot_type: str = "periodic") -> Dict[str, Any]:
-        """Create snapshots for all active clients"""
+    def update_all_clients(
+        self, snapshot_type: str = "periodic", skip_unchanged: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Create snapshots for all active clients.
+
+        Metrics are computed a chunk of clients at a time with grouped
+        queries (see calculate_bulk_metrics) and written with one bulk
+        insert per chunk. Clients whose metrics match their latest snapshot
+        are skipped; by default only for periodic snapshots.
+        """
+        if skip_unchanged is None:
+            skip_unchanged = snapshot_type == "periodic"
+
         active_clients = (
             self.db.query(Client)
+            .options(
+                load_only(
+                    Client.id,
+                    Client.name,
+                    Client.status,
+                    Client.dispute_status,
+                    Client.current_dispute_round,
+                    Client.created_at,
+                )
+            )
             .filter(Client.status.in_(["active", "pending", "signup"]))
+            .order_by(Client.id)
             .all()
         )
 
         created = 0
+        skipped = 0
         errors = 0
 
-        for client in active_clients:
+        for start in range(0, len(active_clients), SNAPSHOT_CHUNK_SIZE):
+            chunk = active_clients[start : start + SNAPSHOT_CHUNK_SIZE]
             try:
-                snapshot = self.create_snapshot(client.id, snapshot_type)
-                if snapshot:
-                    created += 1
-                else:
-                    errors += 1
+                metrics_by_client = self.calculate_bulk_metrics(chunk)
+                previous = (
+                    self._latest_rows(
+                        ClientSuccessMetric,
+                        [c.id for c in chunk],
+                        ClientSuccessMetric.created_at,
+                    )
+                    if skip_unchanged
+                    else {}
+                )
+
+                rows = []
+                for client_id, metrics in metrics_by_client.items():
+                    values = self._snapshot_values(metrics, snapshot_type)
+                    last = previous.get(client_id)
+                    if last is not None and not self._snapshot_changed(last, values):
+                        skipped += 1
+                        continue
+                    rows.append(values)
+
+                if rows:
+                    self.db.bulk_insert_mappings(ClientSuccessMetric, rows)  # type: ignore[arg-type]
+                    self.db.commit()
+                created += len(rows)
             except Exception as e:
-                errors += 1
+                self.db.rollback()
+                logger.error(f"Client success snapshot chunk failed: {e}")
+                errors += len(chunk)
 
         return {
             "total_clients": len(active_clients),
             "snapshots_created": created,
+            "skipped_unchanged": skipped,
             "errors": errors,
         }
 
+    def calculate_bulk_metrics(
+        self, clients: List[Client]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Calculate metrics for many clients with a fixed number of grouped
+        queries. Produces the same figures as calculate_client_metrics.
+        """
+        client_ids = [c.id for c in clients]
+        if not client_ids:
+            return {}
+
+        first_snapshots = self._latest_rows(
+            CreditScoreSnapshot,
+            client_ids,
+            CreditScoreSnapshot.created_at,
+            ascending=True,
+        )
+        latest_snapshots = self._latest_rows(
+            CreditScoreSnapshot, client_ids, CreditScoreSnapshot.created_at
+        )
+
+        round_one_counts = dict(
+            self.db.query(DisputeItem.client_id, func.count(DisputeItem.id))
+            .filter(
+                DisputeItem.client_id.in_(client_ids), DisputeItem.dispute_round == 1
+            )
+            .group_by(DisputeItem.client_id)
+            .all()
+        )
+
+        item_metrics: Dict[int, Dict[str, int]] = defaultdict(self._empty_item_metrics)
+        remaining_counts: Dict[int, int] = defaultdict(int)
+        status_rows = (
+            self.db.query(
+                DisputeItem.client_id,
+                DisputeItem.status,
+                DisputeItem.bureau,
+                func.count(DisputeItem.id),
+            )
+            .filter(DisputeItem.client_id.in_(client_ids))
+            .group_by(DisputeItem.client_id, DisputeItem.status, DisputeItem.bureau)
+            .all()
+        )
+        for client_id, status, bureau, count in status_rows:
+            self._tally_item(item_metrics[client_id], status, bureau, count)
+            # Mirrors status NOT IN (...) in _get_current_data, which excludes NULL
+            if status is not None and status not in ("deleted", "positive"):
+                remaining_counts[client_id] += count
+
+        response_rows = (
+            self.db.query(
+                CRAResponse.client_id,
+                func.sum(CRAResponse.items_deleted),
+                func.sum(CRAResponse.items_verified),
+                func.sum(CRAResponse.items_updated),
+            )
+            .filter(CRAResponse.client_id.in_(client_ids))
+            .group_by(CRAResponse.client_id)
+            .all()
+        )
+        for client_id, deleted, verified, updated in response_rows:
+            metrics = item_metrics[client_id]
+            metrics["total_deleted"] += deleted or 0
+            metrics["total_verified"] += verified or 0
+            metrics["total_updated"] += updated or 0
+
+        estimated_values = dict(
+            self.db.query(
+                Violation.client_id,
+                func.sum(
+                    (
+                        func.coalesce(Violation.statutory_damages_min, 0)
+                        + func.coalesce(Violation.statutory_damages_max, 0)
+                    )
+                    / 2.0
+                ),
+            )
+            .filter(Violation.client_id.in_(client_ids))
+            .group_by(Violation.client_id)
+            .all()
+        )
+
+        results = {}
+        for client in clients:
+            first = first_snapshots.get(client.id)
+            latest = latest_snapshots.get(client.id)
+            initial_data = (
+                self._snapshot_data(first, include_bureau_negatives=True)
+                if first
+                else self._no_snapshot_data(round_one_counts.get(client.id, 0))
+            )
+            current_data = (
+                self._snapshot_data(latest)
+                if latest
+                else self._no_snapshot_data(remaining_counts.get(client.id, 0))
+            )
+            results[client.id] = self._build_metrics(
+                client,
+                initial_data,
+                current_data,
+                item_metrics[client.id],
+                round(float(estimated_values.get(client.id) or 0), 2),
+            )
+        return results
+
+    @staticmethod
+    def _no_snapshot_data(total_negatives: int) -> Dict[str, Any]:
+        return {
+            "equifax_score": None,
+            "experian_score": None,
+            "transunion_score": None,
+            "avg_score": None,
+            "total_negatives": total_negatives,
+        }
+
+    def _latest_rows(
+        self, model: Any, client_ids: List[int], order_column: Any, ascending: bool = False
+    ) -> Dict[int, Any]:
+        """
+        Return the first (ascending) or last row of model per client_id,
+        ordered by order_column with id as the tie-breaker.
+        """
+        order = (
+            (order_column.asc(), model.id.asc())
+            if ascending
+            else (order_column.desc(), model.id.desc())
+        )
+        ranked = (
+            self.db.query(
+                model.id.label("row_id"),
+                func.row_number()
+                .over(partition_by=model.client_id, order_by=order)
+                .label("rank"),
+            )
+            .filter(model.client_id.in_(client_ids))
+            .subquery()
+        )
+        rows = (
+            self.db.query(model)
+            .join(ranked, ranked.c.row_id == model.id)
+            .filter(ranked.c.rank == 1)
+            .all()
+        )
+        return {row.client_id: row for row in rows}
+
+    @staticmethod
+    def _snapshot_changed(last: ClientSuccessMetric, values: Dict[str, Any]) -> bool:
+        """True if values differ from the stored snapshot on any tracked field"""
+        for field, value in values.items():
+            if field in _UNCHANGED_IGNORED_FIELDS:
+                continue
+            stored = getattr(last, field)
+            if isinstance(value, float) or isinstance(stored, float):
+                if stored is None or value is None:
+                    if stored is not value:
+                        return True
+                elif not math.isclose(stored, value, abs_tol=1e-9):
+                    return True
+            elif stored != value:
+                return True
+        return False
+
     # =========================================================================
     # CLIENT SUCCESS SUMMARY
     # =========================================================================
@@ -934,3 +1165,26 @@ def get_client_success_metrics(client_id: int) -> Optional[Dict[str, Any]]:
         }
     except Exception:
         return None
+
+
+# Register the task handler for the scheduler
+try:
+    from services.task_queue_service import register_task_handler
+
+    @register_task_handler("client_success_snapshots")
+    def handle_client_success_snapshots(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Task handler for the nightly client success snapshot run"""
+        from database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            result = ClientSuccessService(db).update_all_clients(
+                snapshot_type=payload.get("snapshot_type", "periodic")
+            )
+            return {"success": True, **result}
+        finally:
+            db.close()
+
+except ImportError:
+    # Task queue not available, handlers will be registered elsewhere
+    pass
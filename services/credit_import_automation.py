@@ -23,10 +23,19 @@ from services.activity_logger import (
     log_credit_import,
     log_credit_import_failed,
 )
+from services.page_readiness import PageReadiness, StepTimings, resolve_timeouts
+from services.xhr_report_capture import REQUIRED_SECTIONS, XHRCapture
 
 REPORTS_DIR = Path("uploads/credit_reports")
 REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
+# "xhr": build the report from captured API payloads and render/scrape the
+# page only for missing sections; "dom": always scrape the rendered page.
+# A service config's "capture_mode" overrides this. "dom" stays the default
+# because parse_credit_report still reads collections and public records
+# from the rendered HTML, and the payloads don't supply those yet.
+CAPTURE_MODE = os.environ.get("CREDIT_IMPORT_CAPTURE_MODE", "dom")
+
 SERVICE_CONFIGS: Dict[str, Dict[str, Any]] = {
     "IdentityIQ.com": {
         "login_url": "https://member.identityiq.com/login.aspx",
@@ -35,6 +44,7 @@ SERVICE_CONFIGS: Dict[str, Dict[str, Any]] = {
         "ssn_last4_selector": "#txtSSN",
         "login_button_selector": "#btnLogin",
         "report_download_flow": "identityiq",
+        "readiness_timeouts": {"report_render": 60000},
     },
     "MyScoreIQ.com": {
         "login_url": "https://member.myscoreiq.com/",
@@ -44,6 +54,7 @@ SERVICE_CONFIGS: Dict[str, Dict[str, Any]] = {
         "login_button_selector": "#imgBtnLogin",
         "report_download_flow": "myscoreiq",
         "post_login_url": "https://member.myscoreiq.com/CreditReport/Index",
+        "readiness_timeouts": {"report_render": 60000},
     },
     "SmartCredit.com": {
         "login_url": "https://member.smartcredit.com/login",
@@ -62,6 +73,8 @@ SERVICE_CONFIGS: Dict[str, Dict[str, Any]] = {
         "report_download_flow": "myfreescorenow",
         "post_login_url": "https://member.myfreescorenow.com/dashboard",  # Dashboard after login
         # Note: No hardcoded report_page_url - will search for link dynamically
+        # Vue renders the report client-side after several XHRs
+        "readiness_timeouts": {"report_render": 60000, "scores": 20000},
     },
     "HighScoreNow.com": {
         "login_url": "https://member.highscorenow.com/login",
@@ -121,17 +134,64 @@ SERVICE_CONFIGS: Dict[str, Dict[str, Any]] = {
     },
 }
 
+# Readiness predicates (page.wait_for_function) for the report pages
+
+# Angular (MyScoreIQ / IdentityIQ): three bureau scores rendered in td.info
+ANGULAR_SCORES_RENDERED_JS = """() => {
+    let scoreCount = 0;
+    document.querySelectorAll('td.info.ng-binding').forEach(td => {
+        if (/^[3-8]\\d{2}$/.test(td.textContent.trim())) {
+            scoreCount++;
+        }
+    });
+    return scoreCount >= 3;
+}"""
+
+# Vue (MyFreeScoreNow): #smartcredit-app holds rendered report content
+VUE_REPORT_RENDERED_JS = """() => {
+    const app = document.querySelector('#smartcredit-app');
+    if (!app) return false;
+    const innerContent = app.innerHTML.trim();
+    if (innerContent.length < 100) return false;
+    return app.querySelectorAll('.account-container').length > 0
+        || app.querySelectorAll('[class*="score"]').length > 0
+        || app.querySelectorAll('[data-test-account-name]').length > 0
+        || innerContent.length > 500;
+}"""
+
+VUE_APP_FILLED_JS = """() => {
+    const app = document.querySelector('#smartcredit-app');
+    return !app || app.innerHTML.length >= 1000;
+}"""
+
+# At least three numbers in the 300-850 score range in the page text
+THREE_SCORES_TEXT_JS = """() => {
+    const matches = document.body.innerText.match(/\\b([3-8]\\d{2})\\b/g) || [];
+    return matches.filter(s => {
+        const num = parseInt(s);
+        return num >= 300 && num <= 850;
+    }).length >= 3;
+}"""
+
+# The page has grown past the given scroll height
+PAGE_GREW_JS = "(height) => document.body.scrollHeight > height"
+
 
 class CreditImportAutomation:
     """Automated credit report import using Playwright browser automation."""
 
-    def __init__(self):
+    def __init__(self, route_setup=None):
         self.browser = None
         self.context = None
         self.page = None
         self.current_flow = (
             None  # Track which service flow we're using for score extraction
         )
+        # Optional async callable(context) installing request routes (replay harness)
+        self.route_setup = route_setup
+        self.timings = StepTimings()
+        # JSON API responses seen during login and navigation
+        self.capture = XHRCapture()
 
     async def _init_browser(self):
         """Initialize headless browser with speed optimizations."""
@@ -165,7 +225,10 @@ class CreditImportAutomation:
                 # Block images and other resources for speed
                 bypass_csp=True,
             )
+            if self.route_setup is not None:
+                await self.route_setup(self.context)
             self.page = await self.context.new_page()
+            self.capture.attach(self.page)
 
             # Note: Don't block images - "View Report" buttons may be image-based
             # Only block fonts and large non-essential resources
@@ -238,6 +301,8 @@ class CreditImportAutomation:
         self.current_flow = config.get(
             "report_download_flow", ""
         )  # Set flow for extraction
+        self.timings = StepTimings()
+        self.capture = XHRCapture()
 
         try:
             log_activity(
@@ -253,7 +318,9 @@ class CreditImportAutomation:
                 client_id=client_id,
                 status="info",
             )
-            if not await self._init_browser():
+            with self.timings.step("browser_init"):
+                browser_ready = await self._init_browser()
+            if not browser_ready:
                 result["error"] = "Failed to initialize browser"
                 log_activity(
                     "Browser Init Failed",
@@ -277,7 +344,8 @@ class CreditImportAutomation:
                 client_id=client_id,
                 status="info",
             )
-            login_success = await self._login(config, username, password, ssn_last4)
+            with self.timings.step("login"):
+                login_success = await self._login(config, username, password, ssn_last4)
             if not login_success:
                 result["error"] = "Login failed - check credentials"
                 log_credit_import_failed(
@@ -291,7 +359,6 @@ class CreditImportAutomation:
                 client_id=client_id,
                 status="success",
             )
-            await asyncio.sleep(1)  # Reduced from 3s
 
             log_activity(
                 "Download Report",
@@ -299,7 +366,8 @@ class CreditImportAutomation:
                 client_id=client_id,
                 status="info",
             )
-            report_data = await self._download_report(config, client_id, client_name)
+            with self.timings.step("download_report"):
+                report_data = await self._download_report(config, client_id, client_name)
             if report_data and report_data.get("success") != False:
                 result["success"] = True
                 result["report_path"] = report_data.get("path")
@@ -327,6 +395,8 @@ class CreditImportAutomation:
 
         finally:
             await self._close_browser()
+            result["timings"] = self.timings.as_dict()
+            logger.info(f"Import step timings for {client_name}: {self.timings.summary()}")
 
         return result
 
@@ -335,22 +405,21 @@ class CreditImportAutomation:
     ) -> bool:
         """Perform login to credit monitoring service."""
         try:
+            ready = PageReadiness(self.page, resolve_timeouts(config), self.timings)
             logger.info(f"Navigating to {config['login_url']}")
             await self.page.goto(
                 config["login_url"], wait_until="domcontentloaded", timeout=30000
             )
-            await asyncio.sleep(1)  # Reduced from 3s
 
             # Wait for visible input fields (not hidden CSRF tokens)
-            try:
+            if not await ready.selector(
+                'input[type="email"]:visible, input[type="password"]:visible, input[name="email"]:visible, input[name="username"]:visible',
+                "login_form",
+            ):
+                # Fallback to any visible input
                 await self.page.wait_for_selector(
-                    'input[type="email"]:visible, input[type="password"]:visible, input[name="email"]:visible, input[name="username"]:visible',
-                    timeout=10000,
+                    "input:visible", timeout=ready.timeouts["login_form"]
                 )
-            except:
-                # Fallback to any visible input
-                await self.page.wait_for_selector("input:visible", timeout=10000)
-            await asyncio.sleep(0.5)  # Reduced from 2s
 
             # Handle comma-separated selectors in config
             config_username_selectors = []
@@ -391,8 +460,6 @@ class CreditImportAutomation:
                 logger.error("Could not find username field")
                 return False
 
-            await asyncio.sleep(1)
-
             # Handle comma-separated password selectors
             config_password_selectors = []
             if config["password_selector"]:
@@ -449,8 +516,6 @@ class CreditImportAutomation:
                     except:
                         continue
 
-            await asyncio.sleep(1)
-
             # Handle comma-separated login button selectors
             config_login_selectors = []
             if config["login_button_selector"]:
@@ -469,6 +534,7 @@ class CreditImportAutomation:
                 'input[type="submit"]',
             ]
 
+            login_page_url = self.page.url
             for selector in login_selectors:
                 if not selector:
                     continue
@@ -481,14 +547,8 @@ class CreditImportAutomation:
                 except:
                     continue
 
-            await asyncio.sleep(2)  # Reduced from 5s
-
-            try:
-                await self.page.wait_for_load_state("networkidle", timeout=30000)
-            except:
-                pass
-
-            await asyncio.sleep(1)  # Reduced from 3s
+            # Navigation away from the login page, then the member area's XHRs
+            await ready.settled(previous_url=login_page_url)
 
             current_url = self.page.url.lower()
             page_content = await self.page.content()
@@ -535,8 +595,7 @@ class CreditImportAutomation:
                     logger.error("Could not find SSN input field")
                     return False
 
-                await asyncio.sleep(1)
-
+                security_page_url = self.page.url
                 submit_selectors = [
                     "#FBfbforcechangesecurityanswer_ibtSubmit",
                     'button[type="submit"]:not([disabled])',
@@ -553,13 +612,7 @@ class CreditImportAutomation:
                     except:
                         continue
 
-                await asyncio.sleep(2)  # Reduced from 5s
-                try:
-                    await self.page.wait_for_load_state("networkidle", timeout=30000)
-                except:
-                    pass
-
-                await asyncio.sleep(1)  # Reduced from 3s
+                await ready.settled(previous_url=security_page_url)
                 screenshot_path2 = (
                     REPORTS_DIR
                     / f"after_security_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.png"
@@ -662,41 +715,9 @@ class CreditImportAutomation:
         """Navigate to credit report and download/save it."""
         try:
             flow = config.get("report_download_flow", "")
-            captured_data: Dict[str, List[Any]] = {"responses": []}
-
-            async def capture_response(response):
-                """Capture XHR responses that might contain credit data."""
-                try:
-                    url = response.url
-                    content_type = response.headers.get("content-type", "")
-
-                    if (
-                        "json" in content_type
-                        or url.endswith(".json")
-                        or "api" in url.lower()
-                        or "data" in url.lower()
-                    ):
-                        try:
-                            body = await response.text()
-                            if body and len(body) > 100:
-                                import json
-
-                                try:
-                                    json_data = json.loads(body)
-                                    captured_data["responses"].append(
-                                        {"url": url, "data": json_data}
-                                    )
-                                    logger.info(
-                                        f"Captured JSON response from: {url[:100]}"
-                                    )
-                                except:
-                                    pass
-                        except:
-                            pass
-                except Exception as e:
-                    pass
+            ready = PageReadiness(self.page, resolve_timeouts(config), self.timings)
+            self.capture.attach(self.page)
 
-            self.page.on("response", capture_response)
 
             if flow == "myscoreiq":
                 logger.info("Navigating to MyScoreIQ credit report page...")
@@ -707,75 +728,27 @@ class CreditImportAutomation:
                 )
 
                 logger.info("Waiting for score elements to render...")
-                try:
-                    await self.page.wait_for_selector(
-                        "td.info.ng-binding", state="visible", timeout=45000
-                    )
-                except Exception as e:
-                    logger.warning(f"Initial selector wait failed: {e}")
+                if not await ready.selector("td.info.ng-binding", "report_render"):
+                    logger.warning("Initial selector wait failed")
 
                 logger.info("Waiting for Angular to render and scores to populate...")
-                # Wait for Angular to fully render - 30 attempts x 2 seconds = 60 seconds max
-                max_attempts = 30
-                for attempt in range(max_attempts):
-                    try:
-                        # Check both: scores are present AND no unrendered {{}} templates
-                        check_result = await self.page.evaluate(
-                            """() => {
-                            // Check for unrendered Angular templates
-                            const bodyText = document.body.textContent;
-                            const hasUnrenderedTemplates = bodyText.includes('{{') && bodyText.includes('}}');
-
-                            const tds = document.querySelectorAll('td.info.ng-binding');
-                            let scoreCount = 0;
-                            tds.forEach(td => {
-                                const text = td.textContent.trim();
-                                if (/^[3-8]\\d{2}$/.test(text)) {
-                                    scoreCount++;
-                                }
-                            });
-                            return { scoreCount, hasUnrenderedTemplates };
-                        }"""
-                        )
-                        score_count = check_result.get("scoreCount", 0)
-                        has_templates = check_result.get("hasUnrenderedTemplates", True)
-
-                        logger.info(
-                            f"Attempt {attempt + 1}: Found {score_count} scores, unrendered templates: {has_templates}"
-                        )
-
-                        # If we have 3 scores, proceed even if some templates haven't rendered
-                        # (some parts of MyScoreIQ pages have templates that never render)
-                        if score_count >= 3:
-                            if not has_templates:
-                                logger.info(
-                                    "All three bureau scores detected and Angular fully rendered!"
-                                )
-                            else:
-                                logger.info(
-                                    "All three bureau scores detected (some templates still unrendered, but proceeding)"
-                                )
-                            break
-                    except Exception as e:
-                        logger.warning(f"Score check attempt {attempt + 1} failed: {e}")
-                    await asyncio.sleep(2)  # Wait 2 seconds between attempts
-                else:
-                    # Loop completed without finding 3 scores - fail the import
+                # Some parts of MyScoreIQ pages have templates that never render,
+                # so three scores are enough to proceed
+                if not await ready.function(ANGULAR_SCORES_RENDERED_JS, "report_render"):
                     logger.error(
-                        "FAILED: Could not find credit score data after 30 attempts. Page may not have loaded properly."
+                        "FAILED: Could not find credit score data. Page may not have loaded properly."
                     )
                     return {
                         "success": False,
                         "error": "Page failed to load credit report data. Please try again.",
                     }
-
-                await asyncio.sleep(1)  # Reduced from 3s
+                logger.info("All three bureau scores detected")
 
                 try:
                     show_all = await self.page.query_selector('a:has-text("Show All")')
                     if show_all:
                         await show_all.click()
-                        await asyncio.sleep(1)  # Reduced from 3s
+                        await ready.dom_quiet()
                 except:
                     pass
 
@@ -791,65 +764,24 @@ class CreditImportAutomation:
                 )
 
                 logger.info("Waiting for IdentityIQ Angular content to render...")
-                try:
-                    await self.page.wait_for_selector(
-                        "td.info.ng-binding", state="visible", timeout=45000
-                    )
-                except Exception as e:
-                    logger.warning(f"Initial selector wait failed: {e}")
+                if not await ready.selector("td.info.ng-binding", "report_render"):
+                    logger.warning("Initial selector wait failed")
 
                 # Wait for Angular to render scores - same logic as MyScoreIQ
-                max_attempts = 30
-                for attempt in range(max_attempts):
-                    try:
-                        check_result = await self.page.evaluate(
-                            """() => {
-                            const bodyText = document.body.textContent;
-                            const hasUnrenderedTemplates = bodyText.includes('{{') && bodyText.includes('}}');
-
-                            const tds = document.querySelectorAll('td.info.ng-binding');
-                            let scoreCount = 0;
-                            tds.forEach(td => {
-                                const text = td.textContent.trim();
-                                if (/^[3-8]\\d{2}$/.test(text)) {
-                                    scoreCount++;
-                                }
-                            });
-                            return { scoreCount, hasUnrenderedTemplates };
-                        }"""
-                        )
-                        score_count = check_result.get("scoreCount", 0)
-                        has_templates = check_result.get("hasUnrenderedTemplates", True)
-
-                        logger.info(
-                            f"IdentityIQ attempt {attempt + 1}: Found {score_count} scores, unrendered: {has_templates}"
-                        )
-
-                        if score_count >= 3:
-                            logger.info("IdentityIQ: All three bureau scores detected!")
-                            break
-                    except Exception as e:
-                        logger.warning(
-                            f"IdentityIQ score check attempt {attempt + 1} failed: {e}"
-                        )
-                    await asyncio.sleep(2)
-                else:
-                    logger.error(
-                        "IdentityIQ: Could not find credit score data after 30 attempts."
-                    )
+                if not await ready.function(ANGULAR_SCORES_RENDERED_JS, "report_render"):
+                    logger.error("IdentityIQ: Could not find credit score data.")
                     return {
                         "success": False,
                         "error": "IdentityIQ page failed to load credit report data. Please try again.",
                     }
-
-                await asyncio.sleep(1)
+                logger.info("IdentityIQ: All three bureau scores detected!")
 
                 # Try to click "Show All" to expand all sections
                 try:
                     show_all = await self.page.query_selector('a:has-text("Show All")')
                     if show_all:
                         await show_all.click()
-                        await asyncio.sleep(1)
+                        await ready.dom_quiet()
                 except:
                     pass
 
@@ -869,8 +801,7 @@ class CreditImportAutomation:
                     await self.page.goto(
                         three_b_url, wait_until="domcontentloaded", timeout=30000
                     )
-                    await asyncio.sleep(2)  # Wait for Vue.js to initialize
-                    await self.page.wait_for_load_state("networkidle", timeout=30000)
+                    await ready.network_idle("report_page")
 
                     page_title = await self.page.title()
                     current_url = self.page.url
@@ -893,69 +824,16 @@ class CreditImportAutomation:
 
                 report_found = True
 
-                logger.info("Waiting for credit report page to load...")
-                await asyncio.sleep(2)  # Reduced from 5s
-
                 # MyFreeScoreNow uses Vue.js with client-side rendering
                 # We MUST wait for Vue to render content inside #smartcredit-app
                 logger.info("Waiting for Vue.js to render content...")
-
-                # Wait for Vue.js app to populate with actual content
-                vue_content_selectors = [
-                    ".account-container",  # Account cards
-                    ".bureau-score",  # Score display
-                    ".report-header",  # Report header section
-                    "[data-test-account-name]",  # Account names
-                    ".credit-score-container",  # Score containers
-                    ".account-section",  # Account sections
-                ]
-
-                vue_rendered = False
-                max_vue_attempts = 20  # Wait up to 60 seconds for Vue to render
-                for attempt in range(max_vue_attempts):
-                    try:
-                        # Check if Vue has rendered content inside #smartcredit-app
-                        has_content = await self.page.evaluate(
-                            """() => {
-                            const app = document.querySelector('#smartcredit-app');
-                            if (!app) return false;
-
-                            // Check if Vue has rendered actual content (not just the shell)
-                            const innerContent = app.innerHTML.trim();
-                            if (innerContent.length < 100) return false;  // Empty or minimal
-
-                            // Look for Vue-rendered elements
-                            const hasAccounts = app.querySelectorAll('.account-container').length > 0;
-                            const hasScores = app.querySelectorAll('[class*="score"]').length > 0;
-                            const hasReportData = app.querySelectorAll('[data-test-account-name]').length > 0;
-
-                            return hasAccounts || hasScores || hasReportData || innerContent.length > 500;
-                        }"""
-                        )
-
-                        if has_content:
-                            logger.info(
-                                f"Vue.js content detected after {attempt + 1} attempts"
-                            )
-                            vue_rendered = True
-                            break
-                        else:
-                            logger.info(
-                                f"Vue attempt {attempt + 1}: Waiting for content to render..."
-                            )
-                    except Exception as e:
-                        logger.warning(f"Vue check attempt {attempt + 1} failed: {e}")
-
-                    await asyncio.sleep(1)  # Reduced from 3s
-
-                if not vue_rendered:
+                if await ready.function(VUE_REPORT_RENDERED_JS, "report_render"):
+                    logger.info("Vue.js content detected")
+                else:
                     logger.warning(
                         "Vue.js may not have fully rendered - proceeding anyway..."
                     )
 
-                # Additional wait for any lazy-loaded content
-                await asyncio.sleep(1)  # Reduced from 3s
-
                 # MyFreeScoreNow uses modern React/Vue, different selectors than Angular
                 score_selectors = [
                     ".score-value",
@@ -967,54 +845,16 @@ class CreditImportAutomation:
                 ]
 
                 logger.info("Waiting for score elements to render...")
-                score_found = False
-                for selector in score_selectors:
-                    try:
-                        await self.page.wait_for_selector(
-                            selector, state="visible", timeout=10000
-                        )
-                        logger.info(f"Found score elements with selector: {selector}")
-                        score_found = True
-                        break
-                    except Exception as e:
-                        logger.debug(f"Selector {selector} not found: {e}")
-                        continue
-
-                if not score_found:
+                if not await ready.selector(", ".join(score_selectors), "scores"):
                     logger.warning(
                         "Could not find score elements with known selectors, continuing anyway..."
                     )
 
-                # Wait for scores to populate
+                # Wait for scores to populate (whole-body text scan, so poll
+                # on an interval rather than every frame)
                 logger.info("Waiting for scores to populate with numeric values...")
-                max_attempts = 15
-                for attempt in range(max_attempts):
-                    try:
-                        score_count = await self.page.evaluate(
-                            """() => {
-                            // Try multiple patterns to find scores
-                            const allText = document.body.innerText;
-                            const scorePattern = /\\b([3-8]\\d{2})\\b/g;
-                            const matches = allText.match(scorePattern) || [];
-                            // Look for exactly 3 scores in typical range
-                            const validScores = matches.filter(s => {
-                                const num = parseInt(s);
-                                return num >= 300 && num <= 850;
-                            });
-                            return validScores.length >= 3 ? 3 : validScores.length;
-                        }"""
-                        )
-                        logger.info(
-                            f"Attempt {attempt + 1}: Found {score_count} score values"
-                        )
-                        if score_count >= 3:
-                            logger.info("All three bureau scores detected!")
-                            break
-                    except Exception as e:
-                        logger.warning(f"Score check attempt {attempt + 1} failed: {e}")
-                    await asyncio.sleep(1)  # Reduced from 3s
-
-                await asyncio.sleep(1)  # Reduced from 3s
+                if await ready.function(THREE_SCORES_TEXT_JS, "scores", polling=250):
+                    logger.info("All three bureau scores detected!")
 
                 # Try to expand all account details
                 try:
@@ -1031,7 +871,7 @@ class CreditImportAutomation:
                             expand_btn = await self.page.query_selector(btn_selector)
                             if expand_btn:
                                 await expand_btn.click()
-                                await asyncio.sleep(2)
+                                await ready.dom_quiet()
                                 logger.info(f"Clicked expand button: {btn_selector}")
                                 break
                         except:
@@ -1060,312 +900,45 @@ class CreditImportAutomation:
                         link = await self.page.query_selector(selector)
                         if link:
                             await link.click()
-                            await self.page.wait_for_load_state(
-                                "networkidle", timeout=30000
-                            )
-                            await asyncio.sleep(2)
+                            await ready.network_idle("report_page")
+                            await ready.dom_quiet()
                             break
                     except:
                         continue
 
-            await asyncio.sleep(2)  # Reduced from 5s
-
-            # MyFreeScoreNow: Try to switch to Classic View which shows ALL data including inquiries/contacts
-            try:
-                classic_btn = await self.page.query_selector(
-                    'button:has-text("Classic View"), button:has-text("Switch to Classic")'
-                )
-                if classic_btn:
-                    logger.info(
-                        "Found 'Switch to Classic View' button - clicking to load full report..."
-                    )
-                    await classic_btn.click()
-                    await asyncio.sleep(5)  # Wait for classic view to load
-                    # Wait for the classic report format to render
-                    await self.page.wait_for_selector(
-                        ".rpt_content_wrapper, #CreditorContacts, #Inquiries, table.rpt_content_header",
-                        timeout=10000,
-                    )
-                    logger.info("Switched to Classic View successfully")
-            except Exception as e:
-                logger.info(f"Classic view switch not available or failed: {e}")
-
-            # Scroll to load ALL sections including Inquiries and Creditor Contacts at bottom
-            logger.info(
-                "Scrolling page to load ALL sections (accounts, inquiries, contacts)..."
-            )
-            try:
-                previous_height = 0
-                # Scroll more aggressively to ensure we get to the bottom
-                for attempt in range(20):  # Increased from 10
-                    await self.page.evaluate(
-                        "window.scrollTo(0, document.body.scrollHeight)"
-                    )
-                    await asyncio.sleep(1.5)  # Faster scrolling
-                    new_height = await self.page.evaluate("document.body.scrollHeight")
-                    if new_height == previous_height:
-                        # Double-check by trying to scroll again
-                        await asyncio.sleep(2)
-                        await self.page.evaluate(
-                            "window.scrollTo(0, document.body.scrollHeight)"
-                        )
-                        await asyncio.sleep(1)
-                        final_height = await self.page.evaluate(
-                            "document.body.scrollHeight"
-                        )
-                        if final_height == new_height:
-                            logger.info(
-                                f"Scrolling complete after {attempt + 1} attempts"
-                            )
-                            break
-                        new_height = final_height
-                    previous_height = new_height
-                    logger.info(
-                        f"Scroll attempt {attempt + 1}: page height {new_height}px"
-                    )
-
-                # Try to scroll to specific sections by clicking nav links
-                try:
-                    inquiries_link = await self.page.query_selector(
-                        "li:has-text('Inquiries')"
-                    )
-                    if inquiries_link:
-                        await inquiries_link.click()
-                        await asyncio.sleep(2)
-                        logger.info("Clicked Inquiries nav link to load section")
-                except:
-                    pass
-
-                try:
-                    contacts_link = await self.page.query_selector(
-                        "li:has-text('Creditor Contacts')"
-                    )
-                    if contacts_link:
-                        await contacts_link.click()
-                        await asyncio.sleep(2)
-                        logger.info(
-                            "Clicked Creditor Contacts nav link to load section"
-                        )
-                except:
-                    pass
-
-                await self.page.evaluate("window.scrollTo(0, 0)")
-                await asyncio.sleep(1)
-            except Exception as e:
-                logger.warning(f"Scroll failed: {e}")
-
-            # Expand all "View all details" sections to capture full account data
-            # IMPORTANT: Must click each button sequentially with waits so Vue.js can render each modal
-            logger.info(
-                "Expanding all account details (clicking each sequentially with Playwright)..."
-            )
-            try:
-                # Get all view-more-link elements using Playwright locator
-                view_more_links = await self.page.locator(".view-more-link").all()
-                view_details_count = len(view_more_links)
+            # XHR-first: build the report from the captured API payloads and
+            # only render/scrape the full page when required sections are missing
+            xhr_report = None
+            if config.get("capture_mode", CAPTURE_MODE) == "xhr":
+                xhr_report = self.capture.build_report(self._parse_account_item)
                 logger.info(
-                    f"Found {view_details_count} 'View all details' links to click"
+                    f"Captured {len(self.capture.responses)} XHR responses, "
+                    f"missing sections: {xhr_report['missing'] or 'none'}"
                 )
-
-                # Click each one sequentially using Playwright's native click() method
-                # Limit to first 10 to avoid long waits - the HTML capture will still get all data
-                max_expand = min(10, len(view_more_links))
-                expanded_count = 0
-                for i, link in enumerate(view_more_links[:max_expand]):
-                    try:
-                        # Scroll the link into view and click it with timeout
-                        await link.scroll_into_view_if_needed()
-                        await link.click(timeout=5000)
-                        expanded_count += 1
-                        logger.info(f"Expanded {expanded_count}/{max_expand}")
-
-                        # Brief wait for Vue.js
-                        await asyncio.sleep(0.3)
-
-                        if (i + 1) % 5 == 0:
-                            logger.info(
-                                f"Expanded {i + 1}/{view_details_count} account details..."
-                            )
-                    except Exception as e:
-                        logger.debug(f"Failed to click link {i}: {e}")
-                        continue
-
-                if expanded_count > 0:
-                    logger.info(
-                        f"Clicked {expanded_count}/{view_details_count} 'View all details' links"
-                    )
-                    # Final wait for all content to settle
-                    await asyncio.sleep(1)  # Reduced from 3s
-
-                    # Verify payment history sections were loaded
-                    payment_history_count = await self.page.evaluate(
-                        """() => {
-                        return document.querySelectorAll('.account-modal .payment-history').length;
-                    }"""
-                    )
-                    logger.info(
-                        f"Found {payment_history_count} payment history sections in modals after expansion"
-                    )
-            except Exception as e:
-                logger.warning(f"Failed to expand account details: {e}")
-
-            # JavaScript-based modal expansion - more reliable than clicking
-            # This injects CSS/JS to make ALL modals visible regardless of Vue state
-            logger.info(
-                "Force-expanding all account modals via JavaScript injection..."
+            use_dom = xhr_report is None or any(
+                section in xhr_report["missing"] for section in REQUIRED_SECTIONS
             )
-            try:
-                expanded_via_js = await self.page.evaluate(
-                    """() => {
-                    let expandedCount = 0;
-
-                    // Method 1: Click all "View all details" links programmatically
-                    const viewLinks = document.querySelectorAll('.view-more-link, .view-more-link p');
-                    viewLinks.forEach((link, i) => {
-                        try {
-                            link.click();
-                            expandedCount++;
-                        } catch(e) {}
-                    });
-
-                    // Method 2: Force all account-modal elements to be visible via CSS
-                    const modals = document.querySelectorAll('.account-modal, .account-modal-bg');
-                    modals.forEach(modal => {
-                        modal.style.display = 'block';
-                        modal.style.visibility = 'visible';
-                        modal.style.opacity = '1';
-                        modal.style.position = 'relative';
-                        modal.style.height = 'auto';
-                    });
-
-                    // Method 3: Try to trigger Vue component expansion if available
-                    const containers = document.querySelectorAll('.account-container');
-                    containers.forEach(container => {
-                        // Look for Vue instance data
-                        const vueInstance = container.__vue__;
-                        if (vueInstance && typeof vueInstance.showDetails !== 'undefined') {
-                            vueInstance.showDetails = true;
-                        }
-                    });
-
-                    return {
-                        clickedLinks: viewLinks.length,
-                        modalsForced: modals.length,
-                        containers: containers.length
-                    };
-                }"""
-                )
-                logger.info(f"JS modal expansion result: {expanded_via_js}")
-
-                # Wait for Vue to re-render after our changes
-                await asyncio.sleep(2)
-
-                # Verify modals are now visible
-                modal_count = await self.page.evaluate(
-                    """() => {
-                    const visibleModals = document.querySelectorAll('.account-modal');
-                    let visibleCount = 0;
-                    visibleModals.forEach(m => {
-                        const style = window.getComputedStyle(m);
-                        if (style.display !== 'none' && style.visibility !== 'hidden') {
-                            visibleCount++;
-                        }
-                    });
-                    return { total: visibleModals.length, visible: visibleCount };
-                }"""
-                )
-                logger.info(f"After JS expansion: {modal_count}")
-
-            except Exception as e:
-                logger.warning(f"JS modal expansion failed: {e}")
-
-            # Expand Creditor Contacts section if it has a "Show" toggle button
-            try:
-                show_result = await self.page.evaluate(
-                    """() => {
-                    let clicked = false;
-                    // Find the Creditor Contacts section and click the Show button
-                    document.querySelectorAll('h5.fw-bold, h5').forEach(h => {
-                        if (h.textContent.includes('Creditor Contacts')) {
-                            const section = h.closest('section') || h.parentElement?.parentElement;
-                            if (section) {
-                                const showBtn = section.querySelector('.creditor-toggle span, small span');
-                                if (showBtn && showBtn.textContent.trim() === 'Show') {
-                                    showBtn.click();
-                                    clicked = true;
-                                }
-                            }
-                        }
-                    });
-                    return clicked;
-                }"""
-                )
-                if show_result:
-                    logger.info(
-                        "Clicked 'Show' button to expand Creditor Contacts section"
-                    )
-                    await asyncio.sleep(1)
-            except Exception as e:
-                logger.debug(f"Creditor Contacts expansion: {e}")
-
-            logger.info(f"Captured {len(captured_data['responses'])} XHR responses")
-            for resp in captured_data["responses"]:
-                logger.info(f"  - {resp['url'][:80]}")
-
-            # Final verification: Check that we have rendered content before capturing
-            logger.info("Verifying page content before capture...")
-            try:
-                content_check = await self.page.evaluate(
-                    """() => {
-                    const result = {
-                        hasSmartCreditApp: false,
-                        appContentLength: 0,
-                        accountCount: 0,
-                        scoreElementCount: 0,
-                        pageTitle: document.title,
-                        bodyLength: document.body.innerHTML.length
-                    };
-
-                    const app = document.querySelector('#smartcredit-app');
-                    if (app) {
-                        result.hasSmartCreditApp = true;
-                        result.appContentLength = app.innerHTML.length;
-                        result.accountCount = app.querySelectorAll('.account-container, [data-test-account-name]').length;
-                        result.scoreElementCount = app.querySelectorAll('[class*="score"], .bureau-score').length;
-                    }
-
-                    return result;
-                }"""
-                )
-                logger.info(f"Content verification: {content_check}")
-
-                # If #smartcredit-app exists but has minimal content, wait more
-                if (
-                    content_check.get("hasSmartCreditApp")
-                    and content_check.get("appContentLength", 0) < 1000
-                ):
-                    logger.warning(
-                        "Vue app exists but content is minimal - waiting longer..."
-                    )
-                    await asyncio.sleep(10)  # Extra wait for slow rendering
-
-            except Exception as e:
-                logger.warning(f"Content verification failed: {e}")
 
-            # Take a debug screenshot
-            debug_screenshot = (
-                REPORTS_DIR / f"debug_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.png"
-            )
-            await self.page.screenshot(path=str(debug_screenshot), full_page=True)
-            logger.info(f"Saved debug screenshot to {debug_screenshot}")
+            if use_dom:
+                with self.timings.step("render_dom"):
+                    await self._render_full_report(ready)
 
             html_content = await self.page.content()
 
-            scores = await self._extract_scores()
-            accounts = self._extract_accounts_from_xhr(captured_data["responses"])
-
-            if not accounts:
-                accounts = await self._extract_accounts_data()
+            with self.timings.step("extract"):
+                if use_dom:
+                    scores = await self._extract_scores()
+                    accounts = self._extract_accounts_from_xhr(self.capture.responses)
+
+                    if not accounts:
+                        accounts = await self._extract_accounts_data()
+                    if xhr_report is not None:
+                        # Keep whichever required section the payloads did have
+                        scores = scores or xhr_report["scores"] or None
+                        accounts = accounts or xhr_report["accounts"]
+                else:
+                    scores = dict(xhr_report["scores"])
+                    accounts = xhr_report["accounts"]
 
             timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
             safe_name = "".join(
@@ -1382,1015 +955,1331 @@ class CreditImportAutomation:
             xhr_filename = f"{client_id}_{safe_name}_{timestamp}_xhr.json"
             xhr_filepath = REPORTS_DIR / xhr_filename
             with open(xhr_filepath, "w", encoding="utf-8") as f:
-                json.dump(captured_data["responses"], f, indent=2)
+                json.dump(self.capture.responses, f, indent=2)
             logger.info(f"Saved XHR data to {xhr_filepath}")
 
-            # Extract personal info (names, addresses, DOB, employers, inquiries, creditor contacts)
             personal_info = {}
             summary_info = {}
             inquiries = []
             creditor_contacts = []
-            try:
-                personal_data = await self.page.evaluate(
-                    """() => {
-                    const data = {
-                        names: [],
-                        addresses: [],
-                        dob: null,
-                        employers: [],
-                        ssn_last4: null,
-                        // Per-bureau data for MyScoreIQ format
-                        transunion: { names: [], dob: null, current_address: null, previous_addresses: [], employers: [] },
-                        experian: { names: [], dob: null, current_address: null, previous_addresses: [], employers: [] },
-                        equifax: { names: [], dob: null, current_address: null, previous_addresses: [], employers: [] }
-                    };
-                    const summary = {
-                        total_accounts: null,
-                        open_accounts: null,
-                        closed_accounts: null,
-                        delinquent_accounts: null,
-                        derogatory_accounts: null,
-                        collection: null,
-                        total_balances: null,
-                        total_payments: null,
-                        public_records: null,
-                        total_inquiries: null,
-                        // Per-bureau summary data
-                        transunion: {},
-                        experian: {},
-                        equifax: {}
-                    };
-                    const inquiries = [];
+            if xhr_report is not None:
+                personal_info = xhr_report["personal_info"]
+                summary_info = xhr_report["summary"]
+                inquiries = xhr_report["inquiries"]
+                creditor_contacts = xhr_report["creditor_contacts"]
+            if use_dom or xhr_report["missing"]:
+                # Extract personal info (names, addresses, DOB, employers, inquiries, creditor contacts)
+                with self.timings.step("extract_dom"):
+                    dom_data = await self._extract_personal_data()
+                summary_info = dom_data["summary"] or summary_info
+                if xhr_report is None or "personal_info" in xhr_report["missing"]:
+                    personal_info = dom_data["personal"]
+                if not inquiries:
+                    inquiries = dom_data["inquiries"]
+                if not creditor_contacts:
+                    creditor_contacts = dom_data["creditor_contacts"]
 
-                    // Parse Personal Information section
-                    const personalSection = document.querySelector('.attribute-collection');
-                    if (personalSection) {
-                        const rows = personalSection.querySelectorAll('.attribute-row');
-                        rows.forEach(row => {
-                            const label = row.querySelector('.text-gray-900')?.textContent.toLowerCase() || '';
-                            const value = row.querySelector('.display-attribute p')?.textContent.trim();
-
-                            if (label.includes('name') && value) {
-                                data.names.push(value);
-                                // Check for aliases
-                                const aliasLink = row.querySelector('.text-link');
-                                if (aliasLink && aliasLink.textContent.includes('aliases')) {
-                                    // Would need to click to expand - note presence
-                                    data.has_aliases = true;
-                                }
-                            }
-                            if (label.includes('birth') && value) {
-                                data.dob = value;
-                            }
-                            if (label.includes('address') && value) {
-                                data.addresses.push(value.replace(/\\s+/g, ' '));
-                                const priorLink = row.querySelector('.text-link');
-                                if (priorLink && priorLink.textContent.includes('prior')) {
-                                    data.has_prior_addresses = true;
-                                }
-                            }
-                            if (label.includes('employer') && value) {
-                                const empDivs = row.querySelectorAll('.title-case');
-                                empDivs.forEach(e => {
-                                    if (e.textContent.trim()) data.employers.push(e.textContent.trim());
-                                });
-                            }
-                        });
-                    }
+            # Payment history conversion is now handled in _extract_accounts_data()
+            # This is a no-op safety net if payment_history is already in unified format
 
-                    // Parse Summary section - Modern View
-                    const summaryRows = document.querySelectorAll('.attribute-collection .attribute-row');
-                    summaryRows.forEach(row => {
-                        const label = row.querySelector('.text-gray-900')?.textContent.toLowerCase() || '';
-                        const value = row.querySelector('.display-attribute p')?.textContent.trim();
-                        if (!value) return;
-
-                        if (label.includes('total accounts')) summary.total_accounts = value;
-                        if (label.includes('open accounts')) summary.open_accounts = value;
-                        if (label.includes('closed accounts')) summary.closed_accounts = value;
-                        if (label.includes('delinquent')) summary.delinquent_accounts = value;
-                        if (label.includes('derogatory')) summary.derogatory_accounts = value;
-                        if (label.includes('balances')) summary.total_balances = value;
-                        if (label.includes('payments') && !label.includes('late')) summary.total_payments = value;
-                        if (label.includes('inquiries')) summary.total_inquiries = value;
-                    });
+            json_filename = f"{client_id}_{safe_name}_{timestamp}.json"
+            json_filepath = REPORTS_DIR / json_filename
+            extracted_data = {
+                "client_id": client_id,
+                "client_name": client_name,
+                "extracted_at": datetime.utcnow().isoformat(),
+                "scores": scores or {},
+                "personal_info": personal_info,
+                "summary": summary_info,
+                "accounts": accounts or [],
+                "inquiries": inquiries,
+                "creditor_contacts": creditor_contacts,
+                "source": "dom" if use_dom else "xhr",
+            }
+            with open(json_filepath, "w", encoding="utf-8") as f:
+                json.dump(extracted_data, f, indent=2)
 
-                    // Parse Summary section - Classic/Original View fallback
-                    if (!summary.total_accounts) {
-                        let summarySection = null;
-                        document.querySelectorAll('h5.fw-bold, h5').forEach(h => {
-                            if (h.textContent.trim() === 'Summary' || h.textContent.trim() === ' Summary ') {
-                                summarySection = h.closest('section') || h.parentElement?.parentElement;
-                            }
-                        });
-                        if (summarySection) {
-                            const grid = summarySection.querySelector('.d-grid.grid-cols-4');
-                            if (grid) {
-                                // Labels are in first column, TU values in 2nd column
-                                // But first row is header (bureau names), data starts at row 2
-                                const labels = grid.querySelectorAll('.labels .grid-cell');
-                                const tuDiv = grid.querySelector('.d-contents:nth-child(2)');
-                                if (tuDiv) {
-                                    const tuCells = tuDiv.querySelectorAll('.grid-cell');
-                                    // tuCells[0] is header "transunion", tuCells[1] is Total Accounts value, etc.
-                                    labels.forEach((labelCell, i) => {
-                                        const label = labelCell.textContent.toLowerCase();
-                                        // i+1 because tuCells[0] is the header
-                                        const value = tuCells[i + 1]?.textContent.trim();
-                                        if (!value || value.includes('transunion') || value.includes('experian') || value.includes('equifax')) return;
-                                        if (label.includes('total accounts')) summary.total_accounts = value;
-                                        if (label.includes('open accounts')) summary.open_accounts = value;
-                                        if (label.includes('closed accounts')) summary.closed_accounts = value;
-                                        if (label.includes('delinquent')) summary.delinquent_accounts = value;
-                                        if (label.includes('derogatory')) summary.derogatory_accounts = value;
-                                        if (label.includes('balances')) summary.total_balances = value;
-                                        if (label.includes('payments') && !label.includes('late')) summary.total_payments = value;
-                                        if (label.includes('inquiries')) summary.total_inquiries = value;
-                                    });
-                                }
-                            }
-                        }
-                    }
+            logger.info(f"Saved report to {filepath}")
+            logger.info(f"Saved extracted data to {json_filepath}")
 
-                    // MYSCOREIQ Summary fallback - uses #Summary id and rpt_content_table
-                    if (!summary.total_accounts) {
-                        const summaryHeader = document.querySelector('#Summary, .rpt_fullReport_header[id="Summary"]');
-                        if (summaryHeader) {
-                            // Find the rpt_content_table within the wrapper or after the summary header
-                            let summaryTable = null;
-                            // First try: look in the wrapper
-                            const wrapper = summaryHeader.closest('.rpt_content_wrapper');
-                            if (wrapper) {
-                                summaryTable = wrapper.querySelector('table.rpt_content_table.rpt_table4column');
-                            }
-                            // Fallback: walk through siblings
-                            if (!summaryTable) {
-                                let el = summaryHeader.nextElementSibling;
-                                while (el && !summaryTable) {
-                                    if (el.tagName === 'TABLE' && el.classList?.contains('rpt_content_table') && !el.classList?.contains('help_text')) {
-                                        summaryTable = el;
-                                    }
-                                    el = el.nextElementSibling;
-                                }
-                            }
-                            if (summaryTable) {
-                                const rows = summaryTable.querySelectorAll('tr');
-                                rows.forEach(row => {
-                                    const labelCell = row.querySelector('td.label');
-                                    if (!labelCell) return;
-                                    const label = labelCell.textContent.toLowerCase().trim();
-                                    // Get all info cells (TransUnion, Experian, Equifax columns)
-                                    const infoCells = row.querySelectorAll('td.info');
-                                    if (infoCells.length === 0) return;
+            return {
+                "path": str(filepath),
+                "json_path": str(json_filepath),
+                "html": html_content,
+                "scores": scores,
+                "accounts": accounts,
+                "source": "dom" if use_dom else "xhr",
+            }
 
-                                    // Column order: TransUnion, Experian, Equifax
-                                    const bureaus = ['transunion', 'experian', 'equifax'];
+        except Exception as e:
+            logger.error(f"Failed to download report: {e}")
+            return None
 
-                                    // Parse values for each bureau
-                                    infoCells.forEach((cell, idx) => {
-                                        if (idx >= 3) return;
-                                        const bureau = bureaus[idx];
-                                        const value = cell.textContent.trim();
-                                        if (!value || value === '-') return;
+    async def _render_full_report(self, ready: PageReadiness) -> None:
+        """Bring every report section into the DOM for HTML scraping.
 
-                                        // Store per-bureau values
-                                        if (label.includes('total accounts')) {
-                                            summary[bureau].total_accounts = value;
-                                            if (!summary.total_accounts) summary.total_accounts = value;
-                                        }
-                                        else if (label.includes('open accounts')) {
-                                            summary[bureau].open_accounts = value;
-                                            if (!summary.open_accounts) summary.open_accounts = value;
-                                        }
-                                        else if (label.includes('closed accounts')) {
-                                            summary[bureau].closed_accounts = value;
-                                            if (!summary.closed_accounts) summary.closed_accounts = value;
-                                        }
-                                        else if (label.includes('delinquent')) {
-                                            summary[bureau].delinquent = value;
-                                            if (!summary.delinquent_accounts) summary.delinquent_accounts = value;
-                                        }
-                                        else if (label.includes('derogatory')) {
-                                            summary[bureau].derogatory = value;
-                                            if (!summary.derogatory_accounts) summary.derogatory_accounts = value;
-                                        }
-                                        else if (label.includes('collection')) {
-                                            summary[bureau].collection = value;
-                                            if (!summary.collection) summary.collection = value;
-                                        }
-                                        else if (label.includes('balance')) {
-                                            summary[bureau].balances = value;
-                                            if (!summary.total_balances) summary.total_balances = value;
-                                        }
-                                        else if (label.includes('payment') && !label.includes('late')) {
-                                            summary[bureau].payments = value;
-                                            if (!summary.total_payments) summary.total_payments = value;
-                                        }
-                                        else if (label.includes('public record')) {
-                                            summary[bureau].public_records = value;
-                                            if (!summary.public_records) summary.public_records = value;
-                                        }
-                                        else if (label.includes('inquir')) {
-                                            summary[bureau].inquiries = value;
-                                            if (!summary.total_inquiries) summary.total_inquiries = value;
-                                        }
-                                    });
-                                });
+        Classic view, scrolling to the bottom, expanding every account and
+        creditor contacts, then a full-page debug screenshot. Only needed
+        when the captured XHR payloads are missing required sections.
+        """
+        # MyFreeScoreNow: Try to switch to Classic View which shows ALL data including inquiries/contacts
+        try:
+            classic_btn = await self.page.query_selector(
+                'button:has-text("Classic View"), button:has-text("Switch to Classic")'
+            )
+            if classic_btn:
+                logger.info(
+                    "Found 'Switch to Classic View' button - clicking to load full report..."
+                )
+                await classic_btn.click()
+                # Wait for the classic report format to render
+                if await ready.selector(
+                    ".rpt_content_wrapper, #CreditorContacts, #Inquiries, table.rpt_content_header",
+                    "section",
+                ):
+                    logger.info("Switched to Classic View successfully")
+        except Exception as e:
+            logger.info(f"Classic view switch not available or failed: {e}")
+
+        # Scroll to load ALL sections including Inquiries and Creditor Contacts at bottom
+        logger.info(
+            "Scrolling page to load ALL sections (accounts, inquiries, contacts)..."
+        )
+        try:
+            # Scroll to the bottom until the page stops growing; lazy sections
+            # that load within scroll_growth extend the loop
+            with self.timings.step("scroll"):
+                height = await self.page.evaluate("document.body.scrollHeight")
+                for attempt in range(20):
+                    await self.page.evaluate(
+                        "window.scrollTo(0, document.body.scrollHeight)"
+                    )
+                    if not await ready.function(
+                        PAGE_GREW_JS, "scroll_growth", arg=height or 0
+                    ):
+                        logger.info(
+                            f"Scrolling complete after {attempt + 1} attempts"
+                        )
+                        break
+                    height = await self.page.evaluate("document.body.scrollHeight")
+                    logger.info(
+                        f"Scroll attempt {attempt + 1}: page height {height}px"
+                    )
+
+            # Try to scroll to specific sections by clicking nav links
+            try:
+                inquiries_link = await self.page.query_selector(
+                    "li:has-text('Inquiries')"
+                )
+                if inquiries_link:
+                    await inquiries_link.click()
+                    await ready.dom_quiet()
+                    logger.info("Clicked Inquiries nav link to load section")
+            except:
+                pass
+
+            try:
+                contacts_link = await self.page.query_selector(
+                    "li:has-text('Creditor Contacts')"
+                )
+                if contacts_link:
+                    await contacts_link.click()
+                    await ready.dom_quiet()
+                    logger.info(
+                        "Clicked Creditor Contacts nav link to load section"
+                    )
+            except:
+                pass
+
+            await self.page.evaluate("window.scrollTo(0, 0)")
+        except Exception as e:
+            logger.warning(f"Scroll failed: {e}")
+
+        # Expand all "View all details" sections to capture full account data
+        # IMPORTANT: Must click each button sequentially with waits so Vue.js can render each modal
+        logger.info(
+            "Expanding all account details (clicking each sequentially with Playwright)..."
+        )
+        try:
+            # Get all view-more-link elements using Playwright locator
+            view_more_links = await self.page.locator(".view-more-link").all()
+            view_details_count = len(view_more_links)
+            logger.info(
+                f"Found {view_details_count} 'View all details' links to click"
+            )
+
+            # Click each one sequentially using Playwright's native click() method
+            # Limit to first 10 to avoid long waits - the HTML capture will still get all data
+            max_expand = min(10, len(view_more_links))
+            expanded_count = 0
+            for i, link in enumerate(view_more_links[:max_expand]):
+                try:
+                    # Scroll the link into view and click it with timeout
+                    await link.scroll_into_view_if_needed()
+                    await link.click(timeout=5000)
+                    expanded_count += 1
+                    logger.info(f"Expanded {expanded_count}/{max_expand}")
+
+                    # Let Vue.js render this modal before the next click
+                    await ready.dom_quiet(quiet_ms=100, timeout=1000)
+
+                    if (i + 1) % 5 == 0:
+                        logger.info(
+                            f"Expanded {i + 1}/{view_details_count} account details..."
+                        )
+                except Exception as e:
+                    logger.debug(f"Failed to click link {i}: {e}")
+                    continue
+
+            if expanded_count > 0:
+                logger.info(
+                    f"Clicked {expanded_count}/{view_details_count} 'View all details' links"
+                )
+                # Final wait for all content to settle
+                await ready.dom_quiet()
+
+                # Verify payment history sections were loaded
+                payment_history_count = await self.page.evaluate(
+                    """() => {
+                    return document.querySelectorAll('.account-modal .payment-history').length;
+                }"""
+                )
+                logger.info(
+                    f"Found {payment_history_count} payment history sections in modals after expansion"
+                )
+        except Exception as e:
+            logger.warning(f"Failed to expand account details: {e}")
+
+        # JavaScript-based modal expansion - more reliable than clicking
+        # This injects CSS/JS to make ALL modals visible regardless of Vue state
+        logger.info(
+            "Force-expanding all account modals via JavaScript injection..."
+        )
+        try:
+            expanded_via_js = await self.page.evaluate(
+                """() => {
+                let expandedCount = 0;
+
+                // Method 1: Click all "View all details" links programmatically
+                const viewLinks = document.querySelectorAll('.view-more-link, .view-more-link p');
+                viewLinks.forEach((link, i) => {
+                    try {
+                        link.click();
+                        expandedCount++;
+                    } catch(e) {}
+                });
+
+                // Method 2: Force all account-modal elements to be visible via CSS
+                const modals = document.querySelectorAll('.account-modal, .account-modal-bg');
+                modals.forEach(modal => {
+                    modal.style.display = 'block';
+                    modal.style.visibility = 'visible';
+                    modal.style.opacity = '1';
+                    modal.style.position = 'relative';
+                    modal.style.height = 'auto';
+                });
+
+                // Method 3: Try to trigger Vue component expansion if available
+                const containers = document.querySelectorAll('.account-container');
+                containers.forEach(container => {
+                    // Look for Vue instance data
+                    const vueInstance = container.__vue__;
+                    if (vueInstance && typeof vueInstance.showDetails !== 'undefined') {
+                        vueInstance.showDetails = true;
+                    }
+                });
+
+                return {
+                    clickedLinks: viewLinks.length,
+                    modalsForced: modals.length,
+                    containers: containers.length
+                };
+            }"""
+            )
+            logger.info(f"JS modal expansion result: {expanded_via_js}")
+
+            # Wait for Vue to re-render after our changes
+            await ready.dom_quiet()
+
+            # Verify modals are now visible
+            modal_count = await self.page.evaluate(
+                """() => {
+                const visibleModals = document.querySelectorAll('.account-modal');
+                let visibleCount = 0;
+                visibleModals.forEach(m => {
+                    const style = window.getComputedStyle(m);
+                    if (style.display !== 'none' && style.visibility !== 'hidden') {
+                        visibleCount++;
+                    }
+                });
+                return { total: visibleModals.length, visible: visibleCount };
+            }"""
+            )
+            logger.info(f"After JS expansion: {modal_count}")
+
+        except Exception as e:
+            logger.warning(f"JS modal expansion failed: {e}")
+
+        # Expand Creditor Contacts section if it has a "Show" toggle button
+        try:
+            show_result = await self.page.evaluate(
+                """() => {
+                let clicked = false;
+                // Find the Creditor Contacts section and click the Show button
+                document.querySelectorAll('h5.fw-bold, h5').forEach(h => {
+                    if (h.textContent.includes('Creditor Contacts')) {
+                        const section = h.closest('section') || h.parentElement?.parentElement;
+                        if (section) {
+                            const showBtn = section.querySelector('.creditor-toggle span, small span');
+                            if (showBtn && showBtn.textContent.trim() === 'Show') {
+                                showBtn.click();
+                                clicked = true;
                             }
                         }
                     }
+                });
+                return clicked;
+            }"""
+            )
+            if show_result:
+                logger.info(
+                    "Clicked 'Show' button to expand Creditor Contacts section"
+                )
+                await ready.dom_quiet()
+        except Exception as e:
+            logger.debug(f"Creditor Contacts expansion: {e}")
+
+        logger.info(f"Captured {len(self.capture.responses)} XHR responses")
+        for resp in self.capture.responses:
+            logger.info(f"  - {resp['url'][:80]}")
 
-                    // Parse Inquiries section - try multiple formats
-                    // Method 1: MyScoreIQ format - uses #Inquiries wrapper with table rows
-                    // Columns: Creditor Name | Type of Business | Date of Inquiry | Credit Bureau
-                    const classicInquiries = document.querySelector('#Inquiries, .rpt_content_wrapper[id="Inquiries"]');
-                    if (classicInquiries) {
-                        // Get the table inside the inquiries wrapper
-                        const inquiryTable = classicInquiries.querySelector('table.rpt_content_table');
-                        if (inquiryTable) {
-                            const rows = inquiryTable.querySelectorAll('tr');
+        # Final verification: Check that we have rendered content before capturing
+        logger.info("Verifying page content before capture...")
+        try:
+            content_check = await self.page.evaluate(
+                """() => {
+                const result = {
+                    hasSmartCreditApp: false,
+                    appContentLength: 0,
+                    accountCount: 0,
+                    scoreElementCount: 0,
+                    pageTitle: document.title,
+                    bodyLength: document.body.innerHTML.length
+                };
+
+                const app = document.querySelector('#smartcredit-app');
+                if (app) {
+                    result.hasSmartCreditApp = true;
+                    result.appContentLength = app.innerHTML.length;
+                    result.accountCount = app.querySelectorAll('.account-container, [data-test-account-name]').length;
+                    result.scoreElementCount = app.querySelectorAll('[class*="score"], .bureau-score').length;
+                }
+
+                return result;
+            }"""
+            )
+            logger.info(f"Content verification: {content_check}")
+
+            # If #smartcredit-app exists but has minimal content, wait more
+            if (
+                content_check.get("hasSmartCreditApp")
+                and content_check.get("appContentLength", 0) < 1000
+            ):
+                logger.warning(
+                    "Vue app exists but content is minimal - waiting longer..."
+                )
+                await ready.function(VUE_APP_FILLED_JS, "report_render")
+
+        except Exception as e:
+            logger.warning(f"Content verification failed: {e}")
+
+        # Take a debug screenshot
+        debug_screenshot = (
+            REPORTS_DIR / f"debug_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.png"
+        )
+        await self.page.screenshot(path=str(debug_screenshot), full_page=True)
+        logger.info(f"Saved debug screenshot to {debug_screenshot}")
+
+    async def _extract_personal_data(self) -> Dict[str, Any]:
+        """Personal info, summary, inquiries and creditor contacts from the DOM."""
+        personal_info = {}
+        summary_info = {}
+        inquiries = []
+        creditor_contacts = []
+        try:
+            personal_data = await self.page.evaluate(
+                """() => {
+                const data = {
+                    names: [],
+                    addresses: [],
+                    dob: null,
+                    employers: [],
+                    ssn_last4: null,
+                    // Per-bureau data for MyScoreIQ format
+                    transunion: { names: [], dob: null, current_address: null, previous_addresses: [], employers: [] },
+                    experian: { names: [], dob: null, current_address: null, previous_addresses: [], employers: [] },
+                    equifax: { names: [], dob: null, current_address: null, previous_addresses: [], employers: [] }
+                };
+                const summary = {
+                    total_accounts: null,
+                    open_accounts: null,
+                    closed_accounts: null,
+                    delinquent_accounts: null,
+                    derogatory_accounts: null,
+                    collection: null,
+                    total_balances: null,
+                    total_payments: null,
+                    public_records: null,
+                    total_inquiries: null,
+                    // Per-bureau summary data
+                    transunion: {},
+                    experian: {},
+                    equifax: {}
+                };
+                const inquiries = [];
+
+                // Parse Personal Information section
+                const personalSection = document.querySelector('.attribute-collection');
+                if (personalSection) {
+                    const rows = personalSection.querySelectorAll('.attribute-row');
+                    rows.forEach(row => {
+                        const label = row.querySelector('.text-gray-900')?.textContent.toLowerCase() || '';
+                        const value = row.querySelector('.display-attribute p')?.textContent.trim();
+
+                        if (label.includes('name') && value) {
+                            data.names.push(value);
+                            // Check for aliases
+                            const aliasLink = row.querySelector('.text-link');
+                            if (aliasLink && aliasLink.textContent.includes('aliases')) {
+                                // Would need to click to expand - note presence
+                                data.has_aliases = true;
+                            }
+                        }
+                        if (label.includes('birth') && value) {
+                            data.dob = value;
+                        }
+                        if (label.includes('address') && value) {
+                            data.addresses.push(value.replace(/\\s+/g, ' '));
+                            const priorLink = row.querySelector('.text-link');
+                            if (priorLink && priorLink.textContent.includes('prior')) {
+                                data.has_prior_addresses = true;
+                            }
+                        }
+                        if (label.includes('employer') && value) {
+                            const empDivs = row.querySelectorAll('.title-case');
+                            empDivs.forEach(e => {
+                                if (e.textContent.trim()) data.employers.push(e.textContent.trim());
+                            });
+                        }
+                    });
+                }
+
+                // Parse Summary section - Modern View
+                const summaryRows = document.querySelectorAll('.attribute-collection .attribute-row');
+                summaryRows.forEach(row => {
+                    const label = row.querySelector('.text-gray-900')?.textContent.toLowerCase() || '';
+                    const value = row.querySelector('.display-attribute p')?.textContent.trim();
+                    if (!value) return;
+
+                    if (label.includes('total accounts')) summary.total_accounts = value;
+                    if (label.includes('open accounts')) summary.open_accounts = value;
+                    if (label.includes('closed accounts')) summary.closed_accounts = value;
+                    if (label.includes('delinquent')) summary.delinquent_accounts = value;
+                    if (label.includes('derogatory')) summary.derogatory_accounts = value;
+                    if (label.includes('balances')) summary.total_balances = value;
+                    if (label.includes('payments') && !label.includes('late')) summary.total_payments = value;
+                    if (label.includes('inquiries')) summary.total_inquiries = value;
+                });
+
+                // Parse Summary section - Classic/Original View fallback
+                if (!summary.total_accounts) {
+                    let summarySection = null;
+                    document.querySelectorAll('h5.fw-bold, h5').forEach(h => {
+                        if (h.textContent.trim() === 'Summary' || h.textContent.trim() === ' Summary ') {
+                            summarySection = h.closest('section') || h.parentElement?.parentElement;
+                        }
+                    });
+                    if (summarySection) {
+                        const grid = summarySection.querySelector('.d-grid.grid-cols-4');
+                        if (grid) {
+                            // Labels are in first column, TU values in 2nd column
+                            // But first row is header (bureau names), data starts at row 2
+                            const labels = grid.querySelectorAll('.labels .grid-cell');
+                            const tuDiv = grid.querySelector('.d-contents:nth-child(2)');
+                            if (tuDiv) {
+                                const tuCells = tuDiv.querySelectorAll('.grid-cell');
+                                // tuCells[0] is header "transunion", tuCells[1] is Total Accounts value, etc.
+                                labels.forEach((labelCell, i) => {
+                                    const label = labelCell.textContent.toLowerCase();
+                                    // i+1 because tuCells[0] is the header
+                                    const value = tuCells[i + 1]?.textContent.trim();
+                                    if (!value || value.includes('transunion') || value.includes('experian') || value.includes('equifax')) return;
+                                    if (label.includes('total accounts')) summary.total_accounts = value;
+                                    if (label.includes('open accounts')) summary.open_accounts = value;
+                                    if (label.includes('closed accounts')) summary.closed_accounts = value;
+                                    if (label.includes('delinquent')) summary.delinquent_accounts = value;
+                                    if (label.includes('derogatory')) summary.derogatory_accounts = value;
+                                    if (label.includes('balances')) summary.total_balances = value;
+                                    if (label.includes('payments') && !label.includes('late')) summary.total_payments = value;
+                                    if (label.includes('inquiries')) summary.total_inquiries = value;
+                                });
+                            }
+                        }
+                    }
+                }
+
+                // MYSCOREIQ Summary fallback - uses #Summary id and rpt_content_table
+                if (!summary.total_accounts) {
+                    const summaryHeader = document.querySelector('#Summary, .rpt_fullReport_header[id="Summary"]');
+                    if (summaryHeader) {
+                        // Find the rpt_content_table within the wrapper or after the summary header
+                        let summaryTable = null;
+                        // First try: look in the wrapper
+                        const wrapper = summaryHeader.closest('.rpt_content_wrapper');
+                        if (wrapper) {
+                            summaryTable = wrapper.querySelector('table.rpt_content_table.rpt_table4column');
+                        }
+                        // Fallback: walk through siblings
+                        if (!summaryTable) {
+                            let el = summaryHeader.nextElementSibling;
+                            while (el && !summaryTable) {
+                                if (el.tagName === 'TABLE' && el.classList?.contains('rpt_content_table') && !el.classList?.contains('help_text')) {
+                                    summaryTable = el;
+                                }
+                                el = el.nextElementSibling;
+                            }
+                        }
+                        if (summaryTable) {
+                            const rows = summaryTable.querySelectorAll('tr');
                             rows.forEach(row => {
-                                // Skip header rows (th elements)
-                                if (row.querySelector('th')) return;
-
-                                const cells = row.querySelectorAll('td.info');
-                                if (cells.length >= 4) {
-                                    const company = cells[0]?.textContent.trim();
-                                    const type = cells[1]?.textContent.trim();  // Type of Business
-                                    const date = cells[2]?.textContent.trim();  // Date of Inquiry
-                                    const bureau = cells[3]?.textContent.trim();  // Credit Bureau
-
-                                    if (company && company.length > 2 && !company.includes('Creditor')) {
-                                        // Parse bureau to set flags
-                                        const bureauLower = (bureau || '').toLowerCase();
-                                        inquiries.push({
-                                            company,
-                                            type: type || null,
-                                            date: date || null,
-                                            bureau: bureau || null,
-                                            transunion: bureauLower.includes('transunion'),
-                                            experian: bureauLower.includes('experian'),
-                                            equifax: bureauLower.includes('equifax'),
-                                            source: 'myscoreiq'
-                                        });
+                                const labelCell = row.querySelector('td.label');
+                                if (!labelCell) return;
+                                const label = labelCell.textContent.toLowerCase().trim();
+                                // Get all info cells (TransUnion, Experian, Equifax columns)
+                                const infoCells = row.querySelectorAll('td.info');
+                                if (infoCells.length === 0) return;
+
+                                // Column order: TransUnion, Experian, Equifax
+                                const bureaus = ['transunion', 'experian', 'equifax'];
+
+                                // Parse values for each bureau
+                                infoCells.forEach((cell, idx) => {
+                                    if (idx >= 3) return;
+                                    const bureau = bureaus[idx];
+                                    const value = cell.textContent.trim();
+                                    if (!value || value === '-') return;
+
+                                    // Store per-bureau values
+                                    if (label.includes('total accounts')) {
+                                        summary[bureau].total_accounts = value;
+                                        if (!summary.total_accounts) summary.total_accounts = value;
                                     }
-                                }
+                                    else if (label.includes('open accounts')) {
+                                        summary[bureau].open_accounts = value;
+                                        if (!summary.open_accounts) summary.open_accounts = value;
+                                    }
+                                    else if (label.includes('closed accounts')) {
+                                        summary[bureau].closed_accounts = value;
+                                        if (!summary.closed_accounts) summary.closed_accounts = value;
+                                    }
+                                    else if (label.includes('delinquent')) {
+                                        summary[bureau].delinquent = value;
+                                        if (!summary.delinquent_accounts) summary.delinquent_accounts = value;
+                                    }
+                                    else if (label.includes('derogatory')) {
+                                        summary[bureau].derogatory = value;
+                                        if (!summary.derogatory_accounts) summary.derogatory_accounts = value;
+                                    }
+                                    else if (label.includes('collection')) {
+                                        summary[bureau].collection = value;
+                                        if (!summary.collection) summary.collection = value;
+                                    }
+                                    else if (label.includes('balance')) {
+                                        summary[bureau].balances = value;
+                                        if (!summary.total_balances) summary.total_balances = value;
+                                    }
+                                    else if (label.includes('payment') && !label.includes('late')) {
+                                        summary[bureau].payments = value;
+                                        if (!summary.total_payments) summary.total_payments = value;
+                                    }
+                                    else if (label.includes('public record')) {
+                                        summary[bureau].public_records = value;
+                                        if (!summary.public_records) summary.public_records = value;
+                                    }
+                                    else if (label.includes('inquir')) {
+                                        summary[bureau].inquiries = value;
+                                        if (!summary.total_inquiries) summary.total_inquiries = value;
+                                    }
+                                });
                             });
                         }
                     }
-
-                    // Method 2: Modern 3B View - look for Inquiries headline section
-                    if (inquiries.length === 0) {
-                        let inquirySection = null;
-                        let inquirySectionParent = null;
-                        document.querySelectorAll('h2.headline, h2, h3').forEach(h => {
-                            if (h.textContent.trim() === 'Inquiries' || h.textContent.includes('Inquiries')) {
-                                inquirySection = h;
-                                inquirySectionParent = h.closest('.col-xs-12, .col-lg-8, div');
-                            }
-                        });
-
-                        if (inquirySection && inquirySectionParent) {
-                            const inquiryContainers = inquirySectionParent.querySelectorAll('.inquiry-container, .inquiry-row, .attribute-row, [class*="inquiry"]');
-                            inquiryContainers.forEach(inq => {
-                                const company = inq.querySelector('[data-test-inquiry-name], strong, .creditor, .company-name, .fw-bold, .fw-semi')?.textContent.trim();
-                                const dateEl = inq.querySelector('.date, .inquiry-date, .text-gray-600, small');
-                                const date = dateEl?.textContent.trim();
-                                const tuPresent = !!inq.querySelector('.text-transunion, [class*="transunion"]');
-                                const exPresent = !!inq.querySelector('.text-experian, [class*="experian"]');
-                                const eqPresent = !!inq.querySelector('.text-equifax, [class*="equifax"]');
-
-                                if (company && company.length > 1 && !company.includes('Inquiries')) {
+                }
+
+                // Parse Inquiries section - try multiple formats
+                // Method 1: MyScoreIQ format - uses #Inquiries wrapper with table rows
+                // Columns: Creditor Name | Type of Business | Date of Inquiry | Credit Bureau
+                const classicInquiries = document.querySelector('#Inquiries, .rpt_content_wrapper[id="Inquiries"]');
+                if (classicInquiries) {
+                    // Get the table inside the inquiries wrapper
+                    const inquiryTable = classicInquiries.querySelector('table.rpt_content_table');
+                    if (inquiryTable) {
+                        const rows = inquiryTable.querySelectorAll('tr');
+                        rows.forEach(row => {
+                            // Skip header rows (th elements)
+                            if (row.querySelector('th')) return;
+
+                            const cells = row.querySelectorAll('td.info');
+                            if (cells.length >= 4) {
+                                const company = cells[0]?.textContent.trim();
+                                const type = cells[1]?.textContent.trim();  // Type of Business
+                                const date = cells[2]?.textContent.trim();  // Date of Inquiry
+                                const bureau = cells[3]?.textContent.trim();  // Credit Bureau
+
+                                if (company && company.length > 2 && !company.includes('Creditor')) {
+                                    // Parse bureau to set flags
+                                    const bureauLower = (bureau || '').toLowerCase();
                                     inquiries.push({
                                         company,
+                                        type: type || null,
                                         date: date || null,
-                                        transunion: tuPresent,
-                                        experian: exPresent,
-                                        equifax: eqPresent,
-                                        source: 'modern'
+                                        bureau: bureau || null,
+                                        transunion: bureauLower.includes('transunion'),
+                                        experian: bureauLower.includes('experian'),
+                                        equifax: bureauLower.includes('equifax'),
+                                        source: 'myscoreiq'
                                     });
                                 }
-                            });
-                        }
+                            }
+                        });
                     }
+                }
+
+                // Method 2: Modern 3B View - look for Inquiries headline section
+                if (inquiries.length === 0) {
+                    let inquirySection = null;
+                    let inquirySectionParent = null;
+                    document.querySelectorAll('h2.headline, h2, h3').forEach(h => {
+                        if (h.textContent.trim() === 'Inquiries' || h.textContent.includes('Inquiries')) {
+                            inquirySection = h;
+                            inquirySectionParent = h.closest('.col-xs-12, .col-lg-8, div');
+                        }
+                    });
 
-                    // Method 3: Look for inquiry-collection divs (common pattern)
-                    if (inquiries.length === 0) {
-                        document.querySelectorAll('.inquiry-collection .account-container, [class*="inquiry"] .account-heading').forEach(inq => {
-                            const company = inq.querySelector('strong, .fs-16')?.textContent.trim();
-                            const date = inq.querySelector('small, .text-gray-600, p:last-child')?.textContent.trim();
-                            if (company) {
-                                inquiries.push({ company, date, source: 'collection' });
+                    if (inquirySection && inquirySectionParent) {
+                        const inquiryContainers = inquirySectionParent.querySelectorAll('.inquiry-container, .inquiry-row, .attribute-row, [class*="inquiry"]');
+                        inquiryContainers.forEach(inq => {
+                            const company = inq.querySelector('[data-test-inquiry-name], strong, .creditor, .company-name, .fw-bold, .fw-semi')?.textContent.trim();
+                            const dateEl = inq.querySelector('.date, .inquiry-date, .text-gray-600, small');
+                            const date = dateEl?.textContent.trim();
+                            const tuPresent = !!inq.querySelector('.text-transunion, [class*="transunion"]');
+                            const exPresent = !!inq.querySelector('.text-experian, [class*="experian"]');
+                            const eqPresent = !!inq.querySelector('.text-equifax, [class*="equifax"]');
+
+                            if (company && company.length > 1 && !company.includes('Inquiries')) {
+                                inquiries.push({
+                                    company,
+                                    date: date || null,
+                                    transunion: tuPresent,
+                                    experian: exPresent,
+                                    equifax: eqPresent,
+                                    source: 'modern'
+                                });
                             }
                         });
                     }
+                }
+
+                // Method 3: Look for inquiry-collection divs (common pattern)
+                if (inquiries.length === 0) {
+                    document.querySelectorAll('.inquiry-collection .account-container, [class*="inquiry"] .account-heading').forEach(inq => {
+                        const company = inq.querySelector('strong, .fs-16')?.textContent.trim();
+                        const date = inq.querySelector('small, .text-gray-600, p:last-child')?.textContent.trim();
+                        if (company) {
+                            inquiries.push({ company, date, source: 'collection' });
+                        }
+                    });
+                }
+
+                // Also try to find inquiries from the account list (some reports list them there)
+                if (inquiries.length === 0) {
+                    const allAccounts = document.querySelectorAll('.account-container');
+                    allAccounts.forEach(acc => {
+                        const accType = acc.querySelector('.account-type, [class*="type"]')?.textContent.toLowerCase() || '';
+                        if (accType.includes('inquiry') || accType.includes('inq')) {
+                            const company = acc.querySelector('.creditor-name, .company, strong')?.textContent.trim();
+                            const date = acc.querySelector('.date, .inquiry-date')?.textContent.trim();
+                            if (company) {
+                                inquiries.push({ company, date, type: 'inquiry' });
+                            }
+                        }
+                    });
+                }
 
-                    // Also try to find inquiries from the account list (some reports list them there)
-                    if (inquiries.length === 0) {
-                        const allAccounts = document.querySelectorAll('.account-container');
-                        allAccounts.forEach(acc => {
-                            const accType = acc.querySelector('.account-type, [class*="type"]')?.textContent.toLowerCase() || '';
-                            if (accType.includes('inquiry') || accType.includes('inq')) {
-                                const company = acc.querySelector('.creditor-name, .company, strong')?.textContent.trim();
-                                const date = acc.querySelector('.date, .inquiry-date')?.textContent.trim();
-                                if (company) {
-                                    inquiries.push({ company, date, type: 'inquiry' });
+                // Method 4: Classic/Original View - h5.fw-bold "Inquiries" with .d-grid.grid-cols-3 rows
+                if (inquiries.length === 0) {
+                    let inquirySection = null;
+                    document.querySelectorAll('h5.fw-bold, h5').forEach(h => {
+                        const text = h.textContent.trim();
+                        if (text === 'Inquiries' || text === ' Inquiries ') {
+                            inquirySection = h.closest('section') || h.parentElement?.parentElement;
+                        }
+                    });
+
+                    if (inquirySection) {
+                        // Get all grid-cols-3 divs (skip first one which is header)
+                        const grids = inquirySection.querySelectorAll('.d-grid.grid-cols-3');
+                        grids.forEach((grid, index) => {
+                            if (index === 0) return; // Skip header row
+                            const cells = grid.querySelectorAll('.grid-cell, p');
+                            if (cells.length >= 3) {
+                                const company = cells[0]?.textContent.trim();
+                                const date = cells[1]?.textContent.trim();
+                                const bureau = cells[2]?.textContent.trim().toLowerCase();
+                                if (company && company.length > 1 &&
+                                    !company.includes('Creditor') && !company.includes('Date') && !company.includes('Bureau')) {
+                                    inquiries.push({
+                                        company,
+                                        date: date || null,
+                                        bureau: bureau || null,
+                                        transunion: bureau?.includes('transunion'),
+                                        experian: bureau?.includes('experian'),
+                                        equifax: bureau?.includes('equifax'),
+                                        source: 'original-view'
+                                    });
                                 }
                             }
                         });
                     }
-
-                    // Method 4: Classic/Original View - h5.fw-bold "Inquiries" with .d-grid.grid-cols-3 rows
-                    if (inquiries.length === 0) {
-                        let inquirySection = null;
-                        document.querySelectorAll('h5.fw-bold, h5').forEach(h => {
-                            const text = h.textContent.trim();
-                            if (text === 'Inquiries' || text === ' Inquiries ') {
-                                inquirySection = h.closest('section') || h.parentElement?.parentElement;
+                }
+
+                // Method 5: MyScoreIQ format - uses rpt_content_table with headerTUC, headerEXP, headerEQF columns
+                if (inquiries.length === 0) {
+                    // Find Inquiries section header
+                    let inquiryTable = null;
+                    document.querySelectorAll('.rpt_fullReport_header, h3, h4').forEach(header => {
+                        if (header.textContent.includes('Inquiries') || header.textContent.includes('INQUIRIES')) {
+                            // Find the next table.rpt_content_table after this header
+                            let el = header.nextElementSibling;
+                            while (el && !inquiryTable) {
+                                if (el.classList?.contains('rpt_content_table')) {
+                                    inquiryTable = el;
+                                } else if (el.querySelector) {
+                                    inquiryTable = el.querySelector('table.rpt_content_table');
+                                }
+                                el = el.nextElementSibling;
                             }
-                        });
-
-                        if (inquirySection) {
-                            // Get all grid-cols-3 divs (skip first one which is header)
-                            const grids = inquirySection.querySelectorAll('.d-grid.grid-cols-3');
-                            grids.forEach((grid, index) => {
-                                if (index === 0) return; // Skip header row
-                                const cells = grid.querySelectorAll('.grid-cell, p');
-                                if (cells.length >= 3) {
-                                    const company = cells[0]?.textContent.trim();
-                                    const date = cells[1]?.textContent.trim();
-                                    const bureau = cells[2]?.textContent.trim().toLowerCase();
-                                    if (company && company.length > 1 &&
-                                        !company.includes('Creditor') && !company.includes('Date') && !company.includes('Bureau')) {
-                                        inquiries.push({
-                                            company,
-                                            date: date || null,
-                                            bureau: bureau || null,
-                                            transunion: bureau?.includes('transunion'),
-                                            experian: bureau?.includes('experian'),
-                                            equifax: bureau?.includes('equifax'),
-                                            source: 'original-view'
-                                        });
+                            // Also check parent's siblings
+                            if (!inquiryTable) {
+                                let parent = header.parentElement;
+                                let sib = parent?.nextElementSibling;
+                                while (sib && !inquiryTable) {
+                                    if (sib.tagName === 'TABLE' && sib.classList?.contains('rpt_content_table')) {
+                                        inquiryTable = sib;
+                                    } else if (sib.querySelector) {
+                                        inquiryTable = sib.querySelector('table.rpt_content_table');
                                     }
+                                    sib = sib.nextElementSibling;
                                 }
-                            });
+                            }
                         }
-                    }
+                    });
 
-                    // Method 5: MyScoreIQ format - uses rpt_content_table with headerTUC, headerEXP, headerEQF columns
-                    if (inquiries.length === 0) {
-                        // Find Inquiries section header
-                        let inquiryTable = null;
-                        document.querySelectorAll('.rpt_fullReport_header, h3, h4').forEach(header => {
-                            if (header.textContent.includes('Inquiries') || header.textContent.includes('INQUIRIES')) {
-                                // Find the next table.rpt_content_table after this header
-                                let el = header.nextElementSibling;
-                                while (el && !inquiryTable) {
-                                    if (el.classList?.contains('rpt_content_table')) {
-                                        inquiryTable = el;
-                                    } else if (el.querySelector) {
-                                        inquiryTable = el.querySelector('table.rpt_content_table');
-                                    }
-                                    el = el.nextElementSibling;
-                                }
-                                // Also check parent's siblings
-                                if (!inquiryTable) {
-                                    let parent = header.parentElement;
-                                    let sib = parent?.nextElementSibling;
-                                    while (sib && !inquiryTable) {
-                                        if (sib.tagName === 'TABLE' && sib.classList?.contains('rpt_content_table')) {
-                                            inquiryTable = sib;
-                                        } else if (sib.querySelector) {
-                                            inquiryTable = sib.querySelector('table.rpt_content_table');
+                    if (inquiryTable) {
+                        const rows = inquiryTable.querySelectorAll('tr');
+                        rows.forEach(row => {
+                            const labelCell = row.querySelector('td.label');
+                            if (!labelCell) return;
+                            const label = labelCell.textContent.trim().toLowerCase();
+
+                            // Skip header rows
+                            if (label.includes('creditor') || label.includes('inquiry') || label.includes('date')) return;
+
+                            const infoCells = row.querySelectorAll('td.info');
+                            if (infoCells.length >= 3) {
+                                // Column order: TransUnion, Experian, Equifax
+                                const bureaus = ['transunion', 'experian', 'equifax'];
+                                infoCells.forEach((cell, idx) => {
+                                    if (idx >= 3) return;
+                                    const bureau = bureaus[idx];
+                                    const text = cell.textContent.replace(/\\s+/g, ' ').trim();
+                                    if (!text || text === '-' || text === 'N/A') return;
+
+                                    // Parse creditor name and date from the cell
+                                    // Format could be "CREDITOR NAME\\n01/15/2024" or just "CREDITOR NAME"
+                                    const lines = text.split(/[\\n\\r]+/);
+                                    const company = lines[0]?.trim();
+                                    const date = lines.length > 1 ? lines[1]?.trim() : null;
+
+                                    if (company && company.length > 2) {
+                                        // Check if this inquiry already exists for this company
+                                        const existing = inquiries.find(i => i.company === company);
+                                        if (existing) {
+                                            // Add bureau flag to existing
+                                            existing[bureau] = true;
+                                        } else {
+                                            inquiries.push({
+                                                company,
+                                                date: date || null,
+                                                transunion: bureau === 'transunion',
+                                                experian: bureau === 'experian',
+                                                equifax: bureau === 'equifax',
+                                                source: 'myscoreiq'
+                                            });
                                         }
-                                        sib = sib.nextElementSibling;
                                     }
-                                }
+                                });
                             }
                         });
+                    }
+                }
+
+                // Parse Creditor Contacts section (addresses/phones at bottom of report)
+                const creditorContacts = [];
+
+                // Method 1: Classic View - uses #CreditorContacts wrapper with table
+                const classicContacts = document.querySelector('#CreditorContacts, .rpt_content_wrapper[id*="Creditor"]');
+                if (classicContacts) {
+                    const rows = classicContacts.querySelectorAll('tr');
+                    rows.forEach(row => {
+                        const cells = row.querySelectorAll('td');
+                        if (cells.length >= 2) {
+                            const name = cells[0]?.textContent.trim();
+                            const address = cells[1]?.textContent.trim();
+                            const phone = cells.length > 2 ? cells[2]?.textContent.trim() : null;
+                            if (name && name.length > 2 && !name.includes('Creditor Name') && !name.includes('Address')) {
+                                creditorContacts.push({ name, address, phone, source: 'classic' });
+                            }
+                        }
+                    });
+                }
+
+                // Method 2: Modern View - look for Creditor Contacts headline
+                if (creditorContacts.length === 0) {
+                    let contactsSection = null;
+                    document.querySelectorAll('h2.headline, h2, h3').forEach(h => {
+                        if (h.textContent.includes('Creditor Contacts') || h.textContent.includes('Creditor Contact')) {
+                            contactsSection = h.closest('.col-xs-12, .col-lg-8, div');
+                        }
+                    });
+                    if (contactsSection) {
+                        const contactRows = contactsSection.querySelectorAll('.attribute-row, .contact-row, .creditor-contact, tr');
+                        contactRows.forEach(row => {
+                            const name = row.querySelector('strong, .creditor-name, .fw-bold, td:first-child')?.textContent.trim();
+                            const address = row.querySelector('.address, p:nth-child(2), td:nth-child(2)')?.textContent.trim();
+                            const phone = row.querySelector('.phone, [href^="tel:"], td:nth-child(3)')?.textContent.trim();
+                            if (name && name.length > 1 && !name.includes('Creditor')) {
+                                creditorContacts.push({ name, address, phone, source: 'modern' });
+                            }
+                        });
+                    }
+                }
+
+                // Method 3: Fallback - look for any contact-collection divs
+                if (creditorContacts.length === 0) {
+                    document.querySelectorAll('.contact-collection, .creditor-list').forEach(container => {
+                        container.querySelectorAll('.contact-item, .creditor-item, li').forEach(item => {
+                            const name = item.querySelector('strong, .name')?.textContent.trim();
+                            const address = item.querySelector('.address, p')?.textContent.trim();
+                            if (name) {
+                                creditorContacts.push({ name, address, source: 'fallback' });
+                            }
+                        });
+                    });
+                }
 
-                        if (inquiryTable) {
-                            const rows = inquiryTable.querySelectorAll('tr');
-                            rows.forEach(row => {
-                                const labelCell = row.querySelector('td.label');
-                                if (!labelCell) return;
-                                const label = labelCell.textContent.trim().toLowerCase();
-
-                                // Skip header rows
-                                if (label.includes('creditor') || label.includes('inquiry') || label.includes('date')) return;
+                // Method 4: Classic/Original View - h5.fw-bold "Creditor Contacts" with .d-grid structure
+                if (creditorContacts.length === 0) {
+                    let contactsSection = null;
+                    document.querySelectorAll('h5.fw-bold, h5').forEach(h => {
+                        const text = h.textContent.trim();
+                        if (text.includes('Creditor Contacts') || text.includes('Creditor Contact')) {
+                            contactsSection = h.closest('section') || h.parentElement?.parentElement;
+                        }
+                    });
 
-                                const infoCells = row.querySelectorAll('td.info');
-                                if (infoCells.length >= 3) {
-                                    // Column order: TransUnion, Experian, Equifax
-                                    const bureaus = ['transunion', 'experian', 'equifax'];
-                                    infoCells.forEach((cell, idx) => {
-                                        if (idx >= 3) return;
-                                        const bureau = bureaus[idx];
-                                        const text = cell.textContent.replace(/\\s+/g, ' ').trim();
-                                        if (!text || text === '-' || text === 'N/A') return;
-
-                                        // Parse creditor name and date from the cell
-                                        // Format could be "CREDITOR NAME\\n01/15/2024" or just "CREDITOR NAME"
-                                        const lines = text.split(/[\\n\\r]+/);
-                                        const company = lines[0]?.trim();
-                                        const date = lines.length > 1 ? lines[1]?.trim() : null;
-
-                                        if (company && company.length > 2) {
-                                            // Check if this inquiry already exists for this company
-                                            const existing = inquiries.find(i => i.company === company);
-                                            if (existing) {
-                                                // Add bureau flag to existing
-                                                existing[bureau] = true;
-                                            } else {
-                                                inquiries.push({
-                                                    company,
-                                                    date: date || null,
-                                                    transunion: bureau === 'transunion',
-                                                    experian: bureau === 'experian',
-                                                    equifax: bureau === 'equifax',
-                                                    source: 'myscoreiq'
-                                                });
-                                            }
-                                        }
-                                    });
-                                }
-                            });
+                    if (contactsSection) {
+                        // Click the Show button if it exists and content is hidden
+                        const showBtn = contactsSection.querySelector('.creditor-toggle span, small span');
+                        if (showBtn && showBtn.textContent.includes('Show')) {
+                            showBtn.click();
                         }
-                    }
 
-                    // Parse Creditor Contacts section (addresses/phones at bottom of report)
-                    const creditorContacts = [];
+                        // Look for creditor contact items - could be in .creditor-contacts or .d-grid
+                        const creditorContainer = contactsSection.querySelector('.creditor-contacts') || contactsSection;
+                        const contactItems = creditorContainer.querySelectorAll('.d-grid, .contact-item, .creditor-row, [class*="contact"]');
 
-                    // Method 1: Classic View - uses #CreditorContacts wrapper with table
-                    const classicContacts = document.querySelector('#CreditorContacts, .rpt_content_wrapper[id*="Creditor"]');
-                    if (classicContacts) {
-                        const rows = classicContacts.querySelectorAll('tr');
-                        rows.forEach(row => {
-                            const cells = row.querySelectorAll('td');
+                        contactItems.forEach(item => {
+                            // Try to get name and address from grid cells or spans
+                            const cells = item.querySelectorAll('.grid-cell, p, span');
                             if (cells.length >= 2) {
                                 const name = cells[0]?.textContent.trim();
                                 const address = cells[1]?.textContent.trim();
                                 const phone = cells.length > 2 ? cells[2]?.textContent.trim() : null;
-                                if (name && name.length > 2 && !name.includes('Creditor Name') && !name.includes('Address')) {
-                                    creditorContacts.push({ name, address, phone, source: 'classic' });
+
+                                if (name && name.length > 2 && !name.includes('Creditor') && !name.includes('Name')) {
+                                    creditorContacts.push({
+                                        name,
+                                        address: address || null,
+                                        phone: phone || null,
+                                        source: 'original-view'
+                                    });
                                 }
                             }
                         });
                     }
-
-                    // Method 2: Modern View - look for Creditor Contacts headline
-                    if (creditorContacts.length === 0) {
-                        let contactsSection = null;
-                        document.querySelectorAll('h2.headline, h2, h3').forEach(h => {
-                            if (h.textContent.includes('Creditor Contacts') || h.textContent.includes('Creditor Contact')) {
-                                contactsSection = h.closest('.col-xs-12, .col-lg-8, div');
-                            }
-                        });
-                        if (contactsSection) {
-                            const contactRows = contactsSection.querySelectorAll('.attribute-row, .contact-row, .creditor-contact, tr');
-                            contactRows.forEach(row => {
-                                const name = row.querySelector('strong, .creditor-name, .fw-bold, td:first-child')?.textContent.trim();
-                                const address = row.querySelector('.address, p:nth-child(2), td:nth-child(2)')?.textContent.trim();
-                                const phone = row.querySelector('.phone, [href^="tel:"], td:nth-child(3)')?.textContent.trim();
-                                if (name && name.length > 1 && !name.includes('Creditor')) {
-                                    creditorContacts.push({ name, address, phone, source: 'modern' });
-                                }
-                            });
+                }
+
+                // Also extract Personal Info for Original View - .d-grid.grid-cols-4 with labels and bureau columns
+                // ORGANIZED BY BUREAU: col-start-2=TransUnion, col-start-3=Experian, col-start-4=Equifax
+                if (data.names.length === 0) {
+                    // Initialize per-bureau structure
+                    data.transunion = { names: [], dob: null, current_address: null, previous_addresses: [], employers: [] };
+                    data.experian = { names: [], dob: null, current_address: null, previous_addresses: [], employers: [] };
+                    data.equifax = { names: [], dob: null, current_address: null, previous_addresses: [], employers: [] };
+
+                    // Find Personal Information section
+                    let personalSection = null;
+                    document.querySelectorAll('h5.fw-bold, h5.m-0.fw-bold').forEach(h => {
+                        if (h.textContent.includes('Personal Information')) {
+                            personalSection = h.closest('section') || h.parentElement?.parentElement;
                         }
-                    }
+                    });
 
-                    // Method 3: Fallback - look for any contact-collection divs
-                    if (creditorContacts.length === 0) {
-                        document.querySelectorAll('.contact-collection, .creditor-list').forEach(container => {
-                            container.querySelectorAll('.contact-item, .creditor-item, li').forEach(item => {
-                                const name = item.querySelector('strong, .name')?.textContent.trim();
-                                const address = item.querySelector('.address, p')?.textContent.trim();
-                                if (name) {
-                                    creditorContacts.push({ name, address, source: 'fallback' });
+                    if (personalSection) {
+                        const grid = personalSection.querySelector('.d-grid.grid-cols-4');
+                        if (grid) {
+                            // Get all cells and organize by bureau column
+                            const allCells = grid.querySelectorAll('.grid-cell');
+                            allCells.forEach(cell => {
+                                const className = cell.className || '';
+
+                                // Determine which bureau based on col-start class
+                                let bureau = null;
+                                if (className.includes('col-start-2')) bureau = 'transunion';
+                                else if (className.includes('col-start-3')) bureau = 'experian';
+                                else if (className.includes('col-start-4')) bureau = 'equifax';
+
+                                if (!bureau) return; // Skip label column
+
+                                const span = cell.querySelector('span');
+                                if (!span) return;
+
+                                const html = span.innerHTML;
+                                const text = span.textContent.trim();
+
+                                // Extract names - row-start-3 (Name + Also Known As)
+                                if (className.includes('row-start-3')) {
+                                    const names = html.split(/<br\\s*\\/?>/i)
+                                        .map(n => n.trim())
+                                        .filter(n => n.length > 2 && !n.includes('<'));
+                                    names.forEach(name => {
+                                        if (!data[bureau].names.includes(name)) {
+                                            data[bureau].names.push(name);
+                                        }
+                                        // Also add to flat list for backward compatibility
+                                        if (!data.names.includes(name)) {
+                                            data.names.push(name);
+                                        }
+                                    });
                                 }
-                            });
-                        });
-                    }
-
-                    // Method 4: Classic/Original View - h5.fw-bold "Creditor Contacts" with .d-grid structure
-                    if (creditorContacts.length === 0) {
-                        let contactsSection = null;
-                        document.querySelectorAll('h5.fw-bold, h5').forEach(h => {
-                            const text = h.textContent.trim();
-                            if (text.includes('Creditor Contacts') || text.includes('Creditor Contact')) {
-                                contactsSection = h.closest('section') || h.parentElement?.parentElement;
-                            }
-                        });
-
-                        if (contactsSection) {
-                            // Click the Show button if it exists and content is hidden
-                            const showBtn = contactsSection.querySelector('.creditor-toggle span, small span');
-                            if (showBtn && showBtn.textContent.includes('Show')) {
-                                showBtn.click();
-                            }
 
-                            // Look for creditor contact items - could be in .creditor-contacts or .d-grid
-                            const creditorContainer = contactsSection.querySelector('.creditor-contacts') || contactsSection;
-                            const contactItems = creditorContainer.querySelectorAll('.d-grid, .contact-item, .creditor-row, [class*="contact"]');
-
-                            contactItems.forEach(item => {
-                                // Try to get name and address from grid cells or spans
-                                const cells = item.querySelectorAll('.grid-cell, p, span');
-                                if (cells.length >= 2) {
-                                    const name = cells[0]?.textContent.trim();
-                                    const address = cells[1]?.textContent.trim();
-                                    const phone = cells.length > 2 ? cells[2]?.textContent.trim() : null;
-
-                                    if (name && name.length > 2 && !name.includes('Creditor') && !name.includes('Name')) {
-                                        creditorContacts.push({
-                                            name,
-                                            address: address || null,
-                                            phone: phone || null,
-                                            source: 'original-view'
-                                        });
+                                // Extract DOB - row-start-4
+                                if (className.includes('row-start-4')) {
+                                    const fullDateMatch = text.match(/(\\d{1,2}\\/\\d{1,2}\\/\\d{4})/);
+                                    if (fullDateMatch) {
+                                        data[bureau].dob = fullDateMatch[1];
+                                        if (!data.dob) data.dob = fullDateMatch[1];
+                                    } else {
+                                        const yearMatch = text.match(/(19[4-9]\\d|20[0-2]\\d)/);
+                                        if (yearMatch) {
+                                            data[bureau].dob = yearMatch[1];
+                                            if (!data.dob) data.dob = yearMatch[1];
+                                        }
                                     }
                                 }
-                            });
-                        }
-                    }
-
-                    // Also extract Personal Info for Original View - .d-grid.grid-cols-4 with labels and bureau columns
-                    // ORGANIZED BY BUREAU: col-start-2=TransUnion, col-start-3=Experian, col-start-4=Equifax
-                    if (data.names.length === 0) {
-                        // Initialize per-bureau structure
-                        data.transunion = { names: [], dob: null, current_address: null, previous_addresses: [], employers: [] };
-                        data.experian = { names: [], dob: null, current_address: null, previous_addresses: [], employers: [] };
-                        data.equifax = { names: [], dob: null, current_address: null, previous_addresses: [], employers: [] };
-
-                        // Find Personal Information section
-                        let personalSection = null;
-                        document.querySelectorAll('h5.fw-bold, h5.m-0.fw-bold').forEach(h => {
-                            if (h.textContent.includes('Personal Information')) {
-                                personalSection = h.closest('section') || h.parentElement?.parentElement;
-                            }
-                        });
 
-                        if (personalSection) {
-                            const grid = personalSection.querySelector('.d-grid.grid-cols-4');
-                            if (grid) {
-                                // Get all cells and organize by bureau column
-                                const allCells = grid.querySelectorAll('.grid-cell');
-                                allCells.forEach(cell => {
-                                    const className = cell.className || '';
-
-                                    // Determine which bureau based on col-start class
-                                    let bureau = null;
-                                    if (className.includes('col-start-2')) bureau = 'transunion';
-                                    else if (className.includes('col-start-3')) bureau = 'experian';
-                                    else if (className.includes('col-start-4')) bureau = 'equifax';
-
-                                    if (!bureau) return; // Skip label column
-
-                                    const span = cell.querySelector('span');
-                                    if (!span) return;
-
-                                    const html = span.innerHTML;
-                                    const text = span.textContent.trim();
-
-                                    // Extract names - row-start-3 (Name + Also Known As)
-                                    if (className.includes('row-start-3')) {
-                                        const names = html.split(/<br\\s*\\/?>/i)
-                                            .map(n => n.trim())
-                                            .filter(n => n.length > 2 && !n.includes('<'));
-                                        names.forEach(name => {
-                                            if (!data[bureau].names.includes(name)) {
-                                                data[bureau].names.push(name);
-                                            }
-                                            // Also add to flat list for backward compatibility
-                                            if (!data.names.includes(name)) {
-                                                data.names.push(name);
-                                            }
-                                        });
-                                    }
-
-                                    // Extract DOB - row-start-4
-                                    if (className.includes('row-start-4')) {
-                                        const fullDateMatch = text.match(/(\\d{1,2}\\/\\d{1,2}\\/\\d{4})/);
-                                        if (fullDateMatch) {
-                                            data[bureau].dob = fullDateMatch[1];
-                                            if (!data.dob) data.dob = fullDateMatch[1];
-                                        } else {
-                                            const yearMatch = text.match(/(19[4-9]\\d|20[0-2]\\d)/);
-                                            if (yearMatch) {
-                                                data[bureau].dob = yearMatch[1];
-                                                if (!data.dob) data.dob = yearMatch[1];
-                                            }
+                                // Extract Current Address - row-start-5
+                                if (className.includes('row-start-5')) {
+                                    const addrText = html
+                                        .replace(/<br\\s*\\/?>/gi, ', ')
+                                        .replace(/<[^>]*>/g, '')
+                                        .trim();
+                                    if (addrText && addrText.length > 5) {
+                                        data[bureau].current_address = addrText;
+                                        if (!data.addresses.includes(addrText)) {
+                                            data.addresses.push(addrText);
                                         }
                                     }
+                                }
 
-                                    // Extract Current Address - row-start-5
-                                    if (className.includes('row-start-5')) {
-                                        const addrText = html
+                                // Extract Previous Addresses - row-start-6
+                                if (className.includes('row-start-6')) {
+                                    const addrBlocks = html.split(/<br\\s*\\/?><br\\s*\\/?>/gi);
+                                    addrBlocks.forEach(block => {
+                                        const addr = block
                                             .replace(/<br\\s*\\/?>/gi, ', ')
                                             .replace(/<[^>]*>/g, '')
                                             .trim();
-                                        if (addrText && addrText.length > 5) {
-                                            data[bureau].current_address = addrText;
-                                            if (!data.addresses.includes(addrText)) {
-                                                data.addresses.push(addrText);
+                                        if (addr && addr.length > 5) {
+                                            if (!data[bureau].previous_addresses.includes(addr)) {
+                                                data[bureau].previous_addresses.push(addr);
+                                            }
+                                            if (!data.addresses.includes(addr)) {
+                                                data.addresses.push(addr);
                                             }
                                         }
-                                    }
+                                    });
+                                }
 
-                                    // Extract Previous Addresses - row-start-6
-                                    if (className.includes('row-start-6')) {
-                                        const addrBlocks = html.split(/<br\\s*\\/?><br\\s*\\/?>/gi);
-                                        addrBlocks.forEach(block => {
-                                            const addr = block
-                                                .replace(/<br\\s*\\/?>/gi, ', ')
-                                                .replace(/<[^>]*>/g, '')
-                                                .trim();
-                                            if (addr && addr.length > 5) {
-                                                if (!data[bureau].previous_addresses.includes(addr)) {
-                                                    data[bureau].previous_addresses.push(addr);
-                                                }
-                                                if (!data.addresses.includes(addr)) {
-                                                    data.addresses.push(addr);
+                                // Extract Employers - row-start-7
+                                if (className.includes('row-start-7')) {
+                                    const empBlocks = html.split(/<br\\s*\\/?><br\\s*\\/?>/gi);
+                                    empBlocks.forEach(block => {
+                                        const parts = block.split(/<br\\s*\\/?>/i);
+                                        const empName = parts[0].replace(/<[^>]*>/g, '').trim();
+                                        if (empName && empName.length > 1 &&
+                                            !empName.toLowerCase().includes('date updated')) {
+                                            let dateUpdated = null;
+                                            for (const part of parts) {
+                                                const dateMatch = part.match(/Date Updated:\\s*([\\d\\/]+)/i);
+                                                if (dateMatch) {
+                                                    dateUpdated = dateMatch[1];
+                                                    break;
                                                 }
                                             }
-                                        });
-                                    }
-
-                                    // Extract Employers - row-start-7
-                                    if (className.includes('row-start-7')) {
-                                        const empBlocks = html.split(/<br\\s*\\/?><br\\s*\\/?>/gi);
-                                        empBlocks.forEach(block => {
-                                            const parts = block.split(/<br\\s*\\/?>/i);
-                                            const empName = parts[0].replace(/<[^>]*>/g, '').trim();
-                                            if (empName && empName.length > 1 &&
-                                                !empName.toLowerCase().includes('date updated')) {
-                                                let dateUpdated = null;
-                                                for (const part of parts) {
-                                                    const dateMatch = part.match(/Date Updated:\\s*([\\d\\/]+)/i);
-                                                    if (dateMatch) {
-                                                        dateUpdated = dateMatch[1];
-                                                        break;
-                                                    }
-                                                }
-                                                const empObj = { name: empName, date_updated: dateUpdated };
-                                                // Add to bureau-specific list
-                                                if (!data[bureau].employers.find(e => e.name === empName)) {
-                                                    data[bureau].employers.push(empObj);
-                                                }
-                                                // Add to flat list for backward compatibility
-                                                if (!data.employers.find(e => e.name === empName)) {
-                                                    data.employers.push(empObj);
-                                                }
+                                            const empObj = { name: empName, date_updated: dateUpdated };
+                                            // Add to bureau-specific list
+                                            if (!data[bureau].employers.find(e => e.name === empName)) {
+                                                data[bureau].employers.push(empObj);
                                             }
-                                        });
-                                    }
-                                });
-                            }
+                                            // Add to flat list for backward compatibility
+                                            if (!data.employers.find(e => e.name === empName)) {
+                                                data.employers.push(empObj);
+                                            }
+                                        }
+                                    });
+                                }
+                            });
                         }
+                    }
 
-                        // MYSCOREIQ FALLBACK: If still no names, try MyScoreIQ format
-                        // MyScoreIQ uses tables with class rpt_content_table and columns headerTUC, headerEXP, headerEQF
-                        if (data.names.length === 0) {
-                            // Find all headers and look for Personal Information
-                            let personalTable = null;
-                            document.querySelectorAll('.rpt_fullReport_header').forEach(header => {
-                                if (header.textContent.includes('Personal Information')) {
-                                    // Find the next table.rpt_content_table after this header (skip help_text tables)
-                                    // Look in parent wrapper first
-                                    const wrapper = header.closest('.rpt_content_wrapper');
-                                    if (wrapper) {
-                                        // Find table.rpt_content_table.rpt_table4column within the wrapper
-                                        personalTable = wrapper.querySelector('table.rpt_content_table.rpt_table4column');
-                                    }
-                                    // Fallback: Walk through siblings
-                                    if (!personalTable) {
-                                        let el = header.nextElementSibling;
-                                        while (el && !personalTable) {
-                                            // Skip help_text tables
-                                            if (el.tagName === 'TABLE' && el.classList?.contains('rpt_content_table') && !el.classList?.contains('help_text')) {
-                                                personalTable = el;
-                                            } else if (el.querySelector) {
-                                                personalTable = el.querySelector('table.rpt_content_table.rpt_table4column');
-                                            }
-                                            el = el.nextElementSibling;
+                    // MYSCOREIQ FALLBACK: If still no names, try MyScoreIQ format
+                    // MyScoreIQ uses tables with class rpt_content_table and columns headerTUC, headerEXP, headerEQF
+                    if (data.names.length === 0) {
+                        // Find all headers and look for Personal Information
+                        let personalTable = null;
+                        document.querySelectorAll('.rpt_fullReport_header').forEach(header => {
+                            if (header.textContent.includes('Personal Information')) {
+                                // Find the next table.rpt_content_table after this header (skip help_text tables)
+                                // Look in parent wrapper first
+                                const wrapper = header.closest('.rpt_content_wrapper');
+                                if (wrapper) {
+                                    // Find table.rpt_content_table.rpt_table4column within the wrapper
+                                    personalTable = wrapper.querySelector('table.rpt_content_table.rpt_table4column');
+                                }
+                                // Fallback: Walk through siblings
+                                if (!personalTable) {
+                                    let el = header.nextElementSibling;
+                                    while (el && !personalTable) {
+                                        // Skip help_text tables
+                                        if (el.tagName === 'TABLE' && el.classList?.contains('rpt_content_table') && !el.classList?.contains('help_text')) {
+                                            personalTable = el;
+                                        } else if (el.querySelector) {
+                                            personalTable = el.querySelector('table.rpt_content_table.rpt_table4column');
                                         }
+                                        el = el.nextElementSibling;
                                     }
-                                    // Also check parent's siblings
-                                    if (!personalTable) {
-                                        let parent = header.parentElement;
-                                        let sib = parent?.nextElementSibling;
-                                        while (sib && !personalTable) {
-                                            if (sib.tagName === 'TABLE' && sib.classList?.contains('rpt_content_table') && !sib.classList?.contains('help_text')) {
-                                                personalTable = sib;
-                                            } else if (sib.querySelector) {
-                                                personalTable = sib.querySelector('table.rpt_content_table.rpt_table4column');
-                                            }
-                                            sib = sib.nextElementSibling;
+                                }
+                                // Also check parent's siblings
+                                if (!personalTable) {
+                                    let parent = header.parentElement;
+                                    let sib = parent?.nextElementSibling;
+                                    while (sib && !personalTable) {
+                                        if (sib.tagName === 'TABLE' && sib.classList?.contains('rpt_content_table') && !sib.classList?.contains('help_text')) {
+                                            personalTable = sib;
+                                        } else if (sib.querySelector) {
+                                            personalTable = sib.querySelector('table.rpt_content_table.rpt_table4column');
                                         }
+                                        sib = sib.nextElementSibling;
                                     }
                                 }
-                            });
-
-                            // Also try direct table selection with 4-column layout
-                            if (!personalTable) {
-                                // Get the first 4-column table that follows a Personal Information header
-                                const piWrapper = document.querySelector('.rpt_content_wrapper:has(.rpt_fullReport_header)');
-                                if (piWrapper && piWrapper.textContent.includes('Personal Information')) {
-                                    personalTable = piWrapper.querySelector('table.rpt_content_table.rpt_table4column');
-                                }
                             }
-                            if (!personalTable) {
-                                personalTable = document.querySelector('table.rpt_content_table.rpt_table4column');
+                        });
+
+                        // Also try direct table selection with 4-column layout
+                        if (!personalTable) {
+                            // Get the first 4-column table that follows a Personal Information header
+                            const piWrapper = document.querySelector('.rpt_content_wrapper:has(.rpt_fullReport_header)');
+                            if (piWrapper && piWrapper.textContent.includes('Personal Information')) {
+                                personalTable = piWrapper.querySelector('table.rpt_content_table.rpt_table4column');
                             }
+                        }
+                        if (!personalTable) {
+                            personalTable = document.querySelector('table.rpt_content_table.rpt_table4column');
+                        }
 
-                            if (personalTable) {
-                                // Initialize per-bureau data if not already
-                                if (!data.transunion) data.transunion = { names: [], also_known_as: [], former_names: [], dob: null, current_address: null, current_address_date: null, previous_addresses: [], employers: [] };
-                                if (!data.experian) data.experian = { names: [], also_known_as: [], former_names: [], dob: null, current_address: null, current_address_date: null, previous_addresses: [], employers: [] };
-                                if (!data.equifax) data.equifax = { names: [], also_known_as: [], former_names: [], dob: null, current_address: null, current_address_date: null, previous_addresses: [], employers: [] };
+                        if (personalTable) {
+                            // Initialize per-bureau data if not already
+                            if (!data.transunion) data.transunion = { names: [], also_known_as: [], former_names: [], dob: null, current_address: null, current_address_date: null, previous_addresses: [], employers: [] };
+                            if (!data.experian) data.experian = { names: [], also_known_as: [], former_names: [], dob: null, current_address: null, current_address_date: null, previous_addresses: [], employers: [] };
+                            if (!data.equifax) data.equifax = { names: [], also_known_as: [], former_names: [], dob: null, current_address: null, current_address_date: null, previous_addresses: [], employers: [] };
 
-                                // Helper function to clean text - removes trailing " -" from MyScoreIQ Angular templates
-                                const cleanText = (text) => {
-                                    if (!text) return '';
-                                    return text.replace(/\\s+-\\s*$/, '').replace(/\\s+/g, ' ').trim();
-                                };
+                            // Helper function to clean text - removes trailing " -" from MyScoreIQ Angular templates
+                            const cleanText = (text) => {
+                                if (!text) return '';
+                                return text.replace(/\\s+-\\s*$/, '').replace(/\\s+/g, ' ').trim();
+                            };
+
+                            // Helper function to extract name from ng-include template (ignores hidden "-" elements)
+                            const extractName = (cell) => {
+                                const nameInclude = cell.querySelector('ng-include[src*="personNameTemplate"]');
+                                if (nameInclude) {
+                                    // Get text from ng-if elements inside the template
+                                    const parts = [];
+                                    nameInclude.querySelectorAll('ng-if').forEach(el => {
+                                        const txt = el.textContent.replace(/&nbsp;/g, ' ').trim();
+                                        if (txt && txt !== '-') parts.push(txt);
+                                    });
+                                    return parts.join(' ').replace(/\\s+/g, ' ').trim();
+                                }
+                                return cleanText(cell.textContent);
+                            };
 
-                                // Helper function to extract name from ng-include template (ignores hidden "-" elements)
-                                const extractName = (cell) => {
-                                    const nameInclude = cell.querySelector('ng-include[src*="personNameTemplate"]');
-                                    if (nameInclude) {
-                                        // Get text from ng-if elements inside the template
+                            // Helper function to extract address with date separated
+                            const extractAddress = (cell) => {
+                                const result = { address: null, date: null };
+                                // First ng-repeat contains the address div
+                                const addrContainer = cell.querySelector('ng-repeat');
+                                if (addrContainer) {
+                                    // ng-include contains the address parts
+                                    const addrInclude = addrContainer.querySelector('ng-include');
+                                    if (addrInclude) {
                                         const parts = [];
-                                        nameInclude.querySelectorAll('ng-if').forEach(el => {
+                                        addrInclude.querySelectorAll('ng-if').forEach(el => {
                                             const txt = el.textContent.replace(/&nbsp;/g, ' ').trim();
                                             if (txt && txt !== '-') parts.push(txt);
                                         });
-                                        return parts.join(' ').replace(/\\s+/g, ' ').trim();
+                                        result.address = parts.join(' ').replace(/\\s+/g, ' ').trim();
                                     }
-                                    return cleanText(cell.textContent);
-                                };
-
-                                // Helper function to extract address with date separated
-                                const extractAddress = (cell) => {
-                                    const result = { address: null, date: null };
-                                    // First ng-repeat contains the address div
-                                    const addrContainer = cell.querySelector('ng-repeat');
-                                    if (addrContainer) {
-                                        // ng-include contains the address parts
-                                        const addrInclude = addrContainer.querySelector('ng-include');
-                                        if (addrInclude) {
-                                            const parts = [];
-                                            addrInclude.querySelectorAll('ng-if').forEach(el => {
-                                                const txt = el.textContent.replace(/&nbsp;/g, ' ').trim();
-                                                if (txt && txt !== '-') parts.push(txt);
-                                            });
-                                            result.address = parts.join(' ').replace(/\\s+/g, ' ').trim();
-                                        }
-                                        // Date is in a separate div with ng-if containing the date
-                                        const dateDiv = addrContainer.querySelector('div[ng-if*="date_last_updated"], div[ng-if*="date_first_reported"]');
-                                        if (dateDiv) {
-                                            result.date = dateDiv.textContent.trim();
-                                        }
+                                    // Date is in a separate div with ng-if containing the date
+                                    const dateDiv = addrContainer.querySelector('div[ng-if*="date_last_updated"], div[ng-if*="date_first_reported"]');
+                                    if (dateDiv) {
+                                        result.date = dateDiv.textContent.trim();
                                     }
-                                    // Fallback: just get the address from text content, clean it
-                                    if (!result.address) {
-                                        const text = cleanText(cell.textContent);
-                                        // Try to separate date from address (MM/YYYY pattern at end)
-                                        const dateMatch = text.match(/\\s+(\\d{2}\\/\\d{4})\\s*$/);
-                                        if (dateMatch) {
-                                            result.address = text.replace(dateMatch[0], '').trim();
-                                            result.date = dateMatch[1];
-                                        } else {
-                                            result.address = text;
-                                        }
+                                }
+                                // Fallback: just get the address from text content, clean it
+                                if (!result.address) {
+                                    const text = cleanText(cell.textContent);
+                                    // Try to separate date from address (MM/YYYY pattern at end)
+                                    const dateMatch = text.match(/\\s+(\\d{2}\\/\\d{4})\\s*$/);
+                                    if (dateMatch) {
+                                        result.address = text.replace(dateMatch[0], '').trim();
+                                        result.date = dateMatch[1];
+                                    } else {
+                                        result.address = text;
                                     }
-                                    return result;
-                                };
+                                }
+                                return result;
+                            };
 
-                                // Helper function to extract multiple addresses from a cell (for Previous Addresses)
-                                const extractMultipleAddresses = (cell) => {
-                                    const addresses = [];
-                                    // Each address is in a separate ng-repeat div
-                                    const addrContainers = cell.querySelectorAll('ng-repeat');
-                                    addrContainers.forEach(container => {
-                                        const addrInclude = container.querySelector('ng-include');
-                                        if (addrInclude) {
-                                            const parts = [];
-                                            addrInclude.querySelectorAll('ng-if').forEach(el => {
-                                                const txt = el.textContent.replace(/&nbsp;/g, ' ').trim();
-                                                if (txt && txt !== '-') parts.push(txt);
-                                            });
-                                            const addrText = parts.join(' ').replace(/\\s+/g, ' ').trim();
-                                            // Get date if present
-                                            const dateDiv = container.querySelector('div[ng-if*="date_last_updated"], div[ng-if*="date_first_reported"]');
-                                            const dateText = dateDiv ? dateDiv.textContent.trim() : null;
-                                            if (addrText) {
-                                                addresses.push({ address: addrText, date: dateText });
-                                            }
+                            // Helper function to extract multiple addresses from a cell (for Previous Addresses)
+                            const extractMultipleAddresses = (cell) => {
+                                const addresses = [];
+                                // Each address is in a separate ng-repeat div
+                                const addrContainers = cell.querySelectorAll('ng-repeat');
+                                addrContainers.forEach(container => {
+                                    const addrInclude = container.querySelector('ng-include');
+                                    if (addrInclude) {
+                                        const parts = [];
+                                        addrInclude.querySelectorAll('ng-if').forEach(el => {
+                                            const txt = el.textContent.replace(/&nbsp;/g, ' ').trim();
+                                            if (txt && txt !== '-') parts.push(txt);
+                                        });
+                                        const addrText = parts.join(' ').replace(/\\s+/g, ' ').trim();
+                                        // Get date if present
+                                        const dateDiv = container.querySelector('div[ng-if*="date_last_updated"], div[ng-if*="date_first_reported"]');
+                                        const dateText = dateDiv ? dateDiv.textContent.trim() : null;
+                                        if (addrText) {
+                                            addresses.push({ address: addrText, date: dateText });
                                         }
-                                    });
-                                    return addresses;
-                                };
+                                    }
+                                });
+                                return addresses;
+                            };
 
-                                const rows = personalTable.querySelectorAll('tr');
-                                rows.forEach(row => {
-                                    const labelCell = row.querySelector('td.label');
-                                    if (!labelCell) return;
-                                    const label = labelCell.textContent.trim();
-
-                                    const infoCells = row.querySelectorAll('td.info');
-                                    if (infoCells.length >= 3) {
-                                        // Column order: TransUnion, Experian, Equifax
-                                        const bureaus = ['transunion', 'experian', 'equifax'];
-                                        infoCells.forEach((cell, idx) => {
-                                            if (idx >= 3) return;
-                                            const bureau = bureaus[idx];
-                                            const rawText = cell.textContent.replace(/\\s+/g, ' ').trim();
-                                            // Skip if cell only contains "-" (placeholder)
-                                            if (!rawText || rawText === '-') return;
-
-                                            // Primary Name (not AKA or Former)
-                                            if (label === 'Name:' || label.match(/^Name$/i)) {
-                                                const nameText = extractName(cell);
-                                                if (nameText && nameText.length > 2 && nameText !== '-') {
-                                                    if (!data[bureau].names.includes(nameText)) {
-                                                        data[bureau].names.push(nameText);
-                                                    }
-                                                    if (!data.names.includes(nameText)) {
-                                                        data.names.push(nameText);
-                                                    }
+                            const rows = personalTable.querySelectorAll('tr');
+                            rows.forEach(row => {
+                                const labelCell = row.querySelector('td.label');
+                                if (!labelCell) return;
+                                const label = labelCell.textContent.trim();
+
+                                const infoCells = row.querySelectorAll('td.info');
+                                if (infoCells.length >= 3) {
+                                    // Column order: TransUnion, Experian, Equifax
+                                    const bureaus = ['transunion', 'experian', 'equifax'];
+                                    infoCells.forEach((cell, idx) => {
+                                        if (idx >= 3) return;
+                                        const bureau = bureaus[idx];
+                                        const rawText = cell.textContent.replace(/\\s+/g, ' ').trim();
+                                        // Skip if cell only contains "-" (placeholder)
+                                        if (!rawText || rawText === '-') return;
+
+                                        // Primary Name (not AKA or Former)
+                                        if (label === 'Name:' || label.match(/^Name$/i)) {
+                                            const nameText = extractName(cell);
+                                            if (nameText && nameText.length > 2 && nameText !== '-') {
+                                                if (!data[bureau].names.includes(nameText)) {
+                                                    data[bureau].names.push(nameText);
+                                                }
+                                                if (!data.names.includes(nameText)) {
+                                                    data.names.push(nameText);
                                                 }
                                             }
-                                            // Also Known As names - get all names beyond index 0
-                                            else if (label.includes('Also Known As')) {
-                                                // AKA names are in ng-repeat with ng-if="$index > 0"
-                                                const akaRepeats = cell.querySelectorAll('ng-repeat[ng-if*="$index > 0"]');
-                                                akaRepeats.forEach(rep => {
-                                                    const nameInclude = rep.querySelector('ng-include');
-                                                    if (nameInclude) {
-                                                        const parts = [];
-                                                        nameInclude.querySelectorAll('ng-if').forEach(el => {
-                                                            const txt = el.textContent.replace(/&nbsp;/g, ' ').trim();
-                                                            if (txt && txt !== '-') parts.push(txt);
-                                                        });
-                                                        const akaName = parts.join(' ').replace(/\\s+/g, ' ').trim();
-                                                        if (akaName && akaName !== '-' && !data[bureau].also_known_as.includes(akaName)) {
-                                                            data[bureau].also_known_as.push(akaName);
-                                                        }
+                                        }
+                                        // Also Known As names - get all names beyond index 0
+                                        else if (label.includes('Also Known As')) {
+                                            // AKA names are in ng-repeat with ng-if="$index > 0"
+                                            const akaRepeats = cell.querySelectorAll('ng-repeat[ng-if*="$index > 0"]');
+                                            akaRepeats.forEach(rep => {
+                                                const nameInclude = rep.querySelector('ng-include');
+                                                if (nameInclude) {
+                                                    const parts = [];
+                                                    nameInclude.querySelectorAll('ng-if').forEach(el => {
+                                                        const txt = el.textContent.replace(/&nbsp;/g, ' ').trim();
+                                                        if (txt && txt !== '-') parts.push(txt);
+                                                    });
+                                                    const akaName = parts.join(' ').replace(/\\s+/g, ' ').trim();
+                                                    if (akaName && akaName !== '-' && !data[bureau].also_known_as.includes(akaName)) {
+                                                        data[bureau].also_known_as.push(akaName);
                                                     }
-                                                });
-                                            }
-                                            // Former names
-                                            else if (label.includes('Former')) {
-                                                const formerRepeats = cell.querySelectorAll('ng-repeat');
-                                                formerRepeats.forEach(rep => {
-                                                    const nameInclude = rep.querySelector('ng-include');
-                                                    if (nameInclude) {
-                                                        const parts = [];
-                                                        nameInclude.querySelectorAll('ng-if').forEach(el => {
-                                                            const txt = el.textContent.replace(/&nbsp;/g, ' ').trim();
-                                                            if (txt && txt !== '-') parts.push(txt);
-                                                        });
-                                                        const formerName = parts.join(' ').replace(/\\s+/g, ' ').trim();
-                                                        if (formerName && formerName !== '-' && !data[bureau].former_names.includes(formerName)) {
-                                                            data[bureau].former_names.push(formerName);
-                                                        }
+                                                }
+                                            });
+                                        }
+                                        // Former names
+                                        else if (label.includes('Former')) {
+                                            const formerRepeats = cell.querySelectorAll('ng-repeat');
+                                            formerRepeats.forEach(rep => {
+                                                const nameInclude = rep.querySelector('ng-include');
+                                                if (nameInclude) {
+                                                    const parts = [];
+                                                    nameInclude.querySelectorAll('ng-if').forEach(el => {
+                                                        const txt = el.textContent.replace(/&nbsp;/g, ' ').trim();
+                                                        if (txt && txt !== '-') parts.push(txt);
+                                                    });
+                                                    const formerName = parts.join(' ').replace(/\\s+/g, ' ').trim();
+                                                    if (formerName && formerName !== '-' && !data[bureau].former_names.includes(formerName)) {
+                                                        data[bureau].former_names.push(formerName);
                                                     }
-                                                });
-                                            }
-                                            else if (label.includes('Date of Birth') || label.includes('Birth Year')) {
-                                                // DOB is in ng-repeat > div.ng-binding
-                                                const dobDiv = cell.querySelector('ng-repeat div.ng-binding');
-                                                let dobText = dobDiv ? dobDiv.textContent.trim() : cleanText(rawText);
-                                                const dateMatch = dobText.match(/(\\d{1,2}\\/\\d{1,2}\\/\\d{4})/);
-                                                const yearMatch = dobText.match(/(19[4-9]\\d|20[0-2]\\d)/);
-                                                if (dateMatch) {
-                                                    data[bureau].dob = dateMatch[1];
-                                                    if (!data.dob) data.dob = dateMatch[1];
-                                                } else if (yearMatch) {
-                                                    data[bureau].dob = yearMatch[1];
-                                                    if (!data.dob) data.dob = yearMatch[1];
                                                 }
+                                            });
+                                        }
+                                        else if (label.includes('Date of Birth') || label.includes('Birth Year')) {
+                                            // DOB is in ng-repeat > div.ng-binding
+                                            const dobDiv = cell.querySelector('ng-repeat div.ng-binding');
+                                            let dobText = dobDiv ? dobDiv.textContent.trim() : cleanText(rawText);
+                                            const dateMatch = dobText.match(/(\\d{1,2}\\/\\d{1,2}\\/\\d{4})/);
+                                            const yearMatch = dobText.match(/(19[4-9]\\d|20[0-2]\\d)/);
+                                            if (dateMatch) {
+                                                data[bureau].dob = dateMatch[1];
+                                                if (!data.dob) data.dob = dateMatch[1];
+                                            } else if (yearMatch) {
+                                                data[bureau].dob = yearMatch[1];
+                                                if (!data.dob) data.dob = yearMatch[1];
                                             }
-                                            // Current Address(es) - first address only
-                                            else if (label.includes('Current Address')) {
-                                                if (!data[bureau].current_address) {
-                                                    const addrData = extractAddress(cell);
-                                                    if (addrData.address && addrData.address.length > 5) {
-                                                        data[bureau].current_address = addrData.address;
-                                                        data[bureau].current_address_date = addrData.date;
-                                                        if (!data.addresses.includes(addrData.address)) {
-                                                            data.addresses.push(addrData.address);
-                                                        }
+                                        }
+                                        // Current Address(es) - first address only
+                                        else if (label.includes('Current Address')) {
+                                            if (!data[bureau].current_address) {
+                                                const addrData = extractAddress(cell);
+                                                if (addrData.address && addrData.address.length > 5) {
+                                                    data[bureau].current_address = addrData.address;
+                                                    data[bureau].current_address_date = addrData.date;
+                                                    if (!data.addresses.includes(addrData.address)) {
+                                                        data.addresses.push(addrData.address);
                                                     }
                                                 }
                                             }
-                                            // Previous Address(es) - can have multiple
-                                            else if (label.includes('Previous Address')) {
-                                                const prevAddrs = extractMultipleAddresses(cell);
-                                                prevAddrs.forEach(addrData => {
-                                                    if (addrData.address && addrData.address.length > 5) {
-                                                        // Store as object with address and date
-                                                        const addrObj = { address: addrData.address, date: addrData.date };
-                                                        const exists = data[bureau].previous_addresses.find(a => a.address === addrData.address);
-                                                        if (!exists) {
-                                                            data[bureau].previous_addresses.push(addrObj);
-                                                        }
-                                                        if (!data.addresses.includes(addrData.address)) {
-                                                            data.addresses.push(addrData.address);
-                                                        }
+                                        }
+                                        // Previous Address(es) - can have multiple
+                                        else if (label.includes('Previous Address')) {
+                                            const prevAddrs = extractMultipleAddresses(cell);
+                                            prevAddrs.forEach(addrData => {
+                                                if (addrData.address && addrData.address.length > 5) {
+                                                    // Store as object with address and date
+                                                    const addrObj = { address: addrData.address, date: addrData.date };
+                                                    const exists = data[bureau].previous_addresses.find(a => a.address === addrData.address);
+                                                    if (!exists) {
+                                                        data[bureau].previous_addresses.push(addrObj);
                                                     }
-                                                });
-                                            }
-                                            else if (label.includes('Employer')) {
-                                                // Employers are in ng-repeat elements, each with ng-if for the name
-                                                const empRepeats = cell.querySelectorAll('ng-repeat');
-                                                empRepeats.forEach(rep => {
-                                                    const nameEl = rep.querySelector('ng-if[ng-if*="emp[\\'name\\']"]');
-                                                    if (nameEl) {
-                                                        const empName = nameEl.textContent.replace(/&nbsp;/g, ' ').trim();
-                                                        if (empName && empName.length > 2 && empName !== '-') {
-                                                            const empObj = { name: empName, date_updated: null };
-                                                            if (!data[bureau].employers.find(e => e.name === empName)) {
-                                                                data[bureau].employers.push(empObj);
-                                                            }
-                                                            if (!data.employers.find(e => e.name === empName)) {
-                                                                data.employers.push(empObj);
-                                                            }
-                                                        }
+                                                    if (!data.addresses.includes(addrData.address)) {
+                                                        data.addresses.push(addrData.address);
                                                     }
-                                                });
-                                                // Fallback: if no ng-repeat found, try cleanText approach
-                                                if (data[bureau].employers.length === 0) {
-                                                    const empText = cleanText(rawText);
-                                                    if (empText && empText.length > 2 && empText !== '-') {
-                                                        const empObj = { name: empText, date_updated: null };
-                                                        if (!data[bureau].employers.find(e => e.name === empText)) {
+                                                }
+                                            });
+                                        }
+                                        else if (label.includes('Employer')) {
+                                            // Employers are in ng-repeat elements, each with ng-if for the name
+                                            const empRepeats = cell.querySelectorAll('ng-repeat');
+                                            empRepeats.forEach(rep => {
+                                                const nameEl = rep.querySelector('ng-if[ng-if*="emp[\\'name\\']"]');
+                                                if (nameEl) {
+                                                    const empName = nameEl.textContent.replace(/&nbsp;/g, ' ').trim();
+                                                    if (empName && empName.length > 2 && empName !== '-') {
+                                                        const empObj = { name: empName, date_updated: null };
+                                                        if (!data[bureau].employers.find(e => e.name === empName)) {
                                                             data[bureau].employers.push(empObj);
                                                         }
-                                                        if (!data.employers.find(e => e.name === empText)) {
+                                                        if (!data.employers.find(e => e.name === empName)) {
                                                             data.employers.push(empObj);
                                                         }
                                                     }
                                                 }
+                                            });
+                                            // Fallback: if no ng-repeat found, try cleanText approach
+                                            if (data[bureau].employers.length === 0) {
+                                                const empText = cleanText(rawText);
+                                                if (empText && empText.length > 2 && empText !== '-') {
+                                                    const empObj = { name: empText, date_updated: null };
+                                                    if (!data[bureau].employers.find(e => e.name === empText)) {
+                                                        data[bureau].employers.push(empObj);
+                                                    }
+                                                    if (!data.employers.find(e => e.name === empText)) {
+                                                        data.employers.push(empObj);
+                                                    }
+                                                }
                                             }
-                                        });
-                                    }
-                                });
-                            }
+                                        }
+                                    });
+                                }
+                            });
                         }
                     }
+                }
 
-                    return { personal: data, summary: summary, inquiries: inquiries, creditor_contacts: creditorContacts };
-                }"""
+                return { personal: data, summary: summary, inquiries: inquiries, creditor_contacts: creditorContacts };
+            }"""
+            )
+            if personal_data:
+                personal_info = personal_data.get("personal", {})
+                summary_info = personal_data.get("summary", {})
+                inquiries = personal_data.get("inquiries", [])
+                creditor_contacts = personal_data.get("creditor_contacts", [])
+                logger.info(
+                    f"Extracted personal info: {len(personal_info.get('names', []))} names, {len(personal_info.get('addresses', []))} addresses"
+                )
+                logger.info(
+                    f"Extracted {len(inquiries)} inquiries, {len(creditor_contacts)} creditor contacts"
                 )
-                if personal_data:
-                    personal_info = personal_data.get("personal", {})
-                    summary_info = personal_data.get("summary", {})
-                    inquiries = personal_data.get("inquiries", [])
-                    creditor_contacts = personal_data.get("creditor_contacts", [])
-                    logger.info(
-                        f"Extracted personal info: {len(personal_info.get('names', []))} names, {len(personal_info.get('addresses', []))} addresses"
-                    )
-                    logger.info(
-                        f"Extracted {len(inquiries)} inquiries, {len(creditor_contacts)} creditor contacts"
-                    )
-            except Exception as e:
-                logger.warning(f"Personal info extraction failed: {e}")
-
-            # Payment history conversion is now handled in _extract_accounts_data()
-            # This is a no-op safety net if payment_history is already in unified format
-
-            json_filename = f"{client_id}_{safe_name}_{timestamp}.json"
-            json_filepath = REPORTS_DIR / json_filename
-            extracted_data = {
-                "client_id": client_id,
-                "client_name": client_name,
-                "extracted_at": datetime.utcnow().isoformat(),
-                "scores": scores or {},
-                "personal_info": personal_info,
-                "summary": summary_info,
-                "accounts": accounts or [],
-                "inquiries": inquiries,
-                "creditor_contacts": creditor_contacts,
-            }
-            with open(json_filepath, "w", encoding="utf-8") as f:
-                json.dump(extracted_data, f, indent=2)
-
-            logger.info(f"Saved report to {filepath}")
-            logger.info(f"Saved extracted data to {json_filepath}")
-
-            return {
-                "path": str(filepath),
-                "json_path": str(json_filepath),
-                "html": html_content,
-                "scores": scores,
-                "accounts": accounts,
-            }
-
         except Exception as e:
-            logger.error(f"Failed to download report: {e}")
-            return None
+            logger.warning(f"Personal info extraction failed: {e}")
+
+        return {
+            "personal": personal_info,
+            "summary": summary_info,
+            "inquiries": inquiries,
+            "creditor_contacts": creditor_contacts,
+        }
 
     async def _extract_scores(self) -> Optional[Dict[str, Any]]:
         """Extract credit scores from the current page after JS rendering."""
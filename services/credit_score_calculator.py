@@ -4,7 +4,9 @@ Estimates credit score improvements based on negative item removal
 and tracks progress from beginning to end.
 """
 
+import re
 from datetime import datetime
+from functools import lru_cache
 
 from database import (
     Analysis,
@@ -408,92 +410,119 @@ def get_score_range_label(score):
     return "Unknown"
 
 
+# Violation text -> impact category. Rules are checked in order and the first
+# whose condition holds wins. A condition is a list of term groups that must
+# all be present; a group is present when any of its terms is. Terms are
+# substrings of the lower-cased text, or (regex, literal core) pairs where a
+# bare substring would match inside unrelated words ("repo" in "reported",
+# "90" in "1990").
+_REPO = (r"\brepos?\b", "repo")
+_MAX = (r"\bmax(?:ed)?\b", "max")
+
+
+def _days(n):
+    return (rf"(?<!\d){n}(?!\d)", str(n))
+
+
+CATEGORY_RULES = [
+    ("bankruptcy_ch7", [["chapter 7", "ch 7", "ch7"]]),
+    ("bankruptcy_ch13", [["chapter 13", "ch 13", "ch13"]]),
+    ("bankruptcy", [["bankruptcy"]]),
+    ("foreclosure", [["foreclosure"]]),
+    ("short_sale", [["short sale"]]),
+    ("deed_in_lieu", [["deed in lieu"]]),
+    ("repossession", [["repossession", _REPO]]),
+    ("profit_loss", [["profit"], ["loss"]]),
+    ("charge_off", [["charge"], ["off"]]),
+    ("student_loan_default", [["student loan"], ["default", "delinq"]]),
+    ("medical_collection", [["medical"], ["collection"]]),
+    ("paid_collection", [["paid"], ["collection"]]),
+    ("collection", [["collection", "collect"]]),
+    ("settled_less", [["settled"], ["less"]]),
+    ("late_payment_120", [[_days(120)], ["day", "late"]]),
+    ("late_payment_90", [[_days(90)], ["day", "late"]]),
+    ("late_payment_60", [[_days(60)], ["day", "late"]]),
+    ("late_payment_30", [[_days(30)], ["day", "late"]]),
+    ("late_payment_30", [["late", "delinquen"]]),
+    ("judgment", [["judgment", "court"]]),
+    ("tax_lien", [["tax"], ["lien"]]),
+    ("identity_theft", [["identity theft", "fraud"]]),
+    ("multiple_inquiries", [["multiple"], ["inquir"]]),
+    ("hard_inquiry", [["hard"], ["inquir"]]),
+    ("inquiry", [["inquir"]]),
+    ("maxed_out", [[_MAX]]),
+    ("over_limit", [["over"], ["limit"]]),
+    ("high_utilization", [["utilization"]]),
+    ("high_utilization", [["high"], ["balance"]]),
+    ("reaged_debt", [["reaged", "re-aged"]]),
+    ("obsolete_info", [["obsolete", "7 year", "seven year"]]),
+    ("mixed_file", [["mixed"], ["file"]]),
+    ("duplicate_account", [["duplicate"]]),
+    ("wrong_date", [["wrong"], ["date"]]),
+    ("wrong_balance", [["wrong"], ["balance"]]),
+    ("wrong_status", [["wrong"], ["status"]]),
+    ("authorized_user_negative", [["authorized user"]]),
+    ("closed_negative", [["closed"], ["creditor", "negative"]]),
+    ("identity_error", [["identity"]]),
+    ("identity_error", [["wrong"], ["name", "ssn", "address"]]),
+    ("inaccurate_info", [["inaccurate", "error", "wrong"]]),
+]
+
+
+def _compile_rules(rules):
+    """
+    Precompile a rule table into (category, groups) of term predicates.
+
+    Literal terms become `in` checks; regex terms check their core before
+    running the precompiled search.
+    """
+    compiled = []
+    for category, groups in rules:
+        predicates = []
+        for group in groups:
+            checks = []
+            for term in group:
+                if isinstance(term, str):
+                    checks.append(lambda text, term=term: term in text)
+                else:
+                    pattern, core = term
+                    checks.append(
+                        lambda text, core=core, search=re.compile(pattern).search: (
+                            core in text and search(text) is not None
+                        )
+                    )
+            predicates.append(checks)
+        compiled.append((category, predicates))
+    return compiled
+
+
+_COMPILED_RULES = _compile_rules(CATEGORY_RULES)
+
+
+def normalize_violation_text(text):
+    """Lower-case a description (the categorizer's cache key)"""
+    return text.lower() if text else ""
+
+
+@lru_cache(maxsize=4096)
+def _categorize_normalized(text):
+    """First rule in CATEGORY_RULES whose term groups all match"""
+    for category, groups in _COMPILED_RULES:
+        if all(any(check(text) for check in group) for group in groups):
+            return category
+    return "unknown"
+
+
 def categorize_violation_type(violation_text):
     """Map violation description to impact category"""
-    text = violation_text.lower() if violation_text else ""
-
-    if "chapter 7" in text or "ch 7" in text or "ch7" in text:
-        return "bankruptcy_ch7"
-    elif "chapter 13" in text or "ch 13" in text or "ch13" in text:
-        return "bankruptcy_ch13"
-    elif "bankruptcy" in text:
-        return "bankruptcy"
-    elif "foreclosure" in text:
-        return "foreclosure"
-    elif "short sale" in text:
-        return "short_sale"
-    elif "deed in lieu" in text:
-        return "deed_in_lieu"
-    elif "repossession" in text or "repo" in text:
-        return "repossession"
-    elif "profit" in text and "loss" in text:
-        return "profit_loss"
-    elif "charge" in text and "off" in text:
-        return "charge_off"
-    elif "student loan" in text and ("default" in text or "delinq" in text):
-        return "student_loan_default"
-    elif "medical" in text and "collection" in text:
-        return "medical_collection"
-    elif "paid" in text and "collection" in text:
-        return "paid_collection"
-    elif "collection" in text or "collect" in text:
-        return "collection"
-    elif "settled" in text and "less" in text:
-        return "settled_less"
-    elif "120" in text and ("day" in text or "late" in text):
-        return "late_payment_120"
-    elif "90" in text and ("day" in text or "late" in text):
-        return "late_payment_90"
-    elif "60" in text and ("day" in text or "late" in text):
-        return "late_payment_60"
-    elif "30" in text and ("day" in text or "late" in text):
-        return "late_payment_30"
-    elif "late" in text or "delinquen" in text:
-        return "late_payment_30"
-    elif "judgment" in text or "court" in text:
-        return "judgment"
-    elif "tax" in text and "lien" in text:
-        return "tax_lien"
-    elif "identity theft" in text or "fraud" in text:
-        return "identity_theft"
-    elif "multiple" in text and "inquir" in text:
-        return "multiple_inquiries"
-    elif "hard" in text and "inquir" in text:
-        return "hard_inquiry"
-    elif "inquiry" in text or "inquir" in text:
-        return "inquiry"
-    elif "maxed" in text or "max" in text:
-        return "maxed_out"
-    elif "over" in text and "limit" in text:
-        return "over_limit"
-    elif "utilization" in text or ("high" in text and "balance" in text):
-        return "high_utilization"
-    elif "reaged" in text or "re-aged" in text:
-        return "reaged_debt"
-    elif "obsolete" in text or ("7 year" in text or "seven year" in text):
-        return "obsolete_info"
-    elif "mixed" in text and "file" in text:
-        return "mixed_file"
-    elif "duplicate" in text:
-        return "duplicate_account"
-    elif "wrong" in text and "date" in text:
-        return "wrong_date"
-    elif "wrong" in text and "balance" in text:
-        return "wrong_balance"
-    elif "wrong" in text and "status" in text:
-        return "wrong_status"
-    elif "authorized user" in text:
-        return "authorized_user_negative"
-    elif "closed" in text and ("creditor" in text or "negative" in text):
-        return "closed_negative"
-    elif "identity" in text or (
-        "wrong" in text and ("name" in text or "ssn" in text or "address" in text)
-    ):
-        return "identity_error"
-    elif "inaccurate" in text or "error" in text or "wrong" in text:
-        return "inaccurate_info"
-    else:
-        return "unknown"
+    return _categorize_normalized(normalize_violation_text(violation_text))
+
+
+def categorize_violation_types(texts):
+    """categorize_violation_type over a list, in order"""
+    return [
+        _categorize_normalized(normalize_violation_text(text)) for text in texts
+    ]
 
 
 def get_all_item_types():
@@ -712,12 +741,9 @@ def calculate_client_projection(client_id):
             current_avg = 550
             current_negatives = len(violations)
 
-        negative_types = []
-        for v in violations:
-            neg_type = categorize_violation_type(
-                v.violation_type or v.description or ""
-            )
-            negative_types.append(neg_type)
+        negative_types = categorize_violation_types(
+            [v.violation_type or v.description or "" for v in violations]
+        )
 
         projection = estimate_score_improvement(
             current_avg or 550, len(violations), negative_types
@@ -794,10 +820,10 @@ def calculate_client_projection(client_id):
 def get_violation_breakdown(violations):
     """Break down violations by type for the calculator"""
     breakdown = {}
-    for v in violations:
-        neg_type = categorize_violation_type(
-            v.violation_type or getattr(v, "description", "") or ""
-        )
+    neg_types = categorize_violation_types(
+        [v.violation_type or getattr(v, "description", "") or "" for v in violations]
+    )
+    for neg_type in neg_types:
         if neg_type not in breakdown:
             breakdown[neg_type] = {
                 "count": 0,
@@ -981,11 +1007,15 @@ def get_client_dispute_items_with_impact(client_id):
             .all()
         )
 
-        result = []
-        for item in items:
-            item_type = categorize_violation_type(
+        item_types = categorize_violation_types(
+            [
                 f"{item.item_type} {item.creditor_name} {item.reason_for_dispute or ''}"
-            )
+                for item in items
+            ]
+        )
+
+        result = []
+        for item, item_type in zip(items, item_types):
             impact = SCORE_IMPACT_BY_TYPE.get(
                 item_type, SCORE_IMPACT_BY_TYPE["unknown"]
             )
@@ -1065,10 +1095,14 @@ def simulate_score_with_items(client_id, selected_item_ids, current_score=None):
         selected_items_for_calc = []
         item_details = []
 
-        for item in items:
-            item_type = categorize_violation_type(
+        item_types = categorize_violation_types(
+            [
                 f"{item.item_type} {item.creditor_name} {item.reason_for_dispute or ''}"
-            )
+                for item in items
+            ]
+        )
+
+        for item, item_type in zip(items, item_types):
             impact = SCORE_IMPACT_BY_TYPE.get(
                 item_type, SCORE_IMPACT_BY_TYPE["unknown"]
             )
@@ -1113,16 +1147,9 @@ def _calculate_confidence(items):
     high_confidence_types = ["collection", "inquiry", "late_payment_30", "hard_inquiry"]
     low_confidence_types = ["bankruptcy", "foreclosure", "judgment", "identity_theft"]
 
-    high_count = sum(
-        1
-        for item in items
-        if categorize_violation_type(item.item_type) in high_confidence_types
-    )
-    low_count = sum(
-        1
-        for item in items
-        if categorize_violation_type(item.item_type) in low_confidence_types
-    )
+    item_types = categorize_violation_types([item.item_type for item in items])
+    high_count = sum(1 for t in item_types if t in high_confidence_types)
+    low_count = sum(1 for t in item_types if t in low_confidence_types)
 
     if low_count > len(items) * 0.3:
         return "low"
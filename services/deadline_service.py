@@ -7,6 +7,8 @@ Sends automated reminder emails at key intervals.
 import logging
 from datetime import date, datetime, timedelta
 
+from sqlalchemy import and_, or_
+
 from services import email_templates
 from services.email_service import is_sendgrid_configured, send_email
 
@@ -374,18 +376,45 @@ def extend_deadline(db, deadline_id, new_days, notes=None):
         raise
 
 
+# Reminder windows, most urgent first:
+# reminder_type -> (sent flag on CaseDeadline, results key, days-remaining range)
+# A None bound is open-ended; a deadline due today gets no reminder.
+REMINDER_WINDOWS = {
+    "overdue": ("overdue_notice_sent", "overdue_notices", (None, -1)),
+    "1_day": ("reminder_sent_1_day", "reminders_1_day", (1, 1)),
+    "3_days": ("reminder_sent_3_days", "reminders_3_days", (2, 3)),
+    "7_days": ("reminder_sent_7_days", "reminders_7_days", (4, 7)),
+}
+
+# Deadlines whose reminders are queued and flagged per commit
+REMINDER_CHUNK_SIZE = 500
+
+
+def _reminder_type_for(days_remaining):
+    for reminder_type, (_, _, (low, high)) in REMINDER_WINDOWS.items():
+        if (low is None or days_remaining >= low) and days_remaining <= high:
+            return reminder_type
+    return None
+
+
 def check_and_send_reminders(db):
     """
-    Check all active deadlines and send reminder emails as needed.
+    Queue reminder emails for active deadlines that are due one.
     Sends reminders at 7 days, 3 days, 1 day before deadline, and overdue notice.
 
+    Only deadlines inside a reminder window whose flag is still unset are
+    selected (date-range predicates on status/deadline_date). For each chunk,
+    the send_deadline_reminder tasks are enqueued with idempotency keys and the
+    flags set in the same commit, so a failure mid-run cannot cause a resend.
+
     Args:
         db: Database session
 
     Returns:
-        Dict with counts of reminders sent
+        Dict with counts of reminders queued
     """
     from database import CaseDeadline, Client
+    from services.task_queue_service import TaskQueueService
 
     results = {
         "checked": 0,
@@ -400,85 +429,90 @@ def check_and_send_reminders(db):
         logger.warning("SendGrid not configured - skipping deadline reminders")
         return results
 
+    today = date.today()
+    windows = []
+    for flag, _, (low, high) in REMINDER_WINDOWS.values():
+        window = [
+            CaseDeadline.deadline_date <= today + timedelta(days=high),
+            getattr(CaseDeadline, flag).isnot(True),
+        ]
+        if low is not None:
+            window.append(CaseDeadline.deadline_date >= today + timedelta(days=low))
+        windows.append(and_(*window))
+
     try:
-        active_deadlines = (
+        due = (
             db.query(CaseDeadline, Client)
             .join(Client, CaseDeadline.client_id == Client.id)
-            .filter(CaseDeadline.status == "active")
+            .filter(CaseDeadline.status == "active", or_(*windows))
             .all()
         )
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error in check_and_send_reminders: {str(e)}")
+        raise
 
-        today = date.today()
+    for start in range(0, len(due), REMINDER_CHUNK_SIZE):
+        chunk = due[start : start + REMINDER_CHUNK_SIZE]
+        tasks = []
+        flagged = []
 
-        for deadline, client in active_deadlines:
+        for deadline, client in chunk:
             results["checked"] += 1
             days_remaining = (deadline.deadline_date - today).days
-
-            try:
-                if days_remaining < 0 and not deadline.overdue_notice_sent:
-                    if _send_deadline_reminder(
-                        db, deadline, client, "overdue", days_remaining
-                    ):
-                        deadline.overdue_notice_sent = True
-                        results["overdue_notices"] += 1
-                        logger.info(f"Sent overdue notice for deadline {deadline.id}")
-
-                elif days_remaining == 1 and not deadline.reminder_sent_1_day:
-                    if _send_deadline_reminder(
-                        db, deadline, client, "1_day", days_remaining
-                    ):
-                        deadline.reminder_sent_1_day = True
-                        results["reminders_1_day"] += 1
-                        logger.info(f"Sent 1-day reminder for deadline {deadline.id}")
-
-                elif (
-                    days_remaining <= 3
-                    and days_remaining > 1
-                    and not deadline.reminder_sent_3_days
-                ):
-                    if _send_deadline_reminder(
-                        db, deadline, client, "3_days", days_remaining
-                    ):
-                        deadline.reminder_sent_3_days = True
-                        results["reminders_3_days"] += 1
-                        logger.info(f"Sent 3-day reminder for deadline {deadline.id}")
-
-                elif (
-                    days_remaining <= 7
-                    and days_remaining > 3
-                    and not deadline.reminder_sent_7_days
-                ):
-                    if _send_deadline_reminder(
-                        db, deadline, client, "7_days", days_remaining
-                    ):
-                        deadline.reminder_sent_7_days = True
-                        results["reminders_7_days"] += 1
-                        logger.info(f"Sent 7-day reminder for deadline {deadline.id}")
-
-            except Exception as e:
-                results["errors"] += 1
-                logger.error(f"Error processing deadline {deadline.id}: {str(e)}")
+            reminder_type = _reminder_type_for(days_remaining)
+            if reminder_type is None:
+                continue
+            flag, counter, _ = REMINDER_WINDOWS[reminder_type]
+            if getattr(deadline, flag):
                 continue
 
-        db.commit()
-
-        total_sent = (
-            results["reminders_7_days"]
-            + results["reminders_3_days"]
-            + results["reminders_1_day"]
-            + results["overdue_notices"]
-        )
-        logger.info(
-            f"Deadline reminder check complete: {results['checked']} checked, "
-            f"{total_sent} reminders sent, {results['errors']} errors"
-        )
-
-        return results
+            tasks.append(
+                {
+                    "task_type": "send_deadline_reminder",
+                    "payload": {
+                        "deadline_id": deadline.id,
+                        "reminder_type": reminder_type,
+                    },
+                    "client_id": client.id,
+                    # The date keeps a reminder for an extended deadline
+                    # from colliding with the one queued for the old date
+                    "idempotency_key": (
+                        f"deadline_reminder:{deadline.id}:{reminder_type}:"
+                        f"{deadline.deadline_date.isoformat()}"
+                    ),
+                }
+            )
+            flagged.append((deadline, flag, counter, tasks[-1]["idempotency_key"]))
+
+        try:
+            added = TaskQueueService.enqueue_bulk(tasks, session=db)
+            for deadline, flag, _, _ in flagged:
+                setattr(deadline, flag, True)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            results["errors"] += len(flagged)
+            logger.error(f"Error queueing deadline reminders: {str(e)}")
+            continue
+
+        queued = {task.idempotency_key for task in added}
+        for _, _, counter, key in flagged:
+            if key in queued:
+                results[counter] += 1
+
+    total_sent = (
+        results["reminders_7_days"]
+        + results["reminders_3_days"]
+        + results["reminders_1_day"]
+        + results["overdue_notices"]
+    )
+    logger.info(
+        f"Deadline reminder check complete: {results['checked']} checked, "
+        f"{total_sent} reminders queued, {results['errors']} errors"
+    )
 
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error in check_and_send_reminders: {str(e)}")
-        raise
+    return results
 
 
 def _send_deadline_reminder(db, deadline, client, reminder_type, days_remaining):
@@ -772,3 +806,41 @@ def create_reinvestigation_deadline(
         start_date=start_date,
         days_allowed=45,
     )
+
+
+# Register the task handler for the scheduler
+from services.task_queue_service import register_task_handler  # noqa: E402
+
+
+@register_task_handler("send_deadline_reminder")
+def handle_send_deadline_reminder(payload):
+    """Task handler: send one queued reminder ({"deadline_id", "reminder_type"})"""
+    from database import CaseDeadline, Client, SessionLocal
+
+    db = SessionLocal()
+    try:
+        deadline = (
+            db.query(CaseDeadline)
+            .filter(CaseDeadline.id == payload["deadline_id"])
+            .first()
+        )
+        if not deadline or deadline.status != "active":
+            return {"success": True, "skipped": "deadline no longer active"}
+
+        client = db.query(Client).filter(Client.id == deadline.client_id).first()
+        if not client or not client.email:
+            return {"success": False, "skipped": "no client email"}
+
+        days_remaining = (deadline.deadline_date - date.today()).days
+        sent = _send_deadline_reminder(
+            db, deadline, client, payload["reminder_type"], days_remaining
+        )
+        db.commit()
+        if not sent:
+            # Let the task queue retry the send
+            raise RuntimeError(
+                f"Failed to send {payload['reminder_type']} reminder for deadline {deadline.id}"
+            )
+        return {"success": True, "deadline_id": deadline.id}
+    finally:
+        db.close()
@@ -81,23 +81,63 @@ def get_client_email_html(analysis_id):
 END OF ROUTES TO ADD
 """
 
+import importlib.util
 import os
+import threading
 from datetime import datetime
 
-# WeasyPrint imports - lazy loaded to allow import of HTML generators without WeasyPrint
-try:
-    from weasyprint import CSS, HTML
-    from weasyprint.text.fonts import FontConfiguration
+# WeasyPrint (and the pango/fontTools stack under it) is imported on the first
+# html_to_pdf call rather than at app boot; the HTML generators never need it
+WEASYPRINT_AVAILABLE = importlib.util.find_spec("weasyprint") is not None
+HTML = None
+CSS = None
+FontConfiguration = None
+
+
+def _load_weasyprint():
+    global HTML, CSS, FontConfiguration
+    if HTML is None:
+        from weasyprint import CSS as _CSS
+        from weasyprint import HTML as _HTML
+        from weasyprint.text.fonts import FontConfiguration as _FontConfiguration
+
+        CSS, FontConfiguration, HTML = _CSS, _FontConfiguration, _HTML
+
+
+# Print rules shared by every report; compiled once per thread with its own
+# FontConfiguration (neither object is safe to share between threads)
+PRINT_CSS = """
+    @page {
+        size: letter;
+        margin: 0;
+    }
+    body {
+        -webkit-print-color-adjust: exact !important;
+        print-color-adjust: exact !important;
+    }
+    .page {
+        page-break-after: always;
+    }
+    .no-break {
+        page-break-inside: avoid;
+    }
+"""
+
+_stylesheets = threading.local()
 
-    WEASYPRINT_AVAILABLE = True
-except ImportError:
-    HTML = None
-    CSS = None
-    FontConfiguration = None
-    WEASYPRINT_AVAILABLE = False
 
+def _print_stylesheet():
+    """(FontConfiguration, print CSS) for this thread, built on first use"""
+    cached = getattr(_stylesheets, "value", None)
+    if cached is None:
+        _load_weasyprint()
+        font_config = FontConfiguration()
+        cached = (font_config, CSS(string=PRINT_CSS, font_config=font_config))
+        _stylesheets.value = cached
+    return cached
 
-def html_to_pdf(html_content, output_path, base_url=None):
+
+def html_to_pdf(html_content, output_path, base_url=None, print_css=True):
     """
     Convert Apple-style HTML to PDF using WeasyPrint.
 
@@ -105,6 +145,8 @@ def html_to_pdf(html_content, output_path, base_url=None):
         html_content (str): Complete HTML string with embedded CSS
         output_path (str): Path to save the PDF file
         base_url (str, optional): Base URL for resolving relative paths
+        print_css (bool): Apply PRINT_CSS (letter size, no margins); pass
+            False for documents that bring their own @page rules
 
     Returns:
         str: Path to the generated PDF
@@ -123,37 +165,20 @@ def html_to_pdf(html_content, output_path, base_url=None):
         raise ImportError(
             "WeasyPrint is not installed. " "Install with: pip install weasyprint"
         )
+    _load_weasyprint()
 
     # Ensure output directory exists
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    # Configure font handling for Google Fonts
-    font_config = FontConfiguration()
-
-    # Add print-specific CSS to preserve colors and handle page breaks
-    print_css = CSS(
-        string="""
-        @page {
-            size: letter;
-            margin: 0;
-        }
-        body {
-            -webkit-print-color-adjust: exact !important;
-            print-color-adjust: exact !important;
-        }
-        .page {
-            page-break-after: always;
-        }
-        .no-break {
-            page-break-inside: avoid;
-        }
-    """,
-        font_config=font_config,
-    )
+    font_config, stylesheet = _print_stylesheet()
 
     # Generate PDF
     html_obj = HTML(string=html_content, base_url=base_url)
-    html_obj.write_pdf(output_path, stylesheets=[print_css], font_config=font_config)
+    html_obj.write_pdf(
+        output_path,
+        stylesheets=[stylesheet] if print_css else None,
+        font_config=font_config,
+    )
 
     return output_path
 
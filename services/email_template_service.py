@@ -17,6 +17,7 @@ from services.email_templates import (
     SECONDARY_COLOR,
     get_base_template,
 )
+from services.template_engine import render_fields
 
 # Template categories
 TEMPLATE_CATEGORIES = {
@@ -427,30 +428,30 @@ class EmailTemplateService:
         variables.setdefault("company_name", COMPANY_NAME)
         variables.setdefault("current_date", datetime.now().strftime("%B %d, %Y"))
 
-        # Substitute variables in subject
-        subject = template["subject"]
-        for key, value in variables.items():
-            subject = subject.replace(f"{{{key}}}", str(value))
-
-        # Substitute variables in HTML content
-        html_content = template["html_content"] or ""
-        for key, value in variables.items():
-            html_content = html_content.replace(f"{{{key}}}", str(value))
+        rendered, missing = render_fields(
+            "email",
+            template["id"],
+            template.get("updated_at"),
+            {
+                "subject": template["subject"],
+                "html": template["html_content"],
+                "plain_text": template["plain_text_content"],
+            },
+            variables,
+        )
+        subject = rendered["subject"]
+        html_content = rendered["html"]
 
         # Wrap in base template if not already wrapped
         if "<html>" not in html_content.lower():
             html_content = get_base_template(html_content, subject)
 
-        # Substitute variables in plain text
-        plain_text = template["plain_text_content"] or ""
-        for key, value in variables.items():
-            plain_text = plain_text.replace(f"{{{key}}}", str(value))
-
         return {
             "success": True,
             "subject": subject,
             "html": html_content,
-            "plain_text": plain_text,
+            "plain_text": rendered["plain_text"],
+            "missing_variables": missing,
             "template_id": template["id"],
             "template_type": template["template_type"],
         }
@@ -1,15 +1,29 @@
 """
 Encryption service for sensitive data storage.
 Uses Fernet symmetric encryption with environment-managed key.
+
+Key rotation: put the new key in FCRA_ENCRYPTION_KEY and the previous one(s)
+in FCRA_ENCRYPTION_OLD_KEYS (comma-separated). New values are encrypted with
+the current key; values under a retired key still decrypt. Run the
+"rotate_encryption_keys" task (services/key_rotation_service.py) to
+re-encrypt stored values, then drop the old key.
 """
 
 import base64
+import logging
 import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+logger = logging.getLogger(__name__)
+
+REENCRYPT_CHUNK_SIZE = 500
+
 
 def get_encryption_key():
     """Get encryption key from environment - fails if not configured."""
@@ -26,6 +40,11 @@ def get_encryption_key():
                 'Generate one with: python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"'
             )
 
+    return _normalize_key(key)
+
+
+def _normalize_key(key):
+    """Accept a Fernet key, or pad/truncate a passphrase to 32 bytes"""
     if isinstance(key, str):
         try:
             key_bytes = (
@@ -43,12 +62,47 @@ def get_encryption_key():
     return key_bytes
 
 
+def get_retired_keys() -> List[bytes]:
+    """Previous keys from FCRA_ENCRYPTION_OLD_KEYS, still accepted for decryption"""
+    raw = os.environ.get("FCRA_ENCRYPTION_OLD_KEYS", "")
+    return [_normalize_key(k.strip()) for k in raw.split(",") if k.strip()]
+
+
+# Built Fernet instances, keyed by the environment they were built from so
+# tests (and key changes) that rewrite the variables get a fresh set
+_ciphers: Optional[Tuple[Tuple[Optional[str], str], Fernet, MultiFernet]] = None
+_ciphers_lock = threading.Lock()
+
+
+def _key_config() -> Tuple[Optional[str], str]:
+    return (
+        os.environ.get("FCRA_ENCRYPTION_KEY"),
+        os.environ.get("FCRA_ENCRYPTION_OLD_KEYS", ""),
+    )
+
+
+def _get_ciphers() -> Tuple[Fernet, MultiFernet]:
+    """(current-key Fernet, MultiFernet over current + retired keys)"""
+    global _ciphers
+    cached = _ciphers
+    if cached is not None and cached[0] == _key_config():
+        return cached[1], cached[2]
+
+    with _ciphers_lock:
+        primary = Fernet(get_encryption_key())  # may generate a key in tests
+        multi = MultiFernet([primary] + [Fernet(k) for k in get_retired_keys()])
+        _ciphers = (_key_config(), primary, multi)
+        return primary, multi
+
+
 def get_fernet():
     """Get Fernet instance with current key"""
-    key = get_encryption_key()
-    if isinstance(key, str):
-        key = key.encode()
-    return Fernet(key)
+    return _get_ciphers()[0]
+
+
+def get_multi_fernet() -> MultiFernet:
+    """MultiFernet that encrypts with the current key and decrypts with any"""
+    return _get_ciphers()[1]
 
 
 def encrypt_value(plaintext: str) -> str:
@@ -69,6 +123,12 @@ def encrypt_value(plaintext: str) -> str:
     return encrypted.decode()
 
 
+def encrypt_many(values: Iterable[Optional[str]]) -> List[str]:
+    """encrypt_value for a batch, resolving the key once"""
+    f = get_fernet()
+    return [f.encrypt(v.encode()).decode() if v else "" for v in values]
+
+
 def decrypt_value(ciphertext: str) -> str:
     """
     Decrypt a base64-encoded ciphertext string.
@@ -83,7 +143,7 @@ def decrypt_value(ciphertext: str) -> str:
         return ""
 
     try:
-        f = get_fernet()
+        f = get_multi_fernet()
         decrypted = f.decrypt(ciphertext.encode())
         return decrypted.decode()
     except Exception as e:
@@ -91,6 +151,47 @@ def decrypt_value(ciphertext: str) -> str:
         return ciphertext
 
 
+def decrypt_many(values: Iterable[Optional[str]]) -> List[str]:
+    """decrypt_value for a batch, resolving the keys once.
+
+    Values that fail to decrypt are returned unchanged, as in decrypt_value,
+    with one summary warning for the batch.
+    """
+    f = get_multi_fernet()
+    results = []
+    failed = 0
+    for value in values:
+        if not value:
+            results.append("")
+            continue
+        try:
+            results.append(f.decrypt(value.encode()).decode())
+        except Exception:
+            failed += 1
+            results.append(value)
+    if failed:
+        logger.warning(f"Decryption failed for {failed} value(s) (may be plaintext)")
+    return results
+
+
+def reencrypt_value(value: str) -> Optional[str]:
+    """Bring a stored value up to the current key.
+
+    Returns the new ciphertext for plaintext values and values under a
+    retired key, or None when the value is already under the current key.
+    Raises InvalidToken for ciphertext that no configured key can read.
+    """
+    primary, multi = _get_ciphers()
+    if not is_encrypted(value):
+        return primary.encrypt(value.encode()).decode()
+    token = value.encode()
+    try:
+        primary.extract_timestamp(token)  # HMAC check only, no decryption
+        return None
+    except InvalidToken:
+        return multi.rotate(token).decode()
+
+
 def is_encrypted(value: str) -> bool:
     """Check if a value appears to be Fernet-encrypted"""
     if not value:
@@ -102,32 +203,81 @@ def is_encrypted(value: str) -> bool:
         return False
 
 
+def reencrypt_column(
+    db_session,
+    model,
+    column: str,
+    after_id: int = 0,
+    rotate: bool = True,
+    chunk_size: int = REENCRYPT_CHUNK_SIZE,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Encrypt plaintext values in one column and, with rotate, re-encrypt
+    values under retired keys.
+
+    Walks the table by primary key in chunks, reading only (id, column), and
+    writes each chunk with one bulk update and commit. Stops early once
+    time.monotonic() passes `deadline`; pass the returned last_id back as
+    after_id to resume.
+    """
+    id_col = model.id
+    value_col = getattr(model, column)
+    stats = {"scanned": 0, "encrypted": 0, "rotated": 0, "unreadable": 0}
+    last_id = after_id
+    done = False
+
+    while True:
+        rows = (
+            db_session.query(id_col, value_col)
+            .filter(id_col > last_id, value_col.isnot(None), value_col != "")
+            .order_by(id_col)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            done = True
+            break
+
+        updates = []
+        for row_id, value in rows:
+            if not is_encrypted(value):
+                updates.append({"id": row_id, column: encrypt_value(value)})
+                stats["encrypted"] += 1
+            elif rotate:
+                try:
+                    new_value = reencrypt_value(value)
+                except InvalidToken:
+                    stats["unreadable"] += 1
+                    continue
+                if new_value is not None:
+                    updates.append({"id": row_id, column: new_value})
+                    stats["rotated"] += 1
+
+        if updates:
+            db_session.bulk_update_mappings(model, updates)
+            db_session.commit()
+
+        stats["scanned"] += len(rows)
+        last_id = rows[-1][0]
+        if len(rows) < chunk_size:
+            done = True
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+
+    return {**stats, "last_id": last_id, "done": done}
+
+
 def migrate_plaintext_to_encrypted(db_session, Client):
     """
     Migrate existing plaintext passwords to encrypted format.
-    Run this once to encrypt all existing passwords.
+    Runs at startup; reads only the password column, in chunks.
     """
-    from database import get_db
-
-    migrated = 0
-    clients = (
-        db_session.query(Client)
-        .filter(
-            Client.credit_monitoring_password_encrypted.isnot(None),
-            Client.credit_monitoring_password_encrypted != "",
-        )
-        .all()
-    )
-
-    for client in clients:
-        current_value = client.credit_monitoring_password_encrypted
-        if current_value and not is_encrypted(current_value):
-            encrypted = encrypt_value(current_value)
-            client.credit_monitoring_password_encrypted = encrypted
-            migrated += 1
+    migrated = reencrypt_column(
+        db_session, Client, "credit_monitoring_password_encrypted", rotate=False
+    )["encrypted"]
 
     if migrated > 0:
-        db_session.commit()
         print(f"✅ Migrated {migrated} plaintext passwords to encrypted format")
 
     return migrated
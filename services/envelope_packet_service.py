@@ -16,6 +16,7 @@ import io
 import logging
 import os
 from datetime import datetime
+from types import SimpleNamespace
 from typing import Any, Dict, List, Optional, Tuple
 
 from reportlab.lib import colors
@@ -35,6 +36,13 @@ from reportlab.platypus import (
 )
 
 from database import Client, SessionLocal
+from services.packet_pipeline import (
+    component_cache,
+    content_key,
+    map_in_packet_pool,
+    merge_pdfs,
+    use_packet_pool,
+)
 from services.sendcertified_service import (
     SendCertifiedService,
     get_sendcertified_service,
@@ -445,6 +453,7 @@ class EnvelopePacketService:
         ftc_report_content: Optional[str] = None,
         police_report_content: Optional[str] = None,
         include_placeholders: bool = True,
+        rendered_reports: Optional[Dict[str, bytes]] = None,
     ) -> Tuple[bytes, Dict[str, Any]]:
         """
         Create a complete envelope packet for a single bureau.
@@ -457,13 +466,13 @@ class EnvelopePacketService:
             ftc_report_content: FTC report content (optional)
             police_report_content: Police report content (optional)
             include_placeholders: Whether to include placeholder pages for ID/address
+            rendered_reports: FTC / police report PDFs already rendered for
+                this client, filled in as they are rendered
 
         Returns:
             Tuple of (PDF bytes, metadata dict)
         """
-        from PyPDF2 import PdfMerger, PdfReader
-
-        merger = PdfMerger()
+        parts = []
         documents_included = []
 
         # 1. Cover Sheet
@@ -472,31 +481,33 @@ class EnvelopePacketService:
             client_name=client.name,
             accounts_disputed=accounts,
         )
-        merger.append(io.BytesIO(cover_pdf))
+        parts.append(cover_pdf)
         documents_included.append("Cover Sheet")
 
         # 2. §605B Letter (convert HTML to PDF)
         letter_pdf = self._html_to_pdf(letter_content, title=f"605B Letter - {bureau}")
-        merger.append(io.BytesIO(letter_pdf))
+        parts.append(letter_pdf)
         documents_included.append("§605B Block Request Letter")
 
         # 3. FTC Report (if provided)
         if ftc_report_content:
-            ftc_pdf = self._html_to_pdf(
-                ftc_report_content, title="FTC Identity Theft Report"
+            ftc_pdf = self._report_pdf(
+                ftc_report_content, "FTC Identity Theft Report", rendered_reports
             )
-            merger.append(io.BytesIO(ftc_pdf))
+            parts.append(ftc_pdf)
             documents_included.append("FTC Identity Theft Report")
 
         # 4. Police Report (if provided)
         if police_report_content:
-            police_pdf = self._html_to_pdf(police_report_content, title="Police Report")
-            merger.append(io.BytesIO(police_pdf))
+            police_pdf = self._report_pdf(
+                police_report_content, "Police Report", rendered_reports
+            )
+            parts.append(police_pdf)
             documents_included.append("Police Report")
 
         # 5. ID Placeholder
         if include_placeholders:
-            id_placeholder = self.create_placeholder_page(
+            id_placeholder = self._cached_placeholder_page(
                 title="GOVERNMENT-ISSUED ID COPY",
                 instructions=[
                     "Remove this page and replace with a clear copy of your:",
@@ -508,12 +519,12 @@ class EnvelopePacketService:
                     "Make sure all text is legible in the copy.",
                 ],
             )
-            merger.append(io.BytesIO(id_placeholder))
+            parts.append(id_placeholder)
             documents_included.append("ID Placeholder (NEEDS CLIENT DOCUMENT)")
 
         # 6. Proof of Address Placeholder
         if include_placeholders:
-            address_placeholder = self.create_placeholder_page(
+            address_placeholder = self._cached_placeholder_page(
                 title="PROOF OF ADDRESS",
                 instructions=[
                     "Remove this page and replace with a recent document showing your address:",
@@ -525,15 +536,13 @@ class EnvelopePacketService:
                     "The address must match what's on your credit report.",
                 ],
             )
-            merger.append(io.BytesIO(address_placeholder))
+            parts.append(address_placeholder)
             documents_included.append(
                 "Address Proof Placeholder (NEEDS CLIENT DOCUMENT)"
             )
 
         # Merge all PDFs
-        output = io.BytesIO()
-        merger.write(output)
-        merger.close()
+        packet_pdf, page_count = merge_pdfs(parts)
 
         bureau_info = BUREAU_FRAUD_ADDRESSES.get(bureau, {})
 
@@ -550,12 +559,12 @@ class EnvelopePacketService:
             },
             "accounts_count": len(accounts),
             "documents_included": documents_included,
-            "page_count": self._count_pages(output.getvalue()),
+            "page_count": page_count,
             "created_at": datetime.now().isoformat(),
             "needs_client_documents": include_placeholders,
         }
 
-        return output.getvalue(), metadata
+        return packet_pdf, metadata
 
     def create_all_bureau_packets(
         self,
@@ -578,25 +587,46 @@ class EnvelopePacketService:
         Returns:
             Dict mapping bureau name to (PDF bytes, metadata)
         """
-        packets = {}
+        bureaus = [
+            bureau
+            for bureau in ["Experian", "Equifax", "TransUnion"]
+            if accounts_by_bureau.get(bureau) and letters_by_bureau.get(bureau)
+        ]
 
-        for bureau in ["Experian", "Equifax", "TransUnion"]:
-            accounts = accounts_by_bureau.get(bureau, [])
-            letter_content = letters_by_bureau.get(bureau)
-
-            if accounts and letter_content:
-                pdf_bytes, metadata = self.create_bureau_packet(
-                    bureau=bureau,
-                    client=client,
-                    accounts=accounts,
-                    letter_content=letter_content,
-                    ftc_report_content=ftc_report_content,
-                    police_report_content=police_report_content,
-                )
-                packets[bureau] = (pdf_bytes, metadata)
-                logger.info(
-                    f"Created packet for {bureau}: {metadata['page_count']} pages, {len(accounts)} accounts"
-                )
+        # The client's FTC and police reports are rendered once, here, and
+        # every bureau's build gets the bytes; they are not kept after this call
+        rendered_reports: Dict[str, bytes] = {}
+        if ftc_report_content:
+            self._report_pdf(ftc_report_content, "FTC Identity Theft Report", rendered_reports)
+        if police_report_content:
+            self._report_pdf(police_report_content, "Police Report", rendered_reports)
+
+        jobs = [
+            {
+                "bureau": bureau,
+                "client_id": client.id,
+                "client_name": client.name,
+                "accounts": accounts_by_bureau[bureau],
+                "letter_content": letters_by_bureau[bureau],
+                "ftc_report_content": ftc_report_content,
+                "police_report_content": police_report_content,
+                "rendered_reports": rendered_reports,
+            }
+            for bureau in bureaus
+        ]
+
+        # Bureaus are built in parallel in the packet worker pool
+        if use_packet_pool(len(jobs)):
+            built = map_in_packet_pool(_build_bureau_packet, jobs)
+        else:
+            built = [_build_bureau_packet(job, service=self) for job in jobs]
+
+        packets = {}
+        for bureau, (pdf_bytes, metadata) in zip(bureaus, built):
+            packets[bureau] = (pdf_bytes, metadata)
+            logger.info(
+                f"Created packet for {bureau}: {metadata['page_count']} pages, {len(accounts_by_bureau[bureau])} accounts"
+            )
 
         return packets
 
@@ -720,10 +750,30 @@ class EnvelopePacketService:
         doc.build(elements)
         return buffer.getvalue()
 
+    def _report_pdf(
+        self,
+        html_content: str,
+        title: str,
+        rendered_reports: Optional[Dict[str, bytes]] = None,
+    ) -> bytes:
+        """_html_to_pdf, reusing a render from the same set of packets"""
+        if rendered_reports is None:
+            return self._html_to_pdf(html_content, title=title)
+        if title not in rendered_reports:
+            rendered_reports[title] = self._html_to_pdf(html_content, title=title)
+        return rendered_reports[title]
+
+    def _cached_placeholder_page(self, title: str, instructions: List[str]) -> bytes:
+        """create_placeholder_page, rendered once per distinct page"""
+        return component_cache.get_or_render(
+            content_key("placeholder", title, instructions),
+            lambda: self.create_placeholder_page(title=title, instructions=instructions),
+        )
+
     def _count_pages(self, pdf_bytes: bytes) -> int:
         """Count pages in a PDF"""
         try:
-            from PyPDF2 import PdfReader
+            from pypdf import PdfReader
 
             reader = PdfReader(io.BytesIO(pdf_bytes))
             return len(reader.pages)
@@ -734,3 +784,67 @@ class EnvelopePacketService:
 def get_envelope_packet_service() -> EnvelopePacketService:
     """Factory function to get EnvelopePacketService instance"""
     return EnvelopePacketService()
+
+
+# =============================================================================
+# Packet worker pool jobs
+# =============================================================================
+
+_worker_service: Optional[EnvelopePacketService] = None
+
+
+def _get_worker_service() -> EnvelopePacketService:
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = EnvelopePacketService()
+    return _worker_service
+
+
+def _build_bureau_packet(
+    job: Dict[str, Any], service: Optional[EnvelopePacketService] = None
+) -> Tuple[bytes, Dict[str, Any]]:
+    """Build one bureau's packet; runs in a pool worker (or inline)"""
+    service = service or _get_worker_service()
+    return service.create_bureau_packet(
+        bureau=job["bureau"],
+        client=SimpleNamespace(id=job["client_id"], name=job["client_name"]),
+        accounts=job["accounts"],
+        letter_content=job["letter_content"],
+        ftc_report_content=job.get("ftc_report_content"),
+        police_report_content=job.get("police_report_content"),
+        rendered_reports=dict(job.get("rendered_reports") or {}),
+    )
+
+
+def _build_client_packets(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Build one client's envelope packets; runs in a pool worker (or inline)"""
+    client = SimpleNamespace(id=job["client_id"], name=job["client_name"])
+    try:
+        packets = _get_worker_service().create_all_bureau_packets(
+            client=client,
+            accounts_by_bureau=job["accounts_by_bureau"],
+            letters_by_bureau=job["letters_by_bureau"],
+            ftc_report_content=job.get("ftc_report_content"),
+            police_report_content=job.get("police_report_content"),
+        )
+        return {"client_id": job["client_id"], "success": True, "packets": packets}
+    except Exception as e:
+        logger.error(f"Packet build failed for client {job['client_id']}: {e}")
+        return {"client_id": job["client_id"], "success": False, "error": str(e)}
+
+
+def build_round_packets(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build envelope packets for a round of clients, one client per pool worker.
+
+    Args:
+        jobs: One dict per client with client_id, client_name,
+            accounts_by_bureau, letters_by_bureau and optionally
+            ftc_report_content / police_report_content
+
+    Returns:
+        One result per job, in order: {client_id, success, packets | error}
+    """
+    if use_packet_pool(len(jobs)):
+        return map_in_packet_pool(_build_client_packets, jobs)
+    return [_build_client_packets(job) for job in jobs]
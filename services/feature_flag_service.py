@@ -5,7 +5,9 @@ Provides feature flag functionality for safe feature rollouts:
 - Simple on/off flags
 - Percentage-based rollouts
 - User/role targeting
-- Caching for performance
+- In-process flag snapshot: every flag is loaded in one query and held as
+  an immutable map, so evaluations do no database work in steady state
+- Evaluation counts kept per worker and written in bulk
 - Decorator and context manager support
 
 Usage:
@@ -36,18 +38,144 @@ Usage:
 import functools
 import hashlib
 import logging
+import os
 import threading
 import time
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from services.shared_state import SharedGeneration
 
 logger = logging.getLogger(__name__)
 
-# Cache configuration
-CACHE_TTL_SECONDS = 60  # Cache flags for 1 minute
-_cache: Dict[str, Any] = {}
-_cache_timestamps: Dict[str, float] = {}
-_cache_lock = threading.RLock()
+# Snapshot configuration. Writes through this service take effect in every
+# worker within about a second (shared version counter); CACHE_TTL_SECONDS
+# bounds how long a change made directly in the database can go unseen.
+CACHE_TTL_SECONDS = 60
+EVALUATION_FLUSH_INTERVAL = 30
+
+
+class FlagSnapshot:
+    """Immutable view of every flag, loaded in one query.
+
+    flags maps key -> (read-only flag dict, expires_at). A refresh builds a
+    new snapshot and swaps the module reference, so readers never lock.
+    """
+
+    __slots__ = ("flags", "loaded_at")
+
+    def __init__(self, flags: Mapping[str, Tuple[Mapping[str, Any], Optional[datetime]]]):
+        self.flags = MappingProxyType(dict(flags))
+        self.loaded_at = time.monotonic()
+
+    @classmethod
+    def load(cls, db) -> "FlagSnapshot":
+        from database import FeatureFlag
+
+        return cls(
+            {
+                flag.key: (MappingProxyType(flag.to_dict()), flag.expires_at)
+                for flag in db.query(FeatureFlag).all()
+            }
+        )
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.loaded_at > CACHE_TTL_SECONDS
+
+
+_snapshot: Optional[FlagSnapshot] = None
+_snapshot_lock = threading.Lock()
+_snapshot_version = SharedGeneration("feature_flags")
+
+# Per-worker evaluation counts. Incremented without a lock (a lost increment
+# under a thread race only skews an audit counter) and swapped out on flush.
+_evaluation_counts: Dict[str, int] = {}
+_flush_thread: Optional[threading.Thread] = None
+
+
+@functools.lru_cache(maxsize=65536)
+def _rollout_bucket(flag_key: str, user_id: int) -> int:
+    """Stable 0-99 bucket for a user in a flag's percentage rollout"""
+    hash_input = f"{flag_key}:{user_id}"
+    return int(hashlib.md5(hash_input.encode()).hexdigest(), 16) % 100
+
+
+def _record_evaluation(key: str) -> None:
+    counts = _evaluation_counts
+    counts[key] = counts.get(key, 0) + 1
+    if _flush_thread is None and os.environ.get("TESTING", "").lower() != "true":
+        start_evaluation_flush_thread()
+
+
+def flush_evaluation_counts(db=None) -> int:
+    """Add buffered evaluation counts to feature_flags in one executemany
+
+    Returns the number of flags updated.
+    """
+    global _evaluation_counts
+    counts, _evaluation_counts = _evaluation_counts, {}
+    if not counts:
+        return 0
+
+    from sqlalchemy import bindparam, func
+
+    from database import FeatureFlag, SessionLocal
+
+    session = db or SessionLocal()
+    try:
+        table = FeatureFlag.__table__
+        now = datetime.utcnow()
+        session.execute(
+            table.update()
+            .where(table.c.key == bindparam("flag_key"))
+            .values(
+                evaluation_count=func.coalesce(table.c.evaluation_count, 0)
+                + bindparam("evaluations"),
+                last_evaluated_at=now,
+            ),
+            [{"flag_key": k, "evaluations": n} for k, n in counts.items()],
+        )
+        session.commit()
+        return len(counts)
+    except Exception as e:
+        session.rollback()
+        logger.warning(f"Feature flag evaluation flush failed: {e}")
+        for key, n in counts.items():
+            _evaluation_counts[key] = _evaluation_counts.get(key, 0) + n
+        return 0
+    finally:
+        if db is None:
+            session.close()
+
+
+def start_evaluation_flush_thread() -> None:
+    """Flush evaluation counts in the background (one thread per process)"""
+    global _flush_thread
+    with _snapshot_lock:
+        if _flush_thread is not None and _flush_thread.is_alive():
+            return
+
+        def flush_loop():
+            while True:
+                time.sleep(EVALUATION_FLUSH_INTERVAL)
+                flush_evaluation_counts()
+
+        _flush_thread = threading.Thread(
+            target=flush_loop, name="feature-flag-flush", daemon=True
+        )
+        _flush_thread.start()
+
+
+def _reset_after_fork() -> None:
+    global _evaluation_counts, _flush_thread, _snapshot_lock
+    _evaluation_counts = {}
+    _flush_thread = None
+    _snapshot_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
 
 # =============================================================================
@@ -174,49 +302,28 @@ class FeatureFlagService:
         if key in self._local_overrides:
             return self._local_overrides[key]
 
-        # Check cache
-        cached = self._get_from_cache(key)
-        if cached is not None:
-            return self._evaluate_flag(cached, user_id, user_role, context)
-
-        # Get from database
-        db = self._get_db()
         try:
-            from database import FeatureFlag
-
-            flag = db.query(FeatureFlag).filter_by(key=key).first()
-
-            if flag is None:
-                logger.debug(
-                    f"Feature flag '{key}' not found, using default: {default}"
-                )
-                return default
-
-            # Check expiration
-            if flag.is_expired():
-                logger.debug(f"Feature flag '{key}' has expired")
-                return default
-
-            # Update evaluation stats
-            flag.last_evaluated_at = datetime.utcnow()
-            flag.evaluation_count = (flag.evaluation_count or 0) + 1
-            db.commit()
-
-            # Cache the flag
-            self._set_cache(key, flag.to_dict())
-
-            return self._evaluate_flag(flag.to_dict(), user_id, user_role, context)
-
+            snapshot = self._get_snapshot()
         except Exception as e:
             logger.error(f"Error checking feature flag '{key}': {e}")
             return default
-        finally:
-            if self._should_close_db():
-                db.close()
+
+        entry = snapshot.flags.get(key)
+        if entry is None:
+            logger.debug(f"Feature flag '{key}' not found, using default: {default}")
+            return default
+
+        flag_data, expires_at = entry
+        if expires_at is not None and datetime.utcnow() > expires_at:
+            logger.debug(f"Feature flag '{key}' has expired")
+            return default
+
+        _record_evaluation(key)
+        return self._evaluate_flag(flag_data, user_id, user_role, context)
 
     def _evaluate_flag(
         self,
-        flag_data: Dict[str, Any],
+        flag_data: Mapping[str, Any],
         user_id: Optional[int],
         user_role: Optional[str],
         context: Optional[Dict[str, Any]],
@@ -296,12 +403,7 @@ class FeatureFlagService:
         if percentage <= 0:
             return False
 
-        # Create a consistent hash
-        hash_input = f"{flag_key}:{user_id}"
-        hash_value = int(hashlib.md5(hash_input.encode()).hexdigest(), 16)
-        bucket = hash_value % 100
-
-        return bucket < percentage
+        return _rollout_bucket(flag_key, user_id) < percentage
 
     # -------------------------------------------------------------------------
     # Flag Management
@@ -516,40 +618,46 @@ class FeatureFlagService:
         self._local_overrides.clear()
 
     # -------------------------------------------------------------------------
-    # Caching
+    # Snapshot
     # -------------------------------------------------------------------------
 
-    def _get_from_cache(self, key: str) -> Optional[Dict[str, Any]]:
-        """Get flag from cache if not expired."""
-        with _cache_lock:
-            if key not in _cache:
-                return None
-
-            timestamp = _cache_timestamps.get(key, 0)
-            if time.time() - timestamp > CACHE_TTL_SECONDS:
-                del _cache[key]
-                del _cache_timestamps[key]
-                return None
-
-            return _cache[key]
-
-    def _set_cache(self, key: str, value: Dict[str, Any]) -> None:
-        """Set flag in cache."""
-        with _cache_lock:
-            _cache[key] = value
-            _cache_timestamps[key] = time.time()
-
-    def _invalidate_cache(self, key: str) -> None:
-        """Invalidate a specific cache entry."""
-        with _cache_lock:
-            _cache.pop(key, None)
-            _cache_timestamps.pop(key, None)
+    def _get_snapshot(self) -> FlagSnapshot:
+        """Current flag snapshot, reloading it when another worker changed a
+        flag or it is older than CACHE_TTL_SECONDS."""
+        global _snapshot
+        if _snapshot_version.changed():
+            _snapshot = None
+        snapshot = _snapshot
+        if snapshot is not None and not snapshot.is_stale():
+            return snapshot
+
+        with _snapshot_lock:
+            if _snapshot is not None and _snapshot is not snapshot:
+                return _snapshot  # another thread just reloaded
+            db = self._get_db()
+            try:
+                _snapshot = FlagSnapshot.load(db)
+            except Exception as e:
+                if snapshot is None:
+                    raise
+                # Keep serving the expired snapshot until the database is back
+                logger.warning(f"Feature flag snapshot refresh failed: {e}")
+                snapshot.loaded_at = time.monotonic()
+                return snapshot
+            finally:
+                if self._should_close_db():
+                    db.close()
+            return _snapshot
+
+    def _invalidate_cache(self, key: Optional[str] = None) -> None:
+        """Drop the snapshot here and signal other workers to reload."""
+        self.clear_cache()
+        _snapshot_version.bump()
 
     def clear_cache(self) -> None:
-        """Clear entire cache."""
-        with _cache_lock:
-            _cache.clear()
-            _cache_timestamps.clear()
+        """Drop this worker's snapshot; the next evaluation reloads it."""
+        global _snapshot
+        _snapshot = None
 
     # -------------------------------------------------------------------------
     # Statistics
@@ -590,7 +698,7 @@ class FeatureFlagService:
                 "disabled_flags": total - enabled,
                 "expired_flags": expired,
                 "by_category": by_category,
-                "cache_size": len(_cache),
+                "cache_size": len(_snapshot.flags) if _snapshot else 0,
             }
 
         finally:
@@ -749,6 +857,7 @@ __all__ = [
     "is_enabled",
     "feature_flag",
     "FeatureFlagContext",
+    "flush_evaluation_counts",
     # Constants
     "FLAG_CATEGORIES",
     "DEFAULT_FLAGS",
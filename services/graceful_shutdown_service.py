@@ -280,7 +280,7 @@ def _register_default_handlers() -> None:
 
     # Priority 10: Stop accepting new requests (handled by Flask/Gunicorn)
 
-    # Priority 20: Shutdown cache cleanup threads
+    # Priority 20: Shutdown cache cleanup threads and the PDF / packet worker pools
     def shutdown_cache():
         try:
             from services.performance_service import app_cache
@@ -291,6 +291,49 @@ def _register_default_handlers() -> None:
 
     manager.register_handler("cache_cleanup", shutdown_cache, priority=20, timeout=5)
 
+    def shutdown_pdf_pool():
+        try:
+            from services.pdf_render_service import shutdown_pdf_render_service
+
+            shutdown_pdf_render_service()
+        except Exception:
+            pass
+
+    manager.register_handler("pdf_render_pool", shutdown_pdf_pool, priority=20, timeout=5)
+
+    def shutdown_packet_workers():
+        try:
+            from services.packet_pipeline import shutdown_packet_pool
+
+            shutdown_packet_pool()
+        except Exception:
+            pass
+
+    manager.register_handler("packet_pool", shutdown_packet_workers, priority=20, timeout=5)
+
+    # Priority 25: Write buffered API key usage, request logs and flag counts
+    def flush_api_usage():
+        try:
+            from services.api_access_service import api_usage_recorder
+
+            api_usage_recorder.shutdown()
+        except Exception:
+            pass
+
+    manager.register_handler("api_usage_flush", flush_api_usage, priority=25, timeout=5)
+
+    def flush_flag_evaluations():
+        try:
+            from services.feature_flag_service import flush_evaluation_counts
+
+            flush_evaluation_counts()
+        except Exception:
+            pass
+
+    manager.register_handler(
+        "feature_flag_flush", flush_flag_evaluations, priority=25, timeout=5
+    )
+
     # Priority 30: Close database connections
     def close_database():
         try:
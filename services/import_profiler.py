@@ -0,0 +1,148 @@
+"""
+Import-Time Profiler for Worker Boot
+
+Every gunicorn worker (and every test process) imports app.py, so anything
+it pulls in at module level is paid on each boot and restart. This runs
+`python -X importtime -c "import app"` in a fresh interpreter and reports the
+cost per module, so regressions show up as a number rather than as slow
+deploys.
+
+Usage:
+    python -m services.import_profiler                 # top 25 modules
+    python -m services.import_profiler --top 50
+    python -m services.import_profiler --budget 10     # exit 1 if over budget
+
+tests/test_import_profiler.py enforces STARTUP_BUDGET_SECONDS and checks
+that none of DEFERRED_MODULES are imported at boot.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+STARTUP_BUDGET_SECONDS = float(os.environ.get("STARTUP_BUDGET_SECONDS", "20"))
+
+# Heavy libraries only needed by a few routes. Code that uses them imports
+# them inside the function (or through a lazy accessor such as app.client).
+DEFERRED_MODULES = (
+    "anthropic",
+    "fpdf",
+    "reportlab",
+    "weasyprint",
+    "playwright",
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    """One line of -X importtime output (times in microseconds)"""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse the stderr of `python -X importtime`"""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            records.append(
+                ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth)
+            )
+        except ValueError:
+            continue
+    return records
+
+
+def profile_imports(
+    target: str = "app", env: Optional[Dict[str, str]] = None, timeout: int = 300
+) -> List[ImportRecord]:
+    """Import `target` in a fresh interpreter and return its import records"""
+    run_env = dict(os.environ)
+    run_env.setdefault("TESTING", "true")
+    run_env.setdefault("DATABASE_URL", "sqlite:///test_db.sqlite")
+    run_env.update(env or {})
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=PROJECT_ROOT,
+        env=run_env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def total_seconds(records: List[ImportRecord], target: str = "app") -> float:
+    """Cumulative import time of `target` itself"""
+    for record in records:
+        if record.name == target and record.depth == 0:
+            return record.cumulative_us / 1_000_000
+    return 0.0
+
+
+def loaded_modules(records: List[ImportRecord]) -> set:
+    return {record.name for record in records}
+
+
+def top_level_costs(records: List[ImportRecord], top: int = 25) -> List[ImportRecord]:
+    """Direct imports of the profiled module, most expensive first"""
+    direct = [record for record in records if record.depth == 1]
+    return sorted(direct, key=lambda r: r.cumulative_us, reverse=True)[:top]
+
+
+def format_report(records: List[ImportRecord], target: str = "app", top: int = 25) -> str:
+    """Human-readable boot cost report"""
+    total = total_seconds(records, target)
+    target_record = next(
+        (r for r in records if r.name == target and r.depth == 0), None
+    )
+    lines = [f"import {target}: {total:.2f}s total, {len(records)} modules"]
+    if target_record is not None:
+        lines.append(f"  module body: {target_record.self_us / 1000:.0f}ms")
+    lines.extend(["", f"{'cumulative':>12}  {'self':>9}  module"])
+    for record in top_level_costs(records, top):
+        lines.append(
+            f"{record.cumulative_us / 1000:10.1f}ms  {record.self_us / 1000:7.1f}ms  {record.name}"
+        )
+
+    eager = sorted(loaded_modules(records) & set(DEFERRED_MODULES))
+    if eager:
+        lines.extend(["", f"Deferred modules imported at boot: {', '.join(eager)}"])
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report per-module import cost")
+    parser.add_argument("--target", default="app", help="module to import")
+    parser.add_argument("--top", type=int, default=25, help="modules to list")
+    parser.add_argument(
+        "--budget", type=float, default=None, help="fail if boot exceeds N seconds"
+    )
+    args = parser.parse_args(argv)
+
+    records = profile_imports(args.target)
+    print(format_report(records, args.target, args.top))
+
+    if args.budget is not None and total_seconds(records, args.target) > args.budget:
+        print(f"\nOver startup budget of {args.budget:.1f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
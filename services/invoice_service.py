@@ -17,14 +17,6 @@ from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
-# PDF generation
-try:
-    from weasyprint import CSS, HTML
-
-    WEASYPRINT_AVAILABLE = True
-except ImportError:
-    WEASYPRINT_AVAILABLE = False
-
 from database import (
     INVOICE_ITEM_TYPES,
     INVOICE_STATUSES,
@@ -35,6 +27,9 @@ from database import (
     SessionLocal,
 )
 
+# PDF generation (rendered by the warm WeasyPrint pool in pdf_render_service)
+from services.document_generators import WEASYPRINT_AVAILABLE
+
 # Service configuration
 INVOICE_PREFIX = os.getenv("INVOICE_PREFIX", "INV")
 INVOICE_PDF_DIR = os.getenv("INVOICE_PDF_DIR", "static/invoices")
@@ -755,7 +750,9 @@ def generate_invoice_pdf(invoice_id: int) -> Dict[str, Any]:
         filename = f"{invoice.invoice_number}.pdf"
         filepath = os.path.join(INVOICE_PDF_DIR, filename)
 
-        HTML(string=html_content).write_pdf(filepath)
+        from services.pdf_render_service import get_pdf_render_service
+
+        get_pdf_render_service().render(html_content, filepath, print_css=False)
 
         # Update invoice
         invoice.pdf_filename = filename
@@ -0,0 +1,133 @@
+"""
+Key Rotation Service
+
+Re-encrypts every stored secret under the current FCRA_ENCRYPTION_KEY after
+a key change (the previous key goes in FCRA_ENCRYPTION_OLD_KEYS until this
+finishes). Plaintext values found along the way are encrypted too.
+
+Columns are processed one at a time in primary-key order, so a run can stop
+at any point and resume from its cursor. The "rotate_encryption_keys" task
+handler runs for a bounded time and re-enqueues itself with the cursor until
+every column is done.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.encryption import REENCRYPT_CHUNK_SIZE, reencrypt_column
+
+logger = logging.getLogger(__name__)
+
+# (model name in database.py, column) for every value written via encrypt_value
+ENCRYPTED_FIELDS: List[Tuple[str, str]] = [
+    ("Client", "credit_monitoring_password_encrypted"),
+    ("Client", "ssn_encrypted"),
+    ("Client", "tu_portal_password_encrypted"),
+    ("Client", "eq_portal_password_encrypted"),
+    ("Client", "exp_portal_password_encrypted"),
+    ("CreditMonitoringCredential", "password_encrypted"),
+    ("CreditMonitoringCredential", "ssn_last4_encrypted"),
+    ("Staff", "two_factor_secret"),
+    ("WhiteLabelTenant", "two_factor_secret"),
+    ("IntegrationConnection", "api_key_encrypted"),
+    ("IntegrationConnection", "api_secret_encrypted"),
+    ("WhiteLabelConfig", "email_from_address_encrypted"),
+]
+
+# How long one task run works before handing off to a continuation task
+TASK_TIME_BUDGET_SECONDS = 240
+
+
+class KeyRotationService:
+    """Resumable re-encryption of all ENCRYPTED_FIELDS"""
+
+    def __init__(self, db=None, chunk_size: int = REENCRYPT_CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def run(
+        self,
+        cursor: Optional[Dict[str, int]] = None,
+        time_budget: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Re-encrypt from `cursor` onwards.
+
+        Args:
+            cursor: {"field": index into ENCRYPTED_FIELDS, "after_id": id}
+                from a previous run's result; None starts from the beginning
+            time_budget: stop after roughly this many seconds
+
+        Returns:
+            Totals, per-field results, `done`, and the `cursor` to resume from
+        """
+        import database
+
+        cursor = cursor or {"field": 0, "after_id": 0}
+        deadline = time.monotonic() + time_budget if time_budget else None
+        totals = {"scanned": 0, "encrypted": 0, "rotated": 0, "unreadable": 0}
+        fields = []
+
+        db = self.db or database.SessionLocal()
+        try:
+            index, after_id = cursor["field"], cursor["after_id"]
+            while index < len(ENCRYPTED_FIELDS):
+                model_name, column = ENCRYPTED_FIELDS[index]
+                result = reencrypt_column(
+                    db,
+                    getattr(database, model_name),
+                    column,
+                    after_id=after_id,
+                    chunk_size=self.chunk_size,
+                    deadline=deadline,
+                )
+                for key in totals:
+                    totals[key] += result[key]
+                fields.append({"field": f"{model_name}.{column}", **result})
+                if result["unreadable"]:
+                    logger.warning(
+                        f"{result['unreadable']} value(s) in {model_name}.{column} "
+                        "could not be decrypted with any configured key"
+                    )
+
+                if not result["done"]:
+                    after_id = result["last_id"]
+                    break
+                index, after_id = index + 1, 0
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+        finally:
+            if self.db is None:
+                db.close()
+
+        done = index >= len(ENCRYPTED_FIELDS)
+        return {
+            "success": True,
+            "done": done,
+            "cursor": None if done else {"field": index, "after_id": after_id},
+            "fields": fields,
+            **totals,
+        }
+
+
+# Register the task handler for the scheduler
+from services.task_queue_service import register_task_handler  # noqa: E402
+
+
+@register_task_handler("rotate_encryption_keys")
+def handle_rotate_encryption_keys(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Task handler: re-encrypt for a bounded time, then enqueue the rest"""
+    from services.task_queue_service import TaskQueueService
+
+    result = KeyRotationService(
+        chunk_size=payload.get("chunk_size", REENCRYPT_CHUNK_SIZE)
+    ).run(
+        cursor=payload.get("cursor"),
+        time_budget=payload.get("time_budget", TASK_TIME_BUDGET_SECONDS),
+    )
+    if not result["done"]:
+        TaskQueueService.enqueue_task(
+            "rotate_encryption_keys", {**payload, "cursor": result["cursor"]}
+        )
+    return result
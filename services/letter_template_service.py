@@ -21,6 +21,7 @@ from database import (
     Violation,
     get_db,
 )
+from services.template_engine import blank_if_falsy, render_fields
 
 # Template categories
 CATEGORIES = {
@@ -679,34 +680,59 @@ class LetterTemplateService:
             if not template:
                 return {"success": False, "error": "Template not found"}
 
-            content = template.content
-            subject = template.subject or ""
-            footer = template.footer or ""
+            return self._render(template, variables)
 
-            # Substitute variables
-            for var_name, var_value in variables.items():
-                placeholder = "{" + var_name + "}"
-                content = content.replace(
-                    placeholder, str(var_value) if var_value else ""
-                )
-                subject = subject.replace(
-                    placeholder, str(var_value) if var_value else ""
-                )
-                footer = footer.replace(
-                    placeholder, str(var_value) if var_value else ""
-                )
+        finally:
+            self._close_db()
+
+    def render_template_batch(
+        self,
+        template_id: int,
+        variable_sets: List[Dict[str, Any]],
+    ) -> Dict:
+        """Render one template for many variable sets (one query, one compile)"""
+        db = self._get_db()
+        try:
+            template = (
+                db.query(LetterTemplate)
+                .filter(LetterTemplate.id == template_id)
+                .first()
+            )
+
+            if not template:
+                return {"success": False, "error": "Template not found"}
 
             return {
                 "success": True,
-                "subject": subject,
-                "content": content,
-                "footer": footer,
-                "full_content": f"{content}\n\n{footer}".strip(),
+                "results": [self._render(template, v) for v in variable_sets],
             }
 
         finally:
             self._close_db()
 
+    @staticmethod
+    def _render(template: LetterTemplate, variables: Dict[str, Any]) -> Dict:
+        rendered, missing = render_fields(
+            "letter",
+            template.id,
+            template.version,
+            {
+                "content": template.content,
+                "subject": template.subject,
+                "footer": template.footer,
+            },
+            variables,
+            formatter=blank_if_falsy,
+        )
+        return {
+            "success": True,
+            "subject": rendered["subject"],
+            "content": rendered["content"],
+            "footer": rendered["footer"],
+            "full_content": f"{rendered['content']}\n\n{rendered['footer']}".strip(),
+            "missing_variables": missing,
+        }
+
     def get_client_variables(
         self, client_id: int, bureau: Optional[str] = None
     ) -> Dict:
@@ -845,9 +871,7 @@ class LetterTemplateService:
                 variables.update(custom_variables)
 
             # Render content
-            render_result = self.render_template(template_id, variables)
-            if not render_result.get("success"):
-                return render_result
+            render_result = self._render(template, variables)
 
             # Create generated letter record
             generated = GeneratedLetter(
@@ -0,0 +1,555 @@
+"""
+Log Partition Service
+
+Monthly time partitioning and retention for the append-heavy log tables
+(audit_logs, api_requests, email_logs, sms_logs, ai_usage_logs,
+background_tasks).
+
+On PostgreSQL, tables converted with ``convert_to_partitioned`` are declared
+``PARTITION BY RANGE`` on their timestamp column with one partition per month
+(``<table>_pYYYYMM``) plus a default partition. Retention then detaches and
+drops whole months instead of running large DELETEs, and queries that filter
+on the timestamp column only touch the matching partitions.
+
+On SQLite (dev) and on PostgreSQL tables that have not been converted,
+retention falls back to rotating out old rows in small id-keyed batches so the
+write lock is held briefly and the WAL/journal stays small.
+
+Nothing is purged automatically: the scheduled maintenance only creates
+upcoming partitions, and retention runs for a table only when a retention
+period is passed for it explicitly (the audit and task cleanup endpoints, or
+the manual maintenance endpoint).
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, not_, text
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import AddConstraint
+
+from database import (
+    AIUsageLog,
+    APIRequest,
+    AuditLog,
+    BackgroundTask,
+    EmailLog,
+    SMSLog,
+    get_db,
+)
+
+logger = logging.getLogger(__name__)
+
+FINISHED_TASK_STATUSES = ["completed", "failed", "cancelled"]
+
+# table name -> partitioning/retention policy
+PARTITIONED_LOG_TABLES: Dict[str, Dict[str, Any]] = {
+    "audit_logs": {
+        "model": AuditLog,
+        "column": "timestamp",
+        # Compliance floor for explicit purges
+        "min_retention_days": 90,
+    },
+    "api_requests": {
+        "model": APIRequest,
+        "column": "created_at",
+    },
+    "email_logs": {
+        "model": EmailLog,
+        "column": "created_at",
+    },
+    "sms_logs": {
+        "model": SMSLog,
+        "column": "created_at",
+    },
+    "ai_usage_logs": {
+        "model": AIUsageLog,
+        "column": "created_at",
+    },
+    "background_tasks": {
+        "model": BackgroundTask,
+        "column": "created_at",
+        # Only finished tasks are eligible; pending/running rows are never dropped
+        "retention_column": "completed_at",
+    },
+}
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_MONTHS_AHEAD = 2
+
+
+def month_start(dt: datetime) -> datetime:
+    """Truncate a datetime to the first instant of its month"""
+    return datetime(dt.year, dt.month, 1)
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """Return the first of the month ``months`` after ``dt``'s month"""
+    index = dt.year * 12 + (dt.month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """Name of the monthly partition holding ``month`` for ``table``"""
+    return f"{table}_p{month.year:04d}{month.month:02d}"
+
+
+def parse_partition_month(table: str, name: str) -> Optional[datetime]:
+    """Inverse of partition_name; None for the default or foreign partitions"""
+    prefix = f"{table}_p"
+    suffix = name[len(prefix):] if name.startswith(prefix) else ""
+    if len(suffix) != 6 or not suffix.isdigit():
+        return None
+    year, month = int(suffix[:4]), int(suffix[4:])
+    if not 1 <= month <= 12:
+        return None
+    return datetime(year, month, 1)
+
+
+class LogPartitionService:
+    """Manages monthly partitions and retention for high-volume log tables"""
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _policy(table: str) -> Dict[str, Any]:
+        if table not in PARTITIONED_LOG_TABLES:
+            raise ValueError(f"Unknown log table: {table}")
+        return PARTITIONED_LOG_TABLES[table]
+
+    @staticmethod
+    def is_postgres(db: Session) -> bool:
+        """True when the session is bound to PostgreSQL"""
+        try:
+            return db.get_bind().dialect.name == "postgresql"
+        except Exception:
+            return False
+
+    def is_partitioned(self, db: Session, table: str) -> bool:
+        """True if ``table`` is a declaratively partitioned PostgreSQL table"""
+        if not self.is_postgres(db):
+            return False
+        row = db.execute(
+            text(
+                """
+                SELECT 1 FROM pg_partitioned_table pt
+                JOIN pg_class c ON c.oid = pt.partrelid
+                WHERE c.relname = :table
+                """
+            ),
+            {"table": table},
+        ).fetchone()
+        return row is not None
+
+    def list_partitions(self, db: Session, table: str) -> List[Tuple[str, Optional[datetime]]]:
+        """List (partition_name, month_start) for a partitioned table, oldest first.
+
+        The default partition is returned with a month of None.
+        """
+        rows = db.execute(
+            text(
+                """
+                SELECT c.relname FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                JOIN pg_class p ON p.oid = i.inhparent
+                WHERE p.relname = :table
+                """
+            ),
+            {"table": table},
+        ).fetchall()
+        partitions = [(r[0], parse_partition_month(table, r[0])) for r in rows]
+        return sorted(partitions, key=lambda p: (p[1] is None, p[1] or datetime.min))
+
+    def _has_inbound_foreign_keys(self, db: Session, table: str) -> bool:
+        row = db.execute(
+            text(
+                """
+                SELECT 1 FROM pg_constraint
+                WHERE contype = 'f' AND confrelid = CAST(:table AS regclass)
+                LIMIT 1
+                """
+            ),
+            {"table": table},
+        ).fetchone()
+        return row is not None
+
+    def _has_unique_indexes(self, db: Session, table: str) -> bool:
+        """True if ``table`` has a unique index or constraint besides its primary key"""
+        row = db.execute(
+            text(
+                """
+                SELECT 1 FROM pg_index
+                WHERE indrelid = CAST(:table AS regclass)
+                  AND indisunique AND NOT indisprimary
+                LIMIT 1
+                """
+            ),
+            {"table": table},
+        ).fetchone()
+        return row is not None
+
+    # ------------------------------------------------------------------
+    # Partition management (PostgreSQL)
+    # ------------------------------------------------------------------
+
+    def ensure_partitions(
+        self,
+        db: Session,
+        table: str,
+        months_ahead: int = DEFAULT_MONTHS_AHEAD,
+        start: Optional[datetime] = None,
+    ) -> List[str]:
+        """Create monthly partitions from ``start`` (default: this month) through
+        ``months_ahead`` months in the future, plus the default partition.
+
+        Returns the names of partitions that were created.
+        """
+        self._policy(table)
+        if not self.is_partitioned(db, table):
+            return []
+
+        created = []
+        existing = {name for name, _ in self.list_partitions(db, table)}
+        first = month_start(start or datetime.utcnow())
+        last = add_months(month_start(datetime.utcnow()), months_ahead)
+
+        month = first
+        while month <= last:
+            if partition_name(table, month) not in existing:
+                try:
+                    created.append(self._create_month_partition(db, table, month))
+                    db.commit()
+                except Exception as e:
+                    # Usually rows for this month already sit in the default partition
+                    db.rollback()
+                    logger.warning(f"Could not create partition {partition_name(table, month)}: {e}")
+            month = add_months(month, 1)
+
+        if f"{table}_pdefault" not in existing:
+            created.append(self._create_default_partition(db, table))
+            db.commit()
+
+        return created
+
+    @staticmethod
+    def _create_month_partition(db: Session, table: str, month: datetime) -> str:
+        """Create (without committing) the partition holding ``month``"""
+        name = partition_name(table, month)
+        upper = add_months(month, 1)
+        db.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+        )
+        return name
+
+    @staticmethod
+    def _create_default_partition(db: Session, table: str) -> str:
+        """Create (without committing) the default partition"""
+        name = f"{table}_pdefault"
+        db.execute(text(f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" DEFAULT'))
+        return name
+
+    def convert_to_partitioned(
+        self, db: Session, table: str, months_ahead: int = DEFAULT_MONTHS_AHEAD
+    ) -> Dict[str, Any]:
+        """Rebuild an existing PostgreSQL log table as a monthly partitioned table.
+
+        Copies all rows into the new layout, so run it in a maintenance window.
+        The rename, the new table and its partitions, the copy and the index
+        rebuild run in a single transaction: on any failure PostgreSQL rolls
+        the DDL back and the original table is untouched.
+
+        The primary key becomes (id, <partition column>) as PostgreSQL requires.
+        Tables are left alone when other tables reference them by foreign key,
+        or when they carry a unique index or constraint besides the primary key
+        (for example background_tasks.idempotency_key): a partitioned table can
+        only enforce uniqueness within one partition, which would silently
+        weaken it.
+        """
+        policy = self._policy(table)
+        if not self.is_postgres(db):
+            return {"table": table, "converted": False, "reason": "not_postgresql"}
+        if self.is_partitioned(db, table):
+            return {"table": table, "converted": False, "reason": "already_partitioned"}
+        if self._has_inbound_foreign_keys(db, table):
+            return {"table": table, "converted": False, "reason": "referenced_by_foreign_key"}
+        if self._has_unique_indexes(db, table):
+            return {"table": table, "converted": False, "reason": "has_unique_constraint"}
+
+        model = policy["model"]
+        column = policy["column"]
+        legacy = f"{table}_unpartitioned"
+        columns = [c.name for c in model.__table__.columns]
+        select_list = ", ".join(
+            f'COALESCE("{c}", now() AT TIME ZONE \'utc\')' if c == column else f'"{c}"'
+            for c in columns
+        )
+        column_list = ", ".join(f'"{c}"' for c in columns)
+
+        try:
+            oldest = db.execute(text(f'SELECT MIN("{column}") FROM "{table}"')).scalar()
+
+            db.execute(text(f'ALTER TABLE "{table}" RENAME TO "{legacy}"'))
+            db.execute(
+                text(
+                    f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS) '
+                    f'PARTITION BY RANGE ("{column}")'
+                )
+            )
+            db.execute(text(f'ALTER TABLE "{table}" ALTER COLUMN "{column}" SET NOT NULL'))
+            db.execute(text(f'ALTER TABLE "{table}" ADD PRIMARY KEY ("id", "{column}")'))
+            db.execute(
+                text(
+                    f"ALTER SEQUENCE IF EXISTS \"{table}_id_seq\" OWNED BY \"{table}\".\"id\""
+                )
+            )
+
+            month = month_start(oldest or datetime.utcnow())
+            last = add_months(month_start(datetime.utcnow()), months_ahead)
+            while month <= last:
+                self._create_month_partition(db, table, month)
+                month = add_months(month, 1)
+            self._create_default_partition(db, table)
+
+            db.execute(
+                text(
+                    f'INSERT INTO "{table}" ({column_list}) '
+                    f'SELECT {select_list} FROM "{legacy}"'
+                )
+            )
+            copied = db.execute(text(f'SELECT COUNT(*) FROM "{legacy}"')).scalar() or 0
+            db.execute(text(f'DROP TABLE "{legacy}"'))
+
+            # Recreate secondary indexes and outbound foreign keys from the model
+            connection = db.connection()
+            for index in model.__table__.indexes:
+                index.create(bind=connection, checkfirst=True)
+            for constraint in model.__table__.foreign_key_constraints:
+                db.execute(AddConstraint(constraint))
+
+            db.commit()
+            return {"table": table, "converted": True, "rows_copied": copied}
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Partition conversion failed for {table}: {e}")
+            return {"table": table, "converted": False, "reason": str(e)}
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+
+    def _retention_criteria(self, table: str, cutoff: datetime) -> List[Any]:
+        policy = self._policy(table)
+        model = policy["model"]
+        retention_column = getattr(model, policy.get("retention_column", policy["column"]))
+        criteria = [retention_column < cutoff]
+        if table == "background_tasks":
+            criteria.append(model.status.in_(FINISHED_TASK_STATUSES))
+        return criteria
+
+    def _delete_in_batches(self, db: Session, table: str, criteria: List[Any]) -> int:
+        """Delete matching rows in id-keyed batches, committing after each batch"""
+        model = self._policy(table)["model"]
+        total = 0
+        while True:
+            ids = [
+                row[0]
+                for row in db.query(model.id).filter(*criteria).limit(self.batch_size).all()
+            ]
+            if not ids:
+                break
+            db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+            total += len(ids)
+            if len(ids) < self.batch_size:
+                break
+        return total
+
+    def _drop_expired_partitions(self, db: Session, table: str, cutoff: datetime) -> int:
+        """Detach and drop monthly partitions that lie entirely before ``cutoff``"""
+        policy = self._policy(table)
+        model = policy["model"]
+        column = getattr(model, policy["column"])
+        criteria = self._retention_criteria(table, cutoff)
+        dropped_rows = 0
+
+        for name, month in self.list_partitions(db, table):
+            if month is None or add_months(month, 1) > cutoff:
+                continue
+
+            in_partition = [column >= month, column < add_months(month, 1)]
+            # A partition may only go if every row in it is past retention
+            keeper = (
+                db.query(model.id)
+                .filter(*in_partition)
+                .filter(not_(and_(*criteria)))
+                .first()
+            )
+            if keeper is not None:
+                continue
+
+            rows = db.query(model).filter(*in_partition).count()
+            db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+            db.execute(text(f'DROP TABLE "{name}"'))
+            db.commit()
+            dropped_rows += rows
+            logger.info(f"Dropped partition {name} ({rows} rows)")
+
+        return dropped_rows
+
+    def purge_before(
+        self, table: str, cutoff: datetime, db: Optional[Session] = None
+    ) -> int:
+        """Remove rows of ``table`` that fall outside retention at ``cutoff``.
+
+        Whole partitions are dropped where possible; the remaining rows (the
+        month straddling the cutoff, the default partition, or a table that is
+        not partitioned at all) are rotated out in batches.
+
+        Returns the number of rows removed.
+        """
+        session = db or get_db()
+        try:
+            removed = 0
+            if self.is_partitioned(session, table):
+                removed += self._drop_expired_partitions(session, table, cutoff)
+            removed += self._delete_in_batches(
+                session, table, self._retention_criteria(table, cutoff)
+            )
+            return removed
+        finally:
+            if db is None:
+                session.close()
+
+    def validate_retention(self, retention_days: Any) -> Dict[str, int]:
+        """Check a {table: days} retention mapping from a request.
+
+        Raises ValueError for unknown tables, non-integer periods and periods
+        below a table's compliance floor.
+        """
+        if not retention_days:
+            return {}
+        if not isinstance(retention_days, dict):
+            raise ValueError("retention_days must map table names to days")
+
+        validated = {}
+        for table, days in retention_days.items():
+            policy = self._policy(table)
+            if isinstance(days, bool) or not isinstance(days, int) or days < 1:
+                raise ValueError(f"Retention for {table} must be a positive number of days")
+            minimum = policy.get("min_retention_days")
+            if minimum and days < minimum:
+                raise ValueError(
+                    f"Minimum retention period is {minimum} days for {table} (compliance)"
+                )
+            validated[table] = days
+        return validated
+
+    def run_maintenance(
+        self,
+        retention_days: Optional[Dict[str, int]] = None,
+        months_ahead: int = DEFAULT_MONTHS_AHEAD,
+    ) -> Dict[str, Any]:
+        """Create upcoming partitions for every log table.
+
+        Rows are only purged from the tables listed in ``retention_days``;
+        tables without an explicit period keep everything.
+        """
+        retention = self.validate_retention(retention_days)
+        results: Dict[str, Any] = {}
+        session = get_db()
+        try:
+            for table in PARTITIONED_LOG_TABLES:
+                days = retention.get(table)
+                try:
+                    created = self.ensure_partitions(session, table, months_ahead)
+                    removed = 0
+                    if days is not None:
+                        cutoff = datetime.utcnow() - timedelta(days=days)
+                        removed = self.purge_before(table, cutoff, db=session)
+                    results[table] = {
+                        "partitioned": self.is_partitioned(session, table),
+                        "partitions_created": created,
+                        "rows_removed": removed,
+                        "retention_days": days,
+                    }
+                except Exception as e:
+                    session.rollback()
+                    logger.error(f"Log partition maintenance failed for {table}: {e}")
+                    results[table] = {"error": str(e), "retention_days": days}
+            return {"success": True, "tables": results, "ran_at": datetime.utcnow().isoformat()}
+        finally:
+            session.close()
+
+    def convert(self, table: str, months_ahead: int = DEFAULT_MONTHS_AHEAD) -> Dict[str, Any]:
+        """convert_to_partitioned on a session of its own"""
+        self._policy(table)
+        session = get_db()
+        try:
+            return self.convert_to_partitioned(session, table, months_ahead=months_ahead)
+        finally:
+            session.close()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Partition layout and row counts per log table"""
+        session = get_db()
+        try:
+            status = {}
+            for table, policy in PARTITIONED_LOG_TABLES.items():
+                partitioned = self.is_partitioned(session, table)
+                entry: Dict[str, Any] = {
+                    "partitioned": partitioned,
+                    "column": policy["column"],
+                    "min_retention_days": policy.get("min_retention_days"),
+                }
+                if partitioned:
+                    entry["partitions"] = [
+                        name for name, _ in self.list_partitions(session, table)
+                    ]
+                status[table] = entry
+            return status
+        finally:
+            session.close()
+
+
+_log_partition_service: Optional[LogPartitionService] = None
+
+
+def get_log_partition_service() -> LogPartitionService:
+    """Get or create the log partition service singleton"""
+    global _log_partition_service
+    if _log_partition_service is None:
+        _log_partition_service = LogPartitionService()
+    return _log_partition_service
+
+
+# Register the task handlers for the scheduler and the admin endpoints
+from services.task_queue_service import register_task_handler  # noqa: E402
+
+
+@register_task_handler("log_partition_maintenance")
+def handle_log_partition_maintenance(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Task handler for monthly partition creation (and explicit log retention)"""
+    return get_log_partition_service().run_maintenance(
+        retention_days=payload.get("retention_days"),
+        months_ahead=payload.get("months_ahead", DEFAULT_MONTHS_AHEAD),
+    )
+
+
+@register_task_handler("log_partition_convert")
+def handle_log_partition_convert(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Task handler that rebuilds one log table as a partitioned table"""
+    result = get_log_partition_service().convert(
+        payload["table"],
+        months_ahead=payload.get("months_ahead", DEFAULT_MONTHS_AHEAD),
+    )
+    result["success"] = result["converted"] or result.get("reason") == "already_partitioned"
+    return result
@@ -8,8 +8,7 @@ AI Dispute Writer, 5-Day Knockout, Goodwill Letters, etc.
 
 import logging
 import re
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -82,17 +81,29 @@ class NegativeItemExtractor:
         "open/never late",
     ]
 
-    def __init__(self, parsed_report: Dict[str, Any]):
+    # payment_history values marking a late or derogatory month
+    LATE_HISTORY_CODES = frozenset(
+        ["30", "60", "90", "120", "150", "180", "CO", "FC", "RP"]
+    )
+    HISTORY_BUREAUS = ("transunion", "experian", "equifax")
+
+    def __init__(
+        self,
+        parsed_report: Dict[str, Any],
+        matcher: Optional["StatusMatcher"] = None,
+    ):
         """
         Initialize with a parsed credit report.
 
         Args:
             parsed_report: Dict from credit_report_parser containing
                           accounts, inquiries, collections, public_records
+            matcher: StatusMatcher to share memoized matches across reports
         """
         self.report = parsed_report
         self.client_id = parsed_report.get("client_id")
         self.client_name = parsed_report.get("client_name", "Unknown")
+        self.matcher = matcher or StatusMatcher(type(self))
 
     def extract_all_negative_items(self) -> List[Dict]:
         """
@@ -135,39 +146,7 @@ class NegativeItemExtractor:
         - Closed for cause
         - High utilization (>90%)
         """
-        negative_items = []
-        accounts = self.report.get("accounts", [])
-
-        for idx, account in enumerate(accounts):
-            negative_reasons = self._detect_negative_indicators(account)
-
-            if negative_reasons:
-                item_type = self._classify_item_type(account, negative_reasons)
-                bureaus = self._get_reporting_bureaus(account)
-
-                item = {
-                    "source_index": idx,
-                    "creditor_name": account.get("creditor", "Unknown"),
-                    "account_id": self._extract_account_number(account),
-                    "item_type": item_type,
-                    "bureaus": bureaus,
-                    "status": account.get("status")
-                    or account.get("payment_status", ""),
-                    "balance": self._parse_currency(account.get("balance")),
-                    "credit_limit": self._parse_currency(account.get("credit_limit")),
-                    "high_credit": self._parse_currency(account.get("high_credit")),
-                    "date_opened": account.get("date_opened"),
-                    "date_closed": account.get("date_closed"),
-                    "last_reported": account.get("last_reported"),
-                    "last_payment": account.get("last_payment"),
-                    "account_type": account.get("account_type"),
-                    "negative_reasons": negative_reasons,
-                    "comments": account.get("comments", ""),
-                    "raw_data": account,
-                }
-                negative_items.append(item)
-
-        return negative_items
+        return TradelineColumns([self.report]).extract(self)[0]
 
     def _detect_negative_indicators(self, account: Dict) -> List[str]:
         """
@@ -175,41 +154,40 @@ class NegativeItemExtractor:
 
         Returns list of reasons why this account is negative.
         """
-        reasons = []
+        return self._detect_from_fields(
+            account,
+            _detection_text(account),
+            self._parse_currency(account.get("balance")),
+            self._parse_currency(account.get("credit_limit")),
+        )
 
-        # Combine all status fields
-        status_text = " ".join(
-            [
-                str(account.get("status", "")),
-                str(account.get("payment_status", "")),
-                str(account.get("account_status", "")),
-                str(account.get("account_rating", "")),  # Include account_rating
-                str(account.get("comments", "")),
-                str(account.get("creditor_remarks", "")),  # Include creditor remarks
-            ]
-        ).lower()
+    def _detect_from_fields(
+        self,
+        account: Dict,
+        status_text: str,
+        balance: Optional[float],
+        limit: Optional[float],
+    ) -> List[str]:
+        """Detect negative indicators from an account's normalized fields."""
+        matcher = self.matcher
 
         # Check for negative status keywords FIRST (before positive check)
-        for keyword in self.NEGATIVE_STATUS_KEYWORDS:
-            if keyword in status_text:
-                reasons.append(f"Status indicates: {keyword}")
+        reasons = [
+            f"Status indicates: {keyword}" for keyword in matcher.keywords(status_text)
+        ]
 
         # Check for late payment patterns in status text
-        for pattern in self.LATE_PAYMENT_PATTERNS:
-            if re.search(pattern, status_text, re.IGNORECASE):
-                match = re.search(pattern, status_text, re.IGNORECASE)
-                reasons.append(f"Late payment: {match.group(0)}")
+        for match in matcher.late_payments(status_text):
+            reasons.append(f"Late payment: {match}")
 
         # Check payment_history array for late payment codes (30, 60, 90, 120, etc.)
-        payment_history = account.get("payment_history", [])
         late_months = []
-        for entry in payment_history:
+        for entry in account.get("payment_history", []):
             month = entry.get("month", "")
-            for bureau in ["transunion", "experian", "equifax"]:
+            for bureau in self.HISTORY_BUREAUS:
                 val = str(entry.get(bureau, "")).strip()
-                # Values like "30", "60", "90", "120", "150", "180" indicate late payments
                 # Values like "OK", "U", "-", "" are not late
-                if val in ["30", "60", "90", "120", "150", "180", "CO", "FC", "RP"]:
+                if val in self.LATE_HISTORY_CODES:
                     late_months.append(f"{month} {bureau}: {val}")
 
         if late_months:
@@ -225,14 +203,10 @@ class NegativeItemExtractor:
                         reasons.append(f"Late payments ({bureau}): {count}x {days}")
 
         # If explicitly positive AND no reasons found so far, skip
-        if not reasons:
-            for positive in self.POSITIVE_STATUS_KEYWORDS:
-                if positive in status_text:
-                    return []
+        if not reasons and matcher.is_positive(status_text):
+            return []
 
         # Check for high utilization
-        balance = self._parse_currency(account.get("balance"))
-        limit = self._parse_currency(account.get("credit_limit"))
         if balance and limit and limit > 0:
             utilization = (balance / limit) * 100
             if utilization > 90:
@@ -248,12 +222,10 @@ class NegativeItemExtractor:
                 bureau_remarks = str(bureau_data.get("creditor_remarks", "")).lower()
                 combined = f"{bureau_status} {bureau_rating} {bureau_comments} {bureau_remarks}"
 
-                for keyword in self.NEGATIVE_STATUS_KEYWORDS:
-                    if (
-                        keyword in combined
-                        and f"Bureau {bureau_name}: {keyword}" not in reasons
-                    ):
-                        reasons.append(f"Bureau {bureau_name}: {keyword}")
+                for keyword in matcher.keywords(combined):
+                    reason = f"Bureau {bureau_name}: {keyword}"
+                    if reason not in reasons:
+                        reasons.append(reason)
 
         return reasons
 
@@ -266,97 +238,9 @@ class NegativeItemExtractor:
                        high_utilization, settled, closed_by_creditor,
                        dispute_notation, tradeline
         """
-        reasons_text = " ".join(negative_reasons).lower()
-        status_text = " ".join(
-            [
-                str(account.get("status", "")),
-                str(account.get("payment_status", "")),
-                str(account.get("comments", "")),
-                str(account.get("creditor_remarks", "")),
-                str(account.get("account_status", "")),
-            ]
-        ).lower()
-
-        # Check for charge-off
-        if "charge" in reasons_text and "off" in reasons_text:
-            return "charge_off"
-        if "charge off" in status_text or "chargeoff" in status_text:
-            return "charge_off"
-
-        # Check for paid collection (before general collection check)
-        if (
-            "paid" in status_text and "collection" in status_text
-        ) or "paid collection" in reasons_text:
-            return "paid_collection"
-
-        # Check for collection
-        if "collection" in reasons_text or "collection" in status_text:
-            return "collection"
-
-        # Check for voluntary surrender (before repossession)
-        if (
-            "voluntary surrender" in status_text
-            or "voluntarily surrendered" in status_text
-        ):
-            return "voluntary_surrender"
-        if "voluntary surrender" in reasons_text:
-            return "voluntary_surrender"
-
-        # Check for repossession
-        if "repossession" in reasons_text or "repossession" in status_text:
-            return "repossession"
-        if "repo" in status_text and (
-            "vehicle" in status_text or "auto" in status_text
-        ):
-            return "repossession"
-
-        # Check for deed in lieu (mortgage specific)
-        if "deed in lieu" in status_text or "deed-in-lieu" in status_text:
-            return "deed_in_lieu"
-        if "deed in lieu" in reasons_text:
-            return "deed_in_lieu"
-
-        # Check for closed by creditor
-        if (
-            "closed by credit grantor" in status_text
-            or "closed by creditor" in status_text
-            or "closed at credit grantor" in status_text
-        ):
-            return "closed_by_creditor"
-        if (
-            "closed by creditor" in reasons_text
-            or "closed by credit grantor" in reasons_text
-        ):
-            return "closed_by_creditor"
-
-        # Check for dispute notation
-        if (
-            "consumer disputes" in status_text
-            or "consumer disputed" in status_text
-            or "account disputed" in status_text
-            or "disputes after resolution" in status_text
-        ):
-            return "dispute_notation"
-        if "dispute" in reasons_text and "consumer" in reasons_text:
-            return "dispute_notation"
-
-        # Check for settled
-        if "settled" in reasons_text or "settled" in status_text:
-            return "settled"
-
-        # Check for late payment
-        for pattern in self.LATE_PAYMENT_PATTERNS:
-            if re.search(pattern, reasons_text, re.IGNORECASE):
-                return "late_payment"
-            if re.search(pattern, status_text, re.IGNORECASE):
-                return "late_payment"
-
-        # Check for high utilization
-        if "utilization" in reasons_text:
-            return "high_utilization"
-
-        # Default to generic tradeline issue
-        return "tradeline"
+        return self.matcher.item_type(
+            " ".join(negative_reasons).lower(), _classification_text(account)
+        )
 
     def _get_reporting_bureaus(self, account: Dict) -> List[str]:
         """
@@ -594,20 +478,273 @@ class NegativeItemExtractor:
 
     def _parse_currency(self, value: Any) -> Optional[float]:
         """Parse currency string to float."""
-        if value is None:
-            return None
-        if isinstance(value, (int, float)):
-            return float(value)
-
-        try:
-            # Remove currency symbols and commas
-            clean = re.sub(r"[^\d.\-]", "", str(value))
-            if clean:
-                return float(clean)
-        except (ValueError, TypeError):
-            pass
+        return _parse_currency(value)
+
+
+def _detection_text(account: Dict) -> str:
+    """Lowercased status fields searched for negative indicators."""
+    return " ".join(
+        [
+            str(account.get("status", "")),
+            str(account.get("payment_status", "")),
+            str(account.get("account_status", "")),
+            str(account.get("account_rating", "")),
+            str(account.get("comments", "")),
+            str(account.get("creditor_remarks", "")),
+        ]
+    ).lower()
+
+
+def _classification_text(account: Dict) -> str:
+    """Lowercased status fields used to pick the item type."""
+    return " ".join(
+        [
+            str(account.get("status", "")),
+            str(account.get("payment_status", "")),
+            str(account.get("comments", "")),
+            str(account.get("creditor_remarks", "")),
+            str(account.get("account_status", "")),
+        ]
+    ).lower()
+
+
+class StatusMatcher:
+    """
+    Precompiled status matchers with per-text memoization.
 
+    Status strings repeat heavily across accounts and reports ("Pays as
+    agreed", "Charged off as bad debt", ...), so each distinct text is only
+    matched once. Share one matcher across a batch to share the memo.
+    """
+
+    def __init__(self, extractor_class: type = NegativeItemExtractor):
+        self.negative_keywords = tuple(extractor_class.NEGATIVE_STATUS_KEYWORDS)
+        self.positive_keywords = tuple(extractor_class.POSITIVE_STATUS_KEYWORDS)
+        self.late_patterns = tuple(
+            re.compile(pattern, re.IGNORECASE)
+            for pattern in extractor_class.LATE_PAYMENT_PATTERNS
+        )
+        # Matches wherever any late pattern does; rules out most texts in one scan
+        self._late_any = re.compile(
+            "|".join(f"(?:{p})" for p in extractor_class.LATE_PAYMENT_PATTERNS),
+            re.IGNORECASE,
+        )
+        self._keyword_hits: Dict[str, Tuple[str, ...]] = {}
+        self._late_hits: Dict[str, Tuple[str, ...]] = {}
+        self._positive: Dict[str, bool] = {}
+        self._item_types: Dict[Tuple[str, str], str] = {}
+
+    def keywords(self, text: str) -> Tuple[str, ...]:
+        """Negative keywords contained in text, in keyword-list order"""
+        hits = self._keyword_hits.get(text)
+        if hits is None:
+            hits = tuple(k for k in self.negative_keywords if k in text)
+            self._keyword_hits[text] = hits
+        return hits
+
+    def late_payments(self, text: str) -> Tuple[str, ...]:
+        """First match of each late payment pattern found in text"""
+        hits = self._late_hits.get(text)
+        if hits is None:
+            hits = ()
+            if self._late_any.search(text):
+                hits = tuple(
+                    match.group(0)
+                    for match in (p.search(text) for p in self.late_patterns)
+                    if match
+                )
+            self._late_hits[text] = hits
+        return hits
+
+    def is_positive(self, text: str) -> bool:
+        positive = self._positive.get(text)
+        if positive is None:
+            positive = any(k in text for k in self.positive_keywords)
+            self._positive[text] = positive
+        return positive
+
+    def item_type(self, reasons_text: str, status_text: str) -> str:
+        """Item type for lowercased reasons and classification text"""
+        key = (reasons_text, status_text)
+        item_type = self._item_types.get(key)
+        if item_type is None:
+            item_type = self._item_types[key] = self._classify(
+                reasons_text, status_text
+            )
+        return item_type
+
+    def _classify(self, reasons_text: str, status_text: str) -> str:
+        # Check for charge-off
+        if "charge" in reasons_text and "off" in reasons_text:
+            return "charge_off"
+        if "charge off" in status_text or "chargeoff" in status_text:
+            return "charge_off"
+
+        # Check for paid collection (before general collection check)
+        if (
+            "paid" in status_text and "collection" in status_text
+        ) or "paid collection" in reasons_text:
+            return "paid_collection"
+
+        # Check for collection
+        if "collection" in reasons_text or "collection" in status_text:
+            return "collection"
+
+        # Check for voluntary surrender (before repossession)
+        if (
+            "voluntary surrender" in status_text
+            or "voluntarily surrendered" in status_text
+        ):
+            return "voluntary_surrender"
+        if "voluntary surrender" in reasons_text:
+            return "voluntary_surrender"
+
+        # Check for repossession
+        if "repossession" in reasons_text or "repossession" in status_text:
+            return "repossession"
+        if "repo" in status_text and (
+            "vehicle" in status_text or "auto" in status_text
+        ):
+            return "repossession"
+
+        # Check for deed in lieu (mortgage specific)
+        if "deed in lieu" in status_text or "deed-in-lieu" in status_text:
+            return "deed_in_lieu"
+        if "deed in lieu" in reasons_text:
+            return "deed_in_lieu"
+
+        # Check for closed by creditor
+        if (
+            "closed by credit grantor" in status_text
+            or "closed by creditor" in status_text
+            or "closed at credit grantor" in status_text
+        ):
+            return "closed_by_creditor"
+        if (
+            "closed by creditor" in reasons_text
+            or "closed by credit grantor" in reasons_text
+        ):
+            return "closed_by_creditor"
+
+        # Check for dispute notation
+        if (
+            "consumer disputes" in status_text
+            or "consumer disputed" in status_text
+            or "account disputed" in status_text
+            or "disputes after resolution" in status_text
+        ):
+            return "dispute_notation"
+        if "dispute" in reasons_text and "consumer" in reasons_text:
+            return "dispute_notation"
+
+        # Check for settled
+        if "settled" in reasons_text or "settled" in status_text:
+            return "settled"
+
+        # Check for late payment
+        if self._late_any.search(reasons_text) or self._late_any.search(status_text):
+            return "late_payment"
+
+        # Check for high utilization
+        if "utilization" in reasons_text:
+            return "high_utilization"
+
+        # Default to generic tradeline issue
+        return "tradeline"
+
+
+class TradelineColumns:
+    """
+    Tradeline fields from one or more reports, normalized once into parallel
+    columns (one row per account) before detection and classification.
+    """
+
+    def __init__(self, reports: List[Dict]):
+        self.report: List[int] = []
+        self.index: List[int] = []
+        self.account: List[Dict] = []
+        self.status_text: List[str] = []
+        self.balance: List[Optional[float]] = []
+        self.credit_limit: List[Optional[float]] = []
+        self.high_credit: List[Optional[float]] = []
+
+        parse = _parse_currency
+        for report_index, report in enumerate(reports):
+            for idx, account in enumerate(report.get("accounts", [])):
+                self.report.append(report_index)
+                self.index.append(idx)
+                self.account.append(account)
+                self.status_text.append(_detection_text(account))
+                self.balance.append(parse(account.get("balance")))
+                self.credit_limit.append(parse(account.get("credit_limit")))
+                self.high_credit.append(parse(account.get("high_credit")))
+        self.report_count = len(reports)
+
+    def extract(self, extractor: NegativeItemExtractor) -> List[List[Dict]]:
+        """Negative tradeline items per report, in report order"""
+        items: List[List[Dict]] = [[] for _ in range(self.report_count)]
+        matcher = extractor.matcher
+        detect = extractor._detect_from_fields
+
+        for row, account in enumerate(self.account):
+            negative_reasons = detect(
+                account,
+                self.status_text[row],
+                self.balance[row],
+                self.credit_limit[row],
+            )
+            if not negative_reasons:
+                continue
+
+            items[self.report[row]].append(
+                {
+                    "source_index": self.index[row],
+                    "creditor_name": account.get("creditor", "Unknown"),
+                    "account_id": extractor._extract_account_number(account),
+                    "item_type": matcher.item_type(
+                        " ".join(negative_reasons).lower(),
+                        _classification_text(account),
+                    ),
+                    "bureaus": extractor._get_reporting_bureaus(account),
+                    "status": account.get("status")
+                    or account.get("payment_status", ""),
+                    "balance": self.balance[row],
+                    "credit_limit": self.credit_limit[row],
+                    "high_credit": self.high_credit[row],
+                    "date_opened": account.get("date_opened"),
+                    "date_closed": account.get("date_closed"),
+                    "last_reported": account.get("last_reported"),
+                    "last_payment": account.get("last_payment"),
+                    "account_type": account.get("account_type"),
+                    "negative_reasons": negative_reasons,
+                    "comments": account.get("comments", ""),
+                    "raw_data": account,
+                }
+            )
+
+        return items
+
+
+_NON_NUMERIC = re.compile(r"[^\d.\-]")
+
+
+def _parse_currency(value: Any) -> Optional[float]:
+    """Parse currency string to float."""
+    if value is None:
         return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    try:
+        # Remove currency symbols and commas
+        clean = _NON_NUMERIC.sub("", str(value))
+        if clean:
+            return float(clean)
+    except (ValueError, TypeError):
+        pass
+
+    return None
+
 
 
 def extract_negative_items_from_report(parsed_report: Dict) -> List[Dict]:
@@ -640,3 +777,38 @@ def extract_negative_items_from_json_file(json_path: str) -> List[Dict]:
         parsed_report = json.load(f)
 
     return extract_negative_items_from_report(parsed_report)
+
+
+def extract_negative_items_batch(parsed_reports: Iterable[Dict]) -> List[List[Dict]]:
+    """
+    Extract negative items from many parsed credit reports at once.
+
+    Tradelines from every report are normalized together into one set of
+    columns and classified with a single shared StatusMatcher, so status
+    text repeated across the book is only matched once.
+
+    Args:
+        parsed_reports: Dicts from CreditReportParser.parse()
+
+    Returns:
+        One list of negative item dicts per report, in input order, equal
+        to what extract_negative_items_from_report returns for each
+    """
+    reports = list(parsed_reports)
+    if not reports:
+        return []
+
+    matcher = StatusMatcher()
+    extractors = [NegativeItemExtractor(r, matcher=matcher) for r in reports]
+    results = TradelineColumns(reports).extract(extractors[0])
+
+    for extractor, items in zip(extractors, results):
+        items.extend(extractor._extract_inquiries())
+        items.extend(extractor._extract_collections())
+        items.extend(extractor._extract_public_records())
+
+    logger.info(
+        f"Extracted {sum(len(items) for items in results)} negative items "
+        f"from {len(reports)} reports"
+    )
+    return results
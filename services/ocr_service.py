@@ -5,9 +5,12 @@ Includes CRA response analysis and reinsertion violation detection.
 """
 
 import base64
+import io
 import json
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from typing import Any, Dict, List, Optional, Union, cast
 
@@ -32,6 +35,19 @@ if not ANTHROPIC_API_KEY or len(ANTHROPIC_API_KEY) < 20:
 
 _anthropic_client = None
 
+# Upper bound on in-flight model calls across every batch in this process.
+# Each batch additionally caps its own worker count (see batch_process_uploads).
+OCR_MAX_CONCURRENT_REQUESTS = int(os.environ.get("OCR_MAX_CONCURRENT_REQUESTS", "8"))
+OCR_BATCH_CONCURRENCY = int(os.environ.get("OCR_BATCH_CONCURRENCY", "4"))
+# Upper bound for caller-supplied batch concurrency (threads and DB sessions)
+OCR_MAX_BATCH_CONCURRENCY = int(os.environ.get("OCR_MAX_BATCH_CONCURRENCY", "8"))
+OCR_PDF_MAX_PAGES = 5
+OCR_PDF_DPI = 150
+
+_model_call_slots = threading.BoundedSemaphore(OCR_MAX_CONCURRENT_REQUESTS)
+_page_executor: Optional[ThreadPoolExecutor] = None
+_page_executor_lock = threading.Lock()
+
 
 def get_anthropic_client() -> Optional[Anthropic]:
     """Get or create Anthropic client instance."""
@@ -110,26 +126,49 @@ def _extract_text_from_pdf(file_path: str) -> Optional[str]:
         return None
 
 
-def _convert_pdf_to_images(file_path: str) -> Optional[List[str]]:
-    """Convert PDF pages to images and return base64 encoded images."""
-    try:
-        import tempfile
+def _get_page_executor() -> ThreadPoolExecutor:
+    """Shared pool for page encoding and PDF text extraction."""
+    global _page_executor
+    if _page_executor is None:
+        with _page_executor_lock:
+            if _page_executor is None:
+                _page_executor = ThreadPoolExecutor(
+                    max_workers=min(8, (os.cpu_count() or 2) * 2),
+                    thread_name_prefix="ocr-page",
+                )
+    return _page_executor
 
-        from pdf2image import convert_from_path
 
-        images = convert_from_path(file_path, dpi=150, first_page=1, last_page=5)
-        base64_images = []
+def _encode_png(image: Any) -> str:
+    """Encode a PIL image as base64 PNG without touching disk."""
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return base64.standard_b64encode(buffer.getvalue()).decode("utf-8")
 
-        for i, img in enumerate(images):
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-                img.save(tmp.name, "PNG")
-                with open(tmp.name, "rb") as f:
-                    base64_images.append(
-                        base64.standard_b64encode(f.read()).decode("utf-8")
-                    )
-                os.unlink(tmp.name)
 
-        return base64_images if base64_images else None
+def _convert_pdf_to_images(
+    file_path: str, max_pages: int = OCR_PDF_MAX_PAGES
+) -> Optional[List[str]]:
+    """
+    Convert PDF pages to images and return base64 encoded images.
+
+    Pages are rasterised by parallel pdftoppm processes (one per page, up to
+    the CPU count) and PNG-encoded in memory on the shared page pool.
+    """
+    try:
+        from pdf2image import convert_from_path
+
+        images = convert_from_path(
+            file_path,
+            dpi=OCR_PDF_DPI,
+            first_page=1,
+            last_page=max_pages,
+            thread_count=max(1, min(max_pages, os.cpu_count() or 1)),
+        )
+        if not images:
+            return None
+
+        return list(_get_page_executor().map(_encode_png, images))
     except ImportError:
         logger.warning("pdf2image not available, falling back to text extraction")
         return None
@@ -138,6 +177,39 @@ def _convert_pdf_to_images(file_path: str) -> Optional[List[str]]:
         return None
 
 
+def _build_pdf_content(file_path: str, text_label: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Build message content blocks for a PDF.
+
+    Rendered pages are preferred; text is extracted only when the PDF cannot
+    be rasterised, so the common path never pays for both.
+    """
+    pdf_images = _convert_pdf_to_images(file_path)
+    if pdf_images:
+        return [
+            {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": "image/png",
+                    "data": img_base64,
+                },
+            }
+            for img_base64 in pdf_images
+        ]
+
+    pdf_text = _extract_text_from_pdf(file_path)
+    if pdf_text:
+        return [{"type": "text", "text": f"{text_label}:\n\n{pdf_text}"}]
+    return None
+
+
+def _create_message(client: Anthropic, **kwargs: Any) -> Any:
+    """Call the model while holding one of the process-wide request slots."""
+    with _model_call_slots:
+        return client.messages.create(**kwargs)
+
+
 CRA_RESPONSE_PROMPT = """You are an expert at analyzing Credit Reporting Agency (CRA) response documents.
 Analyze this document and extract the following information in JSON format.
 
@@ -350,34 +422,14 @@ def extract_cra_response_data(
         messages_content: List[Dict[str, Any]] = []
 
         if file_type_lower == "pdf":
-            pdf_images = _convert_pdf_to_images(file_path)
-            if pdf_images:
-                for img_base64 in pdf_images:
-                    messages_content.append(
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": "image/png",
-                                "data": img_base64,
-                            },
-                        }
-                    )
-            else:
-                pdf_text = _extract_text_from_pdf(file_path)
-                if pdf_text:
-                    messages_content.append(
-                        {
-                            "type": "text",
-                            "text": f"Document Text Content:\n\n{pdf_text}",
-                        }
-                    )
-                else:
-                    return {
-                        "success": False,
-                        "error": "Could not extract content from PDF",
-                        "data": None,
-                    }
+            pdf_content = _build_pdf_content(file_path, "Document Text Content")
+            if not pdf_content:
+                return {
+                    "success": False,
+                    "error": "Could not extract content from PDF",
+                    "data": None,
+                }
+            messages_content.extend(pdf_content)
         else:
             image_base64 = _load_image_as_base64(file_path)
             if not image_base64:
@@ -399,7 +451,8 @@ def extract_cra_response_data(
 
         messages_content.append({"type": "text", "text": prompt})
 
-        response = client.messages.create(
+        response = _create_message(
+            client,
             model="claude-sonnet-4-20250514",
             max_tokens=4096,
             temperature=0,
@@ -471,34 +524,14 @@ def analyze_collection_letter(file_path: str, file_type: str) -> Dict[str, Any]:
         messages_content: List[Dict[str, Any]] = []
 
         if file_type_lower == "pdf":
-            pdf_images = _convert_pdf_to_images(file_path)
-            if pdf_images:
-                for img_base64 in pdf_images:
-                    messages_content.append(
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": "image/png",
-                                "data": img_base64,
-                            },
-                        }
-                    )
-            else:
-                pdf_text = _extract_text_from_pdf(file_path)
-                if pdf_text:
-                    messages_content.append(
-                        {
-                            "type": "text",
-                            "text": f"Collection Letter Text Content:\n\n{pdf_text}",
-                        }
-                    )
-                else:
-                    return {
-                        "success": False,
-                        "error": "Could not extract content from PDF",
-                        "data": None,
-                    }
+            pdf_content = _build_pdf_content(file_path, "Collection Letter Text Content")
+            if not pdf_content:
+                return {
+                    "success": False,
+                    "error": "Could not extract content from PDF",
+                    "data": None,
+                }
+            messages_content.extend(pdf_content)
         else:
             image_base64 = _load_image_as_base64(file_path)
             if not image_base64:
@@ -520,7 +553,8 @@ def analyze_collection_letter(file_path: str, file_type: str) -> Dict[str, Any]:
 
         messages_content.append({"type": "text", "text": COLLECTION_LETTER_PROMPT})
 
-        response = client.messages.create(
+        response = _create_message(
+            client,
             model="claude-sonnet-4-20250514",
             max_tokens=4096,
             temperature=0,
@@ -596,7 +630,8 @@ def detect_fcra_violations(
             document_data=json.dumps(document_data, indent=2),
         )
 
-        response = client.messages.create(
+        response = _create_message(
+            client,
             model="claude-sonnet-4-20250514",
             max_tokens=4096,
             temperature=0,
@@ -785,14 +820,23 @@ def process_upload_for_ocr(
 
 
 def batch_process_uploads(
-    upload_ids: List[int], category: Optional[str] = None
+    upload_ids: List[int],
+    category: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Process multiple ClientUploads for OCR extraction.
 
+    Uploads are processed concurrently on a pool bounded by max_concurrency,
+    so a batch takes roughly as long as its slowest documents rather than
+    their sum. Model calls are further capped process-wide by
+    OCR_MAX_CONCURRENT_REQUESTS. Results keep the order of upload_ids.
+
     Args:
         upload_ids: List of ClientUpload IDs to process
         category: Optional category override for all uploads
+        max_concurrency: Uploads processed at once (default OCR_BATCH_CONCURRENCY,
+            capped at OCR_MAX_BATCH_CONCURRENCY)
 
     Returns:
         Dictionary with batch processing results
@@ -803,9 +847,34 @@ def batch_process_uploads(
         "failed": 0,
         "results": [],
     }
+    if not upload_ids:
+        return results
+
+    workers = max(
+        1,
+        min(
+            max_concurrency or OCR_BATCH_CONCURRENCY,
+            OCR_MAX_BATCH_CONCURRENCY,
+            len(upload_ids),
+        ),
+    )
 
-    for upload_id in upload_ids:
-        result = process_upload_for_ocr(upload_id, category)
+    def _process(upload_id: int) -> Dict[str, Any]:
+        try:
+            return process_upload_for_ocr(upload_id, category)
+        except Exception as e:
+            logger.error(f"Error processing upload {upload_id} in batch: {e}")
+            return {"success": False, "error": str(e), "upload_id": upload_id}
+
+    if workers == 1:
+        batch_results = [_process(upload_id) for upload_id in upload_ids]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ocr-batch"
+        ) as executor:
+            batch_results = list(executor.map(_process, upload_ids))
+
+    for result in batch_results:
         results["results"].append(result)
 
         if result.get("success"):
@@ -0,0 +1,192 @@
+"""
+Packet Pipeline
+
+Shared pieces for assembling mail packets (envelope packets, 5-Day Knock-Out
+packets) out of several rendered PDFs:
+
+- ComponentCache: rendered components keyed by a hash of their content, so
+  pages that are the same in every packet (ID / proof-of-address
+  placeholders) are rendered once per process. Only pages without client
+  data belong here; the cache lives as long as the process.
+- merge_pdfs: appends each part's pages to a single writer by reference and
+  takes the page count from the writer, instead of re-reading the merged
+  output to count it.
+- map_in_packet_pool: runs packet builds (one per bureau, or one per client
+  for a whole round) in a pool of warm worker processes, PACKET_WORKERS per
+  web worker (default one per core, 0 under TESTING). ReportLab rendering is
+  CPU-bound, so processes rather than threads; each worker has its own
+  generator instances and its own component cache.
+"""
+
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _default_workers() -> int:
+    if os.environ.get("TESTING") == "true":
+        return 0
+    return os.cpu_count() or 1
+
+
+PACKET_WORKERS = int(os.environ.get("PACKET_WORKERS", _default_workers()))
+COMPONENT_CACHE_MAX_ENTRIES = int(os.environ.get("PACKET_COMPONENT_CACHE_SIZE", "256"))
+
+
+def content_key(kind: str, *parts: Any) -> str:
+    """Stable cache key for a component built from `parts`"""
+    digest = hashlib.sha256(kind.encode())
+    for part in parts:
+        digest.update(b"\x00")
+        digest.update(repr(part).encode())
+    return f"{kind}:{digest.hexdigest()}"
+
+
+class ComponentCache:
+    """Bounded LRU of rendered PDF components that carry no client data.
+
+    Concurrent requests for the same key wait for a single render rather
+    than each rendering it.
+    """
+
+    def __init__(self, max_entries: int = COMPONENT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key: Hashable, render: Callable[[], bytes]) -> bytes:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            try:
+                with self._lock:
+                    if key in self._entries:
+                        self.hits += 1
+                        return self._entries[key]
+                pdf_bytes = render()
+                with self._lock:
+                    self.misses += 1
+                    self._entries[key] = pdf_bytes
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            finally:
+                # Also on a failed render, so the lock doesn't outlive the key
+                with self._lock:
+                    self._key_locks.pop(key, None)
+        return pdf_bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "components": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_count": self.hits,
+                "miss_count": self.misses,
+            }
+
+
+component_cache = ComponentCache()
+
+
+def merge_pdfs(parts: List[bytes]) -> Tuple[bytes, int]:
+    """Merge PDFs in order; returns (merged bytes, page count)"""
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(PdfReader(io.BytesIO(part)))
+    page_count = len(writer.pages)
+
+    output = io.BytesIO()
+    writer.write(output)
+    writer.close()
+    return output.getvalue(), page_count
+
+
+# =============================================================================
+# Packet worker pool
+# =============================================================================
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_in_worker = False
+
+
+def _warm_worker() -> None:
+    """Pool initializer: import ReportLab and the packet service once"""
+    global _in_worker
+    _in_worker = True
+    # Ctrl-C / SIGINT is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        import services.envelope_packet_service  # noqa: F401
+    except Exception as e:
+        # Reported per job instead
+        logger.warning(f"Packet worker could not preload the packet service: {e}")
+
+
+def use_packet_pool(job_count: int) -> bool:
+    """True when `job_count` builds should be spread over the worker pool.
+
+    Never inside a pool worker, so a round's per-client builds do not fan
+    out again per bureau.
+    """
+    return PACKET_WORKERS > 1 and job_count > 1 and not _in_worker
+
+
+def map_in_packet_pool(fn: Callable[[Any], Any], jobs: List[Any]) -> List[Any]:
+    """Run `fn` over `jobs` in the packet worker pool; results are in job order.
+
+    `fn` and the jobs must be picklable (module-level function, plain data).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: never fork a web worker holding DB connections and threads
+            _pool = ProcessPoolExecutor(
+                max_workers=PACKET_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+        pool = _pool
+    return list(pool.map(fn, jobs))
+
+
+def shutdown_packet_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _reset_after_fork() -> None:
+    # A forked child must not reuse the parent's pool
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
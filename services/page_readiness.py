@@ -0,0 +1,214 @@
+"""
+Page Readiness for Browser Automation
+
+Waits on what a page is actually doing (network idle, a selector becoming
+visible, a JS predicate turning true, the DOM going quiet, an XHR response
+arriving) instead of fixed asyncio.sleep calls, so an import spends as long
+as the monitoring site needs and no longer.
+
+- Every wait is bounded by a named per-service timeout (DEFAULT_TIMEOUTS_MS,
+  overridden by a service config's "readiness_timeouts").
+- Waits never raise: they return True when the condition was met and False
+  on timeout or page error, and the caller decides whether that is fatal.
+- Every wait and every `with timings.step(...)` block is recorded in
+  StepTimings, which CreditImportAutomation returns as result["timings"].
+
+Usage:
+    timings = StepTimings()
+    readiness = PageReadiness(page, resolve_timeouts(config), timings)
+
+    with timings.step("navigate_report"):
+        await page.goto(url, wait_until="domcontentloaded")
+        await readiness.network_idle("report_page")
+        if not await readiness.function(SCORES_JS, "report_render"):
+            ...
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Timeout (ms) per readiness step; service configs override single keys
+DEFAULT_TIMEOUTS_MS: Dict[str, int] = {
+    "login_form": 10000,  # login inputs visible
+    "login_submit": 15000,  # URL changes after submitting credentials
+    "network_idle": 30000,  # no requests in flight for 500ms
+    "report_page": 30000,  # report page navigation
+    "report_render": 45000,  # framework has rendered the report data
+    "scores": 15000,  # three numeric scores on the page
+    "section": 10000,  # a report section (classic view, contacts) appears
+    "scroll_growth": 2500,  # page grows after scrolling to the bottom
+    "dom_quiet": 3000,  # DOM settles after a click or expansion
+}
+
+# Milliseconds without DOM mutations that count as "settled"
+DOM_QUIET_MS = 300
+
+# Installs one MutationObserver per document and reports whether the DOM
+# has been unchanged for `quiet` ms
+DOM_QUIET_JS = """(quiet) => {
+    if (!window.__readinessObserver) {
+        window.__readinessLastMutation = performance.now();
+        window.__readinessObserver = new MutationObserver(() => {
+            window.__readinessLastMutation = performance.now();
+        });
+        window.__readinessObserver.observe(document, {
+            childList: true, subtree: true, attributes: true, characterData: true
+        });
+    }
+    return performance.now() - window.__readinessLastMutation >= quiet;
+}"""
+
+
+def resolve_timeouts(config: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """Default timeouts with a service config's overrides applied"""
+    timeouts = dict(DEFAULT_TIMEOUTS_MS)
+    timeouts.update((config or {}).get("readiness_timeouts") or {})
+    return timeouts
+
+
+class StepTimings:
+    """Wall-clock duration of each import step and readiness wait"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.steps: List[Dict[str, Any]] = []
+
+    def record(self, name: str, seconds: float, ok: bool = True) -> None:
+        self.steps.append({"step": name, "ms": int(seconds * 1000), "ok": ok})
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        started = self._clock()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(name, self._clock() - started, ok)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Totals per step name (a step can run several times)"""
+        totals: Dict[str, int] = {}
+        timeouts: Dict[str, int] = {}
+        for entry in self.steps:
+            totals[entry["step"]] = totals.get(entry["step"], 0) + entry["ms"]
+            if not entry["ok"]:
+                timeouts[entry["step"]] = timeouts.get(entry["step"], 0) + 1
+        return {"steps": totals, "timeouts": timeouts}
+
+    def summary(self) -> str:
+        return ", ".join(f"{name}={ms}ms" for name, ms in self.as_dict()["steps"].items())
+
+
+class PageReadiness:
+    """Bounded, event-driven waits on a Playwright page"""
+
+    def __init__(
+        self,
+        page,
+        timeouts: Optional[Dict[str, int]] = None,
+        timings: Optional[StepTimings] = None,
+    ):
+        self.page = page
+        self.timeouts = timeouts or dict(DEFAULT_TIMEOUTS_MS)
+        self.timings = timings or StepTimings()
+
+    def _timeout(self, key: str, override: Optional[int] = None) -> int:
+        if override is not None:
+            return override
+        return self.timeouts.get(key, DEFAULT_TIMEOUTS_MS.get(key, 10000))
+
+    async def _wait(self, label: str, awaitable) -> bool:
+        started = time.monotonic()
+        try:
+            await awaitable
+            ok = True
+        except Exception as e:
+            logger.debug(f"Readiness wait {label} not met: {e}")
+            ok = False
+        self.timings.record(f"wait:{label}", time.monotonic() - started, ok)
+        return ok
+
+    async def network_idle(self, key: str = "network_idle", timeout: Optional[int] = None) -> bool:
+        """No network connections for 500ms"""
+        return await self._wait(
+            key,
+            self.page.wait_for_load_state("networkidle", timeout=self._timeout(key, timeout)),
+        )
+
+    async def selector(
+        self,
+        selector: str,
+        key: str = "section",
+        state: str = "visible",
+        timeout: Optional[int] = None,
+    ) -> bool:
+        """Any element of a (comma-separated) selector reaches `state`"""
+        return await self._wait(
+            key,
+            self.page.wait_for_selector(
+                selector, state=state, timeout=self._timeout(key, timeout)
+            ),
+        )
+
+    async def function(
+        self,
+        expression: str,
+        key: str,
+        arg: Any = None,
+        polling: Any = "raf",
+        timeout: Optional[int] = None,
+    ) -> bool:
+        """A JS predicate returns truthy (checked every frame by default)"""
+        return await self._wait(
+            key,
+            self.page.wait_for_function(
+                expression, arg=arg, polling=polling, timeout=self._timeout(key, timeout)
+            ),
+        )
+
+    async def response(
+        self,
+        predicate: Callable[[Any], bool],
+        key: str = "network_idle",
+        timeout: Optional[int] = None,
+    ) -> bool:
+        """A network response matching `predicate` arrives"""
+        return await self._wait(
+            key,
+            self.page.wait_for_event(
+                "response", predicate=predicate, timeout=self._timeout(key, timeout)
+            ),
+        )
+
+    async def url_change(
+        self, previous_url: str, key: str = "login_submit", timeout: Optional[int] = None
+    ) -> bool:
+        """The page navigated away from `previous_url`"""
+        return await self._wait(
+            key,
+            self.page.wait_for_url(
+                lambda url: url != previous_url, timeout=self._timeout(key, timeout)
+            ),
+        )
+
+    async def dom_quiet(
+        self,
+        key: str = "dom_quiet",
+        quiet_ms: int = DOM_QUIET_MS,
+        timeout: Optional[int] = None,
+    ) -> bool:
+        """The DOM has not changed for `quiet_ms` (after a click, expand, ...)"""
+        return await self.function(
+            DOM_QUIET_JS, key, arg=quiet_ms, polling=100, timeout=timeout
+        )
+
+    async def settled(self, key: str = "network_idle", previous_url: Optional[str] = None) -> bool:
+        """After a form submit or click: navigation (if any), then network idle"""
+        if previous_url is not None:
+            await self.url_change(previous_url)
+        return await self.network_idle(key)
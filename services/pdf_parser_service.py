@@ -3,6 +3,7 @@ PDF Parser Service for extracting structured data from credit report PDFs.
 Supports Experian, TransUnion, and Equifax credit report formats.
 """
 
+import io
 import logging
 import os
 import re
@@ -39,18 +40,37 @@ def _extract_text_pypdf2(file_path: str) -> Optional[str]:
 
 
 def _extract_text_pdfplumber(file_path: str) -> Optional[str]:
-    """Extract text using pdfplumber (better for tabular data)."""
+    """
+    Extract text using pdfplumber (better for tabular data).
+
+    The file is read once and each page is probed: table detection (the
+    expensive part) only runs on pages with ruling lines, since the default
+    "lines" strategy finds no tables without them, and pages with no text
+    layer for pdfplumber are retried with pypdf from the same buffer.
+
+    Returns "" when the PDF was read but has no extractable text, or None
+    when pdfplumber could not read it.
+    """
     try:
         import pdfplumber
 
+        with open(file_path, "rb") as f:
+            data = f.read()
+
         text_parts = []
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
+        fallback_reader = None
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            for page_number, page in enumerate(pdf.pages):
                 text = page.extract_text()
+                if not (text and text.strip()):
+                    if fallback_reader is None:
+                        fallback_reader = _open_pypdf_reader(data)
+                    text = _extract_page_text_pypdf(fallback_reader, page_number)
                 if text:
                     text_parts.append(text)
-                tables = page.extract_tables()
-                for table in tables:
+                if not page.edges:
+                    continue
+                for table in page.extract_tables():
                     for row in table:
                         if row:
                             row_text = " | ".join(
@@ -58,7 +78,7 @@ def _extract_text_pdfplumber(file_path: str) -> Optional[str]:
                             )
                             if row_text.strip():
                                 text_parts.append(row_text)
-        return "\n\n".join(text_parts) if text_parts else None
+        return "\n\n".join(text_parts)
     except ImportError:
         logger.warning("pdfplumber not available")
         return None
@@ -67,6 +87,29 @@ def _extract_text_pdfplumber(file_path: str) -> Optional[str]:
         return None
 
 
+def _open_pypdf_reader(data: bytes):
+    """pypdf reader over an in-memory PDF, or False if it can't be read."""
+    try:
+        from pypdf import PdfReader
+
+        reader = PdfReader(io.BytesIO(data))
+        return False if reader.is_encrypted else reader
+    except Exception as e:
+        logger.debug(f"pypdf page fallback unavailable: {e}")
+        return False
+
+
+def _extract_page_text_pypdf(reader, page_number: int) -> Optional[str]:
+    """Text of one page via pypdf (reader from _open_pypdf_reader)."""
+    if not reader:
+        return None
+    try:
+        return reader.pages[page_number].extract_text()
+    except Exception as e:
+        logger.debug(f"pypdf could not extract page {page_number + 1}: {e}")
+        return None
+
+
 def _extract_text_pypdf(file_path: str) -> Optional[str]:
     """Extract text using pypdf (fallback)."""
     try:
@@ -101,6 +144,13 @@ def extract_text_from_pdf(file_path: str) -> Tuple[Optional[str], Optional[str]]
     if text and len(text.strip()) > 100:
         logger.info(f"Extracted {len(text)} chars using pdfplumber")
         return text, None
+    if text is not None:
+        # pdfplumber read every page (with pypdf as the per-page fallback),
+        # so running the other extractors over the whole file finds nothing new
+        return (
+            None,
+            "This appears to be an image-based PDF. Please use the OCR scanner instead.",
+        )
 
     text = _extract_text_pypdf2(file_path)
     if text is None:
@@ -152,20 +202,7 @@ def detect_bureau(text: str) -> str:
     if not text:
         return "Unknown"
 
-    text_lower = text.lower()
-
-    bureau_scores = {}
-    for bureau, patterns in BUREAU_PATTERNS.items():
-        score = 0
-        for pattern in patterns:
-            matches = len(re.findall(pattern, text_lower))
-            score += matches
-        bureau_scores[bureau] = score
-
-    if max(bureau_scores.values()) > 0:
-        return max(bureau_scores, key=lambda k: bureau_scores[k])
-
-    return "Unknown"
+    return scan_report_text(text).bureau
 
 
 DATE_PATTERNS = [
@@ -178,6 +215,33 @@ DATE_PATTERNS = [
 ]
 
 
+# One alternation, tried in DATE_PATTERNS order; group d<i> is pattern i
+_DATE_ALTERNATION = "|".join(
+    f"(?P<d{i}>{pattern})" for i, pattern in enumerate(DATE_PATTERNS)
+)
+DATE_REGEX = re.compile(_DATE_ALTERNATION, re.IGNORECASE)
+
+
+def _date_from_match(match: "re.Match") -> str:
+    """YYYY-MM-DD from a DATE_REGEX match."""
+    index = int(match.lastgroup[1:])
+    first = match.lastindex + 1
+    groups = match.groups()[first - 1 : first + 2]
+
+    if index == 3:
+        year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
+    elif index == 4:
+        month, day, year = _month_to_num(groups[0]), int(groups[1]), int(groups[2])
+    elif index == 5:
+        day, month, year = int(groups[0]), _month_to_num(groups[1]), int(groups[2])
+    else:
+        month, day, year = int(groups[0]), int(groups[1]), int(groups[2])
+        if year < 100:
+            year += 2000 if year < 50 else 1900
+
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
 def normalize_date(date_str: str) -> Optional[str]:
     """Normalize date to YYYY-MM-DD format."""
     if not date_str:
@@ -185,27 +249,9 @@ def normalize_date(date_str: str) -> Optional[str]:
 
     date_str = date_str.strip()
 
-    for pattern in DATE_PATTERNS:
-        match = re.match(pattern, date_str, re.IGNORECASE)
-        if match:
-            groups = match.groups()
-            try:
-                if pattern == DATE_PATTERNS[3]:
-                    year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
-                elif pattern == DATE_PATTERNS[4]:
-                    month_name, day, year = groups[0], int(groups[1]), int(groups[2])
-                    month = _month_to_num(month_name)
-                elif pattern == DATE_PATTERNS[5]:
-                    day, month_name, year = int(groups[0]), groups[1], int(groups[2])
-                    month = _month_to_num(month_name)
-                else:
-                    month, day, year = int(groups[0]), int(groups[1]), int(groups[2])
-                    if year < 100:
-                        year += 2000 if year < 50 else 1900
-
-                return f"{year:04d}-{month:02d}-{day:02d}"
-            except (ValueError, TypeError):
-                pass
+    match = DATE_REGEX.match(date_str)
+    if match:
+        return _date_from_match(match)
 
     return date_str
 
@@ -229,6 +275,84 @@ def _month_to_num(month_name: str) -> int:
     return months.get(month_name.lower()[:3], 1)
 
 
+# =============================================================================
+# Single-pass classification
+# =============================================================================
+
+ACCOUNT_MARKERS = [
+    r"(?:REVOLVING ACCOUNTS?|INSTALLMENT ACCOUNTS?|MORTGAGE ACCOUNTS?|OPEN ACCOUNTS?|CLOSED ACCOUNTS?|OTHER ACCOUNTS?)",
+    r"(?:Account Name|Creditor Name|Lender)[:\s]",
+]
+
+_BUREAU_REGEXES = {
+    bureau: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    for bureau, patterns in BUREAU_PATTERNS.items()
+}
+
+# Bureau names, dates and account markers as one alternation, so a report is
+# classified in a single scan instead of one findall per pattern
+REPORT_SCAN_REGEX = re.compile(
+    "|".join(
+        [
+            f"(?P<b{i}>{'|'.join(sorted(patterns, key=len, reverse=True))})"
+            for i, patterns in enumerate(BUREAU_PATTERNS.values())
+        ]
+        + [f"(?P<date>{_DATE_ALTERNATION.replace('(?P<d', '(?P<date_d')})"]
+        + [f"(?P<account_marker>{'|'.join(ACCOUNT_MARKERS)})"]
+    ),
+    re.IGNORECASE,
+)
+_BUREAU_BY_GROUP = {f"b{i}": bureau for i, bureau in enumerate(BUREAU_PATTERNS)}
+
+
+class ReportTextScan:
+    """
+    Bureau mentions, dates and account markers found in report text.
+
+    Feed it pages as they are extracted; scores match the per-pattern counts
+    detect_bureau has always used (a mention counts once for every bureau
+    pattern that matches it).
+    """
+
+    def __init__(self):
+        self.bureau_scores: Dict[str, int] = {bureau: 0 for bureau in BUREAU_PATTERNS}
+        self.dates: List[str] = []
+        self.account_markers = 0
+        self.pages = 0
+
+    def feed(self, text: str) -> "ReportTextScan":
+        if not text:
+            return self
+        self.pages += 1
+        for match in REPORT_SCAN_REGEX.finditer(text):
+            kind = match.lastgroup
+            if kind == "date":
+                self.dates.append(match.group(kind))
+            elif kind == "account_marker":
+                self.account_markers += 1
+            else:
+                bureau = _BUREAU_BY_GROUP[kind]
+                start = match.start()
+                self.bureau_scores[bureau] += sum(
+                    1 for regex in _BUREAU_REGEXES[bureau] if regex.match(text, start)
+                )
+        return self
+
+    @property
+    def bureau(self) -> str:
+        if max(self.bureau_scores.values()) > 0:
+            return max(self.bureau_scores, key=lambda k: self.bureau_scores[k])
+        return "Unknown"
+
+    def normalized_dates(self) -> List[str]:
+        return [normalize_date(date) for date in self.dates]
+
+
+def scan_report_text(text: str) -> ReportTextScan:
+    """Classify report text in one pass (see ReportTextScan)."""
+    return ReportTextScan().feed(text)
+
+
 def extract_personal_info(text: str) -> Dict[str, Any]:
     """Extract personal information from credit report text."""
     info: Dict[str, Optional[str]] = {
@@ -364,12 +488,6 @@ def extract_accounts(text: str) -> List[Dict[str, Any]]:
     if not text:
         return accounts
 
-    account_markers = [
-        r"(?:REVOLVING ACCOUNTS?|INSTALLMENT ACCOUNTS?|MORTGAGE ACCOUNTS?|OPEN ACCOUNTS?|CLOSED ACCOUNTS?|OTHER ACCOUNTS?)",
-        r"(?:Account Name|Creditor Name|Lender)[:\s]",
-        r"(?:BANK|CREDIT UNION|FINANCIAL|CAPITAL ONE|CHASE|DISCOVER|WELLS FARGO|CITI|AMEX|AMERICAN EXPRESS|SYNCHRONY|BARCLAYS)",
-    ]
-
     account_pattern = re.compile(
         r"(?P<creditor>[A-Z][A-Za-z0-9\s&.,'-]{2,50}?)[\s\n]+"
         r"(?:Account\s*(?:Number|#)?[:\s]*)?(?P<account_num>[X\d*-]{4,20})?"
@@ -769,6 +887,8 @@ def parse_credit_report_pdf(file_path: str) -> Dict[str, Any]:
         "public_records": [],
         "raw_text": None,
         "text_length": 0,
+        "dates_found": 0,
+        "account_markers": 0,
         "parsing_confidence": 0.0,
     }
 
@@ -787,7 +907,10 @@ def parse_credit_report_pdf(file_path: str) -> Dict[str, Any]:
     result["raw_text"] = text
     result["text_length"] = len(text)
 
-    result["bureau"] = detect_bureau(text)
+    scan = scan_report_text(text)
+    result["bureau"] = scan.bureau
+    result["dates_found"] = len(scan.dates)
+    result["account_markers"] = scan.account_markers
     personal_info = extract_personal_info(text)
     result["personal_info"] = personal_info
     accounts = extract_accounts(text)
@@ -0,0 +1,327 @@
+"""
+PDF Render Service
+
+HTML-to-PDF conversion (WeasyPrint) off the request thread. A pool of worker
+processes each import WeasyPrint and build the font configuration and print
+stylesheet once at start-up, then render documents straight to disk.
+
+- Concurrency is bounded by the pool size (PDF_RENDER_WORKERS, default 2,
+  per web worker) and by PDF_RENDER_MAX_PENDING queued jobs per web worker.
+- Each document has a timeout (PDF_RENDER_TIMEOUT seconds). A render that
+  overruns is interrupted inside its worker; if the worker itself stops
+  responding the pool is replaced.
+- Output is written to a temporary file beside the target and renamed into
+  place, so readers never see a half-written PDF.
+
+With PDF_RENDER_WORKERS=0 (the default under TESTING) documents are rendered
+in the calling process, through the same code path.
+
+Usage:
+    from services.pdf_render_service import RenderJob, get_pdf_render_service
+
+    service = get_pdf_render_service()
+    service.render(html, "static/generated_letters/report.pdf")
+    results = service.render_batch([RenderJob(html_a, path_a), RenderJob(html_b, path_b)])
+
+Batches nobody is waiting on can instead be queued as the "render_pdf_batch"
+task; it runs only when the task queue is processed.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _default_workers() -> int:
+    if os.environ.get("TESTING") == "true":
+        return 0
+    # Every gunicorn worker gets its own pool, so keep it small
+    return min(2, os.cpu_count() or 1)
+
+
+PDF_RENDER_WORKERS = int(os.environ.get("PDF_RENDER_WORKERS", _default_workers()))
+PDF_RENDER_TIMEOUT = float(os.environ.get("PDF_RENDER_TIMEOUT", "120"))
+PDF_RENDER_MAX_PENDING = int(os.environ.get("PDF_RENDER_MAX_PENDING", "64"))
+
+# Extra time the caller waits beyond the in-worker timeout before deciding the
+# worker process itself is stuck
+_TIMEOUT_GRACE_SECONDS = 10
+
+
+class RenderTimeout(Exception):
+    """A document took longer than its render timeout"""
+
+
+@dataclass
+class RenderJob:
+    """One HTML document to render to `output_path`"""
+
+    html: str
+    output_path: str
+    base_url: Optional[str] = None
+    print_css: bool = True
+
+
+# =============================================================================
+# Worker side
+# =============================================================================
+
+
+def _warm_worker() -> None:
+    """Pool initializer: import WeasyPrint and build the print stylesheet"""
+    # Ctrl-C / SIGINT is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        from services.document_generators import _print_stylesheet
+
+        _print_stylesheet()
+    except Exception as e:
+        # Reported per job by _render_job instead
+        logger.warning(f"PDF render worker could not preload WeasyPrint: {e}")
+
+
+def _on_alarm(signum, frame):
+    raise RenderTimeout()
+
+
+def _render_job(job: RenderJob, timeout: Optional[float]) -> Dict[str, Any]:
+    """Render one job; runs in a pool worker (or inline when the pool is off)"""
+    from services.document_generators import html_to_pdf
+
+    started = time.monotonic()
+    tmp_path = f"{job.output_path}.{os.getpid()}.tmp"
+    use_alarm = (
+        timeout
+        and hasattr(signal, "SIGALRM")
+        and threading.current_thread() is threading.main_thread()
+    )
+    previous = signal.signal(signal.SIGALRM, _on_alarm) if use_alarm else None
+    try:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        html_to_pdf(job.html, tmp_path, base_url=job.base_url, print_css=job.print_css)
+        os.replace(tmp_path, job.output_path)
+        return {
+            "success": True,
+            "output_path": job.output_path,
+            "bytes": os.path.getsize(job.output_path),
+            "seconds": round(time.monotonic() - started, 3),
+        }
+    except RenderTimeout:
+        return {
+            "success": False,
+            "output_path": job.output_path,
+            "error": f"Render timed out after {timeout:g}s",
+        }
+    except Exception as e:
+        return {"success": False, "output_path": job.output_path, "error": str(e)}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+# =============================================================================
+# Caller side
+# =============================================================================
+
+
+class PDFRenderService:
+    """Bounded pool of warm WeasyPrint worker processes"""
+
+    def __init__(
+        self,
+        max_workers: int = PDF_RENDER_WORKERS,
+        timeout: float = PDF_RENDER_TIMEOUT,
+        max_pending: int = PDF_RENDER_MAX_PENDING,
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pending = threading.BoundedSemaphore(max(1, max_pending))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.rendered = 0
+        self.failed = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: never fork a web worker holding DB connections and threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Kill a pool with a stuck worker; the next submit starts a fresh one"""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, job: RenderJob, timeout: Optional[float] = None) -> Future:
+        """Queue one job; blocks while PDF_RENDER_MAX_PENDING jobs are in flight"""
+        timeout = self.timeout if timeout is None else timeout
+        if self.max_workers <= 0:
+            future: Future = Future()
+            future.set_result(_render_job(job, timeout))
+            return future
+
+        self._pending.acquire()
+        try:
+            future = self._get_pool().submit(_render_job, job, timeout)
+        except Exception:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda _: self._pending.release())
+        return future
+
+    def _collect(
+        self, future: Future, job: RenderJob, timeout: Optional[float]
+    ) -> Dict[str, Any]:
+        timeout = self.timeout if timeout is None else timeout
+        wait = timeout + _TIMEOUT_GRACE_SECONDS if timeout else None
+        try:
+            result = future.result(timeout=wait)
+        except FutureTimeout:
+            logger.error(f"PDF render worker unresponsive for {job.output_path}")
+            if self._pool is not None:
+                self._discard_pool(self._pool)
+            result = {
+                "success": False,
+                "output_path": job.output_path,
+                "error": f"Render timed out after {timeout:g}s",
+            }
+        except Exception as e:
+            result = {"success": False, "output_path": job.output_path, "error": str(e)}
+
+        if result["success"]:
+            self.rendered += 1
+        else:
+            self.failed += 1
+            logger.warning(f"PDF render failed for {job.output_path}: {result['error']}")
+        return result
+
+    def render_batch(
+        self, jobs: List[RenderJob], timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Render jobs concurrently; results are in job order and never raise"""
+        futures = [(self.submit(job, timeout), job) for job in jobs]
+        return [self._collect(future, job, timeout) for future, job in futures]
+
+    def render(
+        self,
+        html: str,
+        output_path: str,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        print_css: bool = True,
+    ) -> str:
+        """Render one document and return its path (drop-in for html_to_pdf)"""
+        job = RenderJob(html, output_path, base_url, print_css)
+        result = self._collect(self.submit(job, timeout), job, timeout)
+        if not result["success"]:
+            raise RuntimeError(result["error"])
+        return output_path
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "pool_started": self._pool is not None,
+            "timeout": self.timeout,
+            "rendered": self.rendered,
+            "failed": self.failed,
+        }
+
+
+_service: Optional[PDFRenderService] = None
+_service_lock = threading.Lock()
+
+
+def get_pdf_render_service() -> PDFRenderService:
+    """Process-wide PDFRenderService"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = PDFRenderService()
+    return _service
+
+
+def render_pdfs(jobs: List[RenderJob], timeout: Optional[float] = None) -> List[str]:
+    """Render a batch and return the paths, raising if any document failed"""
+    results = get_pdf_render_service().render_batch(jobs, timeout)
+    errors = [f"{r['output_path']}: {r['error']}" for r in results if not r["success"]]
+    if errors:
+        raise RuntimeError("; ".join(errors))
+    return [r["output_path"] for r in results]
+
+
+def shutdown_pdf_render_service() -> None:
+    if _service is not None:
+        _service.shutdown(wait=False)
+
+
+def _reset_after_fork() -> None:
+    # A forked child must not reuse the parent's pool (its pipes and threads
+    # belong to the parent)
+    global _service, _service_lock
+    _service = None
+    _service_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# Register the task handler for the scheduler
+from services.task_queue_service import register_task_handler  # noqa: E402
+
+
+@register_task_handler("render_pdf_batch")
+def handle_render_pdf_batch(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Task handler: render {"jobs": [RenderJob fields, ...], "timeout": seconds}"""
+    jobs = [RenderJob(**job) for job in payload.get("jobs", [])]
+    results = get_pdf_render_service().render_batch(jobs, payload.get("timeout"))
+    return {
+        "success": all(r["success"] for r in results),
+        "rendered": sum(1 for r in results if r["success"]),
+        "results": results,
+    }
+
+
+__all__ = [
+    "RenderJob",
+    "RenderTimeout",
+    "PDFRenderService",
+    "get_pdf_render_service",
+    "render_pdfs",
+    "shutdown_pdf_render_service",
+]
@@ -10,24 +10,189 @@ Provides:
 
 import hashlib
 import json
+import logging
+import math
+import os
 import re
-import statistics
 import threading
 import time
-from collections import defaultdict
+from array import array
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from flask import g, request
 
+from services.shared_state import SharedStateBackend, get_shared_state
+
+logger = logging.getLogger(__name__)
+
 _cache_store: Dict[str, Dict] = {}
 _cache_lock = threading.RLock()
 
 
-_request_metrics: Dict[str, List[Dict]] = defaultdict(list)
+# Request metrics are kept as one histogram per endpoint per time window.
+# 5-minute windows x 72 = the last 6 hours at constant memory per endpoint.
+_METRICS_WINDOW_SECONDS = 300
+_MAX_METRICS_WINDOWS = 72
+_HISTOGRAM_RELATIVE_ACCURACY = 0.01
+
+_request_metrics: Dict[str, Deque[Tuple[int, "LatencyHistogram"]]] = defaultdict(
+    lambda: deque(maxlen=_MAX_METRICS_WINDOWS)
+)
 _metrics_lock = threading.RLock()
-_MAX_METRICS_PER_ENDPOINT = 1000
+# Last window start (epoch seconds) written to performance_metrics, per endpoint key
+_persisted_windows: Dict[str, int] = {}
+_LIVE_METRICS_PREFIX = "perf:live:"
+
+# Persisted performance_metrics rows (one per endpoint, window and worker) are
+# purged after this many days, at most once per _METRICS_PURGE_INTERVAL seconds
+_METRICS_RETENTION_DAYS = int(os.environ.get("PERFORMANCE_METRICS_RETENTION_DAYS", "7"))
+_METRICS_PURGE_INTERVAL = 3600
+
+
+class LatencyHistogram:
+    """Mergeable log-bucketed latency sketch (DDSketch-style).
+
+    Values land in buckets whose bounds grow geometrically, so any quantile is
+    accurate to within _HISTOGRAM_RELATIVE_ACCURACY of the true value. Bucket
+    counts live in a dense uint32 array offset by the lowest bucket index seen,
+    so recording is O(1) and memory depends only on the latency range.
+    """
+
+    _gamma = (1 + _HISTOGRAM_RELATIVE_ACCURACY) / (1 - _HISTOGRAM_RELATIVE_ACCURACY)
+    _log_gamma = math.log(_gamma)
+
+    __slots__ = (
+        "counts",
+        "offset",
+        "count",
+        "total",
+        "min",
+        "max",
+        "zero_count",
+        "error_count",
+        "cache_hit_count",
+        "last_timestamp",
+    )
+
+    def __init__(self):
+        self.counts = array("I")
+        self.offset = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.zero_count = 0
+        self.error_count = 0
+        self.cache_hit_count = 0
+        self.last_timestamp: Optional[float] = None
+
+    def _bucket_index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _bucket_value(self, index: int) -> float:
+        return 2 * self._gamma**index / (self._gamma + 1)
+
+    def _add_to_bucket(self, index: int, n: int) -> None:
+        if not self.counts:
+            self.offset = index
+            self.counts.append(0)
+        elif index < self.offset:
+            self.counts = array("I", bytes(4 * (self.offset - index))) + self.counts
+            self.offset = index
+        elif index >= self.offset + len(self.counts):
+            self.counts.extend(array("I", bytes(4 * (index - self.offset - len(self.counts) + 1))))
+        self.counts[index - self.offset] += n
+
+    def add(
+        self,
+        value: float,
+        is_error: bool = False,
+        cache_hit: bool = False,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Record one observation"""
+        if value > 0:
+            self._add_to_bucket(self._bucket_index(value), 1)
+        else:
+            self.zero_count += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if is_error:
+            self.error_count += 1
+        if cache_hit:
+            self.cache_hit_count += 1
+        if timestamp is not None:
+            self.last_timestamp = max(self.last_timestamp or timestamp, timestamp)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Fold another histogram into this one (in place) and return self"""
+        for i, n in enumerate(other.counts):
+            if n:
+                self._add_to_bucket(other.offset + i, n)
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.zero_count += other.zero_count
+        self.error_count += other.error_count
+        self.cache_hit_count += other.cache_hit_count
+        if other.last_timestamp is not None:
+            self.last_timestamp = max(self.last_timestamp or 0, other.last_timestamp)
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile q (0-1)"""
+        if self.count == 0:
+            return 0
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(self.min, 0)
+        seen = self.zero_count
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen > rank:
+                value = self._bucket_value(self.offset + i)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form, used to persist and merge across workers"""
+        return {
+            "offset": self.offset,
+            "counts": self.counts.tolist(),
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "zero_count": self.zero_count,
+            "error_count": self.error_count,
+            "cache_hit_count": self.cache_hit_count,
+            "last_timestamp": self.last_timestamp,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        hist = cls()
+        hist.offset = data.get("offset", 0)
+        hist.counts = array("I", data.get("counts") or [])
+        hist.count = data.get("count", 0)
+        hist.total = data.get("total", 0.0)
+        hist.min = data["min"] if data.get("min") is not None else math.inf
+        hist.max = data["max"] if data.get("max") is not None else -math.inf
+        hist.zero_count = data.get("zero_count", 0)
+        hist.error_count = data.get("error_count", 0)
+        hist.cache_hit_count = data.get("cache_hit_count", 0)
+        hist.last_timestamp = data.get("last_timestamp")
+        return hist
 
 
 class InMemoryCache:
@@ -192,11 +357,124 @@ class InMemoryCache:
             self._stats.clear()
 
 
-import os
+_CACHE_MISS = object()
+
+
+class SharedCache:
+    """InMemoryCache-compatible cache stored in the shared state backend.
+
+    Used when a cross-worker backend is configured so every gunicorn worker
+    reads and fills the same cache. Hit/miss counts are kept per worker and
+    added to the shared counters at most every _STATS_FLUSH_SECONDS, so reads
+    never wait on a write.
+    """
+
+    _PREFIX = "cache:"
+    _STATS_PREFIX = "cachestats:"
+    _STATS_FLUSH_SECONDS = 10
+
+    def __init__(self, backend: SharedStateBackend):
+        self.backend = backend
+        self._stats_lock = threading.Lock()
+        self._pending = {"hits": 0, "misses": 0}
+        self._flushed_at = time.monotonic()
+
+    def shutdown(self) -> None:
+        """Push pending hit/miss counts; expiry is handled by the backend"""
+        self._flush_stats()
+
+    def _record(self, counter: str) -> None:
+        with self._stats_lock:
+            self._pending[counter] += 1
+            due = time.monotonic() - self._flushed_at >= self._STATS_FLUSH_SECONDS
+        if due:
+            self._flush_stats()
+
+    def _flush_stats(self) -> None:
+        with self._stats_lock:
+            pending, self._pending = self._pending, {"hits": 0, "misses": 0}
+            self._flushed_at = time.monotonic()
+        for counter, count in pending.items():
+            if count:
+                self.backend.incr(self._STATS_PREFIX + counter, count)
+
+    def get(self, key: str) -> Tuple[Any, bool]:
+        """Get value from cache. Returns (value, hit) tuple."""
+        entry = self.backend.get(self._PREFIX + key, _CACHE_MISS)
+        if entry is _CACHE_MISS:
+            self._record("misses")
+            return None, False
+        self._record("hits")
+        return entry, True
+
+    def set(self, key: str, value: Any, ttl_seconds: int = 300) -> None:
+        """Set value in cache with TTL (default 5 minutes).
+
+        The shared store only holds JSON, so other values are not cached.
+        """
+        try:
+            self.backend.set(
+                self._PREFIX + key, value, ttl=ttl_seconds if ttl_seconds > 0 else None
+            )
+        except TypeError as e:
+            logger.debug(f"Not caching {key}: {e}")
+
+    def delete(self, key: str) -> bool:
+        """Delete a specific key from cache"""
+        return self.backend.delete(self._PREFIX + key)
+
+    def clear(self, pattern: Optional[str] = None) -> int:
+        """Clear cache entries matching pattern (or all if no pattern)"""
+        if pattern is None:
+            return self.backend.delete_prefix(self._PREFIX)
+
+        regex = re.compile(pattern.replace("*", ".*"))
+        cleared = 0
+        for full_key in self.backend.keys(self._PREFIX):
+            if regex.match(full_key[len(self._PREFIX):]) and self.backend.delete(full_key):
+                cleared += 1
+        return cleared
+
+    def cleanup_expired(self) -> int:
+        """Remove all expired entries"""
+        return self.backend.purge_expired()
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        self._flush_stats()
+        hits = int(self.backend.get(self._STATS_PREFIX + "hits", 0) or 0)
+        misses = int(self.backend.get(self._STATS_PREFIX + "misses", 0) or 0)
+        total_requests = hits + misses
+        keys = self.backend.keys(self._PREFIX)
+        return {
+            "backend": self.backend.name,
+            "total_entries": len(keys),
+            "hit_count": hits,
+            "miss_count": misses,
+            "expired_count": 0,
+            "hit_rate": round(hits / total_requests * 100, 2) if total_requests else 0,
+            "entries": [
+                {"key": k[len(self._PREFIX):], "ttl_seconds": self.backend.get_ttl(k)}
+                for k in keys[:50]
+            ],
+            "memory_estimate_kb": 0,
+        }
+
+    def reset_stats(self) -> None:
+        """Reset hit/miss counters"""
+        with self._stats_lock:
+            self._pending = {"hits": 0, "misses": 0}
+        self.backend.delete_prefix(self._STATS_PREFIX)
+
 
 # Cache cleanup interval from environment (default: 60 seconds)
 _CACHE_CLEANUP_INTERVAL = int(os.environ.get("CACHE_CLEANUP_INTERVAL_SECONDS", "60"))
-app_cache = InMemoryCache(cleanup_interval_seconds=_CACHE_CLEANUP_INTERVAL)
+_shared_state = get_shared_state()
+app_cache: Any = (
+    SharedCache(_shared_state)
+    if _shared_state.shared
+    else InMemoryCache(cleanup_interval_seconds=_CACHE_CLEANUP_INTERVAL)
+)
 
 
 def generate_cache_key(*args, **kwargs) -> str:
@@ -256,10 +534,10 @@ class PerformanceService:
 
     def __init__(self, db=None):
         self.db = db
-        self._request_buffer: List[Dict] = []
-        self._buffer_lock = threading.Lock()
         self._flush_interval = 60
         self._last_flush = datetime.utcnow()
+        self._last_purge = 0.0
+        self._flush_thread: Optional[threading.Thread] = None
 
     def record_request(
         self,
@@ -271,24 +549,29 @@ class PerformanceService:
         error_message: Optional[str] = None,
     ) -> None:
         """Record a request for performance tracking"""
-        with _metrics_lock:
-            key = f"{method}:{endpoint}"
+        now = time.time()
+        window_start = int(now // _METRICS_WINDOW_SECONDS) * _METRICS_WINDOW_SECONDS
+        key = f"{method}:{endpoint}"
 
-            metrics = _request_metrics[key]
-            if len(metrics) >= _MAX_METRICS_PER_ENDPOINT:
-                metrics.pop(0)
-
-            metrics.append(
-                {
-                    "timestamp": datetime.utcnow(),
-                    "duration_ms": duration_ms,
-                    "status": status,
-                    "cache_hit": cache_hit,
-                    "error": error_message,
-                    "is_error": status >= 400,
-                }
+        with _metrics_lock:
+            windows = _request_metrics[key]
+            if not windows or windows[-1][0] != window_start:
+                windows.append((window_start, LatencyHistogram()))
+            windows[-1][1].add(
+                duration_ms, is_error=status >= 400, cache_hit=cache_hit, timestamp=now
             )
 
+    @staticmethod
+    def _merge_windows(
+        windows: Deque[Tuple[int, LatencyHistogram]], since: Optional[float] = None
+    ) -> LatencyHistogram:
+        """Merge the windows of one endpoint, optionally only those ending after ``since``"""
+        merged = LatencyHistogram()
+        for window_start, hist in windows:
+            if since is None or window_start + _METRICS_WINDOW_SECONDS > since:
+                merged.merge(hist)
+        return merged
+
     def get_endpoint_metrics(
         self, endpoint: Optional[str] = None, method: Optional[str] = None
     ) -> Dict:
@@ -296,17 +579,19 @@ class PerformanceService:
         with _metrics_lock:
             if endpoint and method:
                 key = f"{method}:{endpoint}"
-                metrics = _request_metrics.get(key, [])
-                return self._calculate_metrics(key, metrics)
+                windows = _request_metrics.get(key) or deque()
+                return self._calculate_metrics(key, self._merge_windows(windows))
 
             all_metrics = {}
-            for key, metrics in _request_metrics.items():
-                all_metrics[key] = self._calculate_metrics(key, metrics)
+            for key, windows in _request_metrics.items():
+                all_metrics[key] = self._calculate_metrics(
+                    key, self._merge_windows(windows)
+                )
             return all_metrics
 
-    def _calculate_metrics(self, key: str, metrics: List[Dict]) -> Dict:
-        """Calculate performance statistics from raw metrics"""
-        if not metrics:
+    def _calculate_metrics(self, key: str, histogram: LatencyHistogram) -> Dict:
+        """Calculate performance statistics from an endpoint histogram"""
+        if not histogram.count:
             return {
                 "endpoint": key,
                 "request_count": 0,
@@ -320,34 +605,25 @@ class PerformanceService:
                 "cache_hit_rate": 0,
             }
 
-        durations = [m["duration_ms"] for m in metrics]
-        sorted_durations = sorted(durations)
-
-        error_count = sum(1 for m in metrics if m["is_error"])
-        cache_hits = sum(1 for m in metrics if m["cache_hit"])
-
-        def percentile(data, p):
-            if not data:
-                return 0
-            k = (len(data) - 1) * p / 100
-            f = int(k)
-            c = f + 1 if f < len(data) - 1 else f
-            return data[f] + (data[c] - data[f]) * (k - f)
-
+        count = histogram.count
         return {
             "endpoint": key,
-            "request_count": len(metrics),
-            "avg_response_time_ms": round(statistics.mean(durations), 2),
-            "min_response_time_ms": round(min(durations), 2),
-            "max_response_time_ms": round(max(durations), 2),
-            "p50_time": round(percentile(sorted_durations, 50), 2),
-            "p95_time": round(percentile(sorted_durations, 95), 2),
-            "p99_time": round(percentile(sorted_durations, 99), 2),
-            "error_count": error_count,
-            "error_rate": round(error_count / len(metrics) * 100, 2),
-            "cache_hit_count": cache_hits,
-            "cache_hit_rate": round(cache_hits / len(metrics) * 100, 2),
-            "last_request": metrics[-1]["timestamp"].isoformat() if metrics else None,
+            "request_count": count,
+            "avg_response_time_ms": round(histogram.mean, 2),
+            "min_response_time_ms": round(histogram.min, 2),
+            "max_response_time_ms": round(histogram.max, 2),
+            "p50_time": round(histogram.quantile(0.50), 2),
+            "p95_time": round(histogram.quantile(0.95), 2),
+            "p99_time": round(histogram.quantile(0.99), 2),
+            "error_count": histogram.error_count,
+            "error_rate": round(histogram.error_count / count * 100, 2),
+            "cache_hit_count": histogram.cache_hit_count,
+            "cache_hit_rate": round(histogram.cache_hit_count / count * 100, 2),
+            "last_request": (
+                datetime.utcfromtimestamp(histogram.last_timestamp).isoformat()
+                if histogram.last_timestamp
+                else None
+            ),
         }
 
     def get_slow_endpoints(self, threshold_ms: float = 100) -> List[Dict]:
@@ -355,11 +631,11 @@ class PerformanceService:
         with _metrics_lock:
             slow_endpoints = []
 
-            for key, metrics in _request_metrics.items():
-                if not metrics:
+            for key, windows in _request_metrics.items():
+                if not windows:
                     continue
 
-                stats = self._calculate_metrics(key, metrics)
+                stats = self._calculate_metrics(key, self._merge_windows(windows))
                 if stats["avg_response_time_ms"] > threshold_ms:
                     method, endpoint = key.split(":", 1)
 
@@ -411,22 +687,21 @@ class PerformanceService:
     def get_performance_summary(self, period_minutes: int = 60) -> Dict:
         """Get aggregated performance summary for a time period"""
         cutoff = datetime.utcnow() - timedelta(minutes=period_minutes)
+        since = time.time() - period_minutes * 60
 
         with _metrics_lock:
-            all_requests = []
+            overall = LatencyHistogram()
             endpoint_stats = []
 
-            for key, metrics in _request_metrics.items():
-                recent = [m for m in metrics if m["timestamp"] > cutoff]
-                if recent:
-                    all_requests.extend(recent)
-                    stats = self._calculate_metrics(key, recent)
-                    endpoint_stats.append(stats)
+            for key, windows in _request_metrics.items():
+                recent = self._merge_windows(windows, since=since)
+                if recent.count:
+                    overall.merge(recent)
+                    endpoint_stats.append(self._calculate_metrics(key, recent))
 
-            total_requests = len(all_requests)
-            total_errors = sum(1 for r in all_requests if r["is_error"])
-            total_cache_hits = sum(1 for r in all_requests if r["cache_hit"])
-            all_durations = [r["duration_ms"] for r in all_requests]
+            total_requests = overall.count
+            total_errors = overall.error_count
+            total_cache_hits = overall.cache_hit_count
 
             return {
                 "period_minutes": period_minutes,
@@ -438,9 +713,7 @@ class PerformanceService:
                     if period_minutes > 0
                     else 0
                 ),
-                "avg_response_time_ms": (
-                    round(statistics.mean(all_durations), 2) if all_durations else 0
-                ),
+                "avg_response_time_ms": round(overall.mean, 2),
                 "total_errors": total_errors,
                 "error_rate": (
                     round(total_errors / total_requests * 100, 2)
@@ -706,23 +979,241 @@ class PerformanceService:
         return recommendations
 
     def clear_old_metrics(self, max_age_minutes: int = 60) -> int:
-        """Clear metrics older than max_age_minutes"""
-        cutoff = datetime.utcnow() - timedelta(minutes=max_age_minutes)
+        """Clear metric windows that ended more than max_age_minutes ago"""
+        cutoff = time.time() - max_age_minutes * 60
         cleared = 0
 
         with _metrics_lock:
             for key in list(_request_metrics.keys()):
-                original_len = len(_request_metrics[key])
-                _request_metrics[key] = [
-                    m for m in _request_metrics[key] if m["timestamp"] > cutoff
-                ]
-                cleared += original_len - len(_request_metrics[key])
+                windows = _request_metrics[key]
+                while windows and windows[0][0] + _METRICS_WINDOW_SECONDS <= cutoff:
+                    cleared += windows.popleft()[1].count
 
-                if not _request_metrics[key]:
+                if not windows:
                     del _request_metrics[key]
 
         return cleared
 
+    def flush_to_database(self, db=None) -> int:
+        """Persist closed metric windows to performance_metrics.
+
+        Each worker writes its own row per endpoint per window, including the
+        serialized histogram, so get_merged_metrics can combine workers.
+        Returns the number of rows written.
+        """
+        from database import PerformanceMetric, get_db
+
+        now = time.time()
+        rows = []
+        with _metrics_lock:
+            for key, windows in _request_metrics.items():
+                last_persisted = _persisted_windows.get(key, 0)
+                for window_start, hist in windows:
+                    closed = window_start + _METRICS_WINDOW_SECONDS <= now
+                    if not closed or window_start <= last_persisted or not hist.count:
+                        continue
+                    rows.append((key, window_start, hist))
+
+        if not rows:
+            self._last_flush = datetime.utcnow()
+            return 0
+
+        session = db or self.db or get_db()
+        try:
+            for key, window_start, hist in rows:
+                method, endpoint = key.split(":", 1)
+                stats = self._calculate_metrics(key, hist)
+                session.add(
+                    PerformanceMetric(
+                        endpoint=endpoint,
+                        method=method,
+                        avg_response_time_ms=stats["avg_response_time_ms"],
+                        p50_time=stats["p50_time"],
+                        p95_time=stats["p95_time"],
+                        p99_time=stats["p99_time"],
+                        min_response_time_ms=stats["min_response_time_ms"],
+                        max_response_time_ms=stats["max_response_time_ms"],
+                        request_count=stats["request_count"],
+                        error_count=stats["error_count"],
+                        cache_hit_count=stats["cache_hit_count"],
+                        cache_hit_rate=stats["cache_hit_rate"],
+                        period_start=datetime.utcfromtimestamp(window_start),
+                        period_end=datetime.utcfromtimestamp(
+                            window_start + _METRICS_WINDOW_SECONDS
+                        ),
+                        histogram=hist.to_dict(),
+                    )
+                )
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            if session is not db and session is not self.db:
+                session.close()
+
+        with _metrics_lock:
+            for key, window_start, _ in rows:
+                if window_start > _persisted_windows.get(key, 0):
+                    _persisted_windows[key] = window_start
+        self._last_flush = datetime.utcnow()
+        return len(rows)
+
+    def purge_persisted_metrics(self, retention_days: Optional[int] = None, db=None) -> int:
+        """Delete performance_metrics rows for windows older than retention_days.
+
+        Returns the number of rows deleted.
+        """
+        from database import PerformanceMetric, get_db
+
+        days = _METRICS_RETENTION_DAYS if retention_days is None else retention_days
+        cutoff = datetime.utcnow() - timedelta(days=days)
+
+        session = db or self.db or get_db()
+        try:
+            deleted = (
+                session.query(PerformanceMetric)
+                .filter(PerformanceMetric.period_start < cutoff)
+                .delete(synchronize_session=False)
+            )
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            if session is not db and session is not self.db:
+                session.close()
+
+        self._last_purge = time.time()
+        return deleted
+
+    def get_merged_metrics(
+        self,
+        period_minutes: int = 60,
+        endpoint: Optional[str] = None,
+        method: Optional[str] = None,
+        db=None,
+    ) -> Dict:
+        """Endpoint metrics merged across all workers.
+
+        Combines histograms persisted by every worker, the live snapshots other
+        workers publish to the shared state backend, and this worker's windows
+        that have not been flushed yet.
+        """
+        from database import PerformanceMetric, get_db
+
+        since = time.time() - period_minutes * 60
+        merged: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+
+        session = db or self.db or get_db()
+        try:
+            query = session.query(PerformanceMetric).filter(
+                PerformanceMetric.period_end > datetime.utcfromtimestamp(since),
+                PerformanceMetric.histogram.isnot(None),
+            )
+            if endpoint and method:
+                query = query.filter(
+                    PerformanceMetric.endpoint == endpoint,
+                    PerformanceMetric.method == method,
+                )
+            for row in query.all():
+                key = f"{row.method}:{row.endpoint}"
+                merged[key].merge(LatencyHistogram.from_dict(row.histogram))
+        finally:
+            if session is not db and session is not self.db:
+                session.close()
+
+        backend = get_shared_state()
+        if backend.shared:
+            own_key = f"{_LIVE_METRICS_PREFIX}{os.getpid()}"
+            for live_key in backend.keys(_LIVE_METRICS_PREFIX):
+                if live_key == own_key:
+                    continue
+                for key, windows in (backend.get(live_key) or {}).items():
+                    if endpoint and method and key != f"{method}:{endpoint}":
+                        continue
+                    for window_start, data in windows:
+                        if window_start + _METRICS_WINDOW_SECONDS > since:
+                            merged[key].merge(LatencyHistogram.from_dict(data))
+
+        with _metrics_lock:
+            for key, windows in _request_metrics.items():
+                if endpoint and method and key != f"{method}:{endpoint}":
+                    continue
+                last_persisted = _persisted_windows.get(key, 0)
+                for window_start, hist in windows:
+                    if window_start > last_persisted and (
+                        window_start + _METRICS_WINDOW_SECONDS > since
+                    ):
+                        merged[key].merge(hist)
+
+        if endpoint and method:
+            key = f"{method}:{endpoint}"
+            return self._calculate_metrics(key, merged.get(key, LatencyHistogram()))
+        return {key: self._calculate_metrics(key, hist) for key, hist in merged.items()}
+
+    def publish_live_windows(self) -> int:
+        """Share this worker's not-yet-persisted windows with other workers.
+
+        The snapshot replaces the previous one and expires if the worker dies,
+        so get_merged_metrics sees in-progress traffic from every worker.
+        """
+        backend = get_shared_state()
+        if not backend.shared:
+            return 0
+
+        snapshot: Dict[str, List] = {}
+        with _metrics_lock:
+            for key, windows in _request_metrics.items():
+                last_persisted = _persisted_windows.get(key, 0)
+                live = [
+                    (window_start, hist.to_dict())
+                    for window_start, hist in windows
+                    if window_start > last_persisted and hist.count
+                ]
+                if live:
+                    snapshot[key] = live
+
+        backend.set(
+            f"{_LIVE_METRICS_PREFIX}{os.getpid()}", snapshot, ttl=self._flush_interval * 2
+        )
+        return len(snapshot)
+
+    def _flush_cycle(self) -> None:
+        """One background flush pass on a session of its own.
+
+        Never falls back to self.db: get_performance_service(db) points that
+        at whichever request's session called it last.
+        """
+        from database import get_db
+
+        db = get_db()
+        try:
+            self.flush_to_database(db=db)
+            self.publish_live_windows()
+            if time.time() - self._last_purge >= _METRICS_PURGE_INTERVAL:
+                self.purge_persisted_metrics(db=db)
+        finally:
+            db.close()
+
+    def start_flush_thread(self) -> None:
+        """Flush closed metric windows to the database in the background"""
+        if self._flush_thread and self._flush_thread.is_alive():
+            return
+
+        def flush_loop():
+            while True:
+                time.sleep(self._flush_interval)
+                try:
+                    self._flush_cycle()
+                except Exception as e:
+                    logger.error(f"Performance metrics flush failed: {e}")
+
+        self._flush_thread = threading.Thread(
+            target=flush_loop, name="perf-metrics-flush", daemon=True
+        )
+        self._flush_thread.start()
+
 
 _performance_service_instance = None
 
@@ -740,6 +1231,9 @@ def get_performance_service(db=None) -> PerformanceService:
 def request_timing_middleware(app):
     """Flask middleware to track request timing and performance"""
 
+    if os.environ.get("TESTING", "").lower() != "true":
+        get_performance_service().start_flush_thread()
+
     @app.before_request
     def before_request():
         g.request_start_time = time.time()
@@ -750,9 +1244,11 @@ def request_timing_middleware(app):
         if hasattr(g, "request_start_time"):
             duration_ms = (time.time() - g.request_start_time) * 1000
 
+            # Key by route pattern so /clients/1 and /clients/2 share a histogram
+            rule = getattr(request, "url_rule", None)
             service = get_performance_service()
             service.record_request(
-                endpoint=request.path,
+                endpoint=rule.rule if rule is not None else request.path,
                 method=request.method,
                 duration_ms=duration_ms,
                 status=response.status_code,
@@ -0,0 +1,308 @@
+"""
+Portal Summary Service
+
+Maintains a per-client projection of the totals the client portal dashboard
+shows (violation totals, damages, disputed accounts per bureau, round
+progress, starting/latest score) in client_portal_summaries, so a page view
+reads one row by primary key instead of loading every DisputeItem and
+Violation for the client.
+
+- Writes: a session listener watches flushes of the models the totals come
+  from and, in the same transaction, marks the affected clients' rows stale
+  and bumps their version. Writers pay one UPDATE, never the recomputation.
+- Reads: get_summary returns the stored row when it is fresh and rebuilds it
+  when it is missing or stale. A rebuild only lands if the row's version is
+  unchanged, so a write that commits mid-rebuild is never overwritten.
+- The "refresh_portal_summaries" task rebuilds every stale row ahead of the
+  morning portal logins.
+
+Usage:
+    from services.portal_summary_service import get_portal_summary_service
+
+    summary = get_portal_summary_service(db).get_summary(client_id)
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, func, inspect, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from database import (
+    Analysis,
+    Client,
+    ClientPortalSummary,
+    CreditScoreSnapshot,
+    Damages,
+    DisputeItem,
+    SessionLocal,
+    Violation,
+)
+
+logger = logging.getLogger(__name__)
+
+# Dispute rounds shown on the dashboard progress bar
+TOTAL_ROUNDS = 4
+
+# model -> (attribute holding the client id, attributes the summary reads)
+WATCHED_MODELS = {
+    DisputeItem: ("client_id", {"client_id", "bureau"}),
+    Violation: (
+        "client_id",
+        {"client_id", "analysis_id", "statutory_damages_min", "statutory_damages_max"},
+    ),
+    Analysis: ("client_id", {"client_id"}),
+    Damages: ("client_id", {"client_id", "analysis_id", "total_exposure"}),
+    CreditScoreSnapshot: ("client_id", {"client_id", "average_score", "created_at"}),
+    Client: ("id", {"current_dispute_round"}),
+}
+
+
+def _changed_client_ids(instance, deleted: bool = False) -> Set[int]:
+    """Client ids whose summary a flushed instance affects (old and new)"""
+    client_attr, watched = WATCHED_MODELS[type(instance)]
+    state = inspect(instance)
+    ids = set()
+
+    if deleted or state.was_deleted:
+        ids.add(getattr(instance, client_attr))
+        return {i for i in ids if i is not None}
+
+    changed = False
+    for name in watched:
+        history = state.attrs[name].history
+        if history.added or history.deleted:
+            changed = True
+            if name == client_attr:
+                ids.update(history.deleted)
+    if changed:
+        ids.add(getattr(instance, client_attr))
+    return {i for i in ids if i is not None}
+
+
+def _invalidate_after_flush(session: Session, flush_context) -> None:
+    """Mark summaries stale for clients touched by this flush"""
+    client_ids: Set[int] = set()
+    for instance in session.new:
+        # A new client has no summary row to invalidate yet
+        if type(instance) in WATCHED_MODELS and type(instance) is not Client:
+            client_attr = WATCHED_MODELS[type(instance)][0]
+            if getattr(instance, client_attr) is not None:
+                client_ids.add(getattr(instance, client_attr))
+    for instance in session.dirty:
+        if type(instance) in WATCHED_MODELS:
+            client_ids |= _changed_client_ids(instance)
+    for instance in session.deleted:
+        if type(instance) in WATCHED_MODELS:
+            client_ids |= _changed_client_ids(instance, deleted=True)
+
+    if client_ids:
+        mark_stale(session, client_ids)
+
+
+def mark_stale(session: Session, client_ids: Iterable[int]) -> None:
+    """Invalidate summaries in the session's current transaction"""
+    client_ids = sorted(set(client_ids))
+    if not client_ids:
+        return
+    session.execute(
+        update(ClientPortalSummary)
+        .where(ClientPortalSummary.client_id.in_(client_ids))
+        .values(stale=True, version=ClientPortalSummary.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    # Rows already loaded in this session must not look fresh
+    for instance in list(session.identity_map.values()):
+        if isinstance(instance, ClientPortalSummary) and instance.client_id in client_ids:
+            set_committed_value(instance, "stale", True)
+
+
+if not event.contains(Session, "after_flush", _invalidate_after_flush):
+    event.listen(Session, "after_flush", _invalidate_after_flush)
+
+
+class PortalSummaryService:
+    """Reads and rebuilds client_portal_summaries rows"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def compute(self, client_id: int) -> Dict[str, Any]:
+        """Totals for one client, straight from the source tables"""
+        db = self.db
+
+        bureau_rows = (
+            db.query(DisputeItem.bureau, func.count(DisputeItem.id))
+            .filter(DisputeItem.client_id == client_id)
+            .group_by(DisputeItem.bureau)
+            .all()
+        )
+        bureau_counts = {bureau: count for bureau, count in bureau_rows if bureau}
+        disputed_accounts = sum(count for _, count in bureau_rows)
+
+        violation_query = db.query(
+            func.count(Violation.id),
+            func.coalesce(
+                func.sum(
+                    func.coalesce(
+                        func.nullif(Violation.statutory_damages_max, 0),
+                        func.nullif(Violation.statutory_damages_min, 0),
+                        0,
+                    )
+                ),
+                0,
+            ),
+        )
+        violation_count, total_violations = violation_query.filter(
+            Violation.client_id == client_id
+        ).one()
+        if not violation_count:
+            # Violations recorded against the client's analyses
+            violation_count, total_violations = (
+                violation_query.join(Analysis, Violation.analysis_id == Analysis.id)
+                .filter(Analysis.client_id == client_id)
+                .one()
+            )
+
+        if not total_violations:
+            # No statutory damages: use each analysis's damages exposure
+            damages_rows = (
+                db.query(Damages.analysis_id, Damages.total_exposure)
+                .join(Analysis, Damages.analysis_id == Analysis.id)
+                .filter(Analysis.client_id == client_id)
+                .order_by(Damages.id)
+                .all()
+            )
+            per_analysis: Dict[int, float] = {}
+            for analysis_id, exposure in damages_rows:
+                per_analysis.setdefault(analysis_id, exposure or 0)
+            total_violations = sum(per_analysis.values())
+
+        current_round = (
+            db.query(Client.current_dispute_round).filter(Client.id == client_id).scalar()
+        )
+
+        scores = (
+            db.query(CreditScoreSnapshot.average_score)
+            .filter(
+                CreditScoreSnapshot.client_id == client_id,
+                CreditScoreSnapshot.average_score.isnot(None),
+            )
+            .order_by(CreditScoreSnapshot.created_at, CreditScoreSnapshot.id)
+        )
+        first_score = scores.first()
+        latest_score = scores.order_by(None).order_by(
+            CreditScoreSnapshot.created_at.desc(), CreditScoreSnapshot.id.desc()
+        ).first()
+
+        return {
+            "client_id": client_id,
+            "violation_count": violation_count or 0,
+            "total_violations": float(total_violations or 0),
+            "disputed_accounts": disputed_accounts,
+            "bureau_counts": bureau_counts,
+            "current_round": current_round or 1,
+            "starting_score": first_score[0] if first_score else None,
+            "current_score": latest_score[0] if latest_score else None,
+        }
+
+    def refresh(self, client_id: int) -> Dict[str, Any]:
+        """Rebuild and store one client's summary; returns the fresh values"""
+        existing = self.db.get(ClientPortalSummary, client_id)
+        seen_version = existing.version if existing is not None else None
+        values = self.compute(client_id)
+        values["refreshed_at"] = datetime.utcnow()
+        stored = {k: v for k, v in values.items() if k != "client_id"}
+
+        try:
+            if existing is None:
+                self.db.add(ClientPortalSummary(**values, stale=False, version=0))
+            else:
+                result = self.db.execute(
+                    update(ClientPortalSummary)
+                    .where(
+                        ClientPortalSummary.client_id == client_id,
+                        ClientPortalSummary.version == seen_version,
+                    )
+                    .values(**stored, stale=False)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 0:
+                    # Invalidated while we computed; the next read rebuilds
+                    logger.debug(f"Portal summary for client {client_id} changed during refresh")
+            self.db.commit()
+        except IntegrityError:
+            # Another request created the row first
+            self.db.rollback()
+        if existing is not None:
+            self.db.expire(existing)
+
+        values["refreshed_at"] = values["refreshed_at"].isoformat()
+        return values
+
+    def get_summary(self, client_id: int) -> Dict[str, Any]:
+        """Summary for the portal: one primary-key read when it is fresh"""
+        summary = self.db.get(ClientPortalSummary, client_id)
+        if summary is not None and not summary.stale:
+            return summary.to_dict()
+        return self.refresh(client_id)
+
+    def refresh_stale(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Rebuild stale rows and create missing ones for clients with portal logins"""
+        stale_ids: List[int] = [
+            row[0]
+            for row in self.db.query(ClientPortalSummary.client_id)
+            .filter(ClientPortalSummary.stale.is_(True))
+            .order_by(ClientPortalSummary.client_id)
+            .limit(limit)
+            .all()
+        ]
+        missing_ids: List[int] = [
+            row[0]
+            for row in self.db.query(Client.id)
+            .outerjoin(ClientPortalSummary, ClientPortalSummary.client_id == Client.id)
+            .filter(
+                ClientPortalSummary.client_id.is_(None),
+                Client.portal_password_hash.isnot(None),
+            )
+            .order_by(Client.id)
+            .limit(limit)
+            .all()
+        ]
+
+        refreshed = 0
+        failed = 0
+        for client_id in stale_ids + missing_ids:
+            try:
+                self.refresh(client_id)
+                refreshed += 1
+            except Exception as e:
+                self.db.rollback()
+                failed += 1
+                logger.warning(f"Portal summary refresh failed for client {client_id}: {e}")
+        return {"refreshed": refreshed, "failed": failed}
+
+
+def get_portal_summary_service(db: Session = None) -> PortalSummaryService:
+    """Factory function to get PortalSummaryService instance."""
+    if db is None:
+        db = SessionLocal()
+    return PortalSummaryService(db)
+
+
+# Register the task handler for the scheduler
+from services.task_queue_service import register_task_handler  # noqa: E402
+
+
+@register_task_handler("refresh_portal_summaries")
+def handle_refresh_portal_summaries(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Task handler: rebuild stale portal summaries ({"limit": n} optional)"""
+    db = SessionLocal()
+    try:
+        result = PortalSummaryService(db).refresh_stale(payload.get("limit"))
+        return {"success": True, **result}
+    finally:
+        db.close()
@@ -4,7 +4,36 @@ Loads prompts from /knowledge folder - no more hardcoded content
 """
 
 import os
+import threading
 from pathlib import Path
+from typing import Dict, Tuple
+
+# Prompt files run to tens of thousands of characters and are loaded for every
+# AI call. Their text is kept in memory (shared by all PromptLoader instances)
+# and re-read only when the file's mtime or size changes.
+_file_cache: Dict[str, Tuple[int, int, str]] = {}
+_file_cache_lock = threading.Lock()
+
+
+def _read_cached(filepath: Path) -> str:
+    stat = filepath.stat()
+    key = os.path.abspath(filepath)
+    with _file_cache_lock:
+        cached = _file_cache.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    with open(filepath, "r", encoding="utf-8") as f:
+        text = f.read()
+    with _file_cache_lock:
+        _file_cache[key] = (stat.st_mtime_ns, stat.st_size, text)
+    return text
+
+
+def clear_prompt_cache():
+    """Drop all cached prompt text"""
+    with _file_cache_lock:
+        _file_cache.clear()
 
 
 class PromptLoader:
@@ -80,8 +109,7 @@ class PromptLoader:
         if not filepath.exists():
             raise FileNotFoundError(f"Prompt file not found: {filepath}")
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            return f.read()
+        return _read_cached(filepath)
 
     def load_file(self, filename):
         """Load any file from knowledge folder by filename"""
@@ -90,8 +118,7 @@ class PromptLoader:
         if not filepath.exists():
             raise FileNotFoundError(f"File not found: {filepath}")
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            return f.read()
+        return _read_cached(filepath)
 
     def list_available_prompts(self):
         """List all available prompt shortcuts"""
@@ -2,7 +2,8 @@
 Rate Limiting Configuration for FCRA Litigation Platform
 
 Prevents abuse by limiting API requests per user/IP.
-Uses Flask-Limiter with in-memory storage (can upgrade to Redis for production).
+Uses Flask-Limiter with the shared state backend (Redis, or a host-local
+SQLite file) so limits hold across gunicorn workers.
 """
 
 import os
@@ -11,6 +12,8 @@ from flask import jsonify, request, session
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
+from services.shared_state import get_limiter_storage_uri
+
 
 # Check if running in CI/test mode - disable rate limiting for tests
 def is_testing_mode():
@@ -50,7 +53,7 @@ def init_rate_limiter(app):
         key_func=get_rate_limit_key,
         app=app,
         default_limits=[DEFAULT_RATE],
-        storage_uri="memory://",  # Use Redis in production: "redis://localhost:6379"
+        storage_uri=get_limiter_storage_uri(),
         strategy="fixed-window",
         headers_enabled=True,  # Adds X-RateLimit headers to responses
         enabled=not is_testing_mode(),  # Disable rate limiting in CI/test mode
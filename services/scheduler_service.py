@@ -202,6 +202,27 @@ class SchedulerService:
             "payload": {},
             "cron_expression": "0 * * * *",  # Every hour
         },
+        # Log Partitions - Creates upcoming monthly partitions (no retention purge)
+        {
+            "name": "Log Partition Maintenance",
+            "task_type": "log_partition_maintenance",
+            "payload": {},
+            "cron_expression": "0 3 * * *",  # Daily at 3 AM
+        },
+        # Client Success - Nightly success metric snapshots for active clients
+        {
+            "name": "Client Success Snapshots",
+            "task_type": "client_success_snapshots",
+            "payload": {"snapshot_type": "periodic"},
+            "cron_expression": "0 2 * * *",  # Daily at 2 AM
+        },
+        # Client Portal - Rebuild stale dashboard summaries before morning logins
+        {
+            "name": "Refresh Portal Summaries",
+            "task_type": "refresh_portal_summaries",
+            "payload": {},
+            "cron_expression": "30 5 * * *",  # Daily at 5:30 AM
+        },
     ]
 
     @staticmethod
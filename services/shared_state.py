@@ -0,0 +1,624 @@
+"""
+Shared State Backend for Multi-Worker Deployments
+
+Gunicorn runs several worker processes, each with its own memory. Anything
+kept in module globals (response cache, request metrics, API rate limit
+counters, flask-limiter windows) is therefore split per worker: cache hit
+rates drop, metrics are fragments, and rate limits are multiplied by the
+worker count.
+
+This module provides one key/value store with atomic counters and TTL keys
+that every worker on the host can see:
+
+- RedisStateBackend   - any Redis-protocol server (Redis, Valkey, KeyDB)
+- SQLiteStateBackend  - a local SQLite file in WAL mode, shared by all workers
+                        on the same machine; used when no Redis is configured
+- MemoryStateBackend  - single-process dict, used in tests
+
+Selection (first match wins):
+    SHARED_STATE_URL=redis://host:6379/0 | sqlite:////path/state.db | memory://
+    REDIS_URL=redis://...
+    TESTING=true / CI=true         -> memory://
+    otherwise                      -> SQLite file in SHARED_STATE_DIR
+                                      (default data/shared_state, mode 0700)
+
+Values are stored as JSON (integers natively, so counters stay atomic); the
+store never unpickles anything, so whoever can write to it cannot run code in
+the workers. The SQLite file is created 0600 in an app-owned directory.
+
+Usage:
+    from services.shared_state import get_shared_state
+
+    state = get_shared_state()
+    hits = state.incr("api:minute:42", ttl=60)
+    state.set("tenant:example.com", tenant_dict, ttl=300)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+from limits.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "shared_state"
+)
+
+# Sentinel distinguishing "missing" from a stored None
+_MISSING = object()
+
+
+def encode_value(value: Any) -> Any:
+    """Storage form of a value: ints as-is (for incr), everything else as JSON.
+
+    Raises TypeError for values JSON cannot represent; tuples come back as lists.
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return json.dumps(value, separators=(",", ":"))
+
+
+def decode_value(raw: Any, default: Any = None) -> Any:
+    """Inverse of encode_value; unreadable entries count as missing"""
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8", "replace")
+    if isinstance(raw, int):
+        return raw
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return default
+
+
+class SharedStateBackend:
+    """Interface shared by all state backends"""
+
+    # True when other worker processes see the same data
+    shared = True
+    name = "base"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """Atomically add ``amount`` to an integer counter and return the new value.
+
+        ``ttl`` is applied only when the counter is created (fixed window), so
+        repeated increments do not extend its life.
+        """
+        raise NotImplementedError
+
+    def get_ttl(self, key: str) -> Optional[float]:
+        """Seconds until ``key`` expires; None if it has no TTL or does not exist"""
+        raise NotImplementedError
+
+    def keys(self, prefix: str = "") -> List[str]:
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every key starting with ``prefix``; returns the number removed"""
+        removed = 0
+        for key in self.keys(prefix):
+            if self.delete(key):
+                removed += 1
+        return removed
+
+    def purge_expired(self) -> int:
+        """Drop expired keys (no-op where the server expires keys itself)"""
+        return 0
+
+    def check(self) -> bool:
+        """Health check"""
+        return True
+
+
+class MemoryStateBackend(SharedStateBackend):
+    """Process-local backend with the same semantics, for tests and single-worker runs"""
+
+    shared = False
+    name = "memory"
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def _alive(self, key: str, now: float) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= now:
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            return False
+        return key in self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if not self._alive(key, time.time()):
+                return default
+            return self._data[key]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = value
+            if ttl:
+                self._expires[key] = time.time() + ttl
+            else:
+                self._expires.pop(key, None)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            self._expires.pop(key, None)
+            return self._data.pop(key, _MISSING) is not _MISSING
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        with self._lock:
+            now = time.time()
+            if not self._alive(key, now):
+                self._data[key] = 0
+                if ttl:
+                    self._expires[key] = now + ttl
+            self._data[key] = int(self._data[key]) + amount
+            return self._data[key]
+
+    def get_ttl(self, key: str) -> Optional[float]:
+        with self._lock:
+            now = time.time()
+            if not self._alive(key, now) or key not in self._expires:
+                return None
+            return self._expires[key] - now
+
+    def keys(self, prefix: str = "") -> List[str]:
+        with self._lock:
+            now = time.time()
+            return [k for k in list(self._data) if k.startswith(prefix) and self._alive(k, now)]
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            now = time.time()
+            expired = [k for k, at in self._expires.items() if at <= now]
+            for key in expired:
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
+            return len(expired)
+
+
+# SQLite keeps per-file lock bookkeeping in process memory. A child that
+# inherits it from a parent with the same file open believes the parent's WAL
+# locks are its own and never takes them at the OS level; another process can
+# then decide it is the last user and delete the WAL under the child's feet.
+# Connections are therefore closed before every fork and reopened on demand.
+_sqlite_backends: "weakref.WeakSet[SQLiteStateBackend]" = weakref.WeakSet()
+
+
+def _close_before_fork() -> None:
+    for backend in list(_sqlite_backends):
+        backend._lock.acquire()
+        backend._close()
+
+
+def _release_after_fork() -> None:
+    for backend in list(_sqlite_backends):
+        backend._pid = os.getpid()
+        backend._lock.release()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_close_before_fork,
+        after_in_parent=_release_after_fork,
+        after_in_child=_release_after_fork,
+    )
+
+
+class SQLiteStateBackend(SharedStateBackend):
+    """Host-local shared store on a SQLite file in WAL mode.
+
+    Every worker opens the same file; WAL lets readers run alongside the single
+    writer, and counters are updated with one UPSERT statement so increments
+    from different processes never race. Each process uses one connection,
+    serialised by a lock and never carried across a fork.
+    """
+
+    name = "sqlite"
+
+    _PURGE_EVERY = 1000
+
+    def __init__(self, path: str):
+        self.path = path
+        _create_private_file(path)
+        self._pid = os.getpid()
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        _sqlite_backends.add(self)
+        self._execute(
+            """
+            CREATE TABLE IF NOT EXISTS shared_state (
+                key TEXT PRIMARY KEY,
+                value,
+                expires_at REAL
+            )
+            """
+        )
+        self._execute(
+            "CREATE INDEX IF NOT EXISTS idx_shared_state_expires ON shared_state(expires_at)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None or self._pid != os.getpid():
+            # A connection from another pid is only possible if a fork bypassed
+            # the hooks above; abandon it rather than closing it here.
+            conn = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._db = conn
+            self._pid = os.getpid()
+        return self._db
+
+    def _close(self) -> None:
+        if self._db is not None and self._pid == os.getpid():
+            self._db.close()
+        self._db = None
+
+    def __del__(self) -> None:
+        # sqlite3 connections sit in a reference cycle and would otherwise stay
+        # open (and be inherited by forks) until the cyclic GC gets to them
+        try:
+            self._close()
+        except Exception:
+            pass
+
+    def _execute(self, sql: str, params: tuple = ()) -> "_Rows":
+        """Run one statement to completion and return its rows"""
+        with self._lock:
+            cur = self._connect().execute(sql, params)
+            rows = cur.fetchall()
+            return _Rows(rows, cur.rowcount)
+
+    def _after_write(self) -> None:
+        self._writes += 1
+        if self._writes % self._PURGE_EVERY == 0:
+            self.purge_expired()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        rows = self._execute(
+            "SELECT value FROM shared_state WHERE key = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        )
+        return decode_value(rows[0][0], default) if rows else default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        stored = encode_value(value)
+        self._execute(
+            "INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, stored, time.time() + ttl if ttl else None),
+        )
+        self._after_write()
+
+    def delete(self, key: str) -> bool:
+        rows = self._execute("DELETE FROM shared_state WHERE key = ?", (key,))
+        return rows.rowcount > 0
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        now = time.time()
+        rows = self._execute(
+            """
+            INSERT INTO shared_state (key, value, expires_at) VALUES (?1, ?2, ?3)
+            ON CONFLICT(key) DO UPDATE SET
+                value = CASE
+                    WHEN expires_at IS NOT NULL AND expires_at <= ?4 THEN excluded.value
+                    ELSE CAST(value AS INTEGER) + ?2
+                END,
+                expires_at = CASE
+                    WHEN expires_at IS NOT NULL AND expires_at <= ?4 THEN excluded.expires_at
+                    ELSE expires_at
+                END
+            RETURNING value
+            """,
+            (key, amount, now + ttl if ttl else None, now),
+        )
+        self._after_write()
+        return int(rows[0][0])
+
+    def get_ttl(self, key: str) -> Optional[float]:
+        now = time.time()
+        rows = self._execute(
+            "SELECT expires_at FROM shared_state WHERE key = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (key, now),
+        )
+        if not rows or rows[0][0] is None:
+            return None
+        return rows[0][0] - now
+
+    def keys(self, prefix: str = "") -> List[str]:
+        rows = self._execute(
+            "SELECT key FROM shared_state WHERE substr(key, 1, ?) = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (len(prefix), prefix, time.time()),
+        )
+        return [r[0] for r in rows]
+
+    def delete_prefix(self, prefix: str) -> int:
+        rows = self._execute(
+            "DELETE FROM shared_state WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        )
+        return rows.rowcount
+
+    def purge_expired(self) -> int:
+        rows = self._execute(
+            "DELETE FROM shared_state WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time(),),
+        )
+        return rows.rowcount
+
+    def check(self) -> bool:
+        try:
+            self._execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+
+class _Rows(list):
+    """Fetched rows plus the statement's rowcount"""
+
+    def __init__(self, rows: List[tuple], rowcount: int):
+        super().__init__(rows)
+        self.rowcount = rowcount
+
+
+class RedisStateBackend(SharedStateBackend):
+    """Backend for any Redis-protocol server (requires the ``redis`` package)"""
+
+    name = "redis"
+
+    def __init__(self, url: str, namespace: str = "fcra:"):
+        import redis
+
+        self.url = url
+        self.namespace = namespace
+        self._client = redis.Redis.from_url(url)
+
+    def _k(self, key: str) -> str:
+        return self.namespace + key
+
+    def get(self, key: str, default: Any = None) -> Any:
+        raw = self._client.get(self._k(key))
+        if raw is None:
+            return default
+        # Counters written by INCRBY come back as bare digits, which is valid JSON
+        return decode_value(raw, default)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        stored = encode_value(value)
+        self._client.set(self._k(key), stored, px=int(ttl * 1000) if ttl else None)
+
+    def delete(self, key: str) -> bool:
+        return bool(self._client.delete(self._k(key)))
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        full_key = self._k(key)
+        pipe = self._client.pipeline(transaction=True)
+        if ttl:
+            pipe.set(full_key, 0, px=int(ttl * 1000), nx=True)
+        pipe.incrby(full_key, amount)
+        return int(pipe.execute()[-1])
+
+    def get_ttl(self, key: str) -> Optional[float]:
+        remaining = self._client.pttl(self._k(key))
+        return remaining / 1000 if remaining and remaining > 0 else None
+
+    def keys(self, prefix: str = "") -> List[str]:
+        strip = len(self.namespace)
+        return [
+            k.decode()[strip:] if isinstance(k, bytes) else k[strip:]
+            for k in self._client.scan_iter(match=self._k(prefix) + "*", count=500)
+        ]
+
+    def check(self) -> bool:
+        try:
+            return bool(self._client.ping())
+        except Exception:
+            return False
+
+
+def _create_private_file(path: str) -> None:
+    """Create ``path`` as 0600 (its directory 0700) before SQLite opens it.
+
+    SQLite gives the -wal and -shm files the main file's permissions.
+    Refuses files or directories owned by another user.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+    try:
+        if hasattr(os, "getuid"):
+            for target in (os.fstat(fd), os.stat(directory)):
+                if target.st_uid != os.getuid():
+                    raise PermissionError(f"Shared state path {path} is owned by another user")
+        os.fchmod(fd, 0o600)
+    finally:
+        os.close(fd)
+
+
+def _default_sqlite_path() -> str:
+    state_dir = os.environ.get("SHARED_STATE_DIR") or DEFAULT_STATE_DIR
+    if not os.path.isdir(state_dir):
+        os.makedirs(state_dir, mode=0o700, exist_ok=True)
+    os.chmod(state_dir, 0o700)
+    return os.path.join(state_dir, "shared_state.sqlite")
+
+
+def resolve_state_url() -> str:
+    """Work out which backend to use from the environment"""
+    url = os.environ.get("SHARED_STATE_URL") or os.environ.get("REDIS_URL")
+    if url:
+        return url
+    if (
+        os.environ.get("TESTING", "").lower() == "true"
+        or os.environ.get("CI", "").lower() == "true"
+    ):
+        return "memory://"
+    return f"sqlite:///{_default_sqlite_path()}"
+
+
+def _sqlite_backend(path: Optional[str] = None) -> SharedStateBackend:
+    """SQLite backend on ``path``; per-process memory if the file is unusable"""
+    try:
+        return SQLiteStateBackend(path or _default_sqlite_path())
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Shared state: cannot use local SQLite ({e}), state is per-worker")
+        return MemoryStateBackend()
+
+
+def create_backend(url: str) -> SharedStateBackend:
+    """Build a backend from a URL, falling back to SQLite if Redis is unusable"""
+    if url.startswith("memory://"):
+        return MemoryStateBackend()
+    if url.startswith("sqlite:///"):
+        return _sqlite_backend(url[len("sqlite:///"):])
+    if url.split("://", 1)[0] in ("redis", "rediss", "valkey", "valkeys", "unix"):
+        try:
+            backend = RedisStateBackend(url.replace("valkey", "redis", 1))
+            if backend.check():
+                return backend
+            logger.warning(f"Shared state: Redis at {url} not reachable, using local SQLite")
+        except ImportError:
+            logger.warning("Shared state: redis package not installed, using local SQLite")
+        return _sqlite_backend()
+    raise ValueError(f"Unsupported shared state URL: {url}")
+
+
+_shared_state: Optional[SharedStateBackend] = None
+_shared_state_lock = threading.Lock()
+
+
+def get_shared_state() -> SharedStateBackend:
+    """Get or create the process-wide shared state backend"""
+    global _shared_state
+    if _shared_state is None:
+        with _shared_state_lock:
+            if _shared_state is None:
+                _shared_state = create_backend(resolve_state_url())
+    return _shared_state
+
+
+class SharedGeneration:
+    """Cross-worker invalidation signal for process-local caches.
+
+    Each worker keeps its own cache and calls changed() before reading it;
+    bump() after a write makes every other worker's changed() return True
+    once. The shared counter is polled at most every check_interval seconds,
+    so other workers see a bump within that delay.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        backend: Optional[SharedStateBackend] = None,
+        check_interval: float = 1.0,
+    ):
+        self.key = f"generation:{key}"
+        self.check_interval = check_interval
+        self._backend = backend
+        self._lock = threading.Lock()
+        self._seen: Any = None
+        self._checked_at = 0.0
+
+    @property
+    def backend(self) -> SharedStateBackend:
+        if self._backend is None:
+            self._backend = get_shared_state()
+        return self._backend
+
+    def bump(self) -> None:
+        """Signal other workers; the caller clears its own cache"""
+        try:
+            seen = self.backend.incr(self.key)
+        except Exception:
+            return
+        with self._lock:
+            self._seen = seen
+            self._checked_at = time.monotonic()
+
+    def changed(self, force: bool = False) -> bool:
+        """True if another worker bumped since the last check"""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return False
+        try:
+            current = self.backend.get(self.key, 0)
+        except Exception:
+            return False
+        with self._lock:
+            self._checked_at = now
+            changed = self._seen is not None and current != self._seen
+            self._seen = current
+        return changed
+
+
+def get_limiter_storage_uri() -> str:
+    """Storage URI for flask-limiter matching the shared state backend"""
+    backend = get_shared_state()
+    if isinstance(backend, RedisStateBackend):
+        return backend.url
+    if backend.shared:
+        return "sharedstate://"
+    return "memory://"
+
+
+class SharedStateLimitStorage(Storage):
+    """flask-limiter/limits storage backed by get_shared_state().
+
+    Registered for the ``sharedstate://`` scheme so the SQLite stand-in
+    enforces limits across workers just like Redis would.
+    """
+
+    STORAGE_SCHEME = ["sharedstate"]
+
+    def __init__(self, uri: Optional[str] = None, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.backend = get_shared_state()
+
+    @property
+    def base_exceptions(self):
+        return (sqlite3.Error,)
+
+    def _key(self, key: str) -> str:
+        return f"limiter:{key}"
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self.backend.incr(self._key(key), amount, ttl=expiry)
+
+    def get(self, key: str) -> int:
+        return int(self.backend.get(self._key(key), 0) or 0)
+
+    def get_expiry(self, key: str) -> float:
+        return time.time() + (self.backend.get_ttl(self._key(key)) or 0)
+
+    def check(self) -> bool:
+        return self.backend.check()
+
+    def reset(self) -> Optional[int]:
+        return self.backend.delete_prefix("limiter:")
+
+    def clear(self, key: str) -> None:
+        self.backend.delete(self._key(key))
@@ -10,6 +10,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from database import SessionLocal, SMSTemplate
+from services.template_engine import render_fields
 
 # Template categories
 SMS_CATEGORIES = {
@@ -414,10 +415,14 @@ class SMSTemplateService:
         # Add default variables
         variables.setdefault("company_name", "Brightpath Ascend")
 
-        # Substitute variables in message
-        message = template["message"]
-        for key, value in variables.items():
-            message = message.replace(f"{{{key}}}", str(value))
+        rendered, missing = render_fields(
+            "sms",
+            template["id"],
+            template.get("updated_at"),
+            {"message": template["message"]},
+            variables,
+        )
+        message = rendered["message"]
 
         char_count = len(message)
         segments = (
@@ -429,6 +434,7 @@ class SMSTemplateService:
             "message": message,
             "char_count": char_count,
             "segments": segments,
+            "missing_variables": missing,
             "template_id": template["id"],
             "template_type": template["template_type"],
         }
@@ -282,10 +282,20 @@ class TaskQueueService:
         client_id: Optional[int] = None,
         staff_id: Optional[int] = None,
         max_retries: int = 3,
+        idempotency_key: Optional[str] = None,
     ) -> BackgroundTask:
-        """Add a new task to the queue"""
+        """Add a new task to the queue (or return the one already queued under idempotency_key)"""
         session = get_db()
         try:
+            if idempotency_key:
+                existing = (
+                    session.query(BackgroundTask)
+                    .filter(BackgroundTask.idempotency_key == idempotency_key)
+                    .first()
+                )
+                if existing:
+                    return existing
+
             task = BackgroundTask(
                 task_type=task_type,
                 payload=payload,
@@ -295,6 +305,7 @@ class TaskQueueService:
                 client_id=client_id,
                 created_by_staff_id=staff_id,
                 max_retries=max_retries,
+                idempotency_key=idempotency_key,
             )
             session.add(task)
             session.commit()
@@ -303,6 +314,60 @@ class TaskQueueService:
         finally:
             session.close()
 
+    @staticmethod
+    def enqueue_bulk(tasks: List[Dict[str, Any]], session=None) -> List[BackgroundTask]:
+        """
+        Add many tasks at once. Each dict takes enqueue_task's arguments;
+        tasks whose idempotency_key is already queued are skipped.
+
+        With `session`, the tasks are only added to the caller's transaction
+        (so they commit together with the caller's own changes); otherwise
+        they are committed here.
+
+        Returns:
+            The tasks added (skipped duplicates are not included)
+        """
+        own_session = session is None
+        session = session or get_db()
+        try:
+            keys = [t["idempotency_key"] for t in tasks if t.get("idempotency_key")]
+            existing = set()
+            if keys:
+                existing = {
+                    key
+                    for (key,) in session.query(BackgroundTask.idempotency_key)
+                    .filter(BackgroundTask.idempotency_key.in_(keys))
+                    .all()
+                }
+
+            new_tasks = []
+            for t in tasks:
+                key = t.get("idempotency_key")
+                if key and key in existing:
+                    continue
+                existing.add(key)
+                new_tasks.append(
+                    BackgroundTask(
+                        task_type=t["task_type"],
+                        payload=t.get("payload"),
+                        priority=min(max(t.get("priority", 5), 1), 10),
+                        status="pending",
+                        scheduled_at=t.get("scheduled_at"),
+                        client_id=t.get("client_id"),
+                        created_by_staff_id=t.get("staff_id"),
+                        max_retries=t.get("max_retries", 3),
+                        idempotency_key=key,
+                    )
+                )
+
+            session.add_all(new_tasks)
+            if own_session:
+                session.commit()
+            return new_tasks
+        finally:
+            if own_session:
+                session.close()
+
     @staticmethod
     def process_pending_tasks(limit: int = 1) -> List[Dict[str, Any]]:
         """Process pending tasks one at a time"""
@@ -430,25 +495,10 @@ class TaskQueueService:
     @staticmethod
     def cleanup_old_tasks(days: int = 30) -> int:
         """Delete completed/failed/cancelled tasks older than specified days"""
-        session = get_db()
-        try:
-            cutoff = datetime.utcnow() - timedelta(days=days)
-
-            deleted = (
-                session.query(BackgroundTask)
-                .filter(
-                    and_(
-                        BackgroundTask.status.in_(["completed", "failed", "cancelled"]),
-                        BackgroundTask.completed_at < cutoff,
-                    )
-                )
-                .delete(synchronize_session=False)
-            )
+        from services.log_partition_service import get_log_partition_service
 
-            session.commit()
-            return deleted
-        finally:
-            session.close()
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        return get_log_partition_service().purge_before("background_tasks", cutoff)
 
     @staticmethod
     def get_tasks(
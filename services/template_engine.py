@@ -0,0 +1,187 @@
+"""
+Compiled Template Engine
+
+Letters, emails, SMS and bulk campaigns fill {variable} placeholders (bulk
+campaigns use {{variable}}). Rather than one str.replace pass per variable
+per send, a template is parsed once into literal and placeholder segments
+and rendered with a single join.
+
+Compiled templates are cached by (kind, template id, version, field); the
+cached entry is only used while the stored source text still matches, so a
+template edited in the database recompiles on its next render even if its
+version did not change.
+
+Placeholders with no value are left in the output as written, matching the
+substitution loops this replaces; missing_variables() reports them.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+SINGLE_BRACE = "single"  # {name}
+DOUBLE_BRACE = "double"  # {{name}}
+
+_PLACEHOLDER_PATTERNS = {
+    SINGLE_BRACE: re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}"),
+    DOUBLE_BRACE: re.compile(r"\{\{([A-Za-z_][A-Za-z0-9_]*)\}\}"),
+}
+
+TEMPLATE_CACHE_MAX_ENTRIES = 2048
+
+ValueFormatter = Callable[[Any], str]
+
+
+def str_value(value: Any) -> str:
+    """str() every value, including None (email and SMS templates)"""
+    return str(value)
+
+
+def blank_if_falsy(value: Any) -> str:
+    """Empty string for None/''/0/False (letters and campaigns)"""
+    return str(value) if value else ""
+
+
+class CompiledTemplate:
+    """A template split into literal text and placeholder names.
+
+    `_literals` has one more entry than `_names`; rendering interleaves them.
+    """
+
+    __slots__ = ("source", "syntax", "variables", "_literals", "_names", "_placeholders")
+
+    def __init__(self, source: str, syntax: str = SINGLE_BRACE):
+        pattern = _PLACEHOLDER_PATTERNS[syntax]
+        literals: List[str] = []
+        names: List[str] = []
+        placeholders: List[str] = []
+        pos = 0
+        for match in pattern.finditer(source):
+            literals.append(source[pos : match.start()])
+            names.append(match.group(1))
+            placeholders.append(match.group(0))
+            pos = match.end()
+        literals.append(source[pos:])
+
+        self.source = source
+        self.syntax = syntax
+        self.variables = frozenset(names)
+        self._literals = tuple(literals)
+        self._names = tuple(names)
+        self._placeholders = tuple(placeholders)
+
+    def render(
+        self, variables: Dict[str, Any], formatter: ValueFormatter = str_value
+    ) -> str:
+        """Fill placeholders in one pass; unknown placeholders stay as written"""
+        if not self._names:
+            return self.source
+        literals = self._literals
+        parts = [literals[0]]
+        for i, name in enumerate(self._names):
+            if name in variables:
+                parts.append(formatter(variables[name]))
+            else:
+                parts.append(self._placeholders[i])
+            parts.append(literals[i + 1])
+        return "".join(parts)
+
+    def render_many(
+        self,
+        variable_sets: Iterable[Dict[str, Any]],
+        formatter: ValueFormatter = str_value,
+    ) -> List[str]:
+        """render() for each variable dict"""
+        return [self.render(variables, formatter) for variables in variable_sets]
+
+    def missing_variables(self, variables: Dict[str, Any]) -> List[str]:
+        """Placeholders in the template with no entry in `variables`"""
+        return sorted(self.variables.difference(variables))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_MAX_ENTRIES)
+def compile_template(source: str, syntax: str = SINGLE_BRACE) -> CompiledTemplate:
+    """Compile ad-hoc template text (memoized on the text itself)"""
+    return CompiledTemplate(source, syntax)
+
+
+class TemplateCache:
+    """Bounded LRU of compiled templates keyed by template id and version"""
+
+    def __init__(self, max_entries: int = TEMPLATE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CompiledTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, key: Optional[Hashable], source: Optional[str], syntax: str = SINGLE_BRACE
+    ) -> CompiledTemplate:
+        """Compiled form of `source`, cached under `key` (e.g. ("email", id, updated_at, "subject"))"""
+        source = source or ""
+        if key is None:
+            return compile_template(source, syntax)
+
+        with self._lock:
+            compiled = self._entries.get(key)
+            if (
+                compiled is not None
+                and compiled.syntax == syntax
+                and (compiled.source is source or compiled.source == source)
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        compiled = CompiledTemplate(source, syntax)
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "templates": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_count": self.hits,
+                "miss_count": self.misses,
+                "hit_rate": round(self.hits / total * 100, 2) if total else 0,
+            }
+
+
+template_cache = TemplateCache()
+
+
+def render_fields(
+    kind: str,
+    template_id: Any,
+    version: Any,
+    fields: Dict[str, Optional[str]],
+    variables: Dict[str, Any],
+    formatter: ValueFormatter = str_value,
+    syntax: str = SINGLE_BRACE,
+) -> Tuple[Dict[str, str], List[str]]:
+    """Render several fields of one template (subject, body, ...).
+
+    Returns the rendered fields and the placeholders left unfilled across
+    all of them.
+    """
+    rendered = {}
+    missing = set()
+    for field, source in fields.items():
+        compiled = template_cache.get((kind, template_id, version, field), source, syntax)
+        rendered[field] = compiled.render(variables, formatter)
+        missing.update(compiled.variables.difference(variables))
+    return rendered, sorted(missing)
@@ -0,0 +1,188 @@
+"""
+Tenant Resolver for Host-Based Branding
+
+Maps a request host to its white-label tenant, white-label config and their
+branding dicts, caching the result per host so the before_request hook, the
+with_branding decorator and WhiteLabelConfigService.get_config_by_domain share
+one cache and do not query the database on every request.
+
+Misses are cached too (unknown hosts are the common case), and entries are
+plain snapshots rather than ORM rows so they are safe to share between
+requests and threads. Tenant and config writes call invalidate_tenant_cache();
+the invalidation generation is kept in the shared state backend so other
+workers drop their copies within a second.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import inspect as sa_inspect
+
+from services.shared_state import SharedGeneration, SharedStateBackend
+
+TENANT_RESOLVER_TTL = int(os.environ.get("TENANT_RESOLVER_TTL_SECONDS", "300"))
+TENANT_RESOLVER_MAX_HOSTS = int(os.environ.get("TENANT_RESOLVER_MAX_HOSTS", "1024"))
+
+
+@dataclass(frozen=True)
+class ResolvedHost:
+    """Everything the request hooks need for one host"""
+
+    tenant: Optional[SimpleNamespace] = None
+    tenant_branding: Optional[Dict[str, Any]] = None
+    whitelabel_config: Optional[SimpleNamespace] = None
+    whitelabel_branding: Optional[Dict[str, Any]] = None
+
+
+UNRESOLVED = ResolvedHost()
+
+
+def normalize_host(host: Optional[str]) -> str:
+    """Lowercase a host and strip any port"""
+    if not host:
+        return ""
+    return host.strip().lower().split(":")[0]
+
+
+def snapshot_row(row: Any) -> SimpleNamespace:
+    """Copy the column values of an ORM row into a detached namespace"""
+    mapper = sa_inspect(row).mapper
+    return SimpleNamespace(
+        **{attr.key: getattr(row, attr.key) for attr in mapper.column_attrs}
+    )
+
+
+def _load_from_db(host: str) -> ResolvedHost:
+    """Resolve a host with one short-lived session"""
+    from database import get_db
+    from services.white_label_service import get_white_label_service
+    from services.whitelabel_service import get_whitelabel_config_service
+
+    db = get_db()
+    try:
+        tenant = get_white_label_service(db).detect_tenant_from_host(host)
+        if tenant is not None and not tenant.is_active:
+            tenant = None
+
+        config = get_whitelabel_config_service(db).detect_config_from_host(host)
+        if config is not None and not config.is_active:
+            config = None
+
+        return ResolvedHost(
+            tenant=snapshot_row(tenant) if tenant else None,
+            tenant_branding=tenant.get_branding_config() if tenant else None,
+            whitelabel_config=snapshot_row(config) if config else None,
+            whitelabel_branding=config.get_branding_dict() if config else None,
+        )
+    finally:
+        db.close()
+
+
+class TenantResolver:
+    """Bounded, TTL-based host -> ResolvedHost cache"""
+
+    def __init__(
+        self,
+        loader: Callable[[str], ResolvedHost] = _load_from_db,
+        ttl: float = TENANT_RESOLVER_TTL,
+        max_hosts: int = TENANT_RESOLVER_MAX_HOSTS,
+        backend: Optional[SharedStateBackend] = None,
+    ):
+        self._loader = loader
+        self.ttl = ttl
+        self.max_hosts = max_hosts
+        self._generation = SharedGeneration("tenant_resolver", backend)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host: Optional[str]) -> ResolvedHost:
+        """Return the cached resolution for a host, loading it on a miss"""
+        host = normalize_host(host)
+        if not host:
+            return UNRESOLVED
+
+        if self._generation.changed():
+            self._clear()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(host)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            epoch = self._epoch
+
+        resolved = self._loader(host)
+
+        with self._lock:
+            if epoch != self._epoch:
+                # Invalidated while loading; the result may already be stale
+                return resolved
+            self._entries[host] = (time.monotonic() + self.ttl, resolved)
+            self._entries.move_to_end(host)
+            while len(self._entries) > self.max_hosts:
+                self._entries.popitem(last=False)
+        return resolved
+
+    def invalidate_host(self, *hosts: Optional[str]) -> None:
+        """Drop specific hosts here and bump the shared generation"""
+        with self._lock:
+            self._epoch += 1
+            for host in hosts:
+                self._entries.pop(normalize_host(host), None)
+        self._generation.bump()
+
+    def invalidate_all(self) -> None:
+        """Drop every cached host here and in other workers"""
+        self._clear()
+        self._generation.bump()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics for the admin performance views"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hosts": len(self._entries),
+                "max_hosts": self.max_hosts,
+                "ttl_seconds": self.ttl,
+                "hit_count": self.hits,
+                "miss_count": self.misses,
+                "hit_rate": round(self.hits / total * 100, 2) if total else 0,
+            }
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+
+_tenant_resolver: Optional[TenantResolver] = None
+_tenant_resolver_lock = threading.Lock()
+
+
+def get_tenant_resolver() -> TenantResolver:
+    """Process-wide resolver instance"""
+    global _tenant_resolver
+    if _tenant_resolver is None:
+        with _tenant_resolver_lock:
+            if _tenant_resolver is None:
+                _tenant_resolver = TenantResolver()
+    return _tenant_resolver
+
+
+def invalidate_tenant_cache() -> None:
+    """Called after any tenant or white-label config write.
+
+    Tenants also match by subdomain slug under any parent domain, so a
+    write cannot be mapped back to a fixed set of hosts; drop them all.
+    """
+    get_tenant_resolver().invalidate_all()
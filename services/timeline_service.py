@@ -6,13 +6,23 @@ through dispute resolution. Provides methods to create, retrieve, and
 display timeline events in the client portal.
 """
 
+import logging
+import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from sqlalchemy import desc
+from sqlalchemy import desc, exists, insert
 from sqlalchemy.orm import Session
 
-from database import Client, SessionLocal, TimelineEvent
+from database import BatchJob, Client, SessionLocal, TimelineEvent
+
+logger = logging.getLogger(__name__)
+
+# Rows per multi-row insert in bulk_backfill_events
+BACKFILL_CHUNK_SIZE = 1000
+
+# Client.payment_status values that count as paid for the backfill
+PAID_STATUSES = ("paid", "completed", "active")
 
 # Define event types with their icons and categories
 EVENT_TYPES = {
@@ -514,65 +524,106 @@ class TimelineService:
         if not client:
             return {"success": False, "error": "Client not found"}
 
-        events_created = 0
+        result = self.bulk_backfill_events(client_ids=[client_id])
 
-        # Check if signup event already exists
-        existing = (
-            self.db.query(TimelineEvent)
-            .filter(
-                TimelineEvent.client_id == client_id,
-                TimelineEvent.event_type == "signup",
-            )
-            .first()
-        )
+        return {
+            "success": True,
+            "client_id": client_id,
+            "events_created": result["events_created"],
+        }
 
-        if not existing and client.created_at:
-            self.create_event(
-                client_id=client_id, event_type="signup", event_date=client.created_at
-            )
-            events_created += 1
-
-        # Check for agreement signed
-        if client.agreement_signed:
-            existing = (
-                self.db.query(TimelineEvent)
-                .filter(
-                    TimelineEvent.client_id == client_id,
-                    TimelineEvent.event_type == "agreement_signed",
-                )
-                .first()
+    def bulk_backfill_events(
+        self,
+        client_ids: List[int] = None,
+        chunk_size: int = BACKFILL_CHUNK_SIZE,
+        progress: Callable[[int, int], None] = None,
+    ) -> Dict[str, Any]:
+        """
+        Backfill timeline events for many clients (default: all of them).
+
+        Missing (client, event_type) pairs are found with one anti-join per
+        event type in BACKFILL_RULES and inserted with multi-row inserts,
+        committing every `chunk_size` events.
+
+        Args:
+            client_ids: Restrict to these clients
+            chunk_size: Events per insert/commit
+            progress: Called as progress(events_created, events_total)
+                after each chunk
+
+        Returns:
+            dict with events created, per event type
+        """
+        now = datetime.utcnow()
+        rows = []
+        by_type = {}
+
+        for event_type, (condition, date_columns) in _backfill_rules().items():
+            already_logged = exists().where(
+                TimelineEvent.client_id == Client.id,
+                TimelineEvent.event_type == event_type,
             )
-            if not existing:
-                self.create_event(
-                    client_id=client_id,
-                    event_type="agreement_signed",
-                    event_date=getattr(client, "agreement_signed_at", None)
-                    or client.updated_at
-                    or datetime.utcnow(),
-                )
-                events_created += 1
-
-        # Check for payment completed
-        if client.payment_status in ["paid", "completed", "active"]:
-            existing = (
-                self.db.query(TimelineEvent)
-                .filter(
-                    TimelineEvent.client_id == client_id,
-                    TimelineEvent.event_type == "payment_completed",
-                )
-                .first()
+            query = self.db.query(Client.id, *date_columns).filter(
+                condition, ~already_logged
             )
-            if not existing:
-                self.create_event(client_id=client_id, event_type="payment_completed")
-                events_created += 1
+            if client_ids is not None:
+                query = query.filter(Client.id.in_(client_ids))
+
+            missing = query.order_by(Client.id).all()
+            by_type[event_type] = len(missing)
+            for client_id, *dates in missing:
+                event_date = next((d for d in dates if d is not None), now)
+                rows.append(_event_row(client_id, event_type, event_date, now))
+
+        total = len(rows)
+        created = 0
+        for start in range(0, total, chunk_size):
+            chunk = rows[start : start + chunk_size]
+            self.db.execute(insert(TimelineEvent), chunk)
+            self.db.commit()
+            created += len(chunk)
+            if progress:
+                progress(created, total)
 
         return {
             "success": True,
-            "client_id": client_id,
-            "events_created": events_created,
+            "events_created": created,
+            "by_type": by_type,
         }
 
 
+# Event types the backfill derives from client columns:
+# event_type -> (which clients qualify, event_date columns in order of preference)
+# Clients with none of the date columns set get the backfill time.
+def _backfill_rules() -> Dict[str, Tuple[Any, Tuple[Any, ...]]]:
+    return {
+        "signup": (Client.created_at.isnot(None), (Client.created_at,)),
+        "agreement_signed": (
+            Client.agreement_signed.is_(True),
+            (Client.agreement_signed_at, Client.updated_at),
+        ),
+        "payment_completed": (Client.payment_status.in_(PAID_STATUSES), ()),
+    }
+
+
+def _event_row(
+    client_id: int, event_type: str, event_date: datetime, created_at: datetime
+) -> Dict[str, Any]:
+    """Column values for a default TimelineEvent (as create_event builds it)"""
+    event_config = EVENT_TYPES.get(event_type, {})
+    return {
+        "client_id": client_id,
+        "event_type": event_type,
+        "event_category": event_config.get("category", "general"),
+        "title": event_config.get("title", event_type.replace("_", " ").title()),
+        "icon": event_config.get("icon", "circle"),
+        "is_milestone": event_config.get("is_milestone", False),
+        "is_visible": True,
+        "event_date": event_date,
+        "created_at": created_at,
+    }
+
+
 def get_timeline_service(db: Session = None) -> TimelineService:
     """Factory function to get TimelineService instance."""
     if db is None:
@@ -702,3 +753,88 @@ def log_milestone(
     service.create_event(
         client_id=client_id, event_type=event_type, title=title, description=description
     )
+
+
+def start_timeline_backfill(staff_id: int, client_ids: List[int] = None) -> Dict[str, Any]:
+    """
+    Queue a bulk timeline backfill as a background task.
+
+    Progress is tracked on a BatchJob, so it can be polled from
+    /api/batch/jobs/<id>/progress like any other batch operation.
+    """
+    from services.task_queue_service import TaskQueueService
+
+    db = SessionLocal()
+    try:
+        job = BatchJob(
+            job_uuid=str(uuid.uuid4()),
+            name="Timeline backfill",
+            action_type="backfill_timeline",
+            action_params={},
+            selection_type="all" if client_ids is None else "manual",
+            selection_filter={"client_ids": client_ids} if client_ids else None,
+            status="pending",
+            created_by_id=staff_id,
+        )
+        db.add(job)
+        db.commit()
+        job_id = job.id
+    finally:
+        db.close()
+
+    task = TaskQueueService.enqueue_task(
+        "backfill_timeline",
+        {"batch_job_id": job_id, "client_ids": client_ids},
+        staff_id=staff_id,
+    )
+    return {"batch_job_id": job_id, "task_id": task.id}
+
+
+# Register the task handler for the scheduler
+from services.task_queue_service import register_task_handler  # noqa: E402
+
+
+@register_task_handler("backfill_timeline")
+def handle_backfill_timeline(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Task handler: bulk timeline backfill ({"batch_job_id", "client_ids"} optional)"""
+    db = SessionLocal()
+    try:
+        job = None
+        if payload.get("batch_job_id"):
+            job = db.query(BatchJob).filter(BatchJob.id == payload["batch_job_id"]).first()
+        if job:
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            db.commit()
+
+        def report(created: int, total: int) -> None:
+            logger.info(f"Timeline backfill: {created}/{total} events")
+            if job:
+                job.total_items = total
+                job.items_processed = job.items_succeeded = created
+                job.progress_percent = created / total * 100
+                db.commit()
+
+        try:
+            result = TimelineService(db).bulk_backfill_events(
+                client_ids=payload.get("client_ids"),
+                chunk_size=payload.get("chunk_size") or BACKFILL_CHUNK_SIZE,
+                progress=report,
+            )
+        except Exception as e:
+            db.rollback()
+            if job:
+                job.status = "failed"
+                job.error_message = str(e)
+                job.completed_at = datetime.utcnow()
+                db.commit()
+            raise
+
+        if job:
+            job.status = "completed"
+            job.progress_percent = 100.0
+            job.completed_at = datetime.utcnow()
+            db.commit()
+        return result
+    finally:
+        db.close()
@@ -20,6 +20,7 @@ from database import (
     TenantUser,
     WhiteLabelTenant,
 )
+from services.tenant_resolver import invalidate_tenant_cache
 
 
 class WhiteLabelService:
@@ -94,6 +95,7 @@ class WhiteLabelService:
         self.db.add(tenant)
         self.db.commit()
         self.db.refresh(tenant)
+        invalidate_tenant_cache()
 
         return tenant
 
@@ -175,6 +177,7 @@ class WhiteLabelService:
         tenant.updated_at = datetime.utcnow()  # type: ignore[assignment]
         self.db.commit()
         self.db.refresh(tenant)
+        invalidate_tenant_cache()
 
         return tenant
 
@@ -194,6 +197,7 @@ class WhiteLabelService:
 
         self.db.delete(tenant)
         self.db.commit()
+        invalidate_tenant_cache()
         return True
 
     def get_tenant_by_id(self, tenant_id: int) -> Optional[WhiteLabelTenant]:
@@ -249,7 +253,8 @@ class WhiteLabelService:
 
         return tenant.get_branding_config()
 
-    def get_default_branding(self) -> Dict[str, Any]:
+    @staticmethod
+    def get_default_branding() -> Dict[str, Any]:
         """Get default branding for non-tenant requests"""
         return {
             "primary_color": "#319795",
@@ -447,6 +452,7 @@ class WhiteLabelService:
         tenant.api_key = new_api_key  # type: ignore[assignment]
         tenant.updated_at = datetime.utcnow()  # type: ignore[assignment]
         self.db.commit()
+        invalidate_tenant_cache()
 
         return new_api_key
 
@@ -8,76 +8,36 @@ import re
 import secrets
 from datetime import datetime
 from functools import lru_cache
+from types import SimpleNamespace
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
 from database import FONT_FAMILIES, FranchiseOrganization, WhiteLabelConfig
 from services.encryption import decrypt_value, encrypt_value
+from services.tenant_resolver import get_tenant_resolver, invalidate_tenant_cache
 
 
 class WhiteLabelConfigService:
     """Service class for white-label configuration management"""
 
-    _config_cache: Dict[str, Any] = {}
-    _cache_ttl = 300
-    _cache_timestamps: Dict[str, datetime] = {}
-
     def __init__(self, db: Session):
         self.db = db
 
-    def get_config_by_domain(self, domain: str) -> Optional[WhiteLabelConfig]:
+    def get_config_by_domain(self, domain: str) -> Optional[SimpleNamespace]:
         """
         Lookup white-label config by subdomain or custom domain.
 
+        Served from the shared per-host tenant resolver cache, so the result
+        is a detached snapshot of the config row rather than the ORM instance.
+
         Args:
             domain: The domain or subdomain to look up
 
         Returns:
-            WhiteLabelConfig if found, None otherwise
+            Snapshot of the active WhiteLabelConfig if found, None otherwise
         """
-        if not domain:
-            return None
-
-        domain = domain.lower().strip()
-
-        cache_key = f"domain:{domain}"
-        cached = self._get_from_cache(cache_key)
-        if cached is not None:
-            return cached
-
-        config = (
-            self.db.query(WhiteLabelConfig)
-            .filter(
-                WhiteLabelConfig.custom_domain == domain,
-                WhiteLabelConfig.is_active == True,
-            )
-            .first()
-        )
-
-        if config:
-            self._set_cache(cache_key, config)
-            return config
-
-        parts = domain.split(".")
-        if len(parts) >= 2:
-            subdomain = parts[0]
-            if subdomain not in ["www", "app", "api", "admin", "mail", "smtp"]:
-                config = (
-                    self.db.query(WhiteLabelConfig)
-                    .filter(
-                        WhiteLabelConfig.subdomain == subdomain,
-                        WhiteLabelConfig.is_active == True,
-                    )
-                    .first()
-                )
-
-                if config:
-                    self._set_cache(cache_key, config)
-                    return config
-
-        self._set_cache(cache_key, None)
-        return None
+        return get_tenant_resolver().resolve(domain).whitelabel_config
 
     def get_config_by_org(self, organization_id: int) -> Optional[WhiteLabelConfig]:
         """
@@ -92,12 +52,7 @@ class WhiteLabelConfigService:
         if not organization_id:
             return None
 
-        cache_key = f"org:{organization_id}"
-        cached = self._get_from_cache(cache_key)
-        if cached is not None:
-            return cached
-
-        config = (
+        return (
             self.db.query(WhiteLabelConfig)
             .filter(
                 WhiteLabelConfig.organization_id == organization_id,
@@ -106,9 +61,6 @@ class WhiteLabelConfigService:
             .first()
         )
 
-        self._set_cache(cache_key, config)
-        return config
-
     def get_config_by_id(self, config_id: int) -> Optional[WhiteLabelConfig]:
         """Get a specific white-label config by ID"""
         return self.db.query(WhiteLabelConfig).filter_by(id=config_id).first()
@@ -195,7 +147,7 @@ class WhiteLabelConfigService:
         self.db.commit()
         self.db.refresh(config)
 
-        self._clear_cache()
+        invalidate_tenant_cache()
 
         return config
 
@@ -288,7 +240,7 @@ class WhiteLabelConfigService:
         self.db.commit()
         self.db.refresh(config)
 
-        self._clear_cache()
+        invalidate_tenant_cache()
 
         return config
 
@@ -309,7 +261,7 @@ class WhiteLabelConfigService:
         self.db.delete(config)
         self.db.commit()
 
-        self._clear_cache()
+        invalidate_tenant_cache()
 
         return True
 
@@ -485,6 +437,9 @@ a:hover {{
         """
         Detect white-label config from request host.
 
+        Always queries the database; this is the tenant resolver's loader.
+        Request paths should use get_config_by_domain instead.
+
         Args:
             host: Request host (e.g., 'partner.example.com')
 
@@ -494,9 +449,33 @@ a:hover {{
         if not host:
             return None
 
-        host = host.lower().split(":")[0]
+        host = host.lower().strip().split(":")[0]
 
-        return self.get_config_by_domain(host)
+        config = (
+            self.db.query(WhiteLabelConfig)
+            .filter(
+                WhiteLabelConfig.custom_domain == host,
+                WhiteLabelConfig.is_active == True,
+            )
+            .first()
+        )
+        if config:
+            return config
+
+        parts = host.split(".")
+        if len(parts) >= 2:
+            subdomain = parts[0]
+            if subdomain not in ["www", "app", "api", "admin", "mail", "smtp"]:
+                return (
+                    self.db.query(WhiteLabelConfig)
+                    .filter(
+                        WhiteLabelConfig.subdomain == subdomain,
+                        WhiteLabelConfig.is_active == True,
+                    )
+                    .first()
+                )
+
+        return None
 
     def _get_default_branding(self) -> Dict[str, Any]:
         """Return default branding configuration"""
@@ -545,32 +524,6 @@ a:hover {{
         pattern = r"^[a-z0-9]([a-z0-9\-]{0,61}[a-z0-9])?$"
         return bool(re.match(pattern, subdomain))
 
-    def _get_from_cache(self, key: str) -> Any:
-        """Get value from cache if not expired"""
-        if key not in self._config_cache:
-            return None
-
-        timestamp = self._cache_timestamps.get(key)
-        if (
-            timestamp
-            and (datetime.utcnow() - timestamp).total_seconds() > self._cache_ttl
-        ):
-            del self._config_cache[key]
-            del self._cache_timestamps[key]
-            return None
-
-        return self._config_cache.get(key)
-
-    def _set_cache(self, key: str, value: Any):
-        """Set value in cache with timestamp"""
-        self._config_cache[key] = value
-        self._cache_timestamps[key] = datetime.utcnow()
-
-    def _clear_cache(self):
-        """Clear all cached configs"""
-        self._config_cache.clear()
-        self._cache_timestamps.clear()
-
 
 def get_whitelabel_config_service(db: Session) -> WhiteLabelConfigService:
     """Factory function to create WhiteLabelConfigService instance"""
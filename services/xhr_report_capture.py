@@ -0,0 +1,463 @@
+"""
+XHR Report Capture for Credit Import Automation
+
+Records the JSON API responses a monitoring site sends while the import
+browser logs in and opens the report, and builds the structured report
+(scores, accounts, personal info, inquiries, creditor contacts) from those
+payloads directly. The rendered-HTML path (scrolling, expanding every
+account, DOM scraping, full-page screenshots) is then only needed when a
+required section is missing from the captured payloads.
+
+Payload shapes differ per site, so sections are found by key anywhere in a
+response (up to MAX_DEPTH levels deep) rather than by URL.
+
+Usage:
+    capture = XHRCapture()
+    capture.attach(page)            # before login
+    ...
+    report = capture.build_report(parse_account)
+    if report["missing"]:
+        ...  # fall back to DOM extraction for those sections
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sections the import cannot do without; the rest are filled from the DOM
+# when absent
+REQUIRED_SECTIONS = ("scores", "accounts")
+
+MAX_DEPTH = 6
+# Bodies shorter than this are status pings, not report data
+MIN_BODY_CHARS = 100
+
+ACCOUNT_KEYS = {
+    "tradelines",
+    "accounts",
+    "tradeLines",
+    "Accounts",
+    "TradeLines",
+    "creditAccounts",
+    "CreditAccounts",
+    "tpartitions",
+    "TPartitions",
+    "trades",  # MyFreeScoreNow format
+    "Trades",
+}
+SCORE_KEYS = {
+    "scores",
+    "Scores",
+    "creditScores",
+    "CreditScores",
+    "bureauScores",
+    "vantageScores",
+}
+INQUIRY_KEYS = {"inquiries", "Inquiries", "inquiryList", "creditInquiries"}
+CONTACT_KEYS = {"creditorContacts", "CreditorContacts", "creditorContactList"}
+PERSONAL_KEYS = {
+    "personalInformation",
+    "PersonalInformation",
+    "personalInfo",
+    "borrower",
+    "Borrower",
+    "consumer",
+}
+
+BUREAU_ALIASES = {
+    "transunion": "transunion",
+    "trans union": "transunion",
+    "tu": "transunion",
+    "tuc": "transunion",
+    "experian": "experian",
+    "exp": "experian",
+    "xpn": "experian",
+    "equifax": "equifax",
+    "eqf": "equifax",
+    "efx": "equifax",
+}
+
+# MyFreeScoreNow currentAccountRating codes
+ACCOUNT_RATINGS = {
+    "00": "Current",
+    "01": "Current",
+    "1": "Current",
+    "02": "30 Days Late",
+    "2": "30 Days Late",
+    "03": "60 Days Late",
+    "3": "60 Days Late",
+    "04": "90 Days Late",
+    "4": "90 Days Late",
+    "05": "120 Days Late",
+    "5": "120 Days Late",
+    "07": "Wage Earner",
+    "08": "Repossession",
+    "09": "Charge Off",
+}
+
+# paymentPattern characters -> unified payment history badges
+PATTERN_BADGES = {"1": "OK", "2": "30", "3": "60", "4": "90", "5": "120", "9": "CO", "C": "CO"}
+
+
+def _first(item: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        value = item.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def normalize_bureau(value: Any) -> Optional[str]:
+    """'TUC', 'TransUnion', 'bureau_experian' ... -> canonical bureau name"""
+    if value is None:
+        return None
+    text = str(value).lower().replace("_", " ").strip()
+    if text in BUREAU_ALIASES:
+        return BUREAU_ALIASES[text]
+    for name in ("transunion", "trans union", "experian", "equifax"):
+        if name in text:
+            return BUREAU_ALIASES[name]
+    return None
+
+
+def _score(value: Any) -> Optional[int]:
+    # {"score": 640}, {"score": {"value": "640"}}, ...
+    while isinstance(value, dict):
+        value = _first(value, ("score", "value", "scoreValue", "riskScore"))
+    try:
+        score = int(float(str(value).strip()))
+    except (TypeError, ValueError):
+        return None
+    return score if 300 <= score <= 850 else None
+
+
+def _date(value: Any) -> Optional[str]:
+    """Epoch milliseconds (MyFreeScoreNow) or a date string -> M/D/YYYY"""
+    if value in (None, ""):
+        return None
+    if isinstance(value, (int, float)):
+        try:
+            day = datetime.utcfromtimestamp(value / 1000)
+        except (OverflowError, OSError, ValueError):
+            return None
+        return f"{day.month}/{day.day}/{day.year}"
+    return str(value)
+
+
+def _amount(value: Any) -> Any:
+    if value in (None, ""):
+        return None
+    try:
+        return float(str(value).replace("$", "").replace(",", ""))
+    except ValueError:
+        return str(value)
+
+
+def _walk(node: Any, depth: int = 0) -> Iterator[Tuple[str, Any]]:
+    """Every (key, value) pair in a JSON document, outermost first"""
+    if depth > MAX_DEPTH:
+        return
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield key, value
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                yield from _walk(value, depth + 1)
+    elif isinstance(node, list):
+        for value in node:
+            if isinstance(value, (dict, list)):
+                yield from _walk(value, depth + 1)
+
+
+class XHRCapture:
+    """Collects JSON responses from a page for the whole import session"""
+
+    def __init__(self):
+        self.responses: List[Dict[str, Any]] = []
+        self._seen: set = set()
+        self.page = None
+
+    def attach(self, page) -> None:
+        if self.page is page:
+            return
+        page.on("response", self.on_response)
+        self.page = page
+
+    async def on_response(self, response) -> None:
+        """page "response" handler: keep JSON bodies that may hold report data"""
+        try:
+            url = response.url
+            content_type = response.headers.get("content-type", "")
+            if not (
+                "json" in content_type
+                or url.endswith(".json")
+                or "api" in url.lower()
+                or "data" in url.lower()
+            ):
+                return
+            if getattr(response, "status", 200) >= 400:
+                return
+            body = await response.text()
+            self.add(url, body)
+        except Exception as e:
+            logger.debug(f"Skipped response capture: {e}")
+
+    def add(self, url: str, body: str) -> bool:
+        """Record one response body; False if it is not new JSON"""
+        if not body or len(body) <= MIN_BODY_CHARS:
+            return False
+        # Polling endpoints return the same body repeatedly
+        digest = hashlib.sha1(f"{url}\n{body}".encode("utf-8", "replace")).hexdigest()
+        if digest in self._seen:
+            return False
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return False
+        self._seen.add(digest)
+        self.responses.append({"url": url, "data": data})
+        logger.info(f"Captured JSON response from: {url[:100]}")
+        return True
+
+    def build_report(
+        self, parse_account: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        return build_report(self.responses, parse_account)
+
+
+def _find_scores(documents: List[Any]) -> Tuple[Dict[str, int], set]:
+    """Valid scores by bureau, and every bureau a score entry was given for"""
+    scores: Dict[str, int] = {}
+    reported: set = set()
+    for document in documents:
+        for key, value in _walk(document):
+            if key not in SCORE_KEYS:
+                continue
+            if isinstance(value, dict):
+                pairs = [(normalize_bureau(k), _score(v)) for k, v in value.items()]
+            elif isinstance(value, list):
+                pairs = [
+                    (
+                        normalize_bureau(
+                            _first(
+                                item,
+                                ("bureau", "bureauName", "bureauCode", "source", "provider", "agency"),
+                            )
+                        ),
+                        _score(item),
+                    )
+                    for item in value
+                    if isinstance(item, dict)
+                ]
+            else:
+                continue
+            for bureau, score in pairs:
+                if bureau:
+                    reported.add(bureau)
+                if bureau and score and bureau not in scores:
+                    scores[bureau] = score
+    return scores, reported
+
+
+def enrich_account(account: Dict[str, Any], item: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill the fields _parse_account_item leaves empty from a trade payload"""
+    fields = {
+        "high_credit": _amount(_first(item, ("highCreditAmount", "highCredit", "highBalance"))),
+        "credit_limit": _amount(_first(item, ("creditLimitAmount", "creditLimit"))),
+        "monthly_payment": _amount(_first(item, ("termsMonthlyPayment", "monthlyPayment"))),
+        "past_due": _amount(_first(item, ("pastDueAmount", "pastDue"))),
+        "date_opened": _date(_first(item, ("openDate", "dateOpened"))),
+        "last_reported": _date(_first(item, ("effectiveDate", "dateReported"))),
+        "last_payment": _date(_first(item, ("lastPaymentDate", "dateLastPayment"))),
+    }
+    rating = _first(item, ("currentAccountRating",))
+    if rating is not None:
+        fields["payment_status"] = ACCOUNT_RATINGS.get(str(rating), str(rating))
+    if "closedDate" in item or "openDate" in item:
+        fields["account_status"] = "Closed" if item.get("closedDate") else "Open"
+    for key, value in fields.items():
+        if value is not None and account.get(key) is None:
+            account[key] = value
+
+    pattern = item.get("paymentPattern")
+    if pattern and not account.get("payment_history"):
+        bureaus = list(account.get("bureaus") or ()) or ["transunion", "experian", "equifax"]
+        account["payment_history"] = [
+            {"month": "", **{b: PATTERN_BADGES.get(char, "-") for b in bureaus}}
+            for char in str(pattern)[:24]
+        ]
+    return account
+
+
+def _find_accounts(
+    documents: List[Any], parse_account: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Parsed accounts (deduplicated) and the raw trade items they came from"""
+    accounts: List[Dict[str, Any]] = []
+    items: List[Dict[str, Any]] = []
+    seen = set()
+    for document in documents:
+        candidates = []
+        if isinstance(document, list):
+            candidates.append(document)
+        candidates.extend(
+            value for key, value in _walk(document) if key in ACCOUNT_KEYS and isinstance(value, list)
+        )
+        for candidate in candidates:
+            for item in candidate:
+                account = parse_account(item)
+                if not account:
+                    continue
+                identity = (account.get("creditor"), account.get("account_number"))
+                if identity in seen:
+                    continue
+                seen.add(identity)
+                accounts.append(enrich_account(account, item))
+                items.append(item)
+    return accounts, items
+
+
+def _find_list(documents: List[Any], keys: set) -> List[Dict[str, Any]]:
+    for document in documents:
+        for key, value in _walk(document):
+            if key in keys and isinstance(value, list) and value:
+                return [item for item in value if isinstance(item, dict)]
+    return []
+
+
+def _address(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        return " ".join(value.split()) or None
+    if not isinstance(value, dict):
+        return None
+    street = _first(value, ("address", "streetAddress", "addressLine1", "line1", "street"))
+    parts = [
+        street,
+        _first(value, ("addressLine2", "line2")),
+        _first(value, ("city",)),
+        " ".join(
+            str(p) for p in (_first(value, ("state",)), _first(value, ("zip", "postalCode", "zipCode"))) if p
+        ),
+    ]
+    text = ", ".join(str(p) for p in parts if p)
+    return text or None
+
+
+def _inquiry(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    company = _first(
+        item, ("subscriberName", "creditorName", "companyName", "inquirerName", "name", "subscriber")
+    )
+    if not company:
+        return None
+    bureau = normalize_bureau(_first(item, ("bureau", "bureauCode", "source")))
+    return {
+        "company": str(company).strip(),
+        "type": _first(item, ("inquiryType", "type")),
+        "date": _date(_first(item, ("inquiryDate", "dateOfInquiry", "date"))),
+        "bureau": bureau,
+        "source": "xhr",
+    }
+
+
+def _contact(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    name = _first(item, ("memberCodeLongName", "name", "creditorName", "companyName"))
+    if not name:
+        return None
+    return {
+        "name": str(name).strip(),
+        "address": _address(item.get("address") if isinstance(item.get("address"), dict) else item),
+        "phone": _first(item, ("phone", "phoneNumber", "telephone")),
+        "source": "xhr",
+    }
+
+
+def _personal_info(documents: List[Any]) -> Dict[str, Any]:
+    info: Dict[str, Any] = {"names": [], "addresses": [], "dob": None, "employers": [], "ssn_last4": None}
+    for document in documents:
+        for key, value in _walk(document):
+            if key not in PERSONAL_KEYS or not isinstance(value, dict):
+                continue
+            names = value.get("names") or []
+            if not names and (value.get("firstName") or value.get("lastName")):
+                names = [f"{value.get('firstName', '')} {value.get('lastName', '')}".strip()]
+            for name in names:
+                if isinstance(name, dict):
+                    name = " ".join(
+                        str(name[k]) for k in ("firstName", "middleName", "lastName") if name.get(k)
+                    ) or name.get("name")
+                if name and name not in info["names"]:
+                    info["names"].append(str(name))
+            for address in value.get("addresses") or []:
+                text = _address(address)
+                if text and text not in info["addresses"]:
+                    info["addresses"].append(text)
+            info["dob"] = info["dob"] or _date(_first(value, ("dob", "dateOfBirth", "birthDate")))
+            for employer in value.get("employers") or []:
+                if isinstance(employer, dict):
+                    employer = _first(employer, ("name", "employerName"))
+                if employer and employer not in info["employers"]:
+                    info["employers"].append(employer)
+    return info
+
+
+def _summary(accounts: List[Dict[str, Any]], inquiries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Report summary counts derived from the parsed accounts"""
+
+    def total(field: str) -> Optional[float]:
+        values = [a[field] for a in accounts if isinstance(a.get(field), (int, float))]
+        return sum(values) if values else None
+
+    return {
+        "total_accounts": len(accounts),
+        "open_accounts": sum(1 for a in accounts if a.get("account_status") == "Open"),
+        "closed_accounts": sum(1 for a in accounts if a.get("account_status") == "Closed"),
+        "total_balances": total("balance"),
+        "total_payments": total("monthly_payment"),
+        "total_inquiries": len(inquiries),
+    }
+
+
+def build_report(
+    responses: List[Dict[str, Any]],
+    parse_account: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Structured report sections from captured responses, plus what is missing"""
+    documents = [resp.get("data") for resp in responses if resp.get("data") is not None]
+
+    scores, reported = _find_scores(documents)
+    accounts, trade_items = _find_accounts(documents, parse_account)
+    for account in accounts:
+        reported.update(filter(None, map(normalize_bureau, account.get("bureaus") or ())))
+    inquiries = [i for i in map(_inquiry, _find_list(documents, INQUIRY_KEYS)) if i]
+    contacts = [c for c in map(_contact, _find_list(documents, CONTACT_KEYS)) if c]
+    if not contacts:
+        # MyFreeScoreNow nests each creditor's contact in its trade
+        for item in trade_items:
+            nested = (item.get("memberCodeAccount") or {}).get("creditorContact")
+            contact = _contact(nested) if isinstance(nested, dict) else None
+            if contact and contact not in contacts:
+                contacts.append(contact)
+    personal_info = _personal_info(documents)
+
+    report = {
+        "scores": scores,
+        "accounts": accounts,
+        "personal_info": personal_info,
+        "inquiries": inquiries,
+        "creditor_contacts": contacts,
+        "summary": _summary(accounts, inquiries),
+    }
+    present = {
+        # A bureau on the report without a usable score needs the rendered page
+        "scores": len(scores) > 0 and reported <= set(scores),
+        "accounts": len(accounts) > 0,
+        "personal_info": bool(personal_info["names"] or personal_info["addresses"]),
+        "inquiries": len(inquiries) > 0,
+        "creditor_contacts": len(contacts) > 0,
+    }
+    report["missing"] = [section for section, found in present.items() if not found]
+    return report
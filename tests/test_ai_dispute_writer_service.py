@@ -1170,6 +1170,62 @@ class TestGenerateLetters:
         assert "error" in result
 
 
+class TestGenerateLettersBulk:
+    """Tests for generate_letters_bulk method."""
+
+    def test_generates_for_each_client(self):
+        """Test bulk generation maps AI results back to clients."""
+        from services.ai_dispute_writer_service import AIDisputeWriterService
+        from services.ai_generation_service import GenerationResult
+
+        service = AIDisputeWriterService(MagicMock(spec=Session))
+
+        def prepare(client_id, round_number, **kwargs):
+            if client_id == 3:
+                return {"error": "Client not found"}
+            return {
+                "client": SimpleNamespace(id=client_id, name=f"Client {client_id}"),
+                "violations": [],
+                "dispute_items": [],
+                "round_info": service.ROUND_STRATEGIES[round_number],
+                "target_bureaus": ["Experian"],
+                "prompt": f"prompt {client_id}",
+            }
+
+        letter = "===START LETTER: Experian===\nDear Experian\n===END LETTER: Experian==="
+        with patch.object(service, "_prepare_generation", side_effect=prepare), patch.object(
+            service, "_load_system_prompt", return_value="SYSTEM"
+        ), patch(
+            "services.ai_generation_service.AIGenerationService.generate_many"
+        ) as generate_many, patch(
+            "services.ai_dispute_writer_service.log_ai_usage"
+        ), patch(
+            "services.ai_dispute_writer_service.log_dispute_generated"
+        ):
+            generate_many.return_value = [
+                GenerationResult(key=1, success=True, text=letter),
+                GenerationResult(key=2, success=False, error="overloaded"),
+            ]
+            result = service.generate_letters_bulk([1, 2, 3], round_number=1)
+
+        requests = generate_many.call_args[0][0]
+        assert [r.key for r in requests] == [1, 2]
+        assert all(r.system == "SYSTEM" for r in requests)
+        assert result["results"][1]["letters"] == {"Experian": "Dear Experian"}
+        assert "overloaded" in result["results"][2]["error"]
+        assert result["results"][3]["error"] == "Client not found"
+        assert result["generated"] == 1
+        assert result["failed"] == 2
+
+    def test_invalid_round(self):
+        """Test bulk generation rejects an unknown round."""
+        from services.ai_dispute_writer_service import AIDisputeWriterService
+
+        service = AIDisputeWriterService(MagicMock(spec=Session))
+
+        assert "Invalid round" in service.generate_letters_bulk([1], round_number=9)["error"]
+
+
 class TestSpecialStrategies:
     """Tests for special strategy configurations."""
 
@@ -1221,3 +1277,45 @@ class TestSpecialStrategies:
         for key, strategy in service.SPECIAL_STRATEGIES.items():
             if "requires" in strategy:
                 assert isinstance(strategy["requires"], list)
+
+
+class TestCreate5DayKnockoutPackets:
+    """Tests for 5-Day Knock-Out envelope packet cover sheets."""
+
+    def _create(self):
+        pytest.importorskip("weasyprint", reason="weasyprint not installed")
+        from services.ai_dispute_writer_service import AIDisputeWriterService
+
+        mock_db = MagicMock(spec=Session)
+        mock_db.query.return_value.filter.return_value.first.return_value = SimpleNamespace(
+            id=1, name="Jane Doe", address_street="1 Main St",
+            address_city="Austin", address_state="TX", address_zip="78701",
+        )
+        service = AIDisputeWriterService(mock_db)
+        return service.create_5day_knockout_packets(
+            client_id=1,
+            documents={"Experian 605B Letter": "<p>x</p>", "TransUnion 605B Letter": "<p>y</p>"},
+            police_case_number="PD-1",
+        )
+
+    def test_cover_sheets_inline(self):
+        """Test every bureau gets a rendered cover sheet."""
+        result = self._create()
+
+        assert result["total_packets"] == len(result["packets"]) >= 2
+        for packet in result["packets"].values():
+            assert packet["cover_sheet_pdf"].startswith(b"%PDF")
+
+    def test_cover_sheets_in_process_pool(self):
+        """Test cover sheets rendered in the packet worker pool match bureau order."""
+        from services.packet_pipeline import shutdown_packet_pool
+
+        try:
+            with patch("services.packet_pipeline.PACKET_WORKERS", 2):
+                result = self._create()
+        finally:
+            shutdown_packet_pool()
+
+        assert result["packets"]["Experian"]["letter_content"] == "<p>x</p>"
+        for packet in result["packets"].values():
+            assert packet["cover_sheet_pdf"].startswith(b"%PDF")
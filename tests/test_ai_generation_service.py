@@ -0,0 +1,198 @@
+"""
+Unit tests for AI Generation Service
+Runs the real async Anthropic client against a local stub Messages API to
+check bounded concurrency, cache-aware ordering, token budget pacing and
+per-request error handling.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ai_generation_service import (
+    MAX_SYSTEM_PROMPT_CHARS,
+    AIGenerationService,
+    GenerationRequest,
+    TokenBudget,
+    system_blocks,
+)
+
+STUB_DELAY = 0.2
+
+
+class StubMessagesAPI(BaseHTTPRequestHandler):
+    """Minimal POST /v1/messages: echoes the prompt after STUB_DELAY"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["messages"][0]["content"]
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.requests.append((time.monotonic(), body))
+        try:
+            time.sleep(STUB_DELAY)
+            if prompt == "fail":
+                status, payload = 400, {
+                    "type": "error",
+                    "error": {"type": "invalid_request_error", "message": "bad prompt"},
+                }
+            else:
+                status, payload = 200, {
+                    "id": "msg_stub",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": body["model"],
+                    "content": [{"type": "text", "text": f"reply to {prompt}"}],
+                    "stop_reason": "end_turn",
+                    "stop_sequence": None,
+                    "usage": {
+                        "input_tokens": 10,
+                        "output_tokens": 5,
+                        "cache_creation_input_tokens": 0,
+                        "cache_read_input_tokens": 100,
+                    },
+                }
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+                server.finished.append(time.monotonic())
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubMessagesAPI)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.in_flight = server.max_in_flight = 0
+    server.requests, server.finished = [], []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def service_factory(stub_server):
+    from anthropic import AsyncAnthropic
+
+    base_url = f"http://127.0.0.1:{stub_server.server_address[1]}"
+
+    def make(**kwargs):
+        return AIGenerationService(
+            client_factory=lambda: AsyncAnthropic(
+                api_key="test", base_url=base_url, max_retries=0
+            ),
+            **kwargs,
+        )
+
+    return make
+
+
+# ============== Request Pool Tests ==============
+
+
+class TestGenerateMany:
+    """Tests for AIGenerationService.generate_many against the stub."""
+
+    def test_bounded_concurrency_and_order(self, stub_server, service_factory):
+        requests = [GenerationRequest(key=i, system="SYSTEM", prompt=f"p{i}") for i in range(7)]
+
+        started = time.monotonic()
+        results = service_factory(max_concurrency=3).generate_many(requests)
+        elapsed = time.monotonic() - started
+
+        assert [r.key for r in results] == list(range(7))
+        assert [r.text for r in results] == [f"reply to p{i}" for i in range(7)]
+        assert stub_server.max_in_flight == 3
+        # 1 cache-writing call, then 6 calls 3 at a time: ~3 round trips, not 7
+        assert elapsed < 5 * STUB_DELAY
+        assert results[1].cache_read_tokens == 100
+
+    def test_first_call_per_system_prompt_runs_alone(self, stub_server, service_factory):
+        requests = [GenerationRequest(key=i, system="SHARED", prompt=f"p{i}") for i in range(4)]
+
+        service_factory(max_concurrency=4).generate_many(requests)
+
+        first_done = stub_server.finished[0]
+        later_starts = [t for t, _ in stub_server.requests[1:]]
+        assert all(start >= first_done for start in later_starts)
+
+    def test_system_prompt_sent_as_cached_block(self, stub_server, service_factory):
+        service_factory().generate_many([GenerationRequest(key=1, system="  SYS  ", prompt="x")])
+
+        body = stub_server.requests[0][1]
+        assert body["system"] == [
+            {"type": "text", "text": "SYS", "cache_control": {"type": "ephemeral"}}
+        ]
+
+    def test_failures_are_per_request(self, stub_server, service_factory):
+        results = service_factory().generate_many(
+            [
+                GenerationRequest(key="ok", system="S", prompt="fine"),
+                GenerationRequest(key="bad", system="S", prompt="fail"),
+            ]
+        )
+
+        assert results[0].success is True
+        assert results[1].success is False
+        assert "bad prompt" in results[1].error
+
+    def test_works_inside_running_loop(self, service_factory):
+        async def caller():
+            return service_factory().generate_many(
+                [GenerationRequest(key=1, system="S", prompt="x")]
+            )
+
+        assert asyncio.run(caller())[0].text == "reply to x"
+
+
+# ============== Helper Tests ==============
+
+
+class TestHelpers:
+    """Tests for system_blocks and TokenBudget."""
+
+    def test_system_blocks_truncates(self):
+        text = system_blocks("x" * (MAX_SYSTEM_PROMPT_CHARS + 10))[0]["text"]
+        assert text.endswith("[Truncated for length]")
+        assert len(text) < MAX_SYSTEM_PROMPT_CHARS + 30
+
+    def test_token_budget_waits_for_window(self):
+        async def run():
+            budget = TokenBudget(tokens_per_minute=100, window=0.3)
+            started = time.monotonic()
+            await budget.acquire(80)
+            await budget.acquire(80)  # must wait for the first to expire
+            await budget.acquire(500)  # over budget on its own: waits, then runs alone
+            return time.monotonic() - started
+
+        assert 0.55 <= asyncio.run(run()) < 1.5
+
+    def test_token_budget_disabled(self):
+        async def run():
+            budget = TokenBudget(tokens_per_minute=0)
+            for _ in range(100):
+                await budget.acquire(10_000)
+
+        asyncio.run(run())
@@ -16,12 +16,18 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from database import APIKey, APIRequest, get_db
 from services.api_access_service import (
     RateLimiter,
     APIAccessService,
+    APIKeyCache,
+    APIUsageRecorder,
+    VerifiedAPIKey,
+    hash_api_key,
     rate_limiter,
     get_api_access_service,
 )
+from services.shared_state import MemoryStateBackend
 
 
 # ============== RateLimiter Tests ==============
@@ -800,6 +806,145 @@ class TestLogRequest:
         assert result is False
 
 
+@pytest.fixture
+def stored_key():
+    """A real APIKey row in the test database; yields (raw_key, key_id)."""
+    raw_key = f"ba_{secrets.token_urlsafe(16)}"
+    key_hash, key_prefix = hash_api_key(raw_key)
+    db = get_db()
+    api_key = APIKey(
+        name="Cache Test Key",
+        key_hash=key_hash,
+        key_prefix=key_prefix,
+        staff_id=1,
+        scopes=["read:clients"],
+        usage_count=3,
+        is_active=True,
+    )
+    db.add(api_key)
+    db.commit()
+    key_id = api_key.id
+    db.close()
+    yield raw_key, key_id
+    db = get_db()
+    db.query(APIRequest).filter(APIRequest.api_key_id == key_id).delete()
+    db.query(APIKey).filter(APIKey.id == key_id).delete()
+    db.commit()
+    db.close()
+
+
+class TestAPIKeyCache:
+    """Tests for the verified-key cache."""
+
+    def test_lookup_returns_detached_copy(self, stored_key):
+        raw_key, key_id = stored_key
+        verified = APIKeyCache(backend=MemoryStateBackend()).lookup(raw_key)
+
+        assert isinstance(verified, VerifiedAPIKey)
+        assert verified.id == key_id
+        assert verified.has_scope("read:clients")
+        assert not verified.has_scope("write:clients")
+
+    def test_second_lookup_skips_database(self, stored_key):
+        raw_key, _ = stored_key
+        cache = APIKeyCache(backend=MemoryStateBackend())
+        cache.lookup(raw_key)
+
+        with patch("services.api_access_service.get_db") as mock_get_db:
+            assert cache.lookup(raw_key) is not None
+        mock_get_db.assert_not_called()
+
+    def test_unknown_keys_are_not_cached(self):
+        cache = APIKeyCache(backend=MemoryStateBackend())
+        db = Mock()
+        db.query.return_value.filter.return_value.first.return_value = None
+
+        assert cache.lookup("ba_doesnotexist", db=db) is None
+        assert cache.lookup("ba_doesnotexist", db=db) is None
+        assert db.query.call_count == 2
+
+    def test_revocation_invalidates_other_workers(self, stored_key):
+        raw_key, key_id = stored_key
+        backend = MemoryStateBackend()
+        worker_a = APIKeyCache(backend=backend)
+        worker_b = APIKeyCache(backend=backend)
+        assert worker_a.lookup(raw_key).is_active is True
+
+        db = get_db()
+        db.query(APIKey).filter(APIKey.id == key_id).update({"is_active": False})
+        db.commit()
+        db.close()
+        worker_b.invalidate(key_id)
+        worker_a._generation._checked_at = 0.0  # skip the 1s poll interval
+
+        assert worker_a.lookup(raw_key).is_active is False
+
+    def test_validate_without_session_defers_usage(self, stored_key):
+        raw_key, key_id = stored_key
+        recorder = APIUsageRecorder()
+        with patch("services.api_access_service.api_key_cache", APIKeyCache(backend=MemoryStateBackend())), \
+                patch("services.api_access_service.api_usage_recorder", recorder):
+            api_key, error = APIAccessService().validate_api_key(f"Bearer {raw_key}")
+
+        assert error is None
+        assert api_key.id == key_id
+        assert recorder.pending() == {"keys": 1, "requests": 0}
+
+
+class TestAPIUsageRecorder:
+    """Tests for buffered usage counters and request logs."""
+
+    def test_flush_writes_counts_and_rows_in_bulk(self, stored_key):
+        _, key_id = stored_key
+        recorder = APIUsageRecorder()
+        for _ in range(4):
+            recorder.record_use(key_id, "10.0.0.9")
+            recorder.record_request(
+                api_key_id=key_id, endpoint="/api/v1/clients", method="GET",
+                request_ip="10.0.0.9", response_status=200, response_time_ms=5,
+            )
+
+        assert recorder.flush() == {"keys": 1, "requests": 4}
+        assert recorder.pending() == {"keys": 0, "requests": 0}
+
+        db = get_db()
+        try:
+            row = db.query(APIKey).filter(APIKey.id == key_id).first()
+            assert row.usage_count == 7
+            assert row.last_used_ip == "10.0.0.9"
+            assert row.last_used_at is not None
+            assert db.query(APIRequest).filter(APIRequest.api_key_id == key_id).count() == 4
+        finally:
+            db.close()
+
+    def test_flush_skips_unknown_keys(self, stored_key):
+        _, key_id = stored_key
+        recorder = APIUsageRecorder()
+        recorder.record_request(api_key_id=0, endpoint="/x", method="GET", response_status=401)
+        recorder.record_request(api_key_id=key_id, endpoint="/x", method="GET", response_status=200)
+
+        assert recorder.flush() == {"keys": 0, "requests": 1}
+
+    def test_failed_flush_requeues(self):
+        recorder = APIUsageRecorder()
+        recorder.record_use(5)
+        recorder.record_request(api_key_id=5, endpoint="/x", method="GET", response_status=200)
+
+        with patch("services.api_access_service.get_db") as mock_get_db:
+            mock_get_db.return_value.query.side_effect = Exception("db down")
+            assert recorder.flush() == {"keys": 0, "requests": 0}
+
+        assert recorder.pending() == {"keys": 1, "requests": 1}
+
+    def test_pending_requests_are_bounded(self):
+        recorder = APIUsageRecorder(max_pending=2)
+        for _ in range(3):
+            recorder.record_request(api_key_id=1, endpoint="/x", method="GET", response_status=200)
+
+        assert recorder.pending()["requests"] == 2
+        assert recorder.dropped_requests == 1
+
+
 class TestGetKeyUsageStats:
     """Tests for get_key_usage_stats method."""
 
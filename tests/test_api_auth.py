@@ -361,12 +361,9 @@ class TestAddRateLimitHeaders:
 class TestLogApiRequest:
     """Tests for log_api_request function."""
 
-    @patch('services.api_auth.get_db')
-    def test_log_api_request_success(self, mock_get_db, app):
-        """Test successful API request logging."""
-        mock_db = Mock()
-        mock_get_db.return_value = mock_db
-
+    @patch('services.api_auth.api_usage_recorder')
+    def test_log_api_request_success(self, mock_recorder, app):
+        """Test API request logging queues a row instead of writing."""
         with app.test_request_context(
             path="/api/clients",
             method="GET",
@@ -376,82 +373,64 @@ class TestLogApiRequest:
 
             log_api_request(api_key_id=1, response_status=200, start_time=start_time)
 
-            mock_db.add.assert_called_once()
-            mock_db.commit.assert_called_once()
-            mock_db.close.assert_called_once()
+            mock_recorder.record_request.assert_called_once()
+            row = mock_recorder.record_request.call_args.kwargs
+            assert row["api_key_id"] == 1
+            assert row["endpoint"] == "/api/clients"
+            assert row["method"] == "GET"
+            assert row["request_ip"] == "192.168.1.1"
+            assert row["response_status"] == 200
 
-    @patch('services.api_auth.get_db')
-    def test_log_api_request_with_error(self, mock_get_db, app):
+    @patch('services.api_auth.api_usage_recorder')
+    def test_log_api_request_with_error(self, mock_recorder, app):
         """Test API request logging with error message."""
-        mock_db = Mock()
-        mock_get_db.return_value = mock_db
-
         with app.test_request_context(
             path="/api/clients",
             method="POST"
         ):
-            start_time = time.time()
-
             log_api_request(
                 api_key_id=1,
                 response_status=400,
-                start_time=start_time,
+                start_time=time.time(),
                 error="Invalid request body"
             )
 
-            # Verify the APIRequest was created with error message
-            call_args = mock_db.add.call_args
-            api_request = call_args[0][0]
-            assert api_request.error_message == "Invalid request body"
+            row = mock_recorder.record_request.call_args.kwargs
+            assert row["error_message"] == "Invalid request body"
 
-    @patch('services.api_auth.get_db')
-    def test_log_api_request_uses_remote_addr_fallback(self, mock_get_db, app):
+    @patch('services.api_auth.api_usage_recorder')
+    def test_log_api_request_uses_remote_addr_fallback(self, mock_recorder, app):
         """Test logging uses remote_addr when X-Forwarded-For not present."""
-        mock_db = Mock()
-        mock_get_db.return_value = mock_db
-
         with app.test_request_context(
             path="/api/clients",
             method="GET",
             environ_base={'REMOTE_ADDR': '10.0.0.1'}
         ):
-            start_time = time.time()
-
-            log_api_request(api_key_id=1, response_status=200, start_time=start_time)
+            log_api_request(api_key_id=1, response_status=200, start_time=time.time())
 
-            call_args = mock_db.add.call_args
-            api_request = call_args[0][0]
-            assert api_request.request_ip == "10.0.0.1"
+            row = mock_recorder.record_request.call_args.kwargs
+            assert row["request_ip"] == "10.0.0.1"
 
-    @patch('services.api_auth.get_db')
-    def test_log_api_request_handles_exception(self, mock_get_db, app):
+    @patch('services.api_auth.api_usage_recorder')
+    def test_log_api_request_handles_exception(self, mock_recorder, app):
         """Test logging handles exceptions gracefully."""
-        mock_db = Mock()
-        mock_db.add.side_effect = Exception("Database error")
-        mock_get_db.return_value = mock_db
+        mock_recorder.record_request.side_effect = Exception("Queue error")
 
         with app.test_request_context(path="/api/clients", method="GET"):
             # Should not raise exception
             log_api_request(api_key_id=1, response_status=200, start_time=time.time())
 
-            # Should still close the database connection
-            mock_db.close.assert_called_once()
-
-    @patch('services.api_auth.get_db')
-    def test_log_api_request_calculates_duration(self, mock_get_db, app):
+    @patch('services.api_auth.api_usage_recorder')
+    def test_log_api_request_calculates_duration(self, mock_recorder, app):
         """Test logging calculates request duration correctly."""
-        mock_db = Mock()
-        mock_get_db.return_value = mock_db
-
         with app.test_request_context(path="/api/clients", method="GET"):
             start_time = time.time() - 0.1  # 100ms ago
 
             log_api_request(api_key_id=1, response_status=200, start_time=start_time)
 
-            call_args = mock_db.add.call_args
-            api_request = call_args[0][0]
+            row = mock_recorder.record_request.call_args.kwargs
             # Duration should be approximately 100ms
-            assert 90 <= api_request.response_time_ms <= 200
+            assert 90 <= row["response_time_ms"] <= 200
 
 
 # ============== require_api_key Decorator Tests ==============
@@ -460,8 +439,8 @@ class TestLogApiRequest:
 class TestRequireApiKeyDecorator:
     """Tests for require_api_key decorator."""
 
-    @patch('services.api_auth.get_db')
-    def test_require_api_key_missing_key(self, mock_get_db, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_api_key_missing_key(self, mock_key_cache, app):
         """Test decorator returns 401 when no API key provided."""
         @require_api_key()
         def test_route():
@@ -473,12 +452,10 @@ class TestRequireApiKeyDecorator:
             assert result[1] == 401
             assert result[0].json["error"] == "API key required"
 
-    @patch('services.api_auth.get_db')
-    def test_require_api_key_invalid_key(self, mock_get_db, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_api_key_invalid_key(self, mock_key_cache, app):
         """Test decorator returns 401 for invalid API key."""
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = None
 
         @require_api_key()
         def test_route():
@@ -490,16 +467,14 @@ class TestRequireApiKeyDecorator:
             assert result[1] == 401
             assert result[0].json["error"] == "Invalid API key"
 
-    @patch('services.api_auth.get_db')
-    def test_require_api_key_revoked_key(self, mock_get_db, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_api_key_revoked_key(self, mock_key_cache, app):
         """Test decorator returns 401 for revoked API key."""
         mock_api_key = Mock()
         mock_api_key.id = 1
         mock_api_key.is_active = False
 
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_api_key
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = mock_api_key
 
         @require_api_key()
         def test_route():
@@ -511,17 +486,15 @@ class TestRequireApiKeyDecorator:
             assert result[1] == 401
             assert "revoked" in result[0].json["error"]
 
-    @patch('services.api_auth.get_db')
-    def test_require_api_key_expired_key(self, mock_get_db, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_api_key_expired_key(self, mock_key_cache, app):
         """Test decorator returns 401 for expired API key."""
         mock_api_key = Mock()
         mock_api_key.id = 1
         mock_api_key.is_active = True
         mock_api_key.expires_at = datetime.utcnow() - timedelta(days=1)  # Expired
 
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_api_key
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = mock_api_key
 
         @require_api_key()
         def test_route():
@@ -533,8 +506,8 @@ class TestRequireApiKeyDecorator:
             assert result[1] == 401
             assert "expired" in result[0].json["error"]
 
-    @patch('services.api_auth.get_db')
-    def test_require_api_key_missing_scopes(self, mock_get_db, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_api_key_missing_scopes(self, mock_key_cache, app):
         """Test decorator returns 403 when required scopes are missing."""
         mock_api_key = Mock()
         mock_api_key.id = 1
@@ -542,9 +515,7 @@ class TestRequireApiKeyDecorator:
         mock_api_key.expires_at = None
         mock_api_key.scopes = ["read:clients"]  # Missing write:clients
 
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_api_key
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = mock_api_key
 
         @require_api_key(scopes=["read:clients", "write:clients"])
         def test_route():
@@ -558,8 +529,8 @@ class TestRequireApiKeyDecorator:
             assert "write:clients" in result[0].json["missing_scopes"]
 
     @patch('services.api_auth.rate_limiter')
-    @patch('services.api_auth.get_db')
-    def test_require_api_key_rate_limit_exceeded(self, mock_get_db, mock_rate_limiter, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_api_key_rate_limit_exceeded(self, mock_key_cache, mock_rate_limiter, app):
         """Test decorator returns 429 when rate limit exceeded."""
         mock_api_key = Mock()
         mock_api_key.id = 1
@@ -569,9 +540,7 @@ class TestRequireApiKeyDecorator:
         mock_api_key.rate_limit_per_minute = 60
         mock_api_key.rate_limit_per_day = 10000
 
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_api_key
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = mock_api_key
 
         # Rate limiter denies request
         mock_rate_limiter.check_and_increment.return_value = (False, {
@@ -591,10 +560,11 @@ class TestRequireApiKeyDecorator:
             assert result.status_code == 429
             assert "Rate limit exceeded" in result.json["error"]
 
+    @patch('services.api_auth.api_usage_recorder')
     @patch('services.api_auth.log_api_request')
     @patch('services.api_auth.rate_limiter')
-    @patch('services.api_auth.get_db')
-    def test_require_api_key_success(self, mock_get_db, mock_rate_limiter, mock_log, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_api_key_success(self, mock_key_cache, mock_rate_limiter, mock_log, mock_recorder, app):
         """Test successful API key authentication."""
         mock_api_key = Mock()
         mock_api_key.id = 1
@@ -607,9 +577,7 @@ class TestRequireApiKeyDecorator:
         mock_api_key.last_used_at = None
         mock_api_key.last_used_ip = None
 
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_api_key
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = mock_api_key
 
         # Rate limiter allows request
         mock_rate_limiter.check_and_increment.return_value = (True, {
@@ -631,16 +599,14 @@ class TestRequireApiKeyDecorator:
         }):
             result = test_route()
 
-            # Verify usage count incremented
-            assert mock_api_key.usage_count == 6
-
-            # Verify last_used_at updated
-            assert mock_api_key.last_used_at is not None
+            # Usage is counted in memory, not written to the key row
+            mock_recorder.record_use.assert_called_once_with(1, "192.168.1.1")
+            assert mock_api_key.usage_count == 5
 
     @patch('services.api_auth.log_api_request')
     @patch('services.api_auth.rate_limiter')
-    @patch('services.api_auth.get_db')
-    def test_require_api_key_no_scopes_required(self, mock_get_db, mock_rate_limiter, mock_log, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_api_key_no_scopes_required(self, mock_key_cache, mock_rate_limiter, mock_log, app):
         """Test decorator works with no required scopes."""
         mock_api_key = Mock()
         mock_api_key.id = 1
@@ -651,9 +617,7 @@ class TestRequireApiKeyDecorator:
         mock_api_key.rate_limit_per_day = 10000
         mock_api_key.usage_count = 0
 
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_api_key
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = mock_api_key
 
         mock_rate_limiter.check_and_increment.return_value = (True, {"minute_remaining": 59})
 
@@ -703,8 +667,8 @@ class TestRequireAuthDecorator:
                 assert result == {"success": True, "auth_type": "session"}
 
     @patch('services.api_auth.rate_limiter')
-    @patch('services.api_auth.get_db')
-    def test_require_auth_with_api_key(self, mock_get_db, mock_rate_limiter, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_auth_with_api_key(self, mock_key_cache, mock_rate_limiter, app):
         """Test decorator accepts API key authentication when no session."""
         mock_api_key = Mock()
         mock_api_key.id = 1
@@ -715,9 +679,7 @@ class TestRequireAuthDecorator:
         mock_api_key.rate_limit_per_day = 10000
         mock_api_key.usage_count = 0
 
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_api_key
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = mock_api_key
 
         mock_rate_limiter.check_and_increment.return_value = (True, {"minute_remaining": 59})
 
@@ -757,17 +719,15 @@ class TestRequireAuthDecorator:
             # Should fail because no session and API key not allowed
             assert result[1] == 401
 
-    @patch('services.api_auth.get_db')
-    def test_require_auth_api_key_expired(self, mock_get_db, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_auth_api_key_expired(self, mock_key_cache, app):
         """Test decorator returns 401 for expired API key."""
         mock_api_key = Mock()
         mock_api_key.id = 1
         mock_api_key.is_active = True
         mock_api_key.expires_at = datetime.utcnow() - timedelta(days=1)  # Expired
 
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_api_key
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = mock_api_key
 
         @require_auth()
         def test_route():
@@ -779,8 +739,8 @@ class TestRequireAuthDecorator:
             assert result[1] == 401
             assert "expired" in result[0].json["error"]
 
-    @patch('services.api_auth.get_db')
-    def test_require_auth_api_key_missing_scopes(self, mock_get_db, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_auth_api_key_missing_scopes(self, mock_key_cache, app):
         """Test decorator returns 403 for missing scopes with API key."""
         mock_api_key = Mock()
         mock_api_key.id = 1
@@ -788,9 +748,7 @@ class TestRequireAuthDecorator:
         mock_api_key.expires_at = None
         mock_api_key.scopes = ["read:clients"]  # Missing analyze:reports
 
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_api_key
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = mock_api_key
 
         @require_auth(scopes=["analyze:reports"])
         def test_route():
@@ -803,8 +761,8 @@ class TestRequireAuthDecorator:
             assert "Insufficient permissions" in result[0].json["error"]
 
     @patch('services.api_auth.rate_limiter')
-    @patch('services.api_auth.get_db')
-    def test_require_auth_api_key_rate_limited(self, mock_get_db, mock_rate_limiter, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_auth_api_key_rate_limited(self, mock_key_cache, mock_rate_limiter, app):
         """Test decorator returns 429 when rate limited."""
         mock_api_key = Mock()
         mock_api_key.id = 1
@@ -814,9 +772,7 @@ class TestRequireAuthDecorator:
         mock_api_key.rate_limit_per_minute = 60
         mock_api_key.rate_limit_per_day = 10000
 
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_api_key
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = mock_api_key
 
         mock_rate_limiter.check_and_increment.return_value = (False, {"error": "Rate limit exceeded"})
 
@@ -1020,12 +976,10 @@ class TestEdgeCases:
         assert error is None
         assert payload is not None
 
-    @patch('services.api_auth.get_db')
-    def test_require_api_key_short_key_prefix(self, mock_get_db, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_api_key_short_key_prefix(self, mock_key_cache, app):
         """Test decorator handles API key shorter than 8 characters."""
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = None
 
         @require_api_key()
         def test_route():
@@ -1056,8 +1010,8 @@ class TestEdgeCases:
 
     @patch('services.api_auth.log_api_request')
     @patch('services.api_auth.rate_limiter')
-    @patch('services.api_auth.get_db')
-    def test_require_api_key_with_none_expires_at(self, mock_get_db, mock_rate_limiter, mock_log, app):
+    @patch('services.api_auth.api_key_cache')
+    def test_require_api_key_with_none_expires_at(self, mock_key_cache, mock_rate_limiter, mock_log, app):
         """Test decorator handles API key with None expires_at."""
         mock_api_key = Mock()
         mock_api_key.id = 1
@@ -1068,9 +1022,7 @@ class TestEdgeCases:
         mock_api_key.rate_limit_per_day = 10000
         mock_api_key.usage_count = 0
 
-        mock_db = Mock()
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_api_key
-        mock_get_db.return_value = mock_db
+        mock_key_cache.lookup.return_value = mock_api_key
 
         mock_rate_limiter.check_and_increment.return_value = (True, {"minute_remaining": 59})
 
@@ -0,0 +1,30 @@
+"""
+Unit tests for the application factory
+Tests that create_app builds the rate limiter and blueprints and that the
+boot-time integrations can be skipped.
+"""
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestCreateApp:
+    """Tests for create_app."""
+
+    def test_module_app_is_fully_initialized(self):
+        from app import app, limiter
+
+        assert app.extensions["rate_limiter"] is limiter
+        assert "flasgger" in app.blueprints
+        assert {"portal", "affiliate_portal", "partner"} <= set(app.blueprints)
+
+    def test_services_can_be_deferred(self):
+        from app import create_app
+
+        app = create_app(init_services=False)
+
+        assert "rate_limiter" in app.extensions
+        assert "portal" in app.blueprints
+        assert "flasgger" not in app.blueprints
@@ -1277,36 +1277,36 @@ class TestExportLogs:
 class TestCleanupOldLogs:
     """Tests for cleanup_old_logs method."""
 
-    def test_cleanup_old_logs_with_records(self):
+    @patch('services.audit_service.get_log_partition_service')
+    def test_cleanup_old_logs_with_records(self, mock_get_partitions):
         """Test cleanup deletes old records."""
         mock_db = Mock()
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.count.return_value = 50
-        mock_query.delete.return_value = 50
-        mock_db.query.return_value = mock_query
-        mock_db.commit = Mock()
+        mock_get_partitions.return_value.purge_before.return_value = 50
 
         service = AuditService(db=mock_db)
 
-        with patch.object(service, 'log_event'):
+        with patch.object(service, 'log_event') as mock_log:
             count = service.cleanup_old_logs(retention_days=365)
 
         assert count == 50
-        mock_db.commit.assert_called_once()
+        table, cutoff = mock_get_partitions.return_value.purge_before.call_args[0]
+        assert table == "audit_logs"
+        assert cutoff < datetime.utcnow() - timedelta(days=364)
+        assert mock_get_partitions.return_value.purge_before.call_args[1]["db"] is mock_db
+        mock_log.assert_called_once()
 
-    def test_cleanup_old_logs_no_records(self):
+    @patch('services.audit_service.get_log_partition_service')
+    def test_cleanup_old_logs_no_records(self, mock_get_partitions):
         """Test cleanup with no old records."""
         mock_db = Mock()
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.count.return_value = 0
-        mock_db.query.return_value = mock_query
+        mock_get_partitions.return_value.purge_before.return_value = 0
 
         service = AuditService(db=mock_db)
-        count = service.cleanup_old_logs(retention_days=365)
+        with patch.object(service, 'log_event') as mock_log:
+            count = service.cleanup_old_logs(retention_days=365)
 
         assert count == 0
+        mock_log.assert_not_called()
 
 
 # ============== Factory Function Tests ==============
@@ -0,0 +1,294 @@
+"""
+Unit tests for Concurrent Automation Orchestration
+Tests for per-portal throttling, the shared browser pool, concurrent step
+execution with AutomationRun checkpoints, and the 5KO / CFPB flows built on it.
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.browser_automation import fko_orchestrator
+from services.browser_automation.base_automation import AutomationError, AutomationResult
+from services.browser_automation.cfpb_automation import CFPBAutomation
+from services.browser_automation.orchestration import (
+    AutomationPool,
+    AutomationStep,
+    PortalThrottle,
+    StepCheckpoint,
+    run_steps,
+)
+
+
+class FakeAutomation:
+    """Stands in for a browser automation; records how many are open"""
+
+    open_now = 0
+    peak = 0
+
+    def __init__(self, portal, log, delay=0.01):
+        self.portal = portal
+        self.log = log
+        self.delay = delay
+
+    async def __aenter__(self):
+        FakeAutomation.open_now += 1
+        FakeAutomation.peak = max(FakeAutomation.peak, FakeAutomation.open_now)
+        self.log.append(("open", self.portal))
+        return self
+
+    async def __aexit__(self, *exc):
+        FakeAutomation.open_now -= 1
+        return False
+
+    async def submit(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        return AutomationResult(
+            success=True,
+            message="ok",
+            confirmation_number=f"{self.portal.upper()}-1",
+        )
+
+
+@pytest.fixture(autouse=True)
+def reset_fake():
+    FakeAutomation.open_now = 0
+    FakeAutomation.peak = 0
+
+
+def fast_pool(**kwargs):
+    """Pool without portal spacing so tests do not sleep"""
+    limits = {p: (2, 0) for p in ("ftc", "cfpb", "equifax", "transunion", "experian")}
+    return AutomationPool(limits=kwargs.pop("limits", limits), **kwargs)
+
+
+def step(key, portal, log, after=(), action=None):
+    return AutomationStep(
+        key=key,
+        portal=portal,
+        factory=lambda: FakeAutomation(portal, log),
+        action=action or (lambda automation: automation.submit()),
+        after=after,
+    )
+
+
+# ============== Throttle Tests ==============
+
+
+class TestPortalThrottle:
+    """Tests for per-portal pacing."""
+
+    def test_starts_are_spaced_by_min_interval(self):
+        now = [100.0]
+        waits = []
+
+        async def fake_sleep(seconds):
+            waits.append(seconds)
+            now[0] += seconds
+
+        throttle = PortalThrottle(
+            max_concurrent=3, min_interval=60, clock=lambda: now[0], sleep=fake_sleep
+        )
+
+        async def run():
+            for _ in range(3):
+                async with throttle.slot():
+                    now[0] += 5
+
+        asyncio.run(run())
+        assert waits == [55, 55]
+
+    def test_pool_keeps_one_throttle_per_portal(self):
+        pool = AutomationPool(limits={"cfpb": (1, 60)})
+
+        assert pool.throttle("cfpb") is pool.throttle("CFPB")
+        assert pool.throttle("tu") is pool.throttle("transunion")
+        assert pool.throttle("cfpb").min_interval == 60
+
+
+# ============== Step Runner Tests ==============
+
+
+class TestRunSteps:
+    """Tests for concurrent step execution."""
+
+    def test_independent_portals_run_concurrently(self):
+        log = []
+        steps = [step(p, p, log) for p in ("equifax", "transunion", "experian")]
+
+        results = asyncio.run(run_steps(steps, pool=fast_pool()))
+
+        assert FakeAutomation.peak == 3
+        assert results["equifax"].confirmation_number == "EQUIFAX-1"
+
+    def test_browser_cap_and_dependencies(self):
+        log = []
+        steps = [step("ftc", "ftc", log)] + [
+            step(p, p, log, after=("ftc",)) for p in ("equifax", "transunion", "experian")
+        ]
+
+        asyncio.run(run_steps(steps, pool=fast_pool(max_browsers=2)))
+
+        assert FakeAutomation.peak == 2
+        assert log[0] == ("open", "ftc")
+
+    def test_failures_become_results(self):
+        log = []
+
+        async def limit(automation):
+            raise AutomationError("Limit reached", error_code="DISPUTE_LIMIT_REACHED")
+
+        async def crash(automation):
+            raise RuntimeError("browser died")
+
+        steps = [
+            step("equifax", "equifax", log, action=limit),
+            AutomationStep(
+                key="experian",
+                portal="experian",
+                factory=lambda: FakeAutomation("experian", log),
+                action=crash,
+                error_code="BUREAU_FAILED",
+            ),
+        ]
+
+        results = asyncio.run(run_steps(steps, pool=fast_pool()))
+
+        assert results["equifax"].error_code == "DISPUTE_LIMIT_REACHED"
+        assert results["experian"].error_code == "BUREAU_FAILED"
+        assert FakeAutomation.open_now == 0
+
+
+# ============== Checkpoint Tests ==============
+
+
+class TestStepCheckpoint:
+    """Tests for checkpointing to AutomationRun and resuming."""
+
+    def test_resume_skips_completed_steps(self, sample_client, db_session):
+        from database import AutomationRun
+
+        log = []
+        calls = []
+
+        async def flaky(automation):
+            calls.append(automation.portal)
+            if len(calls) == 1:
+                raise RuntimeError("timed out")
+            return await automation.submit()
+
+        def steps():
+            return [
+                step("ftc", "ftc", log),
+                step("equifax", "equifax", log, after=("ftc",), action=flaky),
+            ]
+
+        checkpoint = StepCheckpoint(client_id=sample_client.id, automation_type="5ko")
+        first = asyncio.run(run_steps(steps(), pool=fast_pool(), checkpoint=checkpoint))
+        assert first["equifax"].success is False
+
+        run = db_session.query(AutomationRun).get(checkpoint.run_id)
+        assert run.status == "failed"
+        assert run.result_data["steps"]["ftc"]["status"] == "completed"
+
+        log.clear()
+        resumed = StepCheckpoint(
+            client_id=sample_client.id, automation_type="5ko", run_id=checkpoint.run_id
+        )
+        second = asyncio.run(run_steps(steps(), pool=fast_pool(), checkpoint=resumed))
+
+        assert log == [("open", "equifax")]
+        assert second["ftc"].confirmation_number == "FTC-1"
+        assert second["ftc"].data == {"resumed": True}
+        db_session.expire_all()
+        run = db_session.query(AutomationRun).get(checkpoint.run_id)
+        assert run.status == "completed"
+        assert run.items_succeeded == 2
+
+
+# ============== Orchestrator Tests ==============
+
+
+class TestConcurrentKnockout:
+    """Tests for the 5KO and CFPB flows on the step runner."""
+
+    def test_knockout_files_ftc_then_all_portals(self):
+        log = []
+
+        class FakeFTC(FakeAutomation):
+            def __init__(self, **kwargs):
+                super().__init__("ftc", log)
+
+            async def file_identity_theft_report(self, account, is_inquiry=False):
+                return await self.submit()
+
+        class FakeCFPB(FakeAutomation):
+            def __init__(self, **kwargs):
+                super().__init__("cfpb", log)
+
+            async def file_cfpb_complaint(self, bureau, ftc_report_number=None, **kwargs):
+                assert ftc_report_number == "FTC-1"
+                return await self.submit()
+
+        def fake_bureau(bureau, **kwargs):
+            automation = FakeAutomation(bureau, log)
+
+            async def submit_dispute(account, ftc_report_number=None):
+                assert ftc_report_number == "FTC-1"
+                return await automation.submit()
+
+            automation.submit_dispute = submit_dispute
+            return automation
+
+        orch = fko_orchestrator.FiveKnockoutOrchestrator(client_id=1, pool=fast_pool())
+        with patch.object(fko_orchestrator, "FTCAutomation", FakeFTC), patch.object(
+            fko_orchestrator, "CFPBAutomation", FakeCFPB
+        ), patch.object(
+            fko_orchestrator, "get_bureau_automation", fake_bureau
+        ), patch.object(
+            fko_orchestrator.FiveKnockoutOrchestrator, "_update_client_field"
+        ), patch.object(StepCheckpoint, "_update"):
+            status = asyncio.run(
+                orch.run_full_knockout({"bureaus": ["equifax", "transunion"]})
+            )
+
+        assert status.is_complete
+        assert log[0] == ("open", "ftc")
+        assert set(status.cfpb_results) == {"equifax", "transunion"}
+        assert status.bureau_confirmations == {
+            "equifax": "EQUIFAX-1",
+            "transunion": "TRANSUNION-1",
+        }
+        # Both CFPB complaints (cfpb allows 2) and both bureaus at once
+        assert FakeAutomation.peak == 4
+
+    def test_cfpb_all_bureaus_uses_separate_automations(self):
+        spawned = []
+
+        async def file_cfpb_complaint(self, bureau, **kwargs):
+            spawned.append(self)
+            return AutomationResult(success=True, message="ok")
+
+        async def noop(self):
+            pass
+
+        cfpb = CFPBAutomation(client_id=1)
+        with patch.object(CFPBAutomation, "setup", noop), patch.object(
+            CFPBAutomation, "teardown", noop
+        ), patch.object(
+            CFPBAutomation, "file_cfpb_complaint", file_cfpb_complaint
+        ), patch(
+            "services.browser_automation.orchestration.asyncio.sleep", noop
+        ):
+            results = asyncio.run(
+                cfpb.file_complaints_all_bureaus({}, bureaus=["Equifax", "TU"])
+            )
+
+        assert set(results) == {"equifax", "tu"}
+        assert len({id(a) for a in spawned}) == 2
+        assert cfpb not in spawned
@@ -427,3 +427,111 @@ class TestExportSuccessData:
         result = service.export_success_data()
 
         assert result == []
+
+
+class TestBulkSnapshots:
+    """Tests for the set-based snapshot engine against the SQLite test database."""
+
+    @pytest.fixture
+    def seeded(self):
+        from database import (
+            Client,
+            ClientSuccessMetric,
+            CRAResponse,
+            CreditScoreSnapshot,
+            DisputeItem,
+            Violation,
+            get_db,
+        )
+
+        db = get_db()
+        created = datetime.utcnow() - timedelta(days=40)
+        with_scores = Client(name="Bulk Snapshot A", status="active", created_at=created)
+        no_scores = Client(name="Bulk Snapshot B", status="pending", created_at=created)
+        db.add_all([with_scores, no_scores])
+        db.commit()
+
+        db.add_all([
+            CreditScoreSnapshot(
+                client_id=with_scores.id, equifax_score=580, experian_score=590,
+                transunion_score=600, total_negatives=10,
+                created_at=created,
+            ),
+            CreditScoreSnapshot(
+                client_id=with_scores.id, equifax_score=640, experian_score=650,
+                transunion_score=660, total_negatives=4,
+                created_at=created + timedelta(days=30),
+            ),
+            DisputeItem(client_id=with_scores.id, bureau="Equifax", status="deleted", dispute_round=1),
+            DisputeItem(client_id=with_scores.id, bureau="TransUnion", status="deleted", dispute_round=1),
+            DisputeItem(client_id=with_scores.id, bureau="Experian", status="verified", dispute_round=1),
+            DisputeItem(client_id=no_scores.id, bureau="Experian", status="sent", dispute_round=1),
+            DisputeItem(client_id=no_scores.id, bureau="Experian", status="deleted", dispute_round=2),
+            CRAResponse(client_id=with_scores.id, bureau="Equifax", items_deleted=2, items_verified=1),
+            Violation(
+                client_id=with_scores.id, analysis_id=0, bureau="Equifax",
+                statutory_damages_min=100, statutory_damages_max=1000,
+            ),
+        ])
+        db.commit()
+        ids = [with_scores.id, no_scores.id]
+        try:
+            yield db, ids
+        finally:
+            for model in (ClientSuccessMetric, CreditScoreSnapshot, DisputeItem, CRAResponse, Violation):
+                db.query(model).filter(model.client_id.in_(ids)).delete(synchronize_session=False)
+            db.query(Client).filter(Client.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+            db.close()
+
+    def test_bulk_matches_per_client(self, seeded):
+        """Test grouped metrics equal the per-client calculation."""
+        from database import Client
+
+        db, ids = seeded
+        service = ClientSuccessService(db)
+        clients = db.query(Client).filter(Client.id.in_(ids)).all()
+
+        bulk = service.calculate_bulk_metrics(clients)
+
+        for client_id in ids:
+            assert bulk[client_id] == service.calculate_client_metrics(client_id)
+        assert bulk[ids[0]]['items_deleted'] == 4
+        assert bulk[ids[0]]['estimated_value_recovered'] == 550.0
+        assert bulk[ids[1]]['current_negative_items'] == 1
+
+    def test_update_all_skips_unchanged(self, seeded):
+        """Test a second periodic run only writes clients that changed."""
+        from database import ClientSuccessMetric, DisputeItem
+
+        db, ids = seeded
+        service = ClientSuccessService(db)
+
+        service.update_all_clients()
+        assert db.query(ClientSuccessMetric).filter(ClientSuccessMetric.client_id.in_(ids)).count() == 2
+
+        db.add(DisputeItem(client_id=ids[1], bureau="Equifax", status="deleted", dispute_round=2))
+        db.commit()
+        result = service.update_all_clients()
+
+        assert result['skipped_unchanged'] >= 1
+        assert db.query(ClientSuccessMetric).filter(ClientSuccessMetric.client_id == ids[0]).count() == 1
+        assert db.query(ClientSuccessMetric).filter(ClientSuccessMetric.client_id == ids[1]).count() == 2
+
+    def test_manual_snapshots_always_written(self, seeded):
+        """Test non-periodic snapshots are not deduplicated."""
+        from database import ClientSuccessMetric
+
+        db, ids = seeded
+        service = ClientSuccessService(db)
+        service.update_all_clients(snapshot_type="manual")
+        service.update_all_clients(snapshot_type="manual")
+
+        assert db.query(ClientSuccessMetric).filter(ClientSuccessMetric.client_id == ids[0]).count() == 2
+
+    def test_task_handler_registered(self):
+        """Test the nightly snapshot handler is registered with the task queue."""
+        from services.client_success_service import handle_client_success_snapshots
+        from services.task_queue_service import TASK_HANDLERS
+
+        assert TASK_HANDLERS["client_success_snapshots"] is handle_client_success_snapshots
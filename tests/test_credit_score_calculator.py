@@ -15,6 +15,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from services.credit_score_calculator import (
     get_score_range_label,
     categorize_violation_type,
+    categorize_violation_types,
+    normalize_violation_text,
     get_all_item_types,
     estimate_by_item_types,
     estimate_score_improvement,
@@ -28,6 +30,8 @@ from services.credit_score_calculator import (
     ITEM_CATEGORIES,
     SEVERITY_LEVELS,
     SCORE_RANGES,
+    CATEGORY_RULES,
+    _categorize_normalized,
 )
 
 
@@ -303,7 +307,7 @@ class TestCategorizeViolationType:
     def test_categorize_inaccurate_info(self):
         """Test inaccurate information detection."""
         assert categorize_violation_type("inaccurate information") == "inaccurate_info"
-        # Note: "reporting" contains "repo" which matches repossession first
+        assert categorize_violation_type("inaccurate reporting") == "inaccurate_info"
         assert categorize_violation_type("error in data") == "inaccurate_info"
         assert categorize_violation_type("wrong data found") == "inaccurate_info"
 
@@ -323,6 +327,48 @@ class TestCategorizeViolationType:
         assert categorize_violation_type("COLLECTION") == "collection"
 
 
+class TestCategorizeRuleTable:
+    """Test the compiled rule table, word boundaries, batch API and cache."""
+
+    def test_repo_needs_whole_word(self):
+        assert categorize_violation_type("reported balance is inaccurate") == "inaccurate_info"
+        assert categorize_violation_type("auto repos listed") == "repossession"
+
+    def test_max_needs_whole_word(self):
+        assert categorize_violation_type("maximum error") == "inaccurate_info"
+        assert categorize_violation_type("card maxed") == "maxed_out"
+
+    def test_day_counts_need_whole_number(self):
+        assert categorize_violation_type("opened 1990, paid late") == "late_payment_30"
+        assert categorize_violation_type("late 90-day") == "late_payment_90"
+
+    def test_only_case_is_normalized(self):
+        assert normalize_violation_text("Short \n SALE") == "short \n sale"
+        assert categorize_violation_type("SHORT SALE") == "short_sale"
+        assert categorize_violation_type("short\tsale") == "unknown"
+
+    def test_first_matching_rule_wins(self):
+        categories = [category for category, _ in CATEGORY_RULES]
+        # Specific categories are listed before their general fallbacks
+        assert categories.index("medical_collection") < categories.index("collection")
+        assert categories.index("bankruptcy_ch7") < categories.index("bankruptcy")
+        assert categories.index("identity_theft") < categories.index("identity_error")
+        assert categorize_violation_type("medical collection paid") == "medical_collection"
+
+    def test_batch_matches_single(self):
+        texts = ["chapter 7", None, "car repo", "hard inquiry", "", "wrong balance"]
+        assert categorize_violation_types(texts) == [
+            categorize_violation_type(t) for t in texts
+        ]
+
+    def test_results_are_cached_by_normalized_text(self):
+        _categorize_normalized.cache_clear()
+        categorize_violation_types(["Tax Lien", "tax lien", "TAX LIEN"])
+        info = _categorize_normalized.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+
+
 # =============================================================================
 # Tests for get_all_item_types()
 # =============================================================================
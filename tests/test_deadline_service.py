@@ -772,6 +772,11 @@ class TestExtendDeadline:
 # Tests for check_and_send_reminders()
 # =============================================================================
 
+def _queue_all(tasks, session=None):
+    """Stand-in for enqueue_bulk that reports every task as added."""
+    return [MagicMock(idempotency_key=t.get("idempotency_key")) for t in tasks]
+
+
 class TestCheckAndSendReminders:
     """Test reminder checking and sending function."""
 
@@ -786,12 +791,12 @@ class TestCheckAndSendReminders:
         assert result["checked"] == 0
         assert result["errors"] == 0
 
-    @patch('services.deadline_service._send_deadline_reminder')
+    @patch('services.task_queue_service.TaskQueueService.enqueue_bulk')
     @patch('services.deadline_service.is_sendgrid_configured')
     def test_check_reminders_sends_7_day_reminder(self, mock_sendgrid, mock_send):
         """Test 7-day reminder is sent."""
         mock_sendgrid.return_value = True
-        mock_send.return_value = True
+        mock_send.side_effect = _queue_all
 
         mock_db = MagicMock()
         mock_deadline = MagicMock()
@@ -816,13 +821,18 @@ class TestCheckAndSendReminders:
 
         assert result["reminders_7_days"] == 1
         assert mock_deadline.reminder_sent_7_days is True
+        tasks = mock_send.call_args.args[0]
+        assert tasks[0]["idempotency_key"] == (
+            f"deadline_reminder:1:7_days:{mock_deadline.deadline_date.isoformat()}"
+        )
+        assert mock_send.call_args.kwargs["session"] is mock_db
 
-    @patch('services.deadline_service._send_deadline_reminder')
+    @patch('services.task_queue_service.TaskQueueService.enqueue_bulk')
     @patch('services.deadline_service.is_sendgrid_configured')
     def test_check_reminders_sends_3_day_reminder(self, mock_sendgrid, mock_send):
         """Test 3-day reminder is sent."""
         mock_sendgrid.return_value = True
-        mock_send.return_value = True
+        mock_send.side_effect = _queue_all
 
         mock_db = MagicMock()
         mock_deadline = MagicMock()
@@ -848,12 +858,12 @@ class TestCheckAndSendReminders:
         assert result["reminders_3_days"] == 1
         assert mock_deadline.reminder_sent_3_days is True
 
-    @patch('services.deadline_service._send_deadline_reminder')
+    @patch('services.task_queue_service.TaskQueueService.enqueue_bulk')
     @patch('services.deadline_service.is_sendgrid_configured')
     def test_check_reminders_sends_1_day_reminder(self, mock_sendgrid, mock_send):
         """Test 1-day reminder is sent."""
         mock_sendgrid.return_value = True
-        mock_send.return_value = True
+        mock_send.side_effect = _queue_all
 
         mock_db = MagicMock()
         mock_deadline = MagicMock()
@@ -879,12 +889,12 @@ class TestCheckAndSendReminders:
         assert result["reminders_1_day"] == 1
         assert mock_deadline.reminder_sent_1_day is True
 
-    @patch('services.deadline_service._send_deadline_reminder')
+    @patch('services.task_queue_service.TaskQueueService.enqueue_bulk')
     @patch('services.deadline_service.is_sendgrid_configured')
     def test_check_reminders_sends_overdue_notice(self, mock_sendgrid, mock_send):
         """Test overdue notice is sent."""
         mock_sendgrid.return_value = True
-        mock_send.return_value = True
+        mock_send.side_effect = _queue_all
 
         mock_db = MagicMock()
         mock_deadline = MagicMock()
@@ -911,6 +921,125 @@ class TestCheckAndSendReminders:
         assert mock_deadline.overdue_notice_sent is True
 
 
+class TestReminderQueue:
+    """Test reminder selection and queueing against the database."""
+
+    def _deadline(self, db_session, client_id, days, **flags):
+        from database import CaseDeadline
+
+        deadline = CaseDeadline(
+            client_id=client_id,
+            deadline_type="cra_response",
+            start_date=date.today() - timedelta(days=30),
+            deadline_date=date.today() + timedelta(days=days),
+            status="active",
+            **flags,
+        )
+        db_session.add(deadline)
+        db_session.commit()
+        return deadline
+
+    @patch('services.deadline_service.is_sendgrid_configured', return_value=True)
+    def test_selects_only_due_windows_and_queues_once(self, _, db_session, sample_client):
+        """Only unflagged deadlines in a window are queued, each exactly once."""
+        from database import BackgroundTask
+
+        due = {
+            self._deadline(db_session, sample_client.id, 6).id: "7_days",
+            self._deadline(db_session, sample_client.id, 1).id: "1_day",
+            self._deadline(db_session, sample_client.id, -4).id: "overdue",
+        }
+        skipped = [
+            self._deadline(db_session, sample_client.id, 0).id,
+            self._deadline(db_session, sample_client.id, 12).id,
+            self._deadline(db_session, sample_client.id, 2, reminder_sent_3_days=True).id,
+        ]
+
+        check_and_send_reminders(db_session)
+
+        queued = {
+            t.payload["deadline_id"]: t.payload["reminder_type"]
+            for t in db_session.query(BackgroundTask)
+            .filter(BackgroundTask.task_type == "send_deadline_reminder")
+            .all()
+        }
+        for deadline_id, reminder_type in due.items():
+            assert queued[deadline_id] == reminder_type
+        assert not set(skipped) & set(queued)
+
+        # Flags were committed with the tasks, so a rerun queues nothing new
+        check_and_send_reminders(db_session)
+        assert db_session.query(BackgroundTask).filter(
+            BackgroundTask.task_type == "send_deadline_reminder",
+            BackgroundTask.payload["deadline_id"].as_integer().in_(list(due)),
+        ).count() == 3
+
+    def _reminder_tasks(self, db_session, deadline_id):
+        from database import BackgroundTask
+
+        return [
+            t for t in db_session.query(BackgroundTask)
+            .filter(BackgroundTask.task_type == "send_deadline_reminder")
+            .order_by(BackgroundTask.id)
+            .all()
+            if t.payload["deadline_id"] == deadline_id
+        ]
+
+    @patch('services.deadline_service.is_sendgrid_configured', return_value=True)
+    def test_extended_deadline_requeues_reminder(self, _, db_session, sample_client):
+        """Extending a deadline re-queues the reminder for the new date."""
+        deadline = self._deadline(db_session, sample_client.id, 5)
+        deadline_id = deadline.id
+
+        first = check_and_send_reminders(db_session)
+        assert first["reminders_7_days"] == 1
+
+        # start_date is 30 days back, so 36 days lands 6 days out: same window
+        extend_deadline(db_session, deadline_id, new_days=36)
+        second = check_and_send_reminders(db_session)
+
+        tasks = self._reminder_tasks(db_session, deadline_id)
+        assert second["reminders_7_days"] == 1
+        assert [t.payload["reminder_type"] for t in tasks] == ["7_days", "7_days"]
+        assert tasks[0].idempotency_key != tasks[1].idempotency_key
+        assert tasks[1].idempotency_key.endswith(
+            (date.today() + timedelta(days=6)).isoformat()
+        )
+
+    @patch('services.deadline_service.is_sendgrid_configured', return_value=True)
+    def test_already_queued_reminder_is_not_counted(self, _, db_session, sample_client):
+        """A reminder whose task is already queued is not counted again."""
+        from database import CaseDeadline
+
+        deadline = self._deadline(db_session, sample_client.id, 5)
+        deadline_id = deadline.id
+        check_and_send_reminders(db_session)
+
+        # Flag cleared without a date change: the same key is still queued
+        db_session.query(CaseDeadline).filter_by(id=deadline_id).update(
+            {"reminder_sent_7_days": False}
+        )
+        db_session.commit()
+        result = check_and_send_reminders(db_session)
+
+        assert result["reminders_7_days"] == 0
+        assert len(self._reminder_tasks(db_session, deadline_id)) == 1
+
+    @patch('services.deadline_service._send_deadline_reminder', return_value=True)
+    def test_handler_sends_queued_reminder(self, mock_send, db_session, sample_client):
+        """The task handler sends the reminder for an active deadline."""
+        from services.deadline_service import handle_send_deadline_reminder
+
+        deadline = self._deadline(db_session, sample_client.id, 3)
+
+        result = handle_send_deadline_reminder(
+            {"deadline_id": deadline.id, "reminder_type": "3_days"}
+        )
+
+        assert result == {"success": True, "deadline_id": deadline.id}
+        assert mock_send.call_args.args[3:] == ("3_days", 3)
+
+
 # =============================================================================
 # Tests for _build_deadline_email()
 # =============================================================================
@@ -12,15 +12,19 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
 
 from services.encryption import (
     get_encryption_key,
     get_fernet,
     encrypt_value,
     decrypt_value,
+    encrypt_many,
+    decrypt_many,
     is_encrypted,
     migrate_plaintext_to_encrypted,
+    reencrypt_column,
+    reencrypt_value,
 )
 
 
@@ -444,171 +448,252 @@ class TestIsEncrypted:
 # ============== migrate_plaintext_to_encrypted Tests ==============
 
 
-class TestMigratePlaintextToEncrypted:
-    """Tests for migrate_plaintext_to_encrypted function."""
-
-    def test_migrate_plaintext_basic(self, valid_fernet_key, clean_env):
-        """Test basic migration of plaintext passwords."""
-        os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
+@pytest.fixture
+def crypto_db():
+    """Private in-memory database holding just the encrypted-column tables."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
 
-        # Create mock Client class and instances
-        MockClient = Mock()
+    from database import Base, Client, CreditMonitoringCredential, Staff
 
-        # Create mock clients with plaintext passwords
-        client1 = Mock()
-        client1.credit_monitoring_password_encrypted = "plaintext_password_1"
-        client2 = Mock()
-        client2.credit_monitoring_password_encrypted = "plaintext_password_2"
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            Client.__table__,
+            CreditMonitoringCredential.__table__,
+            Staff.__table__,
+        ],
+    )
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+    engine.dispose()
 
-        # Create mock database session
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.all.return_value = [client1, client2]
-        mock_db.query.return_value = mock_query
 
-        with patch('database.get_db'):
-            count = migrate_plaintext_to_encrypted(mock_db, MockClient)
+def _add_clients(db, *passwords):
+    from database import Client
 
-        assert count == 2
-        mock_db.commit.assert_called_once()
-        # Verify passwords were encrypted
-        assert client1.credit_monitoring_password_encrypted != "plaintext_password_1"
-        assert client2.credit_monitoring_password_encrypted != "plaintext_password_2"
+    clients = [
+        Client(name=f"Client {i}", credit_monitoring_password_encrypted=password)
+        for i, password in enumerate(passwords)
+    ]
+    db.add_all(clients)
+    db.commit()
+    return [c.id for c in clients]
 
-    def test_migrate_skips_already_encrypted(self, valid_fernet_key, clean_env):
-        """Test that already encrypted passwords are skipped."""
-        os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
 
-        # Create an encrypted password
-        encrypted_password = encrypt_value("secret")
+def _stored_password(db, client_id):
+    from database import Client
 
-        MockClient = Mock()
-        client = Mock()
-        client.credit_monitoring_password_encrypted = encrypted_password
+    db.expire_all()
+    return db.get(Client, client_id).credit_monitoring_password_encrypted
 
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.all.return_value = [client]
-        mock_db.query.return_value = mock_query
 
-        with patch('database.get_db'):
-            count = migrate_plaintext_to_encrypted(mock_db, MockClient)
+class TestMigratePlaintextToEncrypted:
+    """Tests for migrate_plaintext_to_encrypted function."""
 
-        # Should skip already encrypted password
-        assert count == 0
-        mock_db.commit.assert_not_called()
-        # Password should remain unchanged
-        assert client.credit_monitoring_password_encrypted == encrypted_password
+    def test_migrate_plaintext_basic(self, valid_fernet_key, clean_env, crypto_db):
+        """Test basic migration of plaintext passwords."""
+        from database import Client
 
-    def test_migrate_no_clients(self, valid_fernet_key, clean_env):
-        """Test migration with no clients to migrate."""
         os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
+        ids = _add_clients(crypto_db, "plaintext_password_1", "plaintext_password_2")
 
-        MockClient = Mock()
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.all.return_value = []
-        mock_db.query.return_value = mock_query
+        count = migrate_plaintext_to_encrypted(crypto_db, Client)
 
-        with patch('database.get_db'):
-            count = migrate_plaintext_to_encrypted(mock_db, MockClient)
+        assert count == 2
+        assert decrypt_value(_stored_password(crypto_db, ids[0])) == "plaintext_password_1"
+        assert decrypt_value(_stored_password(crypto_db, ids[1])) == "plaintext_password_2"
 
-        assert count == 0
-        mock_db.commit.assert_not_called()
+    def test_migrate_skips_already_encrypted(self, valid_fernet_key, clean_env, crypto_db):
+        """Test that already encrypted passwords are skipped."""
+        from database import Client
 
-    def test_migrate_mixed_encrypted_and_plaintext(self, valid_fernet_key, clean_env):
-        """Test migration with mix of encrypted and plaintext passwords."""
         os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
+        encrypted_password = encrypt_value("secret")
+        [client_id] = _add_clients(crypto_db, encrypted_password)
 
-        encrypted_password = encrypt_value("already_encrypted")
-
-        MockClient = Mock()
-        client1 = Mock()
-        client1.credit_monitoring_password_encrypted = "plaintext"
-        client2 = Mock()
-        client2.credit_monitoring_password_encrypted = encrypted_password
-        client3 = Mock()
-        client3.credit_monitoring_password_encrypted = "another_plaintext"
-
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.all.return_value = [client1, client2, client3]
-        mock_db.query.return_value = mock_query
+        count = migrate_plaintext_to_encrypted(crypto_db, Client)
 
-        with patch('database.get_db'):
-            count = migrate_plaintext_to_encrypted(mock_db, MockClient)
+        assert count == 0
+        assert _stored_password(crypto_db, client_id) == encrypted_password
 
-        # Should only migrate 2 plaintext passwords
-        assert count == 2
-        mock_db.commit.assert_called_once()
+    def test_migrate_no_clients(self, valid_fernet_key, clean_env, crypto_db):
+        """Test migration with no clients to migrate."""
+        from database import Client
 
-    def test_migrate_empty_password_skipped(self, valid_fernet_key, clean_env):
-        """Test that empty passwords are skipped."""
         os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
+        assert migrate_plaintext_to_encrypted(crypto_db, Client) == 0
 
-        MockClient = Mock()
-        client = Mock()
-        client.credit_monitoring_password_encrypted = ""
+    def test_migrate_mixed_encrypted_and_plaintext(self, valid_fernet_key, clean_env, crypto_db):
+        """Test migration with mix of encrypted and plaintext passwords."""
+        from database import Client
 
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.all.return_value = [client]
-        mock_db.query.return_value = mock_query
+        os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
+        _add_clients(
+            crypto_db, "plaintext", encrypt_value("already_encrypted"), "another_plaintext"
+        )
 
-        with patch('database.get_db'):
-            count = migrate_plaintext_to_encrypted(mock_db, MockClient)
+        assert migrate_plaintext_to_encrypted(crypto_db, Client) == 2
 
-        # Empty string is falsy, but is_encrypted returns False for it
-        # However, the condition checks `if current_value and not is_encrypted(current_value)`
-        # Empty string is falsy so it should be skipped
-        assert count == 0
+    def test_migrate_empty_and_none_skipped(self, valid_fernet_key, clean_env, crypto_db):
+        """Test that empty and missing passwords are left alone."""
+        from database import Client
 
-    def test_migrate_none_password_skipped(self, valid_fernet_key, clean_env):
-        """Test that None passwords are skipped."""
         os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
+        ids = _add_clients(crypto_db, "", None)
 
-        MockClient = Mock()
-        client = Mock()
-        client.credit_monitoring_password_encrypted = None
+        assert migrate_plaintext_to_encrypted(crypto_db, Client) == 0
+        assert _stored_password(crypto_db, ids[0]) == ""
+        assert _stored_password(crypto_db, ids[1]) is None
 
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        # Query filters out None values, so it shouldn't be in results
-        mock_query.all.return_value = []
-        mock_db.query.return_value = mock_query
+    def test_migrate_spans_chunks(self, valid_fernet_key, clean_env, crypto_db):
+        """Test that the column is walked chunk by chunk to the end."""
+        from database import Client
 
-        with patch('database.get_db'):
-            count = migrate_plaintext_to_encrypted(mock_db, MockClient)
+        os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
+        _add_clients(crypto_db, *[f"pw{i}" for i in range(7)])
 
-        assert count == 0
+        result = reencrypt_column(
+            crypto_db, Client, "credit_monitoring_password_encrypted", chunk_size=3
+        )
 
-    def test_migrate_prints_success_message(self, valid_fernet_key, clean_env, capsys):
-        """Test that successful migration prints confirmation."""
-        os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
+        assert result["encrypted"] == 7
+        assert result["scanned"] == 7
+        assert result["done"] is True
 
-        MockClient = Mock()
-        client = Mock()
-        client.credit_monitoring_password_encrypted = "plaintext"
+    def test_migrate_prints_success_message(self, valid_fernet_key, clean_env, capsys, crypto_db):
+        """Test that successful migration prints confirmation."""
+        from database import Client
 
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.all.return_value = [client]
-        mock_db.query.return_value = mock_query
+        os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
+        _add_clients(crypto_db, "plaintext")
 
-        with patch('database.get_db'):
-            migrate_plaintext_to_encrypted(mock_db, MockClient)
+        migrate_plaintext_to_encrypted(crypto_db, Client)
 
         captured = capsys.readouterr()
         assert "Migrated 1 plaintext passwords" in captured.out
 
 
+# ============== Key Rotation Tests ==============
+
+
+@pytest.fixture
+def rotated_keys(clean_env):
+    """Install a new current key with the old one retired; yields (old, new)."""
+    old_key = Fernet.generate_key().decode()
+    new_key = Fernet.generate_key().decode()
+    original_old_keys = os.environ.get("FCRA_ENCRYPTION_OLD_KEYS")
+    os.environ["FCRA_ENCRYPTION_KEY"] = new_key
+    os.environ["FCRA_ENCRYPTION_OLD_KEYS"] = old_key
+    yield old_key, new_key
+    if original_old_keys is None:
+        os.environ.pop("FCRA_ENCRYPTION_OLD_KEYS", None)
+    else:
+        os.environ["FCRA_ENCRYPTION_OLD_KEYS"] = original_old_keys
+
+
+class TestKeyRotation:
+    """Tests for cached ciphers, retired keys and batch helpers."""
+
+    def test_fernet_is_cached(self, valid_fernet_key, clean_env):
+        """Test that the Fernet instance is reused while the key is unchanged."""
+        os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
+        assert get_fernet() is get_fernet()
+
+    def test_key_change_rebuilds_fernet(self, clean_env):
+        """Test that changing the key environment gives a new Fernet."""
+        os.environ["FCRA_ENCRYPTION_KEY"] = Fernet.generate_key().decode()
+        first = get_fernet()
+        os.environ["FCRA_ENCRYPTION_KEY"] = Fernet.generate_key().decode()
+        assert get_fernet() is not first
+
+    def test_retired_key_still_decrypts(self, rotated_keys):
+        """Test that values under a retired key decrypt."""
+        old_key, _ = rotated_keys
+        token = Fernet(old_key.encode()).encrypt(b"secret").decode()
+        assert decrypt_value(token) == "secret"
+
+    def test_new_values_use_current_key(self, rotated_keys):
+        """Test that encryption always uses the current key."""
+        _, new_key = rotated_keys
+        token = encrypt_value("secret")
+        assert Fernet(new_key.encode()).decrypt(token.encode()) == b"secret"
+
+    def test_reencrypt_value(self, rotated_keys):
+        """Test bringing plaintext, old-key and current-key values up to date."""
+        old_key, new_key = rotated_keys
+        current = Fernet(new_key.encode())
+
+        old_token = Fernet(old_key.encode()).encrypt(b"secret").decode()
+        assert current.decrypt(reencrypt_value(old_token).encode()) == b"secret"
+        assert current.decrypt(reencrypt_value("plain").encode()) == b"plain"
+        assert reencrypt_value(encrypt_value("secret")) is None
+
+    def test_reencrypt_value_unknown_key(self, rotated_keys):
+        """Test that ciphertext under an unknown key is rejected."""
+        token = Fernet(Fernet.generate_key()).encrypt(b"secret").decode()
+        with pytest.raises(InvalidToken):
+            reencrypt_value(token)
+
+    def test_encrypt_many_decrypt_many_roundtrip(self, valid_fernet_key, clean_env):
+        """Test the batch helpers against the single-value semantics."""
+        os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
+        values = ["a", "", None, "pässwörd"]
+
+        encrypted = encrypt_many(values)
+
+        assert encrypted[1] == "" and encrypted[2] == ""
+        assert decrypt_many(encrypted) == ["a", "", "", "pässwörd"]
+
+    def test_decrypt_many_returns_undecryptable_unchanged(self, valid_fernet_key, clean_env, caplog):
+        """Test that failures pass through with one summary warning."""
+        os.environ["FCRA_ENCRYPTION_KEY"] = valid_fernet_key
+        token = encrypt_value("secret")
+
+        assert decrypt_many(["plain", token, "other"]) == ["plain", "secret", "other"]
+        assert "failed for 2 value(s)" in caplog.text
+
+    def test_reencrypt_column_rotates(self, rotated_keys, crypto_db):
+        """Test rotating a column written under the retired key."""
+        from database import Client
+
+        old_key, new_key = rotated_keys
+        old = Fernet(old_key.encode())
+        ids = _add_clients(
+            crypto_db,
+            old.encrypt(b"one").decode(),
+            encrypt_value("two"),
+            "three",
+        )
+
+        result = reencrypt_column(crypto_db, Client, "credit_monitoring_password_encrypted")
+
+        assert (result["rotated"], result["encrypted"]) == (1, 1)
+        current = Fernet(new_key.encode())
+        for client_id, plain in zip(ids, [b"one", b"two", b"three"]):
+            assert current.decrypt(_stored_password(crypto_db, client_id).encode()) == plain
+
+    def test_reencrypt_column_resumes_after_deadline(self, rotated_keys, crypto_db):
+        """Test that a deadline stops after a chunk and last_id resumes."""
+        from database import Client
+
+        _add_clients(crypto_db, *[f"pw{i}" for i in range(5)])
+
+        first = reencrypt_column(
+            crypto_db, Client, "credit_monitoring_password_encrypted",
+            chunk_size=2, deadline=0,
+        )
+        assert (first["scanned"], first["done"]) == (2, False)
+
+        rest = reencrypt_column(
+            crypto_db, Client, "credit_monitoring_password_encrypted",
+            after_id=first["last_id"], chunk_size=2,
+        )
+        assert (rest["scanned"], rest["done"]) == (3, True)
+
+
 # ============== Integration Tests ==============
 
 
@@ -28,9 +28,10 @@ from services.feature_flag_service import (
     FLAG_CATEGORIES,
     DEFAULT_FLAGS,
     CACHE_TTL_SECONDS,
-    _cache,
-    _cache_timestamps,
+    flush_evaluation_counts,
 )
+from services.shared_state import SharedGeneration
+import services.feature_flag_service as ffs
 
 
 # =============================================================================
@@ -86,12 +87,12 @@ def mock_flag():
 
 @pytest.fixture(autouse=True)
 def clear_cache():
-    """Clear the cache before each test."""
-    _cache.clear()
-    _cache_timestamps.clear()
+    """Drop the flag snapshot and buffered counts around each test."""
+    ffs._snapshot = None
+    ffs._evaluation_counts.clear()
     yield
-    _cache.clear()
-    _cache_timestamps.clear()
+    ffs._snapshot = None
+    ffs._evaluation_counts.clear()
 
 
 # =============================================================================
@@ -183,56 +184,61 @@ class TestIsEnabled:
 
     def test_is_enabled_returns_default_when_flag_not_found(self, service, mock_db):
         """Test that is_enabled returns default when flag not found."""
-        mock_db.query.return_value.filter_by.return_value.first.return_value = None
+        mock_db.query.return_value.all.return_value = []
         assert service.is_enabled("nonexistent", default=False) is False
         assert service.is_enabled("nonexistent", default=True) is True
 
     def test_is_enabled_with_enabled_flag(self, service, mock_db, mock_flag):
         """Test is_enabled with an enabled flag."""
         mock_flag.enabled = True
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_flag
+        mock_db.query.return_value.all.return_value = [mock_flag]
         assert service.is_enabled("test_flag") is True
 
     def test_is_enabled_with_disabled_flag(self, service, mock_db, mock_flag):
         """Test is_enabled with a disabled flag."""
         mock_flag.enabled = False
         mock_flag.to_dict.return_value["enabled"] = False
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_flag
+        mock_db.query.return_value.all.return_value = [mock_flag]
         assert service.is_enabled("test_flag") is False
 
     def test_is_enabled_with_expired_flag(self, service, mock_db, mock_flag):
         """Test is_enabled with an expired flag."""
-        mock_flag.is_expired.return_value = True
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_flag
+        mock_flag.expires_at = datetime.utcnow() - timedelta(days=1)
+        mock_db.query.return_value.all.return_value = [mock_flag]
         assert service.is_enabled("test_flag", default=False) is False
 
-    def test_is_enabled_updates_evaluation_stats(self, service, mock_db, mock_flag):
-        """Test that is_enabled updates evaluation stats."""
-        mock_flag.evaluation_count = 5
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_flag
+    def test_is_enabled_returns_default_when_load_fails(self, service, mock_db):
+        """Test that a failed snapshot load falls back to the default."""
+        mock_db.query.side_effect = Exception("db down")
+        assert service.is_enabled("test_flag", default=True) is True
+
+    def test_is_enabled_buffers_evaluation_count(self, service, mock_db, mock_flag):
+        """Test that evaluations are counted in memory, not committed."""
+        mock_db.query.return_value.all.return_value = [mock_flag]
 
+        service.is_enabled("test_flag")
         service.is_enabled("test_flag")
 
-        assert mock_flag.evaluation_count == 6
-        assert mock_flag.last_evaluated_at is not None
-        mock_db.commit.assert_called()
+        assert ffs._evaluation_counts == {"test_flag": 2}
+        mock_db.commit.assert_not_called()
 
-    def test_is_enabled_caches_flag(self, service, mock_db, mock_flag):
-        """Test that is_enabled caches the flag."""
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_flag
+    def test_is_enabled_loads_snapshot(self, service, mock_db, mock_flag):
+        """Test that is_enabled loads every flag into the snapshot."""
+        mock_db.query.return_value.all.return_value = [mock_flag]
 
         service.is_enabled("test_flag")
 
-        assert "test_flag" in _cache
+        assert "test_flag" in ffs._snapshot.flags
 
-    def test_is_enabled_uses_cache(self, service, mock_db, mock_flag):
-        """Test that is_enabled uses cached flag on second call."""
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_flag
+    def test_is_enabled_uses_snapshot(self, service, mock_db, mock_flag):
+        """Test that later evaluations do not query the database."""
+        mock_db.query.return_value.all.return_value = [mock_flag]
 
         service.is_enabled("test_flag")
         service.is_enabled("test_flag")
+        service.is_enabled("other_flag")
 
-        # Query should only be called once
+        # One query loads every flag
         assert mock_db.query.call_count == 1
 
 
@@ -460,12 +466,11 @@ class TestUpdateFlag:
     def test_update_flag_invalidates_cache(self, service, mock_db, mock_flag):
         """Test that updating a flag invalidates the cache."""
         mock_db.query.return_value.filter_by.return_value.first.return_value = mock_flag
-        _cache["test_flag"] = {"old": "data"}
-        _cache_timestamps["test_flag"] = time.time()
+        ffs._snapshot = ffs.FlagSnapshot({})
 
         service.update_flag(key="test_flag", enabled=False)
 
-        assert "test_flag" not in _cache
+        assert ffs._snapshot is None
 
 
 class TestDeleteFlag:
@@ -492,12 +497,11 @@ class TestDeleteFlag:
     def test_delete_flag_invalidates_cache(self, service, mock_db, mock_flag):
         """Test that deleting a flag invalidates the cache."""
         mock_db.query.return_value.filter_by.return_value.first.return_value = mock_flag
-        _cache["test_flag"] = {"old": "data"}
-        _cache_timestamps["test_flag"] = time.time()
+        ffs._snapshot = ffs.FlagSnapshot({})
 
         service.delete_flag("test_flag")
 
-        assert "test_flag" not in _cache
+        assert ffs._snapshot is None
 
 
 class TestSetFlag:
@@ -589,51 +593,90 @@ class TestLocalOverrides:
 
 
 class TestCaching:
-    """Tests for caching functionality."""
+    """Tests for the flag snapshot and evaluation count flushing."""
 
-    def test_get_from_cache_empty(self, service):
-        """Test getting from empty cache returns None."""
-        result = service._get_from_cache("nonexistent")
-        assert result is None
+    def test_snapshot_is_read_only(self, service, mock_db, mock_flag):
+        """Test that snapshot entries cannot be mutated by callers."""
+        mock_db.query.return_value.all.return_value = [mock_flag]
+        snapshot = service._get_snapshot()
 
-    def test_set_and_get_cache(self, service):
-        """Test setting and getting from cache."""
-        data = {"key": "test", "enabled": True}
-        service._set_cache("test", data)
-        result = service._get_from_cache("test")
-        assert result == data
+        with pytest.raises(TypeError):
+            snapshot.flags["new"] = ({}, None)
+        with pytest.raises(TypeError):
+            snapshot.flags["test_flag"][0]["enabled"] = False
 
-    def test_cache_expiration(self, service):
-        """Test that cache expires after TTL."""
-        data = {"key": "test", "enabled": True}
-        service._set_cache("test", data)
+    def test_snapshot_expiration(self, service, mock_db, mock_flag):
+        """Test that the snapshot reloads after the TTL."""
+        mock_db.query.return_value.all.return_value = [mock_flag]
+        service._get_snapshot()
 
-        # Manually expire the cache
-        _cache_timestamps["test"] = time.time() - CACHE_TTL_SECONDS - 1
+        ffs._snapshot.loaded_at -= CACHE_TTL_SECONDS + 1
+        service._get_snapshot()
 
-        result = service._get_from_cache("test")
-        assert result is None
-        assert "test" not in _cache
+        assert mock_db.query.call_count == 2
+
+    def test_failed_refresh_keeps_expired_snapshot(self, service, mock_db, mock_flag):
+        """Test that a refresh failure keeps serving the last snapshot."""
+        mock_db.query.return_value.all.return_value = [mock_flag]
+        service._get_snapshot()
+        ffs._snapshot.loaded_at -= CACHE_TTL_SECONDS + 1
+        mock_db.query.side_effect = Exception("db down")
+
+        assert service.is_enabled("test_flag") is True
 
-    def test_invalidate_cache(self, service):
-        """Test cache invalidation."""
-        data = {"key": "test", "enabled": True}
-        service._set_cache("test", data)
+    def test_invalidate_cache(self, service, mock_db, mock_flag):
+        """Test that invalidation drops the snapshot."""
+        mock_db.query.return_value.all.return_value = [mock_flag]
+        service._get_snapshot()
 
-        service._invalidate_cache("test")
+        service._invalidate_cache("test_flag")
 
-        assert "test" not in _cache
-        assert "test" not in _cache_timestamps
+        assert ffs._snapshot is None
 
-    def test_clear_cache(self, service):
-        """Test clearing entire cache."""
-        service._set_cache("flag1", {"enabled": True})
-        service._set_cache("flag2", {"enabled": False})
+    def test_invalidation_reaches_other_workers(self, service, mock_db, mock_flag):
+        """Test that a version bump elsewhere makes this worker reload."""
+        mock_db.query.return_value.all.return_value = [mock_flag]
+        ffs._snapshot_version._checked_at = 0.0
+        service._get_snapshot()
+
+        SharedGeneration("feature_flags").bump()  # as another worker would
+        ffs._snapshot_version._checked_at = 0.0  # skip the 1s poll interval
+        service._get_snapshot()
+
+        assert mock_db.query.call_count == 2
+
+    def test_clear_cache(self, service, mock_db, mock_flag):
+        """Test clearing the snapshot."""
+        mock_db.query.return_value.all.return_value = [mock_flag]
+        service._get_snapshot()
 
         service.clear_cache()
 
-        assert len(_cache) == 0
-        assert len(_cache_timestamps) == 0
+        assert ffs._snapshot is None
+
+    def test_flush_evaluation_counts(self, mock_db):
+        """Test that buffered counts are written in one executemany."""
+        ffs._evaluation_counts.update({"a": 3, "b": 1})
+
+        assert flush_evaluation_counts(mock_db) == 2
+
+        params = mock_db.execute.call_args[0][1]
+        assert sorted(params, key=lambda p: p["flag_key"]) == [
+            {"flag_key": "a", "evaluations": 3},
+            {"flag_key": "b", "evaluations": 1},
+        ]
+        mock_db.commit.assert_called_once()
+        assert ffs._evaluation_counts == {}
+
+    def test_flush_failure_requeues_counts(self, mock_db):
+        """Test that counts survive a failed flush."""
+        ffs._evaluation_counts.update({"a": 3})
+        mock_db.execute.side_effect = Exception("locked")
+
+        assert flush_evaluation_counts(mock_db) == 0
+
+        mock_db.rollback.assert_called_once()
+        assert ffs._evaluation_counts == {"a": 3}
 
 
 # =============================================================================
@@ -884,7 +927,8 @@ class TestIntegrationScenarios:
             "enabled": True,
             "targeting_rules": {"percentage": 25}
         }
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_flag
+        mock_flag.key = "new_feature"
+        mock_db.query.return_value.all.return_value = [mock_flag]
 
         # Test multiple users
         results = {}
@@ -903,7 +947,8 @@ class TestIntegrationScenarios:
             "enabled": True,
             "targeting_rules": {"roles": ["admin"]}
         }
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_flag
+        mock_flag.key = "admin_feature"
+        mock_db.query.return_value.all.return_value = [mock_flag]
 
         # Admin should have access
         assert service.is_enabled("admin_feature", user_id=1, user_role="admin") is True
@@ -920,7 +965,8 @@ class TestIntegrationScenarios:
             "enabled": True,
             "targeting_rules": {"user_ids": [1, 5, 10]}
         }
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_flag
+        mock_flag.key = "beta_feature"
+        mock_db.query.return_value.all.return_value = [mock_flag]
 
         # Beta users should have access
         assert service.is_enabled("beta_feature", user_id=1) is True
@@ -940,7 +986,8 @@ class TestIntegrationScenarios:
             "enabled": True,
             "targeting_rules": None
         }
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_flag
+        mock_flag.key = "payments_enabled"
+        mock_db.query.return_value.all.return_value = [mock_flag]
 
         # Feature is enabled
         assert service.is_enabled("payments_enabled") is True
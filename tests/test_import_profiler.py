@@ -0,0 +1,85 @@
+"""
+Unit tests for Import Profiler
+Tests for parsing -X importtime output and the app boot budget: `import app`
+must stay under STARTUP_BUDGET_SECONDS and must not import the heavy
+libraries listed in DEFERRED_MODULES.
+"""
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.import_profiler import (
+    DEFERRED_MODULES,
+    STARTUP_BUDGET_SECONDS,
+    format_report,
+    loaded_modules,
+    parse_importtime,
+    profile_imports,
+    top_level_costs,
+    total_seconds,
+)
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     json.decoder
+import time:       300 |        420 |   json
+import time:      2000 |       2000 |   anthropic
+import time:      5000 |       7420 | app
+"""
+
+
+# ============== Parser Tests ==============
+
+
+class TestParseImporttime:
+    """Tests for parse_importtime and the report helpers."""
+
+    def test_parses_records_and_depth(self):
+        records = parse_importtime(SAMPLE)
+        assert [(r.name, r.depth) for r in records] == [
+            ("json.decoder", 2),
+            ("json", 1),
+            ("anthropic", 1),
+            ("app", 0),
+        ]
+        assert records[1].self_us == 300
+        assert records[1].cumulative_us == 420
+
+    def test_ignores_other_output(self):
+        assert parse_importtime("Starting...\nimport time: garbage\n") == []
+
+    def test_total_seconds(self):
+        assert total_seconds(parse_importtime(SAMPLE)) == pytest.approx(0.00742)
+
+    def test_top_level_costs_sorted(self):
+        names = [r.name for r in top_level_costs(parse_importtime(SAMPLE))]
+        assert names == ["anthropic", "json"]
+
+    def test_report_flags_deferred_modules(self):
+        report = format_report(parse_importtime(SAMPLE))
+        assert "Deferred modules imported at boot: anthropic" in report
+
+
+# ============== Boot Budget Tests ==============
+
+
+@pytest.fixture(scope="module")
+def app_imports(tmp_path_factory):
+    """Profile `import app` once in a fresh interpreter"""
+    db_path = tmp_path_factory.mktemp("boot") / "boot.sqlite"
+    return profile_imports("app", env={"DATABASE_URL": f"sqlite:///{db_path}"})
+
+
+class TestAppBootBudget:
+    """Startup cost guards for gunicorn worker boot."""
+
+    def test_heavy_modules_are_deferred(self, app_imports):
+        eager = loaded_modules(app_imports) & set(DEFERRED_MODULES)
+        assert not eager, f"imported at boot: {sorted(eager)}"
+
+    def test_boot_within_budget(self, app_imports):
+        seconds = total_seconds(app_imports)
+        assert 0 < seconds <= STARTUP_BUDGET_SECONDS, format_report(app_imports)
@@ -0,0 +1,178 @@
+"""
+Unit tests for Key Rotation Service
+Tests for re-encrypting every encrypted column under the current key,
+resuming from a cursor, and the self-continuing task handler.
+"""
+from unittest.mock import patch
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.fernet import Fernet
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import database
+from services.key_rotation_service import (
+    ENCRYPTED_FIELDS,
+    KeyRotationService,
+    handle_rotate_encryption_keys,
+)
+
+
+@pytest.fixture
+def keys():
+    """New current key with the old one retired; yields (old, new) Fernets."""
+    saved = {k: os.environ.get(k) for k in ("FCRA_ENCRYPTION_KEY", "FCRA_ENCRYPTION_OLD_KEYS")}
+    old_key, new_key = Fernet.generate_key(), Fernet.generate_key()
+    os.environ["FCRA_ENCRYPTION_KEY"] = new_key.decode()
+    os.environ["FCRA_ENCRYPTION_OLD_KEYS"] = old_key.decode()
+    yield Fernet(old_key), Fernet(new_key)
+    for k, v in saved.items():
+        if v is None:
+            os.environ.pop(k, None)
+        else:
+            os.environ[k] = v
+
+
+@pytest.fixture
+def db():
+    """Private in-memory database with every table in ENCRYPTED_FIELDS."""
+    engine = create_engine("sqlite://")
+    tables = {getattr(database, model).__table__ for model, _ in ENCRYPTED_FIELDS}
+    database.Base.metadata.create_all(engine, tables=list(tables))
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def seeded(db, keys):
+    """Rows under the retired key in three of the tables."""
+    old, _ = keys
+    token = lambda text: old.encrypt(text.encode()).decode()  # noqa: E731
+    client = database.Client(
+        name="Rotating Client",
+        credit_monitoring_password_encrypted=token("monitoring"),
+        ssn_encrypted=token("123456789"),
+    )
+    db.add(client)
+    db.flush()
+    db.add(
+        database.CreditMonitoringCredential(
+            client_id=client.id,
+            service_name="IdentityIQ.com",
+            username="user",
+            password_encrypted=token("identityiq"),
+        )
+    )
+    db.add(
+        database.Staff(
+            email="rotate@example.com",
+            password_hash="x",
+            first_name="Key",
+            last_name="Rotation",
+            two_factor_secret=token("JBSWY3DPEHPK3PXP"),
+        )
+    )
+    db.commit()
+    return db
+
+
+def _current_values(db):
+    db.expire_all()
+    client = db.query(database.Client).one()
+    return [
+        client.credit_monitoring_password_encrypted,
+        client.ssn_encrypted,
+        db.query(database.CreditMonitoringCredential).one().password_encrypted,
+        db.query(database.Staff).one().two_factor_secret,
+    ]
+
+
+# ============== Service Tests ==============
+
+
+class TestKeyRotationService:
+    """Tests for KeyRotationService.run."""
+
+    def test_rotates_every_field(self, seeded, keys):
+        _, new = keys
+        result = KeyRotationService(seeded).run()
+
+        assert result["done"] is True
+        assert result["cursor"] is None
+        assert result["rotated"] == 4
+        assert len(result["fields"]) == len(ENCRYPTED_FIELDS)
+        assert [new.decrypt(v.encode()).decode() for v in _current_values(seeded)] == [
+            "monitoring",
+            "123456789",
+            "identityiq",
+            "JBSWY3DPEHPK3PXP",
+        ]
+
+    def test_second_run_is_a_no_op(self, seeded):
+        KeyRotationService(seeded).run()
+        before = _current_values(seeded)
+
+        result = KeyRotationService(seeded).run()
+
+        assert result["rotated"] == 0
+        assert _current_values(seeded) == before
+
+    def test_resumes_from_cursor(self, seeded, keys):
+        _, new = keys
+        first = KeyRotationService(seeded).run(time_budget=1e-9)
+        assert first["done"] is False
+        assert first["cursor"] == {"field": 1, "after_id": 0}
+
+        rest = KeyRotationService(seeded).run(cursor=first["cursor"])
+
+        assert rest["done"] is True
+        assert first["rotated"] + rest["rotated"] == 4
+        for value in _current_values(seeded):
+            new.decrypt(value.encode())
+
+    def test_counts_unreadable_values(self, db, keys):
+        foreign = Fernet(Fernet.generate_key()).encrypt(b"lost").decode()
+        db.add(database.Client(name="Lost Key", ssn_encrypted=foreign))
+        db.commit()
+
+        result = KeyRotationService(db).run()
+
+        assert result["unreadable"] == 1
+        assert result["done"] is True
+
+
+# ============== Task Handler Tests ==============
+
+
+class TestRotateTaskHandler:
+    """Tests for the rotate_encryption_keys task handler."""
+
+    def test_enqueues_continuation_until_done(self):
+        partial = {"done": False, "cursor": {"field": 3, "after_id": 120}}
+        with patch("services.key_rotation_service.KeyRotationService") as service, patch(
+            "services.task_queue_service.TaskQueueService.enqueue_task"
+        ) as enqueue:
+            service.return_value.run.return_value = partial
+            handle_rotate_encryption_keys({"chunk_size": 100})
+
+        enqueue.assert_called_once_with(
+            "rotate_encryption_keys",
+            {"chunk_size": 100, "cursor": {"field": 3, "after_id": 120}},
+        )
+
+    def test_no_continuation_when_done(self):
+        with patch("services.key_rotation_service.KeyRotationService") as service, patch(
+            "services.task_queue_service.TaskQueueService.enqueue_task"
+        ) as enqueue:
+            service.return_value.run.return_value = {"done": True, "cursor": None}
+            handle_rotate_encryption_keys({})
+
+        enqueue.assert_not_called()
@@ -0,0 +1,193 @@
+"""
+Unit tests for the Data-Volume Load Test Profiles
+Tests for the seeded profile generator, the COPY encoding used on PostgreSQL
+and the p95-by-scale report built from locust stats.
+"""
+import csv
+import io
+from dataclasses import replace
+from datetime import datetime
+
+import pytest
+import sys
+import os
+
+from sqlalchemy import create_engine, func, select
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Base
+from load_tests.data_volume import (
+    PROFILES,
+    PORTAL_LOGIN,
+    STAFF_LOGIN,
+    BulkLoader,
+    format_report,
+    main,
+    record_scale,
+    seed_profile,
+)
+
+TINY = replace(PROFILES["10k"], name="tiny", clients=30, staff=3)
+
+STATS_HEADER = [
+    "Type", "Name", "Request Count", "Failure Count", "Median Response Time",
+    "Average Response Time", "50%", "95%", "99%",
+]
+
+
+@pytest.fixture
+def volume_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'volume.sqlite'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _count(engine, table):
+    with engine.connect() as conn:
+        return conn.execute(
+            select(func.count()).select_from(Base.metadata.tables[table])
+        ).scalar()
+
+
+def write_stats(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(STATS_HEADER)
+        writer.writerows(rows)
+    return str(path)
+
+
+# ============== Seeding Tests ==============
+
+
+class TestSeedProfile:
+    """Tests for generating and bulk loading a profile."""
+
+    def test_loads_proportional_rows(self, volume_engine):
+        progress = []
+
+        counts = seed_profile(
+            TINY, engine=volume_engine, chunk_size=12,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+
+        assert progress == [(12, 30), (24, 30), (30, 30)]
+        assert counts["clients"] == _count(volume_engine, "clients") == 30
+        assert counts["staff"] == 3
+        for table in ("dispute_items", "client_messages", "email_logs", "audit_logs"):
+            assert counts[table] == _count(volume_engine, table) > 30
+
+        clients = Base.metadata.tables["clients"]
+        with volume_engine.connect() as conn:
+            login = conn.execute(
+                select(clients.c.status, clients.c.created_at, clients.c.email_opt_in)
+                .where(clients.c.email == PORTAL_LOGIN[0])
+            ).one()
+        assert login.status == "active"
+        assert isinstance(login.created_at, datetime)
+        assert login.email_opt_in is True  # column default filled in
+
+    def test_deterministic_and_appends(self, volume_engine):
+        first = seed_profile(TINY, engine=volume_engine, seed=7)
+        second = seed_profile(TINY, engine=volume_engine, seed=7)
+
+        assert first == second
+        assert _count(volume_engine, "clients") == 60
+        staff = Base.metadata.tables["staff"]
+        with volume_engine.connect() as conn:
+            logins = conn.execute(
+                select(func.count()).where(staff.c.email == STAFF_LOGIN[0])
+            ).scalar()
+        assert logins == 1
+
+
+class TestCopyEncoding:
+    """Tests for the CSV fed to COPY on PostgreSQL."""
+
+    def test_rows_encode_nulls_json_and_dates(self):
+        copied = {}
+
+        class FakeCursor:
+            def copy_expert(self, sql, buffer):
+                copied["sql"] = sql
+                copied["rows"] = list(csv.reader(io.StringIO(buffer.read())))
+
+        class FakeRaw:
+            def cursor(self):
+                return FakeCursor()
+
+            def commit(self):
+                copied["committed"] = True
+
+            def close(self):
+                pass
+
+        class FakeEngine:
+            class dialect:
+                name = "postgresql"
+
+            def raw_connection(self):
+                return FakeRaw()
+
+        loader = BulkLoader(FakeEngine())
+        table = Base.metadata.tables["audit_logs"]
+        loader.load(table, [{
+            "id": 5,
+            "timestamp": datetime(2025, 1, 2, 3, 4, 5),
+            "details": {"a": 1},
+            "user_id": None,
+        }])
+
+        assert copied["sql"] == (
+            "COPY audit_logs (id, timestamp, details, user_id) FROM STDIN WITH (FORMAT csv)"
+        )
+        assert copied["rows"] == [["5", "2025-01-02 03:04:05", '{"a": 1}', ""]]
+        assert copied["committed"]
+        assert loader.counts == {"audit_logs": 1}
+
+
+# ============== Report Tests ==============
+
+
+class TestP95Report:
+    """Tests for the p95-by-scale report."""
+
+    def test_scales_share_one_table(self, tmp_path):
+        small = write_stats(tmp_path / "small.csv", [
+            ["GET", "/dashboard", 100, 0, 80, 90, 80, 150, 300],
+            ["GET", "/api/inbox", 0, 0, 0, 0, "N/A", "N/A", "N/A"],
+            ["", "Aggregated", 100, 0, 80, 90, 80, 150, 300],
+        ])
+        large = write_stats(tmp_path / "large.csv", [
+            ["GET", "/dashboard", 90, 2, 400, 500, 400, 1900, 2500],
+        ])
+
+        report = record_scale({}, PROFILES["100k"], large)
+        record_scale(report, PROFILES["10k"], small)
+
+        endpoints = report["scales"]["10k"]["endpoints"]
+        assert endpoints["GET /dashboard"]["p95_ms"] == 150
+        assert endpoints["GET /api/inbox"]["p95_ms"] is None
+        assert report["scales"]["100k"]["endpoints"]["GET /dashboard"]["failures"] == 2
+
+        lines = format_report(report).splitlines()
+        assert lines[0].split() == ["p95", "(ms)", "10k", "100k"]
+        assert lines[1].split() == ["GET", "/api/inbox", "-", "-"]
+        assert lines[2].split() == ["GET", "/dashboard", "150", "1900"]
+        assert lines[-1].split()[0] == "Aggregated"
+
+    def test_main_merges_output(self, tmp_path, capsys):
+        stats = write_stats(tmp_path / "stats.csv", [
+            ["GET", "/dashboard", 10, 0, 80, 90, 80, 150, 300],
+        ])
+        output = tmp_path / "p95.json"
+
+        for profile in ("10k", "1m"):
+            assert main(["report", "--profile", profile, "--stats", stats,
+                         "--output", str(output)]) == 0
+
+        assert "1m" in capsys.readouterr().out.splitlines()[-2]
+        assert '"10k"' in output.read_text()
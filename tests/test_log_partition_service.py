@@ -0,0 +1,324 @@
+"""
+Unit tests for Log Partition Service
+Tests for monthly partition naming, PostgreSQL partition detection and
+retention, and the batched SQLite rotation fallback.
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import BackgroundTask, SMSLog, get_db
+from services.log_partition_service import (
+    PARTITIONED_LOG_TABLES,
+    LogPartitionService,
+    add_months,
+    get_log_partition_service,
+    handle_log_partition_convert,
+    handle_log_partition_maintenance,
+    month_start,
+    parse_partition_month,
+    partition_name,
+)
+from services.task_queue_service import TASK_HANDLERS
+
+
+def _postgres_session():
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    return session
+
+
+# ============== Helper Tests ==============
+
+
+class TestMonthHelpers:
+    """Tests for month arithmetic and partition naming."""
+
+    def test_month_start(self):
+        assert month_start(datetime(2026, 10, 18, 13, 5)) == datetime(2026, 10, 1)
+
+    def test_add_months_rolls_over_year(self):
+        assert add_months(datetime(2026, 11, 20), 2) == datetime(2027, 1, 1)
+
+    def test_add_months_negative(self):
+        assert add_months(datetime(2026, 1, 5), -1) == datetime(2025, 12, 1)
+
+    def test_partition_name(self):
+        assert partition_name("audit_logs", datetime(2026, 3, 1)) == "audit_logs_p202603"
+
+    def test_parse_partition_month_roundtrip(self):
+        name = partition_name("api_requests", datetime(2025, 7, 1))
+        assert parse_partition_month("api_requests", name) == datetime(2025, 7, 1)
+
+    def test_parse_partition_month_default(self):
+        assert parse_partition_month("audit_logs", "audit_logs_pdefault") is None
+
+    def test_parse_partition_month_other_table(self):
+        assert parse_partition_month("sms_logs", "audit_logs_p202603") is None
+
+
+class TestPolicies:
+    """Tests for the table policy registry."""
+
+    def test_all_log_tables_registered(self):
+        assert set(PARTITIONED_LOG_TABLES) == {
+            "audit_logs",
+            "api_requests",
+            "email_logs",
+            "sms_logs",
+            "ai_usage_logs",
+            "background_tasks",
+        }
+
+    def test_unknown_table_rejected(self):
+        with pytest.raises(ValueError):
+            LogPartitionService().purge_before("clients", datetime.utcnow(), db=MagicMock())
+
+    def test_task_handlers_registered(self):
+        assert TASK_HANDLERS["log_partition_maintenance"] is handle_log_partition_maintenance
+        assert TASK_HANDLERS["log_partition_convert"] is handle_log_partition_convert
+
+    def test_validate_retention(self):
+        service = LogPartitionService()
+        assert service.validate_retention(None) == {}
+        assert service.validate_retention({"sms_logs": 30}) == {"sms_logs": 30}
+        for bad in ({"audit_logs": 30}, {"audit_logs": "365"}, {"sms_logs": True},
+                    {"clients": 365}, [("sms_logs", 30)]):
+            with pytest.raises(ValueError):
+                service.validate_retention(bad)
+
+    def test_singleton(self):
+        assert get_log_partition_service() is get_log_partition_service()
+
+
+# ============== PostgreSQL Partition Tests ==============
+
+
+class TestPartitionDetection:
+    """Tests for is_partitioned and partition listing."""
+
+    def test_sqlite_never_partitioned(self):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "sqlite"
+        assert LogPartitionService().is_partitioned(session, "audit_logs") is False
+        session.execute.assert_not_called()
+
+    def test_postgres_partitioned(self):
+        session = _postgres_session()
+        session.execute.return_value.fetchone.return_value = (1,)
+        assert LogPartitionService().is_partitioned(session, "audit_logs") is True
+
+    def test_list_partitions_sorted_default_last(self):
+        session = _postgres_session()
+        session.execute.return_value.fetchall.return_value = [
+            ("audit_logs_pdefault",),
+            ("audit_logs_p202602",),
+            ("audit_logs_p202512",),
+        ]
+        partitions = LogPartitionService().list_partitions(session, "audit_logs")
+        assert [name for name, _ in partitions] == [
+            "audit_logs_p202512",
+            "audit_logs_p202602",
+            "audit_logs_pdefault",
+        ]
+
+
+class TestDropExpiredPartitions:
+    """Tests for whole-partition retention on PostgreSQL."""
+
+    def test_drops_only_months_fully_before_cutoff(self):
+        service = LogPartitionService()
+        session = _postgres_session()
+        session.query.return_value.filter.return_value.filter.return_value.first.return_value = None
+        session.query.return_value.filter.return_value.count.return_value = 10
+
+        partitions = [
+            ("audit_logs_p202601", datetime(2026, 1, 1)),
+            ("audit_logs_p202602", datetime(2026, 2, 1)),
+            ("audit_logs_pdefault", None),
+        ]
+        with patch.object(service, "list_partitions", return_value=partitions):
+            removed = service._drop_expired_partitions(
+                session, "audit_logs", datetime(2026, 2, 15)
+            )
+
+        assert removed == 10
+        statements = [str(c.args[0]) for c in session.execute.call_args_list]
+        assert any('DROP TABLE "audit_logs_p202601"' in s for s in statements)
+        assert not any("audit_logs_p202602" in s for s in statements)
+        assert not any("audit_logs_pdefault" in s for s in statements)
+
+    def test_keeps_partition_with_unfinished_tasks(self):
+        service = LogPartitionService()
+        session = _postgres_session()
+        session.query.return_value.filter.return_value.filter.return_value.first.return_value = (42,)
+
+        partitions = [("background_tasks_p202601", datetime(2026, 1, 1))]
+        with patch.object(service, "list_partitions", return_value=partitions):
+            removed = service._drop_expired_partitions(
+                session, "background_tasks", datetime(2026, 6, 1)
+            )
+
+        assert removed == 0
+        session.execute.assert_not_called()
+
+    def test_convert_refuses_on_sqlite(self):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "sqlite"
+        result = LogPartitionService().convert_to_partitioned(session, "audit_logs")
+        assert result == {"table": "audit_logs", "converted": False, "reason": "not_postgresql"}
+
+    def test_convert_refuses_tables_with_unique_indexes(self):
+        service = LogPartitionService()
+        session = _postgres_session()
+        with patch.object(service, "is_partitioned", return_value=False), \
+                patch.object(service, "_has_inbound_foreign_keys", return_value=False), \
+                patch.object(service, "_has_unique_indexes", return_value=True):
+            result = service.convert_to_partitioned(session, "background_tasks")
+
+        assert result["reason"] == "has_unique_constraint"
+        session.execute.assert_not_called()
+
+    def test_convert_is_one_transaction(self):
+        service = LogPartitionService()
+        session = _postgres_session()
+        session.execute.return_value.scalar.return_value = datetime(2026, 1, 15)
+
+        def fail_copy(statement, *args):
+            if str(statement).startswith('INSERT INTO "sms_logs"'):
+                raise RuntimeError("copy failed")
+            return session.execute.return_value
+
+        with patch.object(service, "is_partitioned", return_value=False), \
+                patch.object(service, "_has_inbound_foreign_keys", return_value=False), \
+                patch.object(service, "_has_unique_indexes", return_value=False):
+            session.execute.side_effect = fail_copy
+            result = service.convert_to_partitioned(session, "sms_logs", months_ahead=0)
+
+        assert result["converted"] is False
+        session.commit.assert_not_called()
+        session.rollback.assert_called_once()
+        statements = [str(c.args[0]) for c in session.execute.call_args_list]
+        assert any('"sms_logs_p202601" PARTITION OF' in s for s in statements)
+        assert any('"sms_logs_pdefault" PARTITION OF' in s for s in statements)
+
+
+# ============== Maintenance Tests ==============
+
+
+class TestRunMaintenance:
+    """Tests that scheduled maintenance only purges with explicit retention."""
+
+    def test_no_purge_without_retention(self):
+        service = LogPartitionService()
+        with patch.object(service, "purge_before") as purge:
+            result = service.run_maintenance()
+
+        purge.assert_not_called()
+        assert result["tables"]["sms_logs"]["rows_removed"] == 0
+        assert result["tables"]["sms_logs"]["retention_days"] is None
+
+    def test_purges_only_listed_tables(self):
+        service = LogPartitionService()
+        with patch.object(service, "purge_before", return_value=3) as purge:
+            result = service.run_maintenance(retention_days={"api_requests": 90})
+
+        assert [c.args[0] for c in purge.call_args_list] == ["api_requests"]
+        assert result["tables"]["api_requests"]["rows_removed"] == 3
+        assert result["tables"]["email_logs"]["rows_removed"] == 0
+
+
+class TestPartitionRoutes:
+    """Tests for the admin partition endpoints."""
+
+    def test_maintenance_rejects_non_numeric_retention(self, authenticated_client):
+        response = authenticated_client.post(
+            "/api/audit/partitions/maintenance",
+            json={"retention_days": {"audit_logs": "30"}},
+        )
+        assert response.status_code == 400
+
+    def test_maintenance_rejects_short_audit_retention(self, authenticated_client):
+        response = authenticated_client.post(
+            "/api/audit/partitions/maintenance",
+            json={"retention_days": {"audit_logs": 30}},
+        )
+        assert response.status_code == 400
+        assert "90 days" in response.get_json()["error"]
+
+    def test_convert_queues_task(self, authenticated_client):
+        with patch("app.TaskQueueService.enqueue_task") as enqueue:
+            enqueue.return_value.id = 7
+            response = authenticated_client.post(
+                "/api/audit/partitions/convert", json={"table": "audit_logs"}
+            )
+
+        assert response.status_code == 202
+        assert enqueue.call_args.args[:2] == (
+            "log_partition_convert", {"table": "audit_logs", "months_ahead": 2}
+        )
+
+    def test_convert_rejects_unknown_table(self, authenticated_client):
+        response = authenticated_client.post(
+            "/api/audit/partitions/convert", json={"table": "clients"}
+        )
+        assert response.status_code == 400
+
+
+# ============== SQLite Rotation Tests ==============
+
+
+class TestBatchedRotation:
+    """Tests for the batched delete fallback against the SQLite test database."""
+
+    def test_purges_old_sms_logs_in_batches(self):
+        db = get_db()
+        try:
+            old = datetime.utcnow() - timedelta(days=400)
+            for i in range(5):
+                db.add(SMSLog(phone_number="+15550000000", message=f"old-{i}", created_at=old))
+            recent = SMSLog(phone_number="+15550000000", message="recent", created_at=datetime.utcnow())
+            db.add(recent)
+            db.commit()
+            recent_id = recent.id
+
+            service = LogPartitionService(batch_size=2)
+            removed = service.purge_before(
+                "sms_logs", datetime.utcnow() - timedelta(days=365), db=db
+            )
+
+            assert removed >= 5
+            assert db.query(SMSLog).filter(SMSLog.created_at < old + timedelta(days=1)).count() == 0
+            assert db.query(SMSLog).filter(SMSLog.id == recent_id).count() == 1
+        finally:
+            db.query(SMSLog).filter(SMSLog.phone_number == "+15550000000").delete()
+            db.commit()
+            db.close()
+
+    def test_keeps_unfinished_background_tasks(self):
+        db = get_db()
+        try:
+            old = datetime.utcnow() - timedelta(days=90)
+            done = BackgroundTask(
+                task_type="partition_test", status="completed", created_at=old, completed_at=old
+            )
+            pending = BackgroundTask(task_type="partition_test", status="pending", created_at=old)
+            db.add_all([done, pending])
+            db.commit()
+            done_id, pending_id = done.id, pending.id
+
+            LogPartitionService().purge_before(
+                "background_tasks", datetime.utcnow() - timedelta(days=30), db=db
+            )
+
+            assert db.query(BackgroundTask).filter(BackgroundTask.id == done_id).count() == 0
+            assert db.query(BackgroundTask).filter(BackgroundTask.id == pending_id).count() == 1
+        finally:
+            db.query(BackgroundTask).filter(BackgroundTask.task_type == "partition_test").delete()
+            db.commit()
+            db.close()
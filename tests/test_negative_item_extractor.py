@@ -5,8 +5,11 @@ Unit tests for NegativeItemExtractor service.
 import pytest
 from services.negative_item_extractor import (
     NegativeItemExtractor,
+    StatusMatcher,
+    extract_negative_items_batch,
     extract_negative_items_from_report,
 )
+from load_tests.extraction_benchmark import benchmark
 
 
 class TestNegativeItemExtractor:
@@ -588,3 +591,107 @@ class TestEdgeCases:
         items = extractor.extract_all_negative_items()
         assert len(items) == 1
         assert items[0]["creditor_name"] == "Bad Bank"
+
+
+def _book():
+    """A few reports sharing status text, as across a client book."""
+    accounts = [
+        {
+            "creditor": "Good Bank",
+            "status": "Pays as agreed",
+            "balance": "$9,500",
+            "credit_limit": "$10,000",
+            "bureaus": {"transunion": {"present": True, "status": "Current"}},
+        },
+        {
+            "creditor": "Bad Bank",
+            "status": "Charged off",
+            "comments": "Paid collection",
+            "bureaus": {
+                "experian": {"present": True, "status": "Charge off", "number": "4111"},
+                "equifax": {"present": False},
+            },
+        },
+        {
+            "creditor": "Auto Lender",
+            "payment_status": "90 days past due",
+            "payment_history": [
+                {"month": "01/24", "transunion": "OK", "experian": " 30 "},
+                {"month": "02/24", "transunion": "60", "equifax": "RP"},
+            ],
+            "late_payments": {"transunion": {"30": 2, "60": 0}},
+        },
+    ]
+    return [
+        {
+            "client_name": f"Client {i}",
+            "accounts": accounts[i % 3 :] + accounts[: i % 3],
+            "inquiries": [{"company": "Lender", "bureau": "TransUnion"}],
+            "collections": [{"agency": "ABC Collections", "balance": "$300"}],
+            "public_records": [{"type": "Tax Lien", "amount": "1,000"}],
+        }
+        for i in range(4)
+    ]
+
+
+class TestBatchExtraction:
+    """Tests for extracting many reports at once."""
+
+    def test_batch_matches_per_report_extraction(self):
+        """Batch output equals extracting each report separately."""
+        reports = _book()
+        batch = extract_negative_items_batch(reports)
+
+        assert batch == [extract_negative_items_from_report(r) for r in reports]
+        assert [item["source_index"] for item in batch[1][:2]] == [0, 1]
+        assert batch[0][1]["negative_reasons"][-2:] == [
+            "Payment history shows late: 01/24 experian: 30, "
+            "02/24 transunion: 60, 02/24 equifax: RP",
+            "Late payments (transunion): 2x 30",
+        ]
+
+    def test_empty_batch(self):
+        """No reports gives no results."""
+        assert extract_negative_items_batch([]) == []
+        assert extract_negative_items_batch([{}]) == [[]]
+
+    def test_benchmark_reports_identical_output(self):
+        """The benchmark checks batch and per-report output agree."""
+        result = benchmark(_book(), runs=1)
+        assert result["reports"] == 4
+        assert result["accounts"] == 12
+        assert result["identical"] is True
+
+
+class TestStatusMatcher:
+    """Tests for the precompiled status matchers."""
+
+    def test_keywords_in_list_order(self):
+        """All contained keywords are found, including overlapping ones."""
+        matcher = StatusMatcher()
+        assert matcher.keywords("paid charge off - seriously past due") == (
+            "past due",
+            "charge off",
+            "seriously past due",
+            "paid charge off",
+        )
+        assert matcher.keywords("open") == ()
+
+    def test_late_payments_first_match_per_pattern(self):
+        """Each late pattern reports its first match."""
+        matcher = StatusMatcher()
+        assert matcher.late_payments("30 days late, 90 days late") == (
+            "30 day",
+            "90 day",
+            "30 days late",
+        )
+        assert matcher.late_payments("pays as agreed") == ()
+
+    def test_item_type_is_memoized(self):
+        """Repeated classification of the same text is served from the memo."""
+        matcher = StatusMatcher()
+        assert matcher.item_type("status indicates: settled", "settled") == "settled"
+        assert matcher._item_types == {
+            ("status indicates: settled", "settled"): "settled"
+        }
+        assert matcher.item_type("late payment: 60 day", "") == "late_payment"
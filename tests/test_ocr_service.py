@@ -25,6 +25,7 @@ import base64
 import json
 import os
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from unittest.mock import Mock, MagicMock, patch, mock_open
 
@@ -36,6 +37,7 @@ from services.ocr_service import (
     _get_media_type,
     _extract_text_from_pdf,
     _convert_pdf_to_images,
+    _build_pdf_content,
     extract_cra_response_data,
     analyze_collection_letter,
     detect_fcra_violations,
@@ -397,6 +399,52 @@ class TestConvertPdfToImages:
         result = _convert_pdf_to_images('')
         assert result is None
 
+    def test_convert_pdf_to_images_encodes_in_memory(self):
+        """Test pages are PNG-encoded without temp files."""
+        from PIL import Image
+
+        pages = [Image.new('RGB', (4, 4), color) for color in ('white', 'black')]
+        fake_pdf2image = MagicMock()
+        mock_convert = fake_pdf2image.convert_from_path
+        mock_convert.return_value = pages
+        with patch.dict('sys.modules', {'pdf2image': fake_pdf2image}):
+            with patch('tempfile.NamedTemporaryFile') as mock_tmp:
+                result = _convert_pdf_to_images('/path/to/doc.pdf')
+
+        assert len(result) == 2
+        assert base64.b64decode(result[0]).startswith(b'\x89PNG')
+        assert mock_convert.call_args.kwargs['last_page'] == ocr_service.OCR_PDF_MAX_PAGES
+        assert mock_convert.call_args.kwargs['thread_count'] >= 1
+        mock_tmp.assert_not_called()
+
+
+class TestBuildPdfContent:
+    """Tests for building PDF message content."""
+
+    def test_prefers_rendered_pages(self):
+        """Test rendered pages are used when available."""
+        with patch('services.ocr_service._convert_pdf_to_images', return_value=['a', 'b']):
+            with patch('services.ocr_service._extract_text_from_pdf', return_value='text') as extract:
+                content = _build_pdf_content('/doc.pdf', 'Label')
+
+        assert [block['type'] for block in content] == ['image', 'image']
+        assert content[1]['source']['data'] == 'b'
+        extract.assert_not_called()
+
+    def test_falls_back_to_text(self):
+        """Test extracted text is used when pages cannot be rendered."""
+        with patch('services.ocr_service._convert_pdf_to_images', return_value=None):
+            with patch('services.ocr_service._extract_text_from_pdf', return_value='hello'):
+                content = _build_pdf_content('/doc.pdf', 'Label')
+
+        assert content == [{'type': 'text', 'text': 'Label:\n\nhello'}]
+
+    def test_returns_none_when_nothing_extracted(self):
+        """Test None is returned when neither path yields content."""
+        with patch('services.ocr_service._convert_pdf_to_images', return_value=None):
+            with patch('services.ocr_service._extract_text_from_pdf', return_value=None):
+                assert _build_pdf_content('/doc.pdf', 'Label') is None
+
 
 # =============================================================================
 # Test Class: extract_cra_response_data
@@ -922,6 +970,67 @@ class TestBatchProcessUploads:
 
             mock_process.assert_called_with(1, 'collection_letter')
 
+    def test_batch_process_preserves_order(self):
+        """Test results follow upload_ids order under concurrency."""
+        import time
+
+        def fake_process(upload_id, category):
+            time.sleep(0.05 if upload_id == 1 else 0)
+            return {'success': True, 'upload_id': upload_id}
+
+        with patch('services.ocr_service.process_upload_for_ocr', side_effect=fake_process):
+            result = batch_process_uploads([1, 2, 3], max_concurrency=3)
+
+        assert [r['upload_id'] for r in result['results']] == [1, 2, 3]
+
+    def test_batch_process_runs_concurrently(self):
+        """Test a batch takes about as long as its slowest upload."""
+        import threading
+        import time
+
+        active = {'now': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        def fake_process(upload_id, category):
+            with lock:
+                active['now'] += 1
+                active['peak'] = max(active['peak'], active['now'])
+            time.sleep(0.05)
+            with lock:
+                active['now'] -= 1
+            return {'success': True, 'upload_id': upload_id}
+
+        with patch('services.ocr_service.process_upload_for_ocr', side_effect=fake_process):
+            result = batch_process_uploads(list(range(8)), max_concurrency=4)
+
+        assert result['successful'] == 8
+        assert active['peak'] == 4
+
+    def test_batch_concurrency_is_capped(self):
+        """Test caller-supplied concurrency cannot exceed OCR_MAX_BATCH_CONCURRENCY."""
+        with patch('services.ocr_service.OCR_MAX_BATCH_CONCURRENCY', 2), \
+                patch('services.ocr_service.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as pool, \
+                patch('services.ocr_service.process_upload_for_ocr',
+                      side_effect=lambda upload_id, category: {'success': True}):
+            result = batch_process_uploads(list(range(6)), max_concurrency=10000)
+
+        assert result['successful'] == 6
+        assert pool.call_args.kwargs['max_workers'] == 2
+
+    def test_batch_process_isolates_exceptions(self):
+        """Test one failing upload does not abort the batch."""
+        def fake_process(upload_id, category):
+            if upload_id == 2:
+                raise RuntimeError('boom')
+            return {'success': True, 'upload_id': upload_id}
+
+        with patch('services.ocr_service.process_upload_for_ocr', side_effect=fake_process):
+            result = batch_process_uploads([1, 2, 3], max_concurrency=2)
+
+        assert result['successful'] == 2
+        assert result['failed'] == 1
+        assert result['results'][1] == {'success': False, 'error': 'boom', 'upload_id': 2}
+
 
 # =============================================================================
 # Test Class: _calculate_match_score
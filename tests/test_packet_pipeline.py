@@ -0,0 +1,209 @@
+"""
+Unit tests for Packet Pipeline
+Tests for the content-hash component cache, reference-based PDF merging,
+bureau packet assembly in the packet worker pool and whole-round generation.
+"""
+import io
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pypdf import PdfReader
+
+from services.envelope_packet_service import EnvelopePacketService, build_round_packets
+from services.packet_pipeline import (
+    ComponentCache,
+    component_cache,
+    content_key,
+    merge_pdfs,
+    shutdown_packet_pool,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    component_cache.clear()
+    yield
+    component_cache.clear()
+
+
+@pytest.fixture(scope="module")
+def service():
+    return EnvelopePacketService()
+
+
+@pytest.fixture
+def packet_pool():
+    with patch("services.packet_pipeline.PACKET_WORKERS", 2):
+        yield
+    shutdown_packet_pool()
+
+
+def _round_job(client_id):
+    return {
+        "client_id": client_id,
+        "client_name": f"Client {client_id}",
+        "accounts_by_bureau": {"Experian": [{"creditor": "Bank"}], "Equifax": []},
+        "letters_by_bureau": {"Experian": "<p>Letter</p>", "Equifax": "<p>Letter</p>"},
+    }
+
+
+# ============== Component Cache Tests ==============
+
+
+class TestComponentCache:
+    """Tests for content_key and ComponentCache."""
+
+    def test_content_key_depends_on_every_part(self):
+        assert content_key("html", "a", ["x"]) == content_key("html", "a", ["x"])
+        assert content_key("html", "a", ["x"]) != content_key("html", "a", ["y"])
+        assert content_key("html", "ab") != content_key("html", "a", "b")
+
+    def test_concurrent_requests_render_once(self):
+        cache = ComponentCache()
+        calls = []
+
+        def render():
+            calls.append(1)
+            time.sleep(0.05)
+            return b"pdf"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_render("k", render)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == [b"pdf"] * 5
+        assert len(calls) == 1
+        assert cache.get_stats()["hit_count"] == 4
+
+    def test_failed_render_releases_key_lock(self):
+        cache = ComponentCache()
+
+        def fail():
+            raise ValueError("render failed")
+
+        with pytest.raises(ValueError):
+            cache.get_or_render("k", fail)
+
+        assert cache._key_locks == {}
+        assert cache.get_or_render("k", lambda: b"pdf") == b"pdf"
+
+    def test_evicts_oldest(self):
+        cache = ComponentCache(max_entries=1)
+        cache.get_or_render("a", lambda: b"a")
+        cache.get_or_render("b", lambda: b"b")
+        assert cache.get_or_render("a", lambda: b"new") == b"new"
+
+
+# ============== Merge Tests ==============
+
+
+class TestMergePdfs:
+    """Tests for merge_pdfs."""
+
+    def test_merges_in_order_and_counts_pages(self, service):
+        first = service.create_placeholder_page("FIRST", [])
+        second = service.create_placeholder_page("SECOND", [])
+
+        merged, page_count = merge_pdfs([first, second, first])
+
+        reader = PdfReader(io.BytesIO(merged))
+        assert page_count == len(reader.pages) == 3
+        assert "FIRST" in reader.pages[0].extract_text()
+        assert "SECOND" in reader.pages[1].extract_text()
+
+
+# ============== Packet Assembly Tests ==============
+
+
+class TestBureauPackets:
+    """Tests for EnvelopePacketService packet assembly with the pipeline."""
+
+    def test_shared_pages_rendered_once_across_bureaus(self, service):
+        client = SimpleNamespace(id=1, name="Test Client")
+        with patch.object(
+            service, "create_placeholder_page", wraps=service.create_placeholder_page
+        ) as placeholder, patch.object(
+            service, "_html_to_pdf", wraps=service._html_to_pdf
+        ) as html_to_pdf:
+            packets = service.create_all_bureau_packets(
+                client=client,
+                accounts_by_bureau={b: [{"creditor": "Bank"}] for b in ("Experian", "Equifax", "TransUnion")},
+                letters_by_bureau={b: f"<p>{b} letter</p>" for b in ("Experian", "Equifax", "TransUnion")},
+                ftc_report_content="<p>FTC report</p>",
+                police_report_content="<p>Police report</p>",
+            )
+
+        assert list(packets) == ["Experian", "Equifax", "TransUnion"]
+        # ID + address placeholders once each, not once per bureau
+        assert placeholder.call_count == 2
+        # Three letters plus one FTC and one police report
+        assert html_to_pdf.call_count == 5
+        for pdf_bytes, metadata in packets.values():
+            assert metadata["page_count"] == len(PdfReader(io.BytesIO(pdf_bytes)).pages)
+            assert metadata["page_count"] >= 6
+        # Client reports are not kept in the process-wide cache
+        assert component_cache.get_stats()["components"] == 2
+
+    def test_bureaus_built_in_process_pool(self, service, packet_pool):
+        client = SimpleNamespace(id=7, name="Pool Client")
+        packets = service.create_all_bureau_packets(
+            client=client,
+            accounts_by_bureau={b: [{"creditor": "Bank"}] for b in ("Experian", "TransUnion")},
+            letters_by_bureau={b: f"<p>{b} letter</p>" for b in ("Experian", "TransUnion")},
+            ftc_report_content="<p>FTC report</p>",
+        )
+
+        assert list(packets) == ["Experian", "TransUnion"]
+        pdf_bytes, metadata = packets["TransUnion"]
+        assert metadata["client_name"] == "Pool Client"
+        assert "FTC Identity Theft Report" in metadata["documents_included"]
+        assert metadata["page_count"] == len(PdfReader(io.BytesIO(pdf_bytes)).pages)
+
+    def test_count_pages(self, service):
+        pdf = service.create_placeholder_page("ONE", [])
+        assert service._count_pages(pdf) == 1
+
+
+# ============== Round Generation Tests ==============
+
+
+class TestBuildRoundPackets:
+    """Tests for build_round_packets."""
+
+    def test_inline(self):
+        results = build_round_packets([_round_job(1), _round_job(2)])
+
+        assert [r["client_id"] for r in results] == [1, 2]
+        assert all(r["success"] for r in results)
+        assert list(results[0]["packets"]) == ["Experian"]
+
+    def test_process_pool(self, packet_pool):
+        results = build_round_packets([_round_job(1), _round_job(2)])
+
+        assert [r["client_id"] for r in results] == [1, 2]
+        pdf_bytes, metadata = results[1]["packets"]["Experian"]
+        assert metadata["client_name"] == "Client 2"
+        assert pdf_bytes.startswith(b"%PDF")
+
+    def test_failure_is_reported_per_client(self):
+        job = _round_job(3)
+        del job["letters_by_bureau"]
+
+        results = build_round_packets([job])
+
+        assert results[0]["success"] is False
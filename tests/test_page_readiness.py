@@ -0,0 +1,208 @@
+"""
+Unit tests for Page Readiness and the Replay Harness
+Tests for per-service timeouts, step timing telemetry, bounded readiness
+waits on a page, and serving recorded pages from the local replay server.
+"""
+import asyncio
+import json
+import urllib.error
+import urllib.request
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.credit_import_automation import SERVICE_CONFIGS, CreditImportAutomation
+from services.page_readiness import (
+    DEFAULT_TIMEOUTS_MS,
+    PageReadiness,
+    StepTimings,
+    resolve_timeouts,
+)
+from load_tests.page_replay import ReplayServer, median_timings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def recording(tmp_path):
+    (tmp_path / "login.html").write_text("<html><input type='email'></html>")
+    (tmp_path / "report.json").write_text(json.dumps({"accounts": []}))
+    manifest = {
+        "service": "MyScoreIQ.com",
+        "entries": [
+            {"url": "https://member.myscoreiq.com/", "file": "login.html"},
+            {
+                "url": "https://member.myscoreiq.com/",
+                "method": "POST",
+                "status": 302,
+                "headers": {"Location": "https://member.myscoreiq.com/dashboard"},
+            },
+            {
+                "url": "https://member.myscoreiq.com/api/report",
+                "file": "report.json",
+                "content_type": "application/json",
+                "delay_ms": 50,
+            },
+        ],
+    }
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+    return str(tmp_path)
+
+
+# ============== Timeout Tests ==============
+
+
+class TestResolveTimeouts:
+    """Tests for per-service timeout resolution."""
+
+    def test_defaults_without_config(self):
+        assert resolve_timeouts(None) == DEFAULT_TIMEOUTS_MS
+
+    def test_service_overrides_single_keys(self):
+        timeouts = resolve_timeouts(SERVICE_CONFIGS["MyFreeScoreNow.com"])
+
+        assert timeouts["report_render"] == 60000
+        assert timeouts["scores"] == 20000
+        assert timeouts["login_form"] == DEFAULT_TIMEOUTS_MS["login_form"]
+
+
+# ============== Timing Tests ==============
+
+
+class TestStepTimings:
+    """Tests for StepTimings."""
+
+    def test_steps_are_summed_and_failures_counted(self):
+        clock = FakeClock()
+        timings = StepTimings(clock=clock)
+
+        with timings.step("login"):
+            clock.now += 1.5
+        with pytest.raises(RuntimeError):
+            with timings.step("download_report"):
+                clock.now += 0.25
+                raise RuntimeError("boom")
+        timings.record("wait:dom_quiet", 0.1)
+        timings.record("wait:dom_quiet", 0.2, ok=False)
+
+        result = timings.as_dict()
+        assert result["steps"] == {
+            "login": 1500,
+            "download_report": 250,
+            "wait:dom_quiet": 300,
+        }
+        assert result["timeouts"] == {"download_report": 1, "wait:dom_quiet": 1}
+
+
+# ============== Readiness Tests ==============
+
+
+class TestPageReadiness:
+    """Tests for bounded waits against a page."""
+
+    def test_wait_uses_named_timeout_and_records(self):
+        page = MagicMock()
+        page.wait_for_function = AsyncMock()
+        readiness = PageReadiness(page, {"report_render": 1234})
+
+        ok = asyncio.run(readiness.function("() => true", "report_render"))
+
+        assert ok is True
+        assert page.wait_for_function.call_args.kwargs["timeout"] == 1234
+        assert "wait:report_render" in readiness.timings.as_dict()["steps"]
+
+    def test_timeout_returns_false_instead_of_raising(self):
+        page = MagicMock()
+        page.wait_for_selector = AsyncMock(side_effect=TimeoutError("timed out"))
+        readiness = PageReadiness(page)
+
+        ok = asyncio.run(readiness.selector("#missing", "section"))
+
+        assert ok is False
+        assert readiness.timings.as_dict()["timeouts"] == {"wait:section": 1}
+
+    def test_settled_waits_for_navigation_then_idle(self):
+        page = MagicMock()
+        page.wait_for_url = AsyncMock()
+        page.wait_for_load_state = AsyncMock()
+        readiness = PageReadiness(page)
+
+        asyncio.run(readiness.settled(previous_url="https://site/login"))
+
+        predicate = page.wait_for_url.call_args.args[0]
+        assert predicate("https://site/login") is False
+        assert predicate("https://site/dashboard") is True
+        page.wait_for_load_state.assert_awaited_once_with(
+            "networkidle", timeout=DEFAULT_TIMEOUTS_MS["network_idle"]
+        )
+
+    def test_import_report_returns_timings(self):
+        automation = CreditImportAutomation()
+        automation._init_browser = AsyncMock(return_value=True)
+        automation._login = AsyncMock(return_value=False)
+        automation._close_browser = AsyncMock()
+
+        result = asyncio.run(
+            automation.import_report("MyScoreIQ.com", "user", "pw", "1234", 1, "Test")
+        )
+
+        assert set(result["timings"]["steps"]) == {"browser_init", "login"}
+
+
+# ============== Replay Harness Tests ==============
+
+
+class TestReplayServer:
+    """Tests for serving a recording from the local replay server."""
+
+    def test_serves_recorded_entries(self, recording):
+        with ReplayServer(recording) as server:
+            url = server.local_url("https://member.myscoreiq.com/api/report?ts=1")
+            with urllib.request.urlopen(url) as response:
+                assert response.headers["Content-Type"] == "application/json"
+                assert json.loads(response.read()) == {"accounts": []}
+
+            assert server.has("https://member.myscoreiq.com/")
+            assert not server.has("https://member.myscoreiq.com/other")
+            assert server.hits == ["GET member.myscoreiq.com/api/report?ts=1"]
+
+    def test_unrecorded_request_is_404(self, recording):
+        with ReplayServer(recording) as server:
+            with pytest.raises(urllib.error.HTTPError) as exc:
+                urllib.request.urlopen(server.local_url("https://example.com/"))
+            assert exc.value.code == 404
+
+    def test_recorded_redirect(self, recording):
+        class NoRedirect(urllib.request.HTTPRedirectHandler):
+            def redirect_request(self, *args, **kwargs):
+                return None
+
+        with ReplayServer(recording) as server:
+            opener = urllib.request.build_opener(NoRedirect)
+            request = urllib.request.Request(
+                server.local_url("https://member.myscoreiq.com/"), data=b"user=x"
+            )
+            with pytest.raises(urllib.error.HTTPError) as exc:
+                opener.open(request)
+            assert exc.value.code == 302
+            assert exc.value.headers["Location"].endswith("/dashboard")
+
+    def test_median_timings(self):
+        runs = [
+            {"steps": {"login": 100, "download_report": 900}},
+            {"steps": {"login": 300, "download_report": 1100}},
+            {"steps": {"login": 200}},
+        ]
+
+        assert median_timings(runs) == {"login": 200, "download_report": 1000}
@@ -12,9 +12,13 @@ Tests cover:
 - extract_public_records() - Public record extraction
 - parse_credit_report_pdf() - Full PDF parsing workflow
 - get_parsed_text_for_analysis() - Text formatting for analysis
+- scan_report_text() - Single-pass bureau/date/account marker classification
+- Single-open, per-page pdfplumber extraction
 - Edge cases and error handling
 """
 
+import re
+
 import pytest
 import sys
 import os
@@ -41,6 +45,7 @@ from services.pdf_parser_service import (
     _extract_text_pypdf,
     _detect_account_type,
     _month_to_num,
+    scan_report_text,
     BUREAU_PATTERNS,
     DATE_PATTERNS,
     ACCOUNT_STATUS_MAP,
@@ -1348,3 +1353,142 @@ class TestIntegration:
         """Test that date patterns cover common formats."""
         # Should have at least 4 patterns
         assert len(DATE_PATTERNS) >= 4
+
+
+# =============================================================================
+# Test Class: scan_report_text()
+# =============================================================================
+
+def _legacy_bureau_scores(text):
+    """Per-pattern findall counts, as detect_bureau used to compute them."""
+    text_lower = text.lower()
+    return {
+        bureau: sum(len(re.findall(pattern, text_lower)) for pattern in patterns)
+        for bureau, patterns in BUREAU_PATTERNS.items()
+    }
+
+
+class TestScanReportText:
+    """Tests for the combined single-pass matcher."""
+
+    SAMPLE = (
+        "TransUnion LLC consumer report - visit transunion.com\n"
+        "Trans Union disclosure, see also Experian Information Solutions\n"
+        "and experian.com. Equifax Inc.\n"
+        "REVOLVING ACCOUNTS\nCreditor Name: CHASE BANK opened 06/15/2020\n"
+        "INSTALLMENT ACCOUNT\nLender: Ally reported Jan 5, 2024 and 2023-11-02\n"
+    )
+
+    def test_bureau_scores_match_per_pattern_counts(self):
+        scan = scan_report_text(self.SAMPLE)
+        assert scan.bureau_scores == _legacy_bureau_scores(self.SAMPLE)
+        assert scan.bureau == "TransUnion"
+
+    def test_dates_and_account_markers(self):
+        scan = scan_report_text(self.SAMPLE)
+        assert scan.dates == ["06/15/2020", "Jan 5, 2024", "2023-11-02"]
+        assert scan.normalized_dates() == ["2020-06-15", "2024-01-05", "2023-11-02"]
+        assert scan.account_markers == 4
+
+    def test_feed_accumulates_pages(self):
+        scan = scan_report_text("Experian page one")
+        scan.feed("")
+        scan.feed("experian.com page two")
+        assert scan.pages == 2
+        assert scan.bureau_scores["Experian"] == 3
+
+    def test_empty_text(self):
+        scan = scan_report_text("")
+        assert scan.bureau == "Unknown"
+        assert scan.dates == []
+
+    def test_parse_result_includes_scan_counts(self):
+        with patch("services.pdf_parser_service.extract_text_from_pdf") as mock_extract:
+            mock_extract.return_value = (self.SAMPLE + "A" * 200, None)
+            result = parse_credit_report_pdf("/test.pdf")
+
+        assert result["bureau"] == "TransUnion"
+        assert result["dates_found"] == 3
+        assert result["account_markers"] == 4
+
+
+# =============================================================================
+# Test Class: per-page pdfplumber extraction
+# =============================================================================
+
+def _write_pdf(path, pages, table_on_page=None):
+    """PDF with one page per entry in `pages` (None = blank page)."""
+    from reportlab.pdfgen import canvas
+
+    pdf = canvas.Canvas(str(path))
+    for index, lines in enumerate(pages):
+        for offset, line in enumerate(lines or []):
+            pdf.drawString(72, 720 - offset * 16, line)
+        if index == table_on_page:
+            for y in (500, 520, 540):
+                pdf.line(72, y, 372, y)
+            for x in (72, 222, 372):
+                pdf.line(x, 500, x, 540)
+            pdf.drawString(80, 525, "Balance")
+            pdf.drawString(230, 525, "$500")
+            pdf.drawString(80, 505, "Status")
+            pdf.drawString(230, 505, "Open")
+        pdf.showPage()
+    pdf.save()
+
+
+class TestExtractTextPerPage:
+    """Tests for single-open, per-page extraction."""
+
+    REPORT_LINES = [f"Experian account line {i} with enough text to count" for i in range(5)]
+
+    def test_extracts_every_page_and_tables(self, tmp_path):
+        path = tmp_path / "report.pdf"
+        _write_pdf(path, [self.REPORT_LINES, self.REPORT_LINES], table_on_page=1)
+
+        text, error = extract_text_from_pdf(str(path))
+
+        assert error is None
+        assert text.count("Experian account line 0") == 2
+        assert "Balance | $500" in text
+
+    def test_table_detection_skipped_on_pages_without_lines(self, tmp_path):
+        import pdfplumber.page
+
+        path = tmp_path / "report.pdf"
+        _write_pdf(path, [self.REPORT_LINES] * 3, table_on_page=2)
+
+        with patch.object(
+            pdfplumber.page.Page, "extract_tables", autospec=True, return_value=[]
+        ) as extract_tables:
+            _extract_text_pdfplumber(str(path))
+
+        assert extract_tables.call_count == 1
+        assert extract_tables.call_args[0][0].page_number == 3
+
+    def test_blank_page_falls_back_to_pypdf(self, tmp_path):
+        path = tmp_path / "report.pdf"
+        _write_pdf(path, [self.REPORT_LINES, None])
+
+        with patch(
+            "services.pdf_parser_service._extract_page_text_pypdf", return_value="recovered"
+        ) as fallback:
+            text = _extract_text_pdfplumber(str(path))
+
+        fallback.assert_called_once()
+        assert fallback.call_args[0][1] == 1
+        assert text.endswith("recovered")
+
+    def test_image_only_pdf_is_not_reparsed(self, tmp_path):
+        path = tmp_path / "scan.pdf"
+        _write_pdf(path, [None, None])
+
+        with patch("services.pdf_parser_service._extract_text_pypdf2") as pypdf2, patch(
+            "services.pdf_parser_service._extract_text_pypdf"
+        ) as pypdf:
+            text, error = extract_text_from_pdf(str(path))
+
+        assert text is None
+        assert "image-based PDF" in error
+        pypdf2.assert_not_called()
+        pypdf.assert_not_called()
@@ -0,0 +1,170 @@
+"""
+Unit tests for PDF Render Service
+Tests for rendering HTML to PDF through the warm worker pool: atomic writes,
+per-document timeouts, batch ordering, the task handler and the per-thread
+print stylesheet.
+"""
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services.document_generators as document_generators
+from services.pdf_render_service import (
+    PDFRenderService,
+    RenderJob,
+    handle_render_pdf_batch,
+    render_pdfs,
+)
+
+
+def _fake_html_to_pdf(html, output_path, base_url=None, print_css=True):
+    if "fail" in html:
+        raise ValueError("bad markup")
+    if "slow" in html:
+        time.sleep(2)
+    with open(output_path, "wb") as f:
+        f.write(b"%PDF-1.7 " + html.encode())
+    return output_path
+
+
+@pytest.fixture
+def fake_renderer():
+    with patch.object(document_generators, "html_to_pdf", side_effect=_fake_html_to_pdf) as fake:
+        yield fake
+
+
+# ============== Inline Rendering Tests ==============
+
+
+class TestInlineRendering:
+    """Tests with PDF_RENDER_WORKERS=0 (render in the calling process)."""
+
+    def test_render_writes_file_atomically(self, tmp_path, fake_renderer):
+        target = tmp_path / "report.pdf"
+        service = PDFRenderService(max_workers=0)
+
+        assert service.render("<p>hi</p>", str(target)) == str(target)
+        assert target.read_bytes() == b"%PDF-1.7 <p>hi</p>"
+        assert os.listdir(tmp_path) == ["report.pdf"]
+        # Rendered to a temp file, then renamed into place
+        assert fake_renderer.call_args[0][1] != str(target)
+
+    def test_print_css_flag_is_passed_through(self, tmp_path, fake_renderer):
+        PDFRenderService(max_workers=0).render(
+            "<p>invoice</p>", str(tmp_path / "inv.pdf"), print_css=False
+        )
+        assert fake_renderer.call_args[1]["print_css"] is False
+
+    def test_batch_results_in_job_order(self, tmp_path, fake_renderer):
+        jobs = [
+            RenderJob("<p>a</p>", str(tmp_path / "a.pdf")),
+            RenderJob("fail", str(tmp_path / "b.pdf")),
+            RenderJob("<p>c</p>", str(tmp_path / "c.pdf")),
+        ]
+        service = PDFRenderService(max_workers=0)
+
+        results = service.render_batch(jobs)
+
+        assert [r["success"] for r in results] == [True, False, True]
+        assert results[1]["error"] == "bad markup"
+        assert not (tmp_path / "b.pdf").exists()
+        assert service.get_stats()["rendered"] == 2
+        assert service.get_stats()["failed"] == 1
+
+    def test_render_raises_on_failure(self, tmp_path, fake_renderer):
+        with pytest.raises(RuntimeError, match="bad markup"):
+            PDFRenderService(max_workers=0).render("fail", str(tmp_path / "x.pdf"))
+
+    def test_timeout_interrupts_render(self, tmp_path, fake_renderer):
+        started = time.monotonic()
+        results = PDFRenderService(max_workers=0).render_batch(
+            [RenderJob("slow", str(tmp_path / "slow.pdf"))], timeout=0.2
+        )
+
+        assert time.monotonic() - started < 1.5
+        assert "timed out" in results[0]["error"]
+        assert os.listdir(tmp_path) == []
+
+    def test_render_pdfs_raises_with_every_failure(self, tmp_path, fake_renderer):
+        with patch(
+            "services.pdf_render_service.get_pdf_render_service",
+            return_value=PDFRenderService(max_workers=0),
+        ):
+            with pytest.raises(RuntimeError, match="a.pdf.*bad markup"):
+                render_pdfs([RenderJob("fail", str(tmp_path / "a.pdf"))])
+
+
+# ============== Process Pool Tests ==============
+
+
+class TestProcessPool:
+    """Tests for the spawned worker pool."""
+
+    def test_default_pool_is_small(self):
+        from services.pdf_render_service import _default_workers
+
+        with patch.dict(os.environ, {"TESTING": "false"}), \
+                patch("services.pdf_render_service.os.cpu_count", return_value=32):
+            assert _default_workers() == 2
+
+    def test_pool_returns_result_per_job(self, tmp_path):
+        service = PDFRenderService(max_workers=2, timeout=60)
+        jobs = [RenderJob("<p>x</p>", str(tmp_path / f"{i}.pdf")) for i in range(3)]
+        try:
+            results = service.render_batch(jobs)
+        finally:
+            service.shutdown()
+
+        assert [r["output_path"] for r in results] == [j.output_path for j in jobs]
+        if document_generators.WEASYPRINT_AVAILABLE:
+            assert all(r["success"] for r in results)
+        else:
+            assert all("WeasyPrint is not installed" in r["error"] for r in results)
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+# ============== Task Handler Tests ==============
+
+
+class TestRenderTaskHandler:
+    """Tests for the render_pdf_batch task handler."""
+
+    def test_renders_payload_jobs(self, tmp_path, fake_renderer):
+        with patch(
+            "services.pdf_render_service.get_pdf_render_service",
+            return_value=PDFRenderService(max_workers=0),
+        ):
+            result = handle_render_pdf_batch(
+                {"jobs": [{"html": "<p>a</p>", "output_path": str(tmp_path / "a.pdf")}]}
+            )
+
+        assert result["success"] is True
+        assert result["rendered"] == 1
+
+
+# ============== Stylesheet Tests ==============
+
+
+class TestPrintStylesheet:
+    """Tests for the per-thread FontConfiguration and print CSS."""
+
+    @patch("services.document_generators.HTML", MagicMock())
+    @patch("services.document_generators.CSS")
+    @patch("services.document_generators.FontConfiguration")
+    def test_built_once_per_thread(self, mock_font_config, mock_css):
+        document_generators._stylesheets.value = None
+        try:
+            first = document_generators._print_stylesheet()
+            second = document_generators._print_stylesheet()
+        finally:
+            document_generators._stylesheets.value = None
+
+        assert first is second
+        mock_font_config.assert_called_once()
+        mock_css.assert_called_once()
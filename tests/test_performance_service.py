@@ -6,6 +6,7 @@ Tests cover:
 - Cache TTL expiration
 - Cache statistics tracking
 - PerformanceService request recording
+- LatencyHistogram percentiles, merging and serialization
 - Performance metrics calculation
 - Slow endpoint detection
 - Performance summary generation
@@ -25,6 +26,7 @@ import pytest
 
 from services.performance_service import (
     InMemoryCache,
+    LatencyHistogram,
     PerformanceService,
     app_cache,
     cached,
@@ -33,6 +35,8 @@ from services.performance_service import (
     invalidate_cache,
     _request_metrics,
     _metrics_lock,
+    _persisted_windows,
+    _METRICS_WINDOW_SECONDS,
 )
 
 
@@ -57,6 +61,7 @@ def performance_service():
     # Clear metrics after test
     with _metrics_lock:
         _request_metrics.clear()
+        _persisted_windows.clear()
 
 
 @pytest.fixture
@@ -969,3 +974,231 @@ class TestPerformanceServiceIndexRecommendations:
         # Should return recommendations for common patterns
         assert len(recommendations) > 0
         assert all("sql" in r for r in recommendations)
+
+
+# ============================================================================
+# LatencyHistogram Tests
+# ============================================================================
+
+class TestLatencyHistogram:
+    """Tests for the mergeable latency sketch"""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Test quantiles stay within 1% of the exact value"""
+        hist = LatencyHistogram()
+        values = [float(i) for i in range(1, 10001)]
+        for v in values:
+            hist.add(v)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert abs(hist.quantile(q) - exact) <= exact * 0.011
+
+    def test_memory_is_bounded_by_range_not_count(self):
+        """Test bucket array does not grow with repeated observations"""
+        hist = LatencyHistogram()
+        for _ in range(50000):
+            hist.add(42.0)
+        assert hist.count == 50000
+        assert len(hist.counts) == 1
+
+    def test_zero_and_negative_durations(self):
+        """Test non-positive durations are counted without a log bucket"""
+        hist = LatencyHistogram()
+        hist.add(0.0)
+        hist.add(10.0)
+        assert hist.count == 2
+        assert hist.zero_count == 1
+        assert hist.quantile(0) == 0
+
+    def test_merge_equals_combined_stream(self):
+        """Test merging two histograms matches recording everything in one"""
+        a, b, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i in range(1, 500):
+            a.add(float(i), is_error=i % 10 == 0)
+            combined.add(float(i), is_error=i % 10 == 0)
+        for i in range(2000, 2500):
+            b.add(float(i), cache_hit=True)
+            combined.add(float(i), cache_hit=True)
+
+        a.merge(b)
+
+        assert a.count == combined.count
+        assert a.error_count == combined.error_count
+        assert a.cache_hit_count == combined.cache_hit_count
+        assert a.min == combined.min and a.max == combined.max
+        assert a.quantile(0.95) == combined.quantile(0.95)
+
+    def test_serialization_roundtrip(self):
+        """Test to_dict/from_dict preserves the distribution"""
+        hist = LatencyHistogram()
+        for i in range(1, 101):
+            hist.add(float(i), timestamp=1000.0 + i)
+
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(hist.to_dict())))
+
+        assert restored.count == 100
+        assert restored.last_timestamp == 1100.0
+        assert restored.quantile(0.5) == hist.quantile(0.5)
+
+    def test_empty_histogram_serializes(self):
+        """Test empty histogram round-trips without infinities"""
+        data = LatencyHistogram().to_dict()
+        assert data["min"] is None
+        assert LatencyHistogram.from_dict(json.loads(json.dumps(data))).count == 0
+
+
+class TestPerformanceServiceWindows:
+    """Tests for time-windowed rotation and cross-worker merging"""
+
+    def test_requests_share_one_window(self, performance_service):
+        """Test requests in the same window update one histogram"""
+        for _ in range(10):
+            performance_service.record_request("/api/test", "GET", 5.0, 200)
+
+        assert len(_request_metrics["GET:/api/test"]) == 1
+
+    def test_clear_old_metrics_drops_expired_windows(self, performance_service):
+        """Test windows older than max age are removed with their counts"""
+        old = LatencyHistogram()
+        for _ in range(3):
+            old.add(10.0)
+        old_start = int(time.time() // _METRICS_WINDOW_SECONDS) * _METRICS_WINDOW_SECONDS - 7200
+        _request_metrics["GET:/api/old"].append((old_start, old))
+        performance_service.record_request("/api/old", "GET", 10.0, 200)
+
+        cleared = performance_service.clear_old_metrics(max_age_minutes=60)
+
+        assert cleared == 3
+        assert performance_service.get_endpoint_metrics("/api/old", "GET")["request_count"] == 1
+
+    def test_flush_and_merge_across_workers(self, performance_service):
+        """Test persisted histograms from another worker merge with local windows"""
+        from database import PerformanceMetric, get_db
+
+        db = get_db()
+        try:
+            closed_start = int(time.time() // _METRICS_WINDOW_SECONDS) * _METRICS_WINDOW_SECONDS - _METRICS_WINDOW_SECONDS
+            local = LatencyHistogram()
+            for i in range(1, 51):
+                local.add(float(i))
+            _request_metrics["GET:/api/merge-test"].append((closed_start, local))
+
+            written = performance_service.flush_to_database(db=db)
+            assert written == 1
+            # Flushing again does not duplicate the window
+            assert performance_service.flush_to_database(db=db) == 0
+
+            # Simulate a second worker's row for the same window
+            other = LatencyHistogram()
+            for i in range(51, 101):
+                other.add(float(i))
+            db.add(PerformanceMetric(
+                endpoint="/api/merge-test",
+                method="GET",
+                period_start=datetime.utcfromtimestamp(closed_start),
+                period_end=datetime.utcfromtimestamp(closed_start + _METRICS_WINDOW_SECONDS),
+                histogram=other.to_dict(),
+            ))
+            db.commit()
+
+            # Plus an unflushed request in the current window
+            performance_service.record_request("/api/merge-test", "GET", 100.0, 500)
+
+            merged = performance_service.get_merged_metrics(
+                period_minutes=60, endpoint="/api/merge-test", method="GET", db=db
+            )
+
+            assert merged["request_count"] == 101
+            assert merged["error_count"] == 1
+            assert 49 <= merged["p50_time"] <= 52
+        finally:
+            db.query(PerformanceMetric).filter(
+                PerformanceMetric.endpoint == "/api/merge-test"
+            ).delete()
+            db.commit()
+            db.close()
+
+    def test_purge_persisted_metrics_keeps_recent_windows(self, performance_service):
+        """Test persisted rows past retention are deleted and recent ones kept"""
+        from database import PerformanceMetric, get_db
+
+        db = get_db()
+        try:
+            now = datetime.utcnow()
+            for days_ago in (10, 1):
+                start = now - timedelta(days=days_ago)
+                db.add(PerformanceMetric(
+                    endpoint="/api/purge-test",
+                    method="GET",
+                    period_start=start,
+                    period_end=start + timedelta(seconds=_METRICS_WINDOW_SECONDS),
+                ))
+            db.commit()
+
+            deleted = performance_service.purge_persisted_metrics(retention_days=7, db=db)
+
+            assert deleted >= 1
+            remaining = db.query(PerformanceMetric).filter(
+                PerformanceMetric.endpoint == "/api/purge-test"
+            ).all()
+            assert len(remaining) == 1
+            assert remaining[0].period_start > now - timedelta(days=2)
+        finally:
+            db.query(PerformanceMetric).filter(
+                PerformanceMetric.endpoint == "/api/purge-test"
+            ).delete()
+            db.commit()
+            db.close()
+
+    def test_flush_cycle_uses_its_own_session(self, performance_service):
+        """Test the background flush never touches a request's session"""
+        request_session = MagicMock()
+        performance_service.db = request_session
+        own_session = MagicMock()
+        closed_start = int(time.time() // _METRICS_WINDOW_SECONDS) * _METRICS_WINDOW_SECONDS - _METRICS_WINDOW_SECONDS
+        hist = LatencyHistogram()
+        hist.add(5.0)
+        _request_metrics["GET:/api/flush-cycle"].append((closed_start, hist))
+
+        with patch("database.get_db", return_value=own_session):
+            performance_service._flush_cycle()
+
+        own_session.add.assert_called()
+        own_session.commit.assert_called()
+        own_session.close.assert_called_once()
+        assert request_session.method_calls == []
+
+    def test_live_windows_from_other_workers_are_merged(self, performance_service, tmp_path):
+        """Test in-progress windows published by another worker are included"""
+        from services.shared_state import SQLiteStateBackend
+
+        backend = SQLiteStateBackend(str(tmp_path / "state.sqlite"))
+        current = int(time.time() // _METRICS_WINDOW_SECONDS) * _METRICS_WINDOW_SECONDS
+        other = LatencyHistogram()
+        for _ in range(4):
+            other.add(20.0)
+        backend.set("perf:live:999999", {"GET:/api/live-test": [(current, other.to_dict())]})
+
+        performance_service.record_request("/api/live-test", "GET", 20.0, 200)
+
+        with patch("services.performance_service.get_shared_state", return_value=backend):
+            assert performance_service.publish_live_windows() == 1
+            merged = performance_service.get_merged_metrics(
+                period_minutes=10, endpoint="/api/live-test", method="GET"
+            )
+
+        # 4 from the other worker + 1 local; our own published snapshot is not double counted
+        assert merged["request_count"] == 5
+
+    def test_metrics_endpoint_merges_workers_by_default(self, authenticated_client):
+        """Test /api/performance/metrics returns cross-worker metrics unless opted out"""
+        with patch.object(
+            PerformanceService, "get_merged_metrics", return_value={"GET:/x": {}}
+        ) as merged:
+            response = authenticated_client.get("/api/performance/metrics")
+            assert response.get_json()["metrics"] == {"GET:/x": {}}
+            assert merged.call_count == 1
+
+            authenticated_client.get("/api/performance/metrics?all_workers=false")
+            assert merged.call_count == 1
@@ -0,0 +1,158 @@
+"""
+Unit tests for the Pipeline Benchmark
+Tests for corpus loading, tradeline mapping, the staged replay and the
+regression comparison used to fail CI.
+"""
+import json
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from load_tests.pipeline_benchmark import (
+    STAGES,
+    compare_results,
+    format_report,
+    load_corpus,
+    main,
+    run_benchmark,
+    tradeline_from_account,
+)
+
+PARSED_REPORT = {
+    "client_name": "Test Client",
+    "accounts": [
+        {
+            "creditor": "BAD BANK",
+            "account_number": "4111****",
+            "status": "Charged off as bad debt",
+            "balance": "$1,200.00",
+            "credit_limit": "$1,000.00",
+            "date_opened": "03/10/2020",
+            "payment_history": [
+                {"month": "Jan", "transunion": "OK", "experian": "OK"},
+                {"month": "Feb", "transunion": None, "experian": "30"},
+                {"month": "Mar", "equifax": "CO"},
+                {"month": "Apr"},
+            ],
+            "bureaus": {"experian": {"present": True, "status": "Charge off"}},
+        }
+    ],
+    "inquiries": [{"company": "LENDER", "bureau": "TransUnion"}],
+    "collections": [],
+    "public_records": [],
+}
+
+
+def _results(**stages):
+    return {
+        "stages": {
+            stage: {"median_ms": ms, "min_ms": ms, "max_ms": ms, "alloc_peak_kb": kb}
+            for stage, (ms, kb) in stages.items()
+        },
+        "peak_rss_mb": 100.0,
+    }
+
+
+@pytest.fixture
+def corpus_dir(tmp_path):
+    (tmp_path / "b_report.json").write_text(json.dumps(PARSED_REPORT))
+    (tmp_path / "a_report.html").write_text("<html><body><p>empty</p></body></html>")
+    (tmp_path / "notes.txt").write_text("not a report")
+    return tmp_path
+
+
+# ============== Corpus Tests ==============
+
+
+class TestCorpus:
+    """Tests for corpus loading and tradeline mapping."""
+
+    def test_load_corpus_filters_and_sorts(self, corpus_dir):
+        corpus = load_corpus([corpus_dir, corpus_dir / "missing.html"])
+
+        assert [r.name for r in corpus] == ["a_report.html", "b_report.json"]
+        assert [r.is_html for r in corpus] == [True, False]
+
+    def test_tradeline_history_codes(self):
+        tradeline = tradeline_from_account(PARSED_REPORT["accounts"][0])
+
+        assert tradeline["payment_history"] == "01L-"
+        assert tradeline["creditor_name"] == "BAD BANK"
+        assert tradeline["current_balance"] == "$1,200.00"
+        assert tradeline["account_status"] == "Charged off as bad debt"
+
+
+# ============== Replay Tests ==============
+
+
+class TestRunBenchmark:
+    """Tests for replaying the corpus through every stage."""
+
+    def test_records_every_stage(self, corpus_dir):
+        results = run_benchmark(load_corpus([corpus_dir]), runs=2, warmup=0)
+
+        assert list(results["stages"]) == list(STAGES)
+        for stage in results["stages"].values():
+            assert stage["min_ms"] <= stage["median_ms"] <= stage["max_ms"]
+            assert stage["alloc_peak_kb"] >= 0
+        report = results["corpus"][1]
+        assert report["name"] == "b_report.json"
+        assert (report["accounts"], report["items"]) == (1, 2)
+        assert report["metro2_violations"] > 0
+        assert results["peak_rss_mb"] > 0
+        json.dumps(results)
+        assert "peak RSS" in format_report(results)
+
+    def test_empty_corpus(self):
+        with pytest.raises(ValueError):
+            run_benchmark([])
+
+
+# ============== Regression Tests ==============
+
+
+class TestCompareResults:
+    """Tests for the regression gate."""
+
+    def test_slower_stage_regresses(self):
+        baseline = _results(parse=(100.0, 1000), extract=(1.0, 10))
+        current = _results(parse=(130.0, 1000), extract=(2.0, 10))
+
+        regressions = compare_results(current, baseline, threshold=0.25)
+
+        # extract doubled but by less than MIN_REGRESSION_MS
+        assert regressions == ["parse: median 130.0ms vs 100.0ms (+30%)"]
+        assert compare_results(current, baseline, threshold=0.5) == []
+
+    def test_overlapping_runs_do_not_regress(self):
+        baseline = _results(parse=(100.0, 1000))
+        current = _results(parse=(130.0, 1000))
+        baseline["stages"]["parse"]["max_ms"] = 140.0
+
+        assert compare_results(current, baseline, threshold=0.25) == []
+
+    def test_allocation_growth_but_not_rss(self):
+        baseline = _results(pdf=(50.0, 400))
+        current = _results(pdf=(50.0, 500), letters=(1.0, 900))
+        current["peak_rss_mb"] = 150.0
+
+        regressions = compare_results(current, baseline, alloc_threshold=0.10)
+
+        assert regressions == ["pdf: peak allocations 500KB vs 400KB (+25%)"]
+
+    def test_main_exit_codes(self, corpus_dir, tmp_path):
+        output = tmp_path / "results.json"
+        args = ["--corpus", str(corpus_dir), "--runs", "1", "--warmup", "0"]
+
+        assert main(args + ["--output", str(output)]) == 0
+        baseline = json.loads(output.read_text())
+        assert main(args + ["--baseline", str(output), "--threshold", "100",
+                            "--alloc-threshold", "100"]) == 0
+
+        baseline["stages"]["metro2"]["alloc_peak_kb"] = 0.001
+        output.write_text(json.dumps(baseline))
+        assert main(args + ["--baseline", str(output)]) == 1
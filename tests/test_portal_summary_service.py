@@ -0,0 +1,210 @@
+"""
+Unit tests for Portal Summary Service
+Tests for computing the per-client portal summary, invalidation on writes to
+its source tables, version-checked rebuilds and the stale-row refresh task.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import (
+    Analysis,
+    Client,
+    ClientPortalSummary,
+    CreditScoreSnapshot,
+    Damages,
+    DisputeItem,
+    Violation,
+)
+from services.portal_summary_service import (
+    PortalSummaryService,
+    handle_refresh_portal_summaries,
+    mark_stale,
+)
+
+
+@pytest.fixture
+def portal_client(db_session):
+    client = Client(
+        name="Portal Summary",
+        email=f"portal-summary-{uuid.uuid4().hex[:8]}@test.com",
+        current_dispute_round=2,
+        portal_password_hash="hash",
+    )
+    db_session.add(client)
+    db_session.commit()
+    return client
+
+
+@pytest.fixture
+def analysis(db_session, portal_client):
+    analysis = Analysis(
+        credit_report_id=1,
+        client_id=portal_client.id,
+        client_name=portal_client.name,
+        dispute_round=1,
+    )
+    db_session.add(analysis)
+    db_session.commit()
+    return analysis
+
+
+def _violation(analysis, client_id, minimum=0, maximum=0):
+    return Violation(
+        analysis_id=analysis.id,
+        client_id=client_id,
+        statutory_damages_min=minimum,
+        statutory_damages_max=maximum,
+    )
+
+
+def _stored(db_session, client_id):
+    db_session.expire_all()
+    return db_session.get(ClientPortalSummary, client_id)
+
+
+# ============== Compute Tests ==============
+
+
+class TestCompute:
+    """Tests for PortalSummaryService.compute."""
+
+    def test_totals_from_source_tables(self, db_session, portal_client, analysis):
+        db_session.add_all(
+            [
+                DisputeItem(client_id=portal_client.id, bureau="Equifax"),
+                DisputeItem(client_id=portal_client.id, bureau="Equifax"),
+                DisputeItem(client_id=portal_client.id, bureau="Experian"),
+                _violation(analysis, portal_client.id, minimum=100, maximum=1000),
+                _violation(analysis, portal_client.id, minimum=100),
+                _violation(analysis, portal_client.id),
+                CreditScoreSnapshot(
+                    client_id=portal_client.id,
+                    average_score=580,
+                    created_at=datetime.utcnow() - timedelta(days=60),
+                ),
+                CreditScoreSnapshot(client_id=portal_client.id, average_score=640),
+            ]
+        )
+        db_session.commit()
+
+        summary = PortalSummaryService(db_session).compute(portal_client.id)
+
+        assert summary["disputed_accounts"] == 3
+        assert summary["bureau_counts"] == {"Equifax": 2, "Experian": 1}
+        assert summary["violation_count"] == 3
+        assert summary["total_violations"] == 1100
+        assert summary["current_round"] == 2
+        assert summary["starting_score"] == 580
+        assert summary["current_score"] == 640
+
+    def test_falls_back_to_damages_exposure(self, db_session, portal_client, analysis):
+        db_session.add(
+            Damages(analysis_id=analysis.id, client_id=portal_client.id, total_exposure=7500)
+        )
+        db_session.commit()
+
+        summary = PortalSummaryService(db_session).compute(portal_client.id)
+
+        assert summary["violation_count"] == 0
+        assert summary["total_violations"] == 7500
+        assert summary["starting_score"] is None
+
+
+# ============== Projection Tests ==============
+
+
+class TestProjection:
+    """Tests for reads, invalidation and rebuilds."""
+
+    def test_first_read_creates_row(self, db_session, portal_client):
+        service = PortalSummaryService(db_session)
+
+        summary = service.get_summary(portal_client.id)
+
+        row = _stored(db_session, portal_client.id)
+        assert row is not None and row.stale is False
+        assert summary["current_round"] == 2
+
+    def test_write_to_source_marks_row_stale(self, db_session, portal_client, analysis):
+        service = PortalSummaryService(db_session)
+        service.get_summary(portal_client.id)
+        version = _stored(db_session, portal_client.id).version
+
+        db_session.add(_violation(analysis, portal_client.id, maximum=1000))
+        db_session.commit()
+
+        row = _stored(db_session, portal_client.id)
+        assert row.stale is True
+        assert row.version == version + 1
+        assert service.get_summary(portal_client.id)["total_violations"] == 1000
+        assert _stored(db_session, portal_client.id).stale is False
+
+    def test_unwatched_client_change_keeps_row_fresh(self, db_session, portal_client):
+        PortalSummaryService(db_session).get_summary(portal_client.id)
+
+        portal_client.phone = "555-000-1111"
+        db_session.commit()
+        assert _stored(db_session, portal_client.id).stale is False
+
+        portal_client.current_dispute_round = 3
+        db_session.commit()
+        assert _stored(db_session, portal_client.id).stale is True
+
+    def test_delete_marks_row_stale(self, db_session, portal_client):
+        item = DisputeItem(client_id=portal_client.id, bureau="TransUnion")
+        db_session.add(item)
+        db_session.commit()
+        service = PortalSummaryService(db_session)
+        assert service.get_summary(portal_client.id)["disputed_accounts"] == 1
+
+        db_session.delete(item)
+        db_session.commit()
+
+        assert service.get_summary(portal_client.id)["disputed_accounts"] == 0
+
+    def test_rebuild_does_not_overwrite_newer_invalidation(
+        self, db_session, portal_client, monkeypatch
+    ):
+        service = PortalSummaryService(db_session)
+        service.get_summary(portal_client.id)
+        mark_stale(db_session, [portal_client.id])
+        db_session.commit()
+
+        compute = service.compute
+
+        def compute_then_invalidate(client_id):
+            values = compute(client_id)
+            # A write commits while the rebuild is running
+            mark_stale(db_session, [client_id])
+            return values
+
+        monkeypatch.setattr(service, "compute", compute_then_invalidate)
+        service.refresh(portal_client.id)
+
+        assert _stored(db_session, portal_client.id).stale is True
+
+
+# ============== Task Handler Tests ==============
+
+
+class TestRefreshTask:
+    """Tests for the refresh_portal_summaries task handler."""
+
+    def test_refreshes_stale_and_missing_rows(self, db_session, portal_client):
+        db_session.add(DisputeItem(client_id=portal_client.id, bureau="Equifax"))
+        db_session.commit()
+
+        result = handle_refresh_portal_summaries({})
+
+        assert result["success"] is True
+        assert result["failed"] == 0
+        row = _stored(db_session, portal_client.id)
+        assert row.stale is False
+        assert row.disputed_accounts == 1
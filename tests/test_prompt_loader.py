@@ -408,3 +408,26 @@ class TestFactoryFunction:
             loader = get_prompt_loader(knowledge_path=tmpdir)
 
             assert str(loader.knowledge_path) == tmpdir
+
+
+class TestPromptCache:
+    """Tests for the in-memory prompt cache"""
+
+    def test_reuses_text_until_file_changes(self):
+        """Should read from disk once, and again only after the file changes"""
+        from services.prompt_loader import PromptLoader
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / PromptLoader.PROMPT_FILES["quick"]
+            path.write_text("version one")
+            loader = PromptLoader(knowledge_path=tmpdir)
+
+            assert loader.load_prompt("quick") == "version one"
+            with patch("builtins.open") as mock_open:
+                assert PromptLoader(knowledge_path=tmpdir).load_prompt("quick") == "version one"
+                mock_open.assert_not_called()
+
+            path.write_text("version two, longer")
+            os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+
+            assert loader.load_prompt("quick") == "version two, longer"
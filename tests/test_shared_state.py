@@ -0,0 +1,331 @@
+"""
+Unit tests for Shared State Backend
+Tests for the memory and SQLite backends, backend selection, the
+flask-limiter storage adapter, and the consumers that use shared state
+(API rate limiter and SharedCache).
+"""
+import multiprocessing
+import pickle
+import sqlite3
+import stat
+import time
+from unittest.mock import patch
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limits.storage import storage_from_string
+
+from services.api_access_service import RateLimiter
+from services.performance_service import SharedCache
+from services.shared_state import (
+    MemoryStateBackend,
+    SQLiteStateBackend,
+    SharedStateLimitStorage,
+    create_backend,
+    get_limiter_storage_uri,
+    resolve_state_url,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    """Each backend runs the same contract tests"""
+    if request.param == "memory":
+        return MemoryStateBackend()
+    return SQLiteStateBackend(str(tmp_path / "state.sqlite"))
+
+
+def _hammer(path, n):
+    state = SQLiteStateBackend(path)
+    for _ in range(n):
+        state.incr("counter", ttl=60)
+
+
+# ============== Backend Contract Tests ==============
+
+
+class TestBackendContract:
+    """Behaviour every backend must share."""
+
+    def test_set_get_roundtrip(self, backend):
+        backend.set("k", {"a": [1, 2]})
+        assert backend.get("k") == {"a": [1, 2]}
+
+    def test_get_missing_returns_default(self, backend):
+        assert backend.get("missing", "fallback") == "fallback"
+
+    def test_stored_none_is_not_missing(self, backend):
+        sentinel = object()
+        backend.set("none", None)
+        assert backend.get("none", sentinel) is None
+
+    def test_ttl_expiry(self, backend):
+        backend.set("short", "v", ttl=0.05)
+        assert backend.get("short") == "v"
+        time.sleep(0.1)
+        assert backend.get("short") is None
+
+    def test_delete(self, backend):
+        backend.set("k", 1)
+        assert backend.delete("k") is True
+        assert backend.delete("k") is False
+
+    def test_incr_creates_and_adds(self, backend):
+        assert backend.incr("c") == 1
+        assert backend.incr("c", 5) == 6
+        assert backend.incr("c", -2) == 4
+
+    def test_incr_ttl_is_fixed_window(self, backend):
+        backend.incr("w", ttl=0.2)
+        time.sleep(0.1)
+        backend.incr("w", ttl=0.2)
+        remaining = backend.get_ttl("w")
+        assert remaining is not None and remaining < 0.15
+
+    def test_incr_restarts_after_expiry(self, backend):
+        backend.incr("w", 3, ttl=0.05)
+        time.sleep(0.1)
+        assert backend.incr("w", ttl=60) == 1
+
+    def test_keys_and_delete_prefix(self, backend):
+        backend.set("a:1", 1)
+        backend.set("a:2", 2)
+        backend.set("b:1", 3)
+        assert sorted(backend.keys("a:")) == ["a:1", "a:2"]
+        assert backend.delete_prefix("a:") == 2
+        assert backend.keys("a:") == []
+        assert backend.get("b:1") == 3
+
+    def test_purge_expired(self, backend):
+        backend.set("gone", 1, ttl=0.01)
+        backend.set("kept", 1)
+        time.sleep(0.05)
+        assert backend.purge_expired() == 1
+        assert backend.get("kept") == 1
+
+
+class TestSQLiteBackend:
+    """Tests specific to the host-local SQLite stand-in."""
+
+    def test_file_is_private(self, tmp_path):
+        path = tmp_path / "s.sqlite"
+        SQLiteStateBackend(str(path)).set("k", "v")
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    def test_values_are_json_not_pickle(self, tmp_path):
+        path = str(tmp_path / "s.sqlite")
+        state = SQLiteStateBackend(path)
+        state.set("doc", {"a": (1, 2)})
+        state.set("n", 5)
+
+        conn = sqlite3.connect(path)
+        rows = dict(conn.execute("SELECT key, value FROM shared_state").fetchall())
+        conn.close()
+        assert rows == {"doc": '{"a":[1,2]}', "n": 5}
+        assert state.get("doc") == {"a": [1, 2]}
+
+    def test_non_json_values_rejected(self, tmp_path):
+        state = SQLiteStateBackend(str(tmp_path / "s.sqlite"))
+        with pytest.raises(TypeError):
+            state.set("obj", object())
+
+    def test_pickled_entries_are_not_loaded(self, tmp_path):
+        path = str(tmp_path / "s.sqlite")
+        state = SQLiteStateBackend(path)
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "INSERT INTO shared_state (key, value) VALUES ('evil', ?)",
+            (pickle.dumps({"x": 1}),),
+        )
+        conn.commit()
+        conn.close()
+        assert state.get("evil", "missing") == "missing"
+
+    def test_shared_flag(self, tmp_path):
+        assert SQLiteStateBackend(str(tmp_path / "s.sqlite")).shared is True
+        assert MemoryStateBackend().shared is False
+
+    def test_visible_across_instances(self, tmp_path):
+        path = str(tmp_path / "s.sqlite")
+        SQLiteStateBackend(path).set("hello", "world")
+        assert SQLiteStateBackend(path).get("hello") == "world"
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="relies on fork")
+    def test_incr_atomic_across_processes(self, tmp_path):
+        # The parent keeps its backend open across the fork, as a preloading
+        # gunicorn master does
+        path = str(tmp_path / "s.sqlite")
+        parent = SQLiteStateBackend(path)
+        parent.set("warm", 1)
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_hammer, args=(path, 200)) for _ in range(4)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join(timeout=60)
+
+        assert parent.get("counter") == 800
+        assert SQLiteStateBackend(path).get("counter") == 800
+
+
+# ============== Selection Tests ==============
+
+
+class TestBackendSelection:
+    """Tests for resolve_state_url and create_backend."""
+
+    def test_explicit_url_wins(self):
+        with patch.dict(os.environ, {"SHARED_STATE_URL": "memory://", "REDIS_URL": "redis://x"}):
+            assert resolve_state_url() == "memory://"
+
+    def test_redis_url_used(self):
+        env = {"REDIS_URL": "redis://cache:6379/0", "TESTING": "true"}
+        with patch.dict(os.environ, env):
+            os.environ.pop("SHARED_STATE_URL", None)
+            assert resolve_state_url() == "redis://cache:6379/0"
+
+    def test_testing_defaults_to_memory(self):
+        with patch.dict(os.environ, {"TESTING": "true"}):
+            os.environ.pop("SHARED_STATE_URL", None)
+            os.environ.pop("REDIS_URL", None)
+            assert resolve_state_url() == "memory://"
+
+    def test_production_defaults_to_sqlite(self, tmp_path):
+        state_dir = tmp_path / "state"
+        env = {"TESTING": "false", "CI": "false", "SHARED_STATE_DIR": str(state_dir)}
+        with patch.dict(os.environ, env):
+            os.environ.pop("SHARED_STATE_URL", None)
+            os.environ.pop("REDIS_URL", None)
+            assert resolve_state_url() == f"sqlite:///{state_dir / 'shared_state.sqlite'}"
+        assert stat.S_IMODE(os.stat(state_dir).st_mode) == 0o700
+
+    def test_create_sqlite_backend(self, tmp_path):
+        backend = create_backend(f"sqlite:///{tmp_path / 'x.sqlite'}")
+        assert isinstance(backend, SQLiteStateBackend)
+
+    def test_unreachable_redis_falls_back_to_sqlite(self, tmp_path):
+        with patch("services.shared_state.RedisStateBackend") as mock_redis, patch.dict(
+            os.environ, {"SHARED_STATE_DIR": str(tmp_path)}
+        ):
+            mock_redis.return_value.check.return_value = False
+            backend = create_backend("redis://nowhere:1")
+        assert isinstance(backend, SQLiteStateBackend)
+        assert backend.path == str(tmp_path / "shared_state.sqlite")
+
+    def test_unusable_sqlite_falls_back_to_memory(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        backend = create_backend(f"sqlite:///{blocker / 'state.sqlite'}")
+        assert isinstance(backend, MemoryStateBackend)
+
+    def test_unknown_scheme_rejected(self):
+        with pytest.raises(ValueError):
+            create_backend("ftp://nope")
+
+    def test_limiter_uri_memory_in_tests(self):
+        assert get_limiter_storage_uri() == "memory://"
+
+
+# ============== Consumer Tests ==============
+
+
+class TestLimiterStorage:
+    """Tests for the flask-limiter storage adapter."""
+
+    def test_registered_scheme(self):
+        assert isinstance(storage_from_string("sharedstate://"), SharedStateLimitStorage)
+
+    def test_counts_against_backend(self, tmp_path):
+        backend = SQLiteStateBackend(str(tmp_path / "l.sqlite"))
+        with patch("services.shared_state.get_shared_state", return_value=backend):
+            storage = SharedStateLimitStorage("sharedstate://")
+        assert storage.incr("k", 60) == 1
+        assert storage.incr("k", 60) == 2
+        assert storage.get("k") == 2
+        assert storage.get_expiry("k") > time.time()
+        storage.clear("k")
+        assert storage.get("k") == 0
+
+
+class TestSharedRateLimiter:
+    """Tests for RateLimiter on a shared backend."""
+
+    def test_two_workers_share_one_limit(self, tmp_path):
+        path = str(tmp_path / "r.sqlite")
+        worker_a = RateLimiter(backend=SQLiteStateBackend(path))
+        worker_b = RateLimiter(backend=SQLiteStateBackend(path))
+
+        for _ in range(3):
+            assert worker_a.check_and_increment(1, per_minute=5, per_day=100)[0]
+        for _ in range(2):
+            assert worker_b.check_and_increment(1, per_minute=5, per_day=100)[0]
+
+        allowed, info = worker_a.check_and_increment(1, per_minute=5, per_day=100)
+        assert allowed is False
+        assert "per minute" in info["error"]
+        assert worker_b.get_usage(1)["minute_count"] == 5
+
+    def test_rejection_does_not_consume_day_quota(self):
+        limiter = RateLimiter(backend=MemoryStateBackend())
+        limiter.check_and_increment(2, per_minute=1, per_day=100)
+        limiter.check_and_increment(2, per_minute=1, per_day=100)
+        assert limiter.get_usage(2)["day_count"] == 1
+
+    def test_day_limit(self):
+        limiter = RateLimiter(backend=MemoryStateBackend())
+        for _ in range(3):
+            limiter.check_and_increment(3, per_minute=100, per_day=3)
+        allowed, info = limiter.check_and_increment(3, per_minute=100, per_day=3)
+        assert allowed is False
+        assert "per day" in info["error"]
+
+
+class TestSharedCache:
+    """Tests for the cross-worker response cache."""
+
+    def test_hit_and_miss(self, tmp_path):
+        cache = SharedCache(SQLiteStateBackend(str(tmp_path / "c.sqlite")))
+        assert cache.get("k") == (None, False)
+        cache.set("k", [1, 2, 3], ttl_seconds=60)
+        assert cache.get("k") == ([1, 2, 3], True)
+
+        stats = cache.get_stats()
+        assert stats["hit_count"] == 1
+        assert stats["miss_count"] == 1
+        assert stats["total_entries"] == 1
+
+    def test_reads_do_not_write_counters(self, tmp_path):
+        backend = SQLiteStateBackend(str(tmp_path / "c.sqlite"))
+        cache = SharedCache(backend)
+        cache.set("k", 1)
+        with patch.object(backend, "incr", wraps=backend.incr) as incr:
+            for _ in range(50):
+                cache.get("k")
+                cache.get("missing")
+            incr.assert_not_called()
+            assert cache.get_stats()["hit_count"] == 50
+            assert incr.call_count == 2
+
+    def test_unserializable_values_are_skipped(self, tmp_path):
+        cache = SharedCache(SQLiteStateBackend(str(tmp_path / "c.sqlite")))
+        cache.set("obj", object())
+        assert cache.get("obj") == (None, False)
+
+    def test_visible_from_other_worker(self, tmp_path):
+        path = str(tmp_path / "c.sqlite")
+        SharedCache(SQLiteStateBackend(path)).set("dash", {"x": 1})
+        assert SharedCache(SQLiteStateBackend(path)).get("dash") == ({"x": 1}, True)
+
+    def test_clear_pattern(self, tmp_path):
+        cache = SharedCache(SQLiteStateBackend(str(tmp_path / "c.sqlite")))
+        cache.set("clients:1", 1)
+        cache.set("clients:2", 2)
+        cache.set("other", 3)
+        assert cache.clear("clients:*") == 2
+        assert cache.get("other") == (3, True)
+        assert cache.clear() == 1
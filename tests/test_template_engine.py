@@ -0,0 +1,113 @@
+"""
+Unit tests for Template Engine
+Tests for compiling {variable} / {{variable}} templates, single-pass
+rendering, the versioned compile cache and render_fields.
+"""
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.template_engine import (
+    DOUBLE_BRACE,
+    CompiledTemplate,
+    TemplateCache,
+    blank_if_falsy,
+    compile_template,
+    render_fields,
+    template_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    template_cache.clear()
+    yield
+    template_cache.clear()
+
+
+# ============== CompiledTemplate Tests ==============
+
+
+class TestCompiledTemplate:
+    """Tests for parsing and rendering."""
+
+    def test_renders_placeholders(self):
+        compiled = CompiledTemplate("Dear {client_name}, re: {bureau} ({bureau})")
+        assert compiled.variables == {"client_name", "bureau"}
+        assert (
+            compiled.render({"client_name": "Jane", "bureau": "Equifax"})
+            == "Dear Jane, re: Equifax (Equifax)"
+        )
+
+    def test_missing_placeholders_left_as_written(self):
+        compiled = CompiledTemplate("Hi {first_name} {last_name}")
+        assert compiled.render({"first_name": "Jane"}) == "Hi Jane {last_name}"
+        assert compiled.missing_variables({"first_name": "Jane"}) == ["last_name"]
+
+    def test_values_are_not_re_expanded(self):
+        compiled = CompiledTemplate("{a} {b}")
+        assert compiled.render({"a": "{b}", "b": "x"}) == "{b} x"
+
+    def test_formatters(self):
+        compiled = CompiledTemplate("[{value}]")
+        assert compiled.render({"value": None}) == "[None]"
+        assert compiled.render({"value": None}, blank_if_falsy) == "[]"
+        assert compiled.render({"value": 0}, blank_if_falsy) == "[]"
+
+    def test_double_brace_syntax(self):
+        compiled = CompiledTemplate("Hi {{first_name}}, {single}", DOUBLE_BRACE)
+        assert compiled.variables == {"first_name"}
+        assert compiled.render({"first_name": "Jane"}) == "Hi Jane, {single}"
+
+    def test_ignores_non_identifier_braces(self):
+        compiled = CompiledTemplate("body { color: red; } {name}")
+        assert compiled.variables == {"name"}
+        assert compiled.render({"name": "x"}) == "body { color: red; } x"
+
+    def test_render_many(self):
+        compiled = compile_template("{n}!")
+        assert compiled.render_many([{"n": 1}, {"n": 2}]) == ["1!", "2!"]
+
+
+# ============== Cache Tests ==============
+
+
+class TestTemplateCache:
+    """Tests for TemplateCache and render_fields."""
+
+    def test_hit_on_same_key_and_source(self):
+        cache = TemplateCache()
+        first = cache.get(("email", 1, "v1", "subject"), "Hi {name}")
+        second = cache.get(("email", 1, "v1", "subject"), "Hi {name}")
+        assert first is second
+        assert cache.get_stats()["hit_count"] == 1
+
+    def test_recompiles_when_source_changes(self):
+        cache = TemplateCache()
+        cache.get(("sms", 1, None, "message"), "old {x}")
+        compiled = cache.get(("sms", 1, None, "message"), "new {x}")
+        assert compiled.render({"x": 1}) == "new 1"
+
+    def test_evicts_oldest(self):
+        cache = TemplateCache(max_entries=2)
+        for i in range(3):
+            cache.get(i, f"t{i}")
+        assert cache.get_stats()["templates"] == 2
+
+    def test_render_fields(self):
+        rendered, missing = render_fields(
+            "letter",
+            7,
+            1,
+            {"subject": "Re: {account}", "content": "{client_name} {ssn_last4}", "footer": None},
+            {"account": "1234", "client_name": "Jane"},
+        )
+        assert rendered == {
+            "subject": "Re: 1234",
+            "content": "Jane {ssn_last4}",
+            "footer": "",
+        }
+        assert missing == ["ssn_last4"]
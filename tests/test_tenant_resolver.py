@@ -0,0 +1,170 @@
+"""
+Unit tests for Tenant Resolver
+Tests for host normalization, positive and negative caching, LRU bounds,
+invalidation (local and cross-worker), and the detect_tenant middleware.
+"""
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.shared_state import MemoryStateBackend
+from services.tenant_resolver import (
+    UNRESOLVED,
+    ResolvedHost,
+    TenantResolver,
+    normalize_host,
+)
+
+
+def _resolver(loader=None, **kwargs):
+    loader = loader or MagicMock(return_value=UNRESOLVED)
+    kwargs.setdefault("backend", MemoryStateBackend())
+    return TenantResolver(loader=loader, **kwargs), loader
+
+
+# ============== Resolver Tests ==============
+
+
+class TestNormalizeHost:
+    """Tests for normalize_host."""
+
+    def test_strips_port_and_case(self):
+        assert normalize_host("Partner.Example.COM:8443") == "partner.example.com"
+
+    def test_empty(self):
+        assert normalize_host(None) == ""
+        assert normalize_host("") == ""
+
+
+class TestTenantResolver:
+    """Tests for the per-host cache."""
+
+    def test_caches_per_normalized_host(self):
+        resolver, loader = _resolver()
+        resolver.resolve("a.example.com")
+        resolver.resolve("A.example.com:5000")
+        assert loader.call_count == 1
+        assert resolver.get_stats()["hit_count"] == 1
+
+    def test_negative_results_are_cached(self):
+        resolver, loader = _resolver()
+        assert resolver.resolve("unknown.example.com") is UNRESOLVED
+        assert resolver.resolve("unknown.example.com") is UNRESOLVED
+        assert loader.call_count == 1
+
+    def test_empty_host_skips_loader(self):
+        resolver, loader = _resolver()
+        assert resolver.resolve("") is UNRESOLVED
+        loader.assert_not_called()
+
+    def test_ttl_expiry(self):
+        resolver, loader = _resolver(ttl=0.05)
+        resolver.resolve("a.example.com")
+        time.sleep(0.1)
+        resolver.resolve("a.example.com")
+        assert loader.call_count == 2
+
+    def test_bounded_lru(self):
+        resolver, loader = _resolver(max_hosts=2)
+        resolver.resolve("a.com")
+        resolver.resolve("b.com")
+        resolver.resolve("a.com")
+        resolver.resolve("c.com")  # evicts b.com, the least recently used
+        assert resolver.get_stats()["hosts"] == 2
+        resolver.resolve("a.com")
+        assert loader.call_count == 3
+        resolver.resolve("b.com")
+        assert loader.call_count == 4
+
+    def test_invalidate_all(self):
+        resolver, loader = _resolver()
+        resolver.resolve("a.com")
+        resolver.invalidate_all()
+        resolver.resolve("a.com")
+        assert loader.call_count == 2
+
+    def test_invalidate_host(self):
+        resolver, loader = _resolver()
+        resolver.resolve("a.com")
+        resolver.resolve("b.com")
+        resolver.invalidate_host("A.com:80")
+        resolver.resolve("a.com")
+        resolver.resolve("b.com")
+        assert loader.call_count == 3
+
+    def test_invalidation_during_load_is_not_cached(self):
+        resolver, _ = _resolver()
+
+        def loader(host):
+            resolver.invalidate_all()
+            return UNRESOLVED
+
+        resolver._loader = MagicMock(side_effect=loader)
+        resolver.resolve("a.com")
+        assert resolver.get_stats()["hosts"] == 0
+
+    def test_invalidation_reaches_other_workers(self):
+        backend = MemoryStateBackend()
+        worker_a, loader_a = _resolver(backend=backend)
+        worker_b, _ = _resolver(backend=backend)
+
+        worker_a.resolve("a.com")
+        worker_b.invalidate_all()
+        worker_a._generation._checked_at = 0.0  # skip the 1s poll interval
+        worker_a.resolve("a.com")
+        assert loader_a.call_count == 2
+
+
+# ============== Middleware Tests ==============
+
+
+class TestDetectTenantMiddleware:
+    """Tests for the app's before_request hook."""
+
+    @pytest.fixture
+    def app_client(self):
+        from app import app
+
+        app.config["TESTING"] = True
+        return app
+
+    def test_static_paths_skip_resolution(self, app_client):
+        from app import detect_tenant
+
+        with patch("app.get_tenant_resolver") as mock_resolver:
+            with app_client.test_request_context("/static/css/app.css"):
+                detect_tenant()
+        mock_resolver.assert_not_called()
+
+    def test_tenant_and_branding_from_resolver(self, app_client):
+        from flask import g
+
+        from app import detect_tenant
+
+        tenant = MagicMock(id=7, slug="acme")
+        resolved = ResolvedHost(tenant=tenant, tenant_branding={"company_name": "Acme"})
+        with patch("app.get_tenant_resolver") as mock_resolver:
+            mock_resolver.return_value.resolve.return_value = resolved
+            with app_client.test_request_context("/dashboard", base_url="http://acme.example.com"):
+                detect_tenant()
+                assert g.tenant is tenant
+                assert g.tenant_branding == {"company_name": "Acme"}
+        mock_resolver.return_value.resolve.assert_called_once_with("acme.example.com")
+
+    def test_unknown_host_gets_default_branding(self, app_client):
+        from flask import g
+
+        from app import detect_tenant
+
+        with patch("app.get_tenant_resolver") as mock_resolver:
+            mock_resolver.return_value.resolve.return_value = UNRESOLVED
+            with app_client.test_request_context("/", base_url="http://nobody.example.com"):
+                detect_tenant()
+                assert g.tenant is None
+                assert g.tenant_branding["primary_color"] == "#319795"
@@ -5,6 +5,7 @@ Tests timeline event creation, retrieval, and progress tracking.
 """
 
 import pytest
+import uuid
 from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 import sys
@@ -625,6 +626,76 @@ class TestBackfillEvents:
         assert count == 1
 
 
+class TestBulkBackfillEvents:
+    """Tests for bulk_backfill_events and the backfill task handler"""
+
+    def _clients(self, db_session):
+        from database import Client
+
+        clients = [
+            Client(name='Bulk A', email='bulk_a@example.com',
+                   created_at=datetime(2024, 1, 1), agreement_signed=True,
+                   agreement_signed_at=datetime(2024, 1, 5), payment_status='paid'),
+            Client(name='Bulk B', email='bulk_b@example.com',
+                   created_at=datetime(2024, 2, 1), payment_status='pending'),
+            Client(name='Bulk C', email='bulk_c@example.com',
+                   created_at=datetime(2024, 3, 1), agreement_signed=True),
+        ]
+        db_session.add_all(clients)
+        db_session.commit()
+        return [c.id for c in clients]
+
+    def test_creates_missing_pairs_in_chunks(self, db_session):
+        """Should insert only missing events, reporting progress per chunk"""
+        from database import TimelineEvent
+
+        ids = self._clients(db_session)
+        service = TimelineService(db_session)
+        service.create_event(client_id=ids[1], event_type='signup')
+        progress = []
+
+        result = service.bulk_backfill_events(
+            client_ids=ids, chunk_size=2, progress=lambda *p: progress.append(p)
+        )
+
+        assert result['by_type'] == {
+            'signup': 2, 'agreement_signed': 2, 'payment_completed': 1
+        }
+        assert progress == [(2, 5), (4, 5), (5, 5)]
+        agreement = db_session.query(TimelineEvent).filter_by(
+            client_id=ids[0], event_type='agreement_signed'
+        ).one()
+        assert agreement.event_date == datetime(2024, 1, 5)
+        assert agreement.title == EVENT_TYPES['agreement_signed']['title']
+        assert agreement.is_milestone is True
+
+        again = service.bulk_backfill_events(client_ids=ids)
+        assert again['events_created'] == 0
+
+    def test_task_handler_tracks_batch_job(self, db_session, sample_staff):
+        """Should record progress on the BatchJob"""
+        from database import BatchJob
+        from services.timeline_service import handle_backfill_timeline
+
+        ids = self._clients(db_session)
+        job = BatchJob(job_uuid=str(uuid.uuid4()), name='Timeline backfill',
+                       action_type='backfill_timeline', created_by_id=sample_staff.id)
+        db_session.add(job)
+        db_session.commit()
+
+        result = handle_backfill_timeline(
+            {'batch_job_id': job.id, 'client_ids': ids}
+        )
+
+        db_session.expire_all()
+        job = db_session.query(BatchJob).get(job.id)
+        assert result['events_created'] == 6
+        assert job.status == 'completed'
+        assert job.total_items == 6
+        assert job.items_processed == 6
+        assert job.progress_percent == 100.0
+
+
 class TestHelperFunctions:
     """Tests for helper logging functions"""
 
@@ -16,6 +16,8 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from services.shared_state import MemoryStateBackend
+from services.tenant_resolver import ResolvedHost, TenantResolver
 from services.whitelabel_service import (
     WhiteLabelConfigService,
     get_whitelabel_config_service,
@@ -43,12 +45,21 @@ def mock_db():
 
 
 @pytest.fixture
-def service(mock_db):
+def resolver(mock_db):
+    """Fresh tenant resolver that loads configs through the mocked db."""
+    return TenantResolver(
+        loader=lambda host: ResolvedHost(
+            whitelabel_config=WhiteLabelConfigService(mock_db).detect_config_from_host(host)
+        ),
+        backend=MemoryStateBackend(),
+    )
+
+
+@pytest.fixture
+def service(mock_db, resolver):
     """Create WhiteLabelConfigService instance with mocked db."""
-    svc = WhiteLabelConfigService(mock_db)
-    # Clear any cached data between tests
-    svc._clear_cache()
-    return svc
+    with patch("services.whitelabel_service.get_tenant_resolver", return_value=resolver):
+        yield WhiteLabelConfigService(mock_db)
 
 
 @pytest.fixture
@@ -224,21 +235,14 @@ class TestGetConfigByOrg:
         result = service.get_config_by_org(0)
         assert result is None
 
-    def test_get_config_by_org_uses_cache(self, service, mock_db, mock_config):
-        """Test that organization config lookup uses cache."""
+    def test_get_config_by_org_is_not_cached(self, service, mock_db, mock_config):
+        """Test that organization lookups return live rows, not cached ones."""
         mock_db.query.return_value.filter.return_value.first.return_value = mock_config
 
-        # First lookup
-        result1 = service.get_config_by_org(1)
-        assert result1 == mock_config
+        service.get_config_by_org(1)
+        service.get_config_by_org(1)
 
-        # Reset mock
-        mock_db.reset_mock()
-
-        # Second lookup should use cache
-        result2 = service.get_config_by_org(1)
-        assert result2 == mock_config
-        mock_db.query.assert_not_called()
+        assert mock_db.query.call_count == 2
 
 
 # ============== Get Config by ID Tests ==============
@@ -364,17 +368,13 @@ class TestCreateConfig:
 
     def test_create_config_clears_cache(self, service, mock_db, mock_config):
         """Test that creating a config clears the cache."""
-        # Pre-populate cache
-        service._set_cache("test_key", "test_value")
-        assert service._get_from_cache("test_key") == "test_value"
-
         mock_db.query.return_value.filter_by.return_value.first.return_value = None
 
-        with patch("services.whitelabel_service.encrypt_value", return_value="encrypted"):
+        with patch("services.whitelabel_service.encrypt_value", return_value="encrypted"), \
+                patch("services.whitelabel_service.invalidate_tenant_cache") as invalidate:
             service.create_config(1, {"subdomain": "newdomain", "organization_name": "Test"})
 
-        # Cache should be cleared
-        assert service._get_from_cache("test_key") is None
+        invalidate.assert_called_once()
 
     def test_create_config_encrypts_email(self, service, mock_db):
         """Test that email_from_address is encrypted on creation."""
@@ -451,12 +451,12 @@ class TestUpdateConfig:
 
     def test_update_config_clears_cache(self, service, mock_db, mock_config):
         """Test that updating a config clears the cache."""
-        service._set_cache("test_key", "test_value")
         mock_db.query.return_value.filter_by.return_value.first.return_value = mock_config
 
-        service.update_config(1, organization_name="Updated")
+        with patch("services.whitelabel_service.invalidate_tenant_cache") as invalidate:
+            service.update_config(1, organization_name="Updated")
 
-        assert service._get_from_cache("test_key") is None
+        invalidate.assert_called_once()
 
     def test_update_config_encrypts_email(self, service, mock_db, mock_config):
         """Test that email_from_address is encrypted on update."""
@@ -516,12 +516,12 @@ class TestDeleteConfig:
 
     def test_delete_config_clears_cache(self, service, mock_db, mock_config):
         """Test that deleting a config clears the cache."""
-        service._set_cache("test_key", "test_value")
         mock_db.query.return_value.filter_by.return_value.first.return_value = mock_config
 
-        service.delete_config(1)
+        with patch("services.whitelabel_service.invalidate_tenant_cache") as invalidate:
+            service.delete_config(1)
 
-        assert service._get_from_cache("test_key") is None
+        invalidate.assert_called_once()
 
 
 # ============== Get All Configs Tests ==============
@@ -805,55 +805,46 @@ class TestSubdomainValidation:
 
 
 class TestCaching:
-    """Tests for caching mechanism."""
-
-    def test_cache_set_and_get(self, service):
-        """Test setting and getting from cache."""
-        service._set_cache("test_key", "test_value")
-
-        result = service._get_from_cache("test_key")
-
-        assert result == "test_value"
-
-    def test_cache_not_found(self, service):
-        """Test getting non-existent key returns None."""
-        result = service._get_from_cache("nonexistent_key")
+    """Tests for the shared tenant resolver cache."""
 
-        assert result is None
-
-    def test_cache_expiration(self, service):
-        """Test cache expires after TTL."""
-        service._set_cache("test_key", "test_value")
-
-        # Manually set timestamp to expired
-        service._cache_timestamps["test_key"] = datetime.utcnow() - timedelta(seconds=service._cache_ttl + 10)
+    def test_domain_lookup_reads_shared_resolver(self, mock_db):
+        """Test that domain lookups go through the process-wide resolver."""
+        service = WhiteLabelConfigService(mock_db)
+        resolver = Mock()
+        resolver.resolve.return_value = ResolvedHost(whitelabel_config="snapshot")
 
-        result = service._get_from_cache("test_key")
-
-        assert result is None
+        with patch("services.whitelabel_service.get_tenant_resolver", return_value=resolver):
+            result = service.get_config_by_domain("partner.example.com")
 
-    def test_cache_clear(self, service):
-        """Test clearing cache."""
-        service._set_cache("key1", "value1")
-        service._set_cache("key2", "value2")
-
-        service._clear_cache()
-
-        assert service._get_from_cache("key1") is None
-        assert service._get_from_cache("key2") is None
+        assert result == "snapshot"
+        resolver.resolve.assert_called_once_with("partner.example.com")
+        mock_db.query.assert_not_called()
 
     def test_cache_stores_none_values(self, service, mock_db):
         """Test that None values are also cached (for negative lookups)."""
         mock_db.query.return_value.filter.return_value.first.return_value = None
 
-        # First lookup
-        result1 = service.get_config_by_domain("nonexistent.com")
-        assert result1 is None
+        assert service.get_config_by_domain("nonexistent.com") is None
+        mock_db.reset_mock()
+
+        assert service.get_config_by_domain("nonexistent.com") is None
+        mock_db.query.assert_not_called()
+
+    def test_write_invalidates_resolver(self, service, resolver, mock_db, mock_config):
+        """Test that a config write makes the next domain lookup hit the DB."""
+        mock_db.query.return_value.filter.return_value.first.return_value = mock_config
+        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_config
+        service.get_config_by_domain("testfirm.com")
+
+        with patch(
+            "services.whitelabel_service.invalidate_tenant_cache",
+            side_effect=resolver.invalidate_all,
+        ):
+            service.update_config(1, organization_name="Updated")
+        mock_db.reset_mock()
 
-        # Manually verify the None is cached
-        cache_key = "domain:nonexistent.com"
-        # The cache value should exist (even if None)
-        assert cache_key in service._config_cache
+        assert service.get_config_by_domain("testfirm.com") == mock_config
+        mock_db.query.assert_called()
 
 
 # ============== Factory Function Tests ==============
@@ -0,0 +1,252 @@
+"""
+Unit tests for XHR Report Capture
+Tests for recording JSON responses, building the structured report from
+captured payloads, and the XHR-first path in CreditImportAutomation with its
+DOM fallback.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services.credit_import_automation as cia
+from services.credit_import_automation import SERVICE_CONFIGS, CreditImportAutomation
+from services.xhr_report_capture import XHRCapture, build_report, normalize_bureau
+
+TRADES_PAYLOAD = {
+    "report": {
+        "trades": [
+            {
+                "memberCodeShortName": "CAPITAL ONE",
+                "maskedAccountNumber": "5178****",
+                "currentBalanceAmount": 1250,
+                "creditLimitAmount": 3000,
+                "openDate": 1577836800000,
+                "currentAccountRating": "03",
+                "paymentPattern": "1123",
+                "memberCodeAccount": {
+                    "creditorContact": {
+                        "memberCodeLongName": "CAPITAL ONE BANK USA",
+                        "phone": "800-955-7070",
+                        "city": "Richmond",
+                        "state": "VA",
+                    }
+                },
+            },
+            {
+                "memberCodeShortName": "DISCOVER",
+                "maskedAccountNumber": "6011****",
+                "closedDate": 1609459200000,
+            },
+        ]
+    }
+}
+SCORES_PAYLOAD = {
+    "creditScores": [
+        {"bureau": "TUC", "score": 640},
+        {"bureau": "Experian", "score": {"value": "652"}},
+        {"bureau": "EQF", "score": 618},
+    ]
+}
+SCORES = {"transunion": 640, "experian": 652, "equifax": 618}
+PROFILE_PAYLOAD = {
+    "personalInformation": {
+        "names": [{"firstName": "JANE", "lastName": "DOE"}],
+        "addresses": [{"streetAddress": "1 MAIN ST", "city": "AUSTIN", "state": "TX", "zip": "78701"}],
+        "dateOfBirth": "1980",
+    },
+    "inquiries": [{"subscriberName": "AUTO LENDER", "inquiryDate": "01/02/2024", "bureau": "EFX"}],
+}
+
+
+def _responses(*payloads):
+    return [{"url": f"https://api.example.com/{i}", "data": p} for i, p in enumerate(payloads)]
+
+
+@pytest.fixture
+def parse_account():
+    return CreditImportAutomation()._parse_account_item
+
+
+# ============== Capture Tests ==============
+
+
+class TestXHRCapture:
+    """Tests for recording responses."""
+
+    def test_keeps_new_json_only(self):
+        capture = XHRCapture()
+        body = json.dumps(SCORES_PAYLOAD)
+
+        assert capture.add("https://x/api/scores", body) is True
+        assert capture.add("https://x/api/scores", body) is False  # repeated poll
+        assert capture.add("https://x/api/ping", '{"ok": true}') is False
+        assert capture.add("https://x/api/page", "<html>" + "x" * 200) is False
+        assert len(capture.responses) == 1
+
+    def test_on_response_filters_errors(self):
+        capture = XHRCapture()
+        response = SimpleNamespace(
+            url="https://x/api/scores",
+            status=500,
+            headers={"content-type": "application/json"},
+            text=AsyncMock(return_value=json.dumps(SCORES_PAYLOAD)),
+        )
+
+        asyncio.run(capture.on_response(response))
+        assert capture.responses == []
+
+        response.status = 200
+        asyncio.run(capture.on_response(response))
+        assert len(capture.responses) == 1
+
+    def test_attach_once_per_page(self):
+        capture = XHRCapture()
+        page = MagicMock()
+
+        capture.attach(page)
+        capture.attach(page)
+
+        page.on.assert_called_once_with("response", capture.on_response)
+
+
+# ============== Report Builder Tests ==============
+
+
+class TestBuildReport:
+    """Tests for build_report."""
+
+    def test_full_report_from_payloads(self, parse_account):
+        report = build_report(
+            _responses(TRADES_PAYLOAD, SCORES_PAYLOAD, PROFILE_PAYLOAD), parse_account
+        )
+
+        assert report["missing"] == []
+        assert report["scores"] == SCORES
+        capital_one, discover = report["accounts"]
+        assert capital_one["creditor"] == "CAPITAL ONE"
+        assert capital_one["balance"] == 1250.0
+        assert capital_one["credit_limit"] == 3000.0
+        assert capital_one["date_opened"] == "1/1/2020"
+        assert capital_one["payment_status"] == "60 Days Late"
+        assert [m["transunion"] for m in capital_one["payment_history"]] == ["OK", "OK", "30", "60"]
+        assert discover["account_status"] == "Closed"
+        assert report["creditor_contacts"][0]["name"] == "CAPITAL ONE BANK USA"
+        assert report["personal_info"]["names"] == ["JANE DOE"]
+        assert report["personal_info"]["addresses"] == ["1 MAIN ST, AUSTIN, TX 78701"]
+        assert report["inquiries"][0]["bureau"] == "equifax"
+        assert report["summary"]["total_accounts"] == 2
+
+    def test_duplicate_trades_across_responses(self, parse_account):
+        report = build_report(_responses(TRADES_PAYLOAD, TRADES_PAYLOAD), parse_account)
+
+        assert len(report["accounts"]) == 2
+        assert "scores" in report["missing"]
+
+    def test_scores_need_every_reported_bureau(self, parse_account):
+        partial = {
+            "creditScores": [
+                {"bureau": "TUC", "score": 640},
+                {"bureau": "EQF", "score": 999},  # out of range
+            ]
+        }
+        trade = {"trades": [{"memberCodeShortName": "BANK", "EXP": {"balance": 10}}]}
+
+        report = build_report(_responses(partial, trade), parse_account)
+
+        assert report["scores"] == {"transunion": 640}
+        assert "scores" in report["missing"]
+
+    def test_normalize_bureau(self):
+        assert normalize_bureau("TUC") == "transunion"
+        assert normalize_bureau("bureau_experian") == "experian"
+        assert normalize_bureau("EFX") == "equifax"
+        assert normalize_bureau("unknown") is None
+
+
+# ============== Import Flow Tests ==============
+
+
+class TestXHRFirstDownload:
+    """Tests for _download_report choosing between payloads and the DOM."""
+
+    @pytest.fixture(autouse=True)
+    def xhr_mode(self, monkeypatch):
+        monkeypatch.setattr(cia, "CAPTURE_MODE", "xhr")
+
+    def _run(self, automation, payloads, tmp_path):
+        page = AsyncMock()
+        page.url = "https://member.example.com/report"
+        page.on = MagicMock()
+        page.content = AsyncMock(return_value="<html>report</html>")
+        page.query_selector = AsyncMock(return_value=None)
+        automation.page = page
+        for payload in payloads:
+            automation.capture.add("https://api.example.com/report", json.dumps(payload))
+
+        with patch.object(cia, "REPORTS_DIR", tmp_path), patch.object(
+            automation, "_render_full_report", AsyncMock()
+        ) as render, patch.object(
+            automation, "_extract_accounts_data", AsyncMock(return_value=[])
+        ) as scrape, patch.object(
+            automation, "_extract_personal_data", AsyncMock(
+                return_value={"personal": {"names": ["DOM NAME"]}, "summary": {},
+                              "inquiries": [], "creditor_contacts": []}
+            )
+        ) as personal:
+            result = asyncio.run(
+                automation._download_report(SERVICE_CONFIGS["IdentityClub.com"], 1, "Test")
+            )
+        return result, render, scrape, personal
+
+    def test_complete_payloads_skip_dom(self, tmp_path):
+        automation = CreditImportAutomation()
+
+        result, render, scrape, personal = self._run(
+            automation, [TRADES_PAYLOAD, SCORES_PAYLOAD, PROFILE_PAYLOAD], tmp_path
+        )
+
+        assert result["source"] == "xhr"
+        assert result["scores"] == SCORES
+        assert len(result["accounts"]) == 2
+        render.assert_not_called()
+        scrape.assert_not_called()
+        personal.assert_not_called()
+        with open(result["json_path"]) as f:
+            saved = json.load(f)
+        assert saved["personal_info"]["names"] == ["JANE DOE"]
+
+    def test_missing_accounts_fall_back_to_dom(self, tmp_path):
+        automation = CreditImportAutomation()
+
+        with patch.object(automation, "_extract_scores", AsyncMock(return_value=None)):
+            result, render, scrape, personal = self._run(
+                automation, [SCORES_PAYLOAD], tmp_path
+            )
+
+        assert result["source"] == "dom"
+        render.assert_awaited_once()
+        scrape.assert_awaited_once()
+        # Scores the payloads did have are kept
+        assert result["scores"] == SCORES
+        with open(result["json_path"]) as f:
+            assert json.load(f)["personal_info"]["names"] == ["DOM NAME"]
+
+    def test_dom_capture_mode(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cia, "CAPTURE_MODE", "dom")
+        automation = CreditImportAutomation()
+
+        with patch.object(automation, "_extract_scores", AsyncMock(return_value={})):
+            result, render, _, _ = self._run(
+                automation, [TRADES_PAYLOAD, SCORES_PAYLOAD, PROFILE_PAYLOAD], tmp_path
+            )
+
+        assert result["source"] == "dom"
+        render.assert_awaited_once()